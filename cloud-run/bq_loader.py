@@ -1,44 +1,144 @@
 """BigQueryデータ投入モジュール
 
-pandas DataFrame → BigQuery load_table_from_dataframe でバッチ投入。
+収集行を正規化しながら NDJSON 一時ファイルへ書き出し、load_table_from_file でバッチ投入。
 """
 
+import json
 import logging
-from datetime import datetime, timezone
-from typing import Optional
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from typing import IO, Iterable, Iterator, Optional
 
-import pandas as pd
 from google.cloud import bigquery
 
+import clients
 import config
+import typed_columns
 
 logger = logging.getLogger(__name__)
 
 
 def _build_bq_client() -> bigquery.Client:
-    """BigQueryクライアントを構築"""
-    return bigquery.Client(project=config.GCP_PROJECT_ID)
+    """BigQueryクライアント（clients のプロセス共有クライアント）"""
+    return clients.bq_client()
 
 
-def _rows_to_dataframe(rows: list[list], columns: list[str]) -> pd.DataFrame:
-    """2次元配列をDataFrameに変換
+def _normalize_row(row: list, expected_cols: int) -> list[Optional[str]]:
+    """1行を列数に揃え、全値を文字列化する
 
-    GASのデータは列数が不揃いの場合があるため、不足分をNoneで埋める。
+    GASのデータは列数が不揃いの場合があるため、不足分をNoneで埋め、超過分は切り捨てる。
+    BQスキーマが全列STRINGのため、値は str() で文字列化する。
+    """
+    if len(row) < expected_cols:
+        row = row + [None] * (expected_cols - len(row))
+    elif len(row) > expected_cols:
+        row = row[:expected_cols]
+    return [str(v) if v is not None else None for v in row]
+
+
+def _iter_ndjson_batches(
+    rows: Iterable[list],
+    columns: list[str],
+    ingested_at: datetime,
+    batch_rows: int,
+    table_name: Optional[str] = None,
+) -> Iterator[bytes]:
+    """rows を batch_rows 行ずつ正規化し、NDJSON のバイト列として順に返す
+
+    全行の正規化済みコピーを一度に持たないため、メモリ上の追加コピーは1バッチ分に収まる。
+    table_name に型付き派生列（config.TABLE_TYPED_COLUMNS）があれば、正規化後の値から
+    typed_columns.derive で計算して同じレコードに含める。
     """
-    normalized = []
     expected_cols = len(columns)
-
+    typed = table_name in config.TABLE_TYPED_COLUMNS
+    ts = ingested_at.strftime("%Y-%m-%d %H:%M:%S.%f UTC")
+    lines: list[str] = []
     for row in rows:
-        if len(row) < expected_cols:
-            row = row + [None] * (expected_cols - len(row))
-        elif len(row) > expected_cols:
-            row = row[:expected_cols]
-        # 全値を文字列に変換（BQスキーマがSTRING）
-        normalized.append([str(v) if v is not None else None for v in row])
+        record = dict(zip(columns, _normalize_row(row, expected_cols)))
+        if typed:
+            record.update(typed_columns.derive(table_name, record))
+        record["ingested_at"] = ts
+        lines.append(json.dumps(record, ensure_ascii=False))
+        if len(lines) >= batch_rows:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _write_ndjson(
+    rows: Iterable[list],
+    columns: list[str],
+    fileobj: IO[bytes],
+    table_name: Optional[str] = None,
+) -> int:
+    """rows を NDJSON として fileobj に書き出し、書き出した行数を返す"""
+    count = 0
+    ingested_at = datetime.now(timezone.utc)
+    for chunk in _iter_ndjson_batches(
+        rows, columns, ingested_at, config.BQ_LOAD_BATCH_ROWS, table_name=table_name
+    ):
+        fileobj.write(chunk)
+        count += chunk.count(b"\n")
+    return count
+
+
+def _layout_options(table_name: Optional[str]) -> dict:
+    """config.TABLE_LAYOUTS のパーティション・クラスタ指定を LoadJobConfig の引数にする"""
+    layout = config.TABLE_LAYOUTS.get(table_name)
+    if not layout:
+        return {}
+    start, end = config.BQ_YEAR_MONTH_RANGE
+    return {
+        "range_partitioning": bigquery.RangePartitioning(
+            field=layout["partition"],
+            range_=bigquery.PartitionRange(start=start, end=end, interval=1),
+        ),
+        "clustering_fields": layout["cluster"],
+    }
+
+
+def _load_rows(
+    client,
+    table_id: str,
+    rows: list[list],
+    columns: list[str],
+    write_disposition: str = bigquery.WriteDisposition.WRITE_TRUNCATE,
+    table_name: Optional[str] = None,
+    apply_layout: bool = False,
+) -> int:
+    """rows を table_id へ WRITE_TRUNCATE（既定）でロードし、行数を返す
+
+    DataFrame を経由せず、BQ_LOAD_BATCH_ROWS 行ずつ正規化して NDJSON 一時ファイルへ
+    書き出し、1回の load_table_from_file で投入する（ロードジョブは1つなので
+    WRITE_TRUNCATE の原子性は従来どおり）。
+    table_name（論理テーブル名。staging へのロードでも本テーブル名）に
+    config.TABLE_TYPED_COLUMNS があれば、その型付き派生列も計算して書き込む。
+    apply_layout なら config.TABLE_LAYOUTS のパーティション・クラスタ指定も付ける
+    （本テーブル用。既存テーブルと指定が食い違うとロードが失敗するため staging には付けない）。
+    """
+    # BQスキーマを明示（JSON の自動検出で STRING→INTEGER に変わるのを防止）
+    schema = [bigquery.SchemaField(col, "STRING") for col in columns]
+    schema.extend(
+        bigquery.SchemaField(col, col_type)
+        for col, col_type in config.TABLE_TYPED_COLUMNS.get(table_name, [])
+    )
+    schema.append(bigquery.SchemaField("ingested_at", "TIMESTAMP"))
+
+    job_config = bigquery.LoadJobConfig(
+        write_disposition=write_disposition,
+        source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+        schema=schema,
+        **(_layout_options(table_name) if apply_layout else {}),
+    )
 
-    df = pd.DataFrame(normalized, columns=columns)
-    df["ingested_at"] = datetime.now(timezone.utc)
-    return df
+    with tempfile.TemporaryFile() as fileobj:
+        count = _write_ndjson(rows, columns, fileobj, table_name=table_name)
+        fileobj.seek(0)
+        job = client.load_table_from_file(fileobj, table_id, job_config=job_config)
+        job.result()  # 完了まで待機
+    return count
 
 
 def load_to_bigquery(table_name: str, rows: list[list]) -> int:
@@ -60,24 +160,429 @@ def load_to_bigquery(table_name: str, rows: list[list]) -> int:
     client = _build_bq_client()
     table_id = f"{config.GCP_PROJECT_ID}.{config.BQ_DATASET}.{table_name}"
 
-    df = _rows_to_dataframe(rows, columns)
+    count = _load_rows(
+        client, table_id, rows, columns, table_name=table_name, apply_layout=True
+    )
 
-    # BQスキーマを明示（pandas型推論でSTRING→INTEGERに変わるのを防止）
-    schema = [bigquery.SchemaField(col, "STRING") for col in columns]
-    schema.append(bigquery.SchemaField("ingested_at", "TIMESTAMP"))
+    logger.info(
+        "テーブル %s: %d行を書き込みました", table_name, count
+    )
+    # 全件置換はどの年月が変わったか分からないため全件を再計算する
+    for proc_name, derived_table in _refreshed_tables(table_name):
+        _call_refresh(proc_name, derived_table, None)
+    return count
+
+
+def _refresh_proc_id(proc_name: str) -> str:
+    return f"{config.GCP_PROJECT_ID}.{config.BQ_DATASET}.{proc_name}"
+
+
+def _build_delta_sql(
+    table_id: str,
+    staging_id: str,
+    columns: list[str],
+    typed_cols: Iterable[str] = (),
+    refresh_procs: Iterable[str] = (),
+) -> str:
+    """staging と本テーブルを source_url 単位で比較し、差分のある source_url だけを
+    1トランザクションで DELETE + INSERT する multi-statement SQL を組み立てる。
+
+    比較は source_url ごとの行内容 fingerprint（行 JSON をソートして連結した SHA256）。
+    行の並び順には依存せず、重複行は件数ごと比較される。ingested_at は比較に含めない。
+    typed_cols（型付き派生列）は元の列から決まるため比較に含めず、INSERT でだけ写す。
+    typed_cols に year_month があれば、置換する source_url の新旧行の年月を
+    changed_months として集め、refresh_procs（年月配列を受けるプロシージャ）を
+    同じトランザクション内で順に呼ぶ。
+    """
+    typed_cols = list(typed_cols)
+    refresh_procs = list(refresh_procs)
+    data_cols = [c for c in columns if c != "source_url"]
+    struct = ", ".join(f"`{c}`" for c in data_cols)
+    col_list = ", ".join(f"`{c}`" for c in [*columns, *typed_cols])
+    track_months = "year_month" in typed_cols
+    declare_months = "DECLARE changed_months ARRAY<INT64>;" if track_months else ""
+    set_months = f"""SET changed_months = (
+      SELECT IFNULL(ARRAY_AGG(DISTINCT year_month), [])
+      FROM (
+        SELECT year_month FROM `{table_id}` WHERE source_url IN UNNEST(changed_urls)
+        UNION ALL
+        SELECT year_month FROM `{staging_id}` WHERE source_url IN UNNEST(changed_urls)
+      )
+      WHERE year_month IS NOT NULL
+    );""" if track_months else ""
+    calls = "\n      ".join(f"CALL `{proc}`(changed_months);" for proc in refresh_procs)
+    call_refresh = f"""IF ARRAY_LENGTH(changed_months) > 0 THEN
+      {calls}
+    END IF;""" if track_months and refresh_procs else ""
+    select_months = ", changed_months" if track_months else ""
+
+    def _fingerprint(source: str) -> str:
+        return f"""
+        SELECT source_url,
+               TO_HEX(SHA256(STRING_AGG(row_json, '\\n' ORDER BY row_json))) AS fp
+        FROM (
+          SELECT source_url, TO_JSON_STRING(STRUCT({struct})) AS row_json
+          FROM `{source}`
+        )
+        GROUP BY source_url"""
+
+    return f"""
+    DECLARE changed_urls ARRAY<STRING>;
+    {declare_months}
+    BEGIN TRANSACTION;
+    SET changed_urls = (
+      SELECT IFNULL(ARRAY_AGG(COALESCE(s.source_url, t.source_url)), [])
+      FROM ({_fingerprint(staging_id)}) s
+      FULL OUTER JOIN ({_fingerprint(table_id)}) t
+      ON s.source_url = t.source_url
+      WHERE s.fp IS NULL OR t.fp IS NULL OR s.fp != t.fp
+    );
+    {set_months}
+    DELETE FROM `{table_id}` WHERE source_url IN UNNEST(changed_urls);
+    INSERT INTO `{table_id}` ({col_list}, ingested_at)
+    SELECT {col_list}, ingested_at FROM `{staging_id}`
+    WHERE source_url IN UNNEST(changed_urls);
+    {call_refresh}
+    COMMIT TRANSACTION;
+    SELECT ARRAY_LENGTH(changed_urls) AS changed_count{select_months};
+    """
 
-    job_config = bigquery.LoadJobConfig(
-        write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
-        schema=schema,
+
+def load_delta_to_bigquery(table_name: str, rows: list[list]) -> int:
+    """source_url 単位の差分ロード（報告テーブル用）
+
+    1. 全行を `<table>_staging` に WRITE_TRUNCATE でロード（ロードジョブは無課金）
+    2. staging と本テーブルの source_url ごとの内容 fingerprint を比較し、
+       追加・変更・削除された source_url の行だけを1トランザクションで置換
+       （gyomu_reports は同じトランザクション内で、置換した行の年月分の
+       team_budget_actuals・team_month_hashes も再計算する。
+       config.TEAM_BUDGET_ACTUALS_REFRESH / TEAM_MONTH_HASHES_REFRESH）
+
+    内容が変わっていない source_url の行は書き換えないため、バイトと ingested_at が
+    保持され、ダッシュボードから見て途中状態（全件削除直後など）も発生しない。
+
+    Returns:
+        投入対象の行数（load_to_bigquery と同じく入力行数。実際に置換した
+        source_url 数はログに出す）
+    """
+    if not rows:
+        logger.info("テーブル %s: 書き込むデータなし", table_name)
+        return 0
+
+    columns = config.TABLE_COLUMNS.get(table_name)
+    if not columns or columns[0] != "source_url":
+        raise ValueError(f"テーブル {table_name} は source_url 単位の差分ロードに対応していません")
+
+    client = _build_bq_client()
+    dataset = f"{config.GCP_PROJECT_ID}.{config.BQ_DATASET}"
+    table_id = f"{dataset}.{table_name}"
+    staging_id = f"{dataset}.{table_name}{config.BQ_STAGING_SUFFIX}"
+
+    typed_cols = [col for col, _ in config.TABLE_TYPED_COLUMNS.get(table_name, [])]
+    refresh_procs = [_refresh_proc_id(proc) for proc, _ in _refreshed_tables(table_name)]
+    count = _load_rows(client, staging_id, rows, columns, table_name=table_name)
+    result = list(client.query(
+        _build_delta_sql(table_id, staging_id, columns, typed_cols, refresh_procs)
+    ).result())
+    changed = result[0]["changed_count"] if result else None
+    logger.info(
+        "テーブル %s: %d行を staging 経由で差分反映（置換 source_url: %s件）",
+        table_name, count, changed,
     )
+    if refresh_procs and result:
+        logger.info(
+            "%s: 年月 %s を再計算",
+            ", ".join(label for _, label in _refreshed_tables(table_name)),
+            sorted(result[0]["changed_months"]),
+        )
+    return count
 
-    job = client.load_table_from_dataframe(df, table_id, job_config=job_config)
-    job.result()  # 完了まで待機
 
+def _refreshed_tables(table_name: str) -> list[tuple[str, str]]:
+    """table_name のロードで再計算する派生テーブル [(プロシージャ名, テーブル名), ...]
+
+    どちらも gyomu_reports の年月単位の派生で、プロシージャは年月配列（NULL なら全件）を受ける。
+    """
+    if table_name != config.BQ_TABLE_GYOMU:
+        return []
+    tables = []
+    if config.TEAM_BUDGET_ACTUALS_REFRESH:
+        tables.append((
+            config.BQ_PROC_REFRESH_TEAM_BUDGET_ACTUALS, config.BQ_TABLE_TEAM_BUDGET_ACTUALS,
+        ))
+    if config.TEAM_MONTH_HASHES_REFRESH:
+        tables.append((
+            config.BQ_PROC_REFRESH_TEAM_MONTH_HASHES, config.BQ_TABLE_TEAM_MONTH_HASHES,
+        ))
+    return tables
+
+
+def refresh_team_budget_actuals(year_months: Optional[Iterable[int]] = None) -> None:
+    """team_budget_actuals を year_months（YYYYMM）分だけ再計算する。None なら全件
+
+    refresh_team_budget_actuals プロシージャ（infra/bigquery/views.sql）を
+    1トランザクションで呼ぶため、読み手が対象年月の行の欠けた途中状態を見ることはない。
+    """
+    _call_refresh(
+        config.BQ_PROC_REFRESH_TEAM_BUDGET_ACTUALS, config.BQ_TABLE_TEAM_BUDGET_ACTUALS,
+        year_months,
+    )
+
+
+def refresh_team_month_hashes(year_months: Optional[Iterable[int]] = None) -> None:
+    """team_month_hashes（隊 × 年月の gyomu_reports 内容 hash）を year_months 分だけ再計算する
+
+    None なら全件。refresh_team_month_hashes プロシージャを 1トランザクションで呼ぶ。
+    """
+    _call_refresh(
+        config.BQ_PROC_REFRESH_TEAM_MONTH_HASHES, config.BQ_TABLE_TEAM_MONTH_HASHES,
+        year_months,
+    )
+
+
+def _call_refresh(
+    proc_name: str, table_name: str, year_months: Optional[Iterable[int]]
+) -> None:
+    client = _build_bq_client()
+    if year_months is None:
+        arg, job_config = "NULL", None
+    else:
+        arg = "@months"
+        job_config = bigquery.QueryJobConfig(query_parameters=[
+            bigquery.ArrayQueryParameter("months", "INT64", sorted(set(year_months))),
+        ])
+    sql = f"""
+    BEGIN TRANSACTION;
+    CALL `{_refresh_proc_id(proc_name)}`({arg});
+    COMMIT TRANSACTION;
+    """
+    client.query(sql, job_config=job_config).result()
     logger.info(
-        "テーブル %s: %d行を書き込みました", table_name, len(df)
+        "%s: %s を再計算",
+        table_name,
+        "全件" if year_months is None else f"年月 {sorted(set(year_months))}",
+    )
+
+
+def compensation_closed_before(today: date) -> int:
+    """today 時点で締め済みでない最初の年月（YYYYMM）。これより前の月が締め済み
+
+    views.sql の v_monthly_compensation の境界（当月の 2 か月前）と同じ規則。
+    """
+    months = today.year * 12 + today.month - 1 - (config.COMPENSATION_OPEN_MONTHS - 1)
+    return (months // 12) * 100 + months % 12 + 1
+
+
+def _freeze_proc_id() -> str:
+    return (
+        f"{config.GCP_PROJECT_ID}.{config.BQ_DATASET}."
+        f"{config.BQ_PROC_FREEZE_MONTHLY_COMPENSATION}"
     )
-    return len(df)
+
+
+def _build_freeze_missing_sql(closed_table_id: str) -> str:
+    """@closed_before より前で報告データがあり、未凍結の年月を凍結する multi-statement SQL
+
+    報告テーブルは year_month パーティションのため、年月の列挙は year_month 列だけを読む。
+    最後の SELECT で凍結した年月を返す。
+    """
+    dataset = f"{config.GCP_PROJECT_ID}.{config.BQ_DATASET}"
+    return f"""
+    DECLARE months ARRAY<INT64> DEFAULT (
+      SELECT IFNULL(ARRAY_AGG(DISTINCT year_month ORDER BY year_month), ARRAY<INT64>[])
+      FROM (
+        SELECT year_month FROM `{dataset}.{config.BQ_TABLE_GYOMU}`
+        WHERE year_month < @closed_before
+        UNION ALL
+        SELECT year_month FROM `{dataset}.{config.BQ_TABLE_HOJO}`
+        WHERE year_month < @closed_before
+      )
+      WHERE year_month NOT IN (SELECT DISTINCT year_month FROM `{closed_table_id}`)
+    );
+    BEGIN TRANSACTION;
+    CALL `{_freeze_proc_id()}`(months);
+    COMMIT TRANSACTION;
+    SELECT months;
+    """
+
+
+def freeze_closed_compensation(
+    today: date, year_months: Optional[Iterable[int]] = None
+) -> list[int]:
+    """締め済み月の報酬を monthly_compensation_closed に凍結し、凍結した年月（YYYYMM）を返す
+
+    year_months 省略時は、today 時点で締め済みの月のうち未凍結の月を凍結する（毎朝バッチ）。
+    締まる前の月は凍結しない（締め日当日の訂正を取りこぼさない）。月替わりの 0 時から
+    バッチまでの間の直近締め月は v_monthly_compensation がその場計算で補う。
+    year_months 指定時は凍結済みでも作り直す（締め後の訂正の反映）。未締めの月は
+    ValueError（VIEW はまだ読まないが、締まった後も途中の値が残り自動凍結もされないため）。
+    """
+    closed_before = compensation_closed_before(today)
+    client = _build_bq_client()
+    if year_months is None:
+        closed_table_id = (
+            f"{config.GCP_PROJECT_ID}.{config.BQ_DATASET}."
+            f"{config.BQ_TABLE_MONTHLY_COMPENSATION_CLOSED}"
+        )
+        job_config = bigquery.QueryJobConfig(query_parameters=[
+            bigquery.ScalarQueryParameter("closed_before", "INT64", closed_before),
+        ])
+        result = list(client.query(
+            _build_freeze_missing_sql(closed_table_id), job_config=job_config
+        ).result())
+        frozen = sorted(result[0]["months"]) if result else []
+    else:
+        frozen = sorted(set(year_months))
+        open_months = [m for m in frozen if m >= closed_before]
+        if open_months:
+            raise ValueError(
+                f"未締めの年月は凍結できません: {open_months}（締め済みは {closed_before} より前）"
+            )
+        if frozen:
+            job_config = bigquery.QueryJobConfig(query_parameters=[
+                bigquery.ArrayQueryParameter("months", "INT64", frozen),
+            ])
+            client.query(f"""
+            BEGIN TRANSACTION;
+            CALL `{_freeze_proc_id()}`(@months);
+            COMMIT TRANSACTION;
+            """, job_config=job_config).result()
+    logger.info("monthly_compensation_closed: 年月 %s を凍結", frozen)
+    return frozen
+
+
+def read_reimbursement_manifest() -> dict[str, dict]:
+    """立替金シート差分収集マニフェストを読み取る
+
+    fail-soft: テーブル不在（初回）・BQ 障害時は空 dict（全シートをタブ検索から読み直すだけ）。
+
+    Returns:
+        {spreadsheet_id: {"name": str, "modified_time": str, "tab_name": str,
+                          "data": [[A, ..., L], ...]}}
+        前回読めなかったシートは tab_name が空文字。
+    """
+    client = _build_bq_client()
+    table_id = (
+        f"{config.GCP_PROJECT_ID}.{config.BQ_DATASET}.{config.BQ_TABLE_REIMBURSEMENT_MANIFEST}"
+    )
+    query = (
+        f"SELECT spreadsheet_id, name, modified_time, tab_name, rows_json FROM `{table_id}`"
+    )
+    try:
+        rows = client.query(query).result()
+    except Exception as exc:
+        logger.warning("立替金マニフェスト読み取り失敗（全シート再取得）: %s", exc)
+        return {}
+
+    manifest: dict[str, dict] = {}
+    for row in rows:
+        try:
+            data = json.loads(row["rows_json"] or "[]")
+        except ValueError:
+            continue
+        manifest[row["spreadsheet_id"]] = {
+            "name": row["name"],
+            "modified_time": row["modified_time"],
+            "tab_name": row["tab_name"],
+            "data": data,
+        }
+    return manifest
+
+
+def read_reimbursement_changes_token() -> Optional[str]:
+    """立替金フォルダ用に保存した Drive changes の pageToken を読み取る
+
+    fail-soft: テーブル不在（初回）・BQ 障害時は None（フォルダ一覧取得にフォールバック）。
+    """
+    table_id = (
+        f"{config.GCP_PROJECT_ID}.{config.BQ_DATASET}."
+        f"{config.BQ_TABLE_REIMBURSEMENT_CHANGES_TOKEN}"
+    )
+    query = f"SELECT page_token FROM `{table_id}` ORDER BY ingested_at DESC LIMIT 1"
+    try:
+        rows = list(_build_bq_client().query(query).result())
+    except Exception as exc:
+        logger.warning("changes pageToken 読み取り失敗（フォルダ一覧から収集）: %s", exc)
+        return None
+    return (rows[0]["page_token"] or None) if rows else None
+
+
+def _sheet_checkpoint_table_id() -> str:
+    return f"{config.GCP_PROJECT_ID}.{config.BQ_DATASET}.{config.BQ_TABLE_SHEET_CHECKPOINT}"
+
+
+def append_sheet_checkpoint(rows: list[list]) -> int:
+    """収集途中の取得済みシートを report_sheet_checkpoint に WRITE_APPEND で追記する
+
+    rows は TABLE_COLUMNS[BQ_TABLE_SHEET_CHECKPOINT] 順。ingested_at が追記時刻になる。
+    """
+    if not rows:
+        return 0
+    columns = config.TABLE_COLUMNS[config.BQ_TABLE_SHEET_CHECKPOINT]
+    return _load_rows(
+        _build_bq_client(), _sheet_checkpoint_table_id(), rows, columns,
+        write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+    )
+
+
+def replace_sheet_checkpoint(rows: list[list]) -> int:
+    """収集完了時にチェックポイントを rows（今回の失敗シート）だけに置き換える
+
+    load_to_bigquery は空データだと何もしないため、rows が空なら TRUNCATE する。
+    fail-soft: 置き換えに失敗しても、残った行は再開時に modifiedTime と
+    有効期間（REPORT_CHECKPOINT_MAX_AGE_HOURS）で絞られるだけなので 0 を返す。
+    """
+    if rows:
+        return load_to_bigquery(config.BQ_TABLE_SHEET_CHECKPOINT, rows)
+    try:
+        _build_bq_client().query(f"TRUNCATE TABLE `{_sheet_checkpoint_table_id()}`").result()
+    except Exception as exc:
+        logger.warning("チェックポイントのクリア失敗（次回再開時に期限で除外）: %s", exc)
+    return 0
+
+
+def read_sheet_checkpoint(max_age_hours: Optional[int] = None) -> dict[str, dict]:
+    """report_sheet_checkpoint から source_url ごとの最新行を読み取る
+
+    fail-soft: テーブル不在・BQ 障害時は空 dict（再開も再取得対象の特定もしないだけ）。
+
+    Args:
+        max_age_hours: 指定時はこの時間内に追記された行のみ（中断した収集の再開用）
+
+    Returns:
+        {source_url: {"modified_time": str, "data": {bq_table: [[b, c, ...], ...]},
+                      "status": "done" | "failed"}}
+    """
+    where = ""
+    if max_age_hours is not None:
+        where = (
+            "WHERE ingested_at >= "
+            f"TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {int(max_age_hours)} HOUR)"
+        )
+    query = f"""
+    SELECT source_url, modified_time, rows_json, status
+    FROM `{_sheet_checkpoint_table_id()}`
+    {where}
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY source_url ORDER BY ingested_at DESC) = 1
+    """
+    try:
+        rows = _build_bq_client().query(query).result()
+    except Exception as exc:
+        logger.warning("チェックポイント読み取り失敗（再開なし）: %s", exc)
+        return {}
+
+    checkpoint: dict[str, dict] = {}
+    for row in rows:
+        try:
+            data = json.loads(row["rows_json"] or "{}")
+        except ValueError:
+            continue
+        checkpoint[row["source_url"]] = {
+            "modified_time": row["modified_time"],
+            "data": data,
+            "status": row["status"],
+        }
+    return checkpoint
 
 
 def create_snapshots(snapshot_date: str) -> dict[str, int]:
@@ -90,6 +595,8 @@ def create_snapshots(snapshot_date: str) -> dict[str, int]:
 
     同日に複数回呼ばれても最初の1断面を保持する（IF NOT EXISTS）。
     1テーブルの作成が失敗しても残りのテーブルは継続する（部分失敗許容、付随処理のため）。
+    CLONE クエリは全テーブル分を先に投入してからまとめて完了待ちする
+    （サーバー側で並行実行され、Step 0 の所要時間が最も遅い1テーブル分に縮む）。
 
     Args:
         snapshot_date: snapshot名のサフィックス（例 "20260529"）。
@@ -102,6 +609,14 @@ def create_snapshots(snapshot_date: str) -> dict[str, int]:
     project = config.GCP_PROJECT_ID
     expiration_days = config.BQ_SNAPSHOT_EXPIRATION_DAYS
     results: dict[str, int] = {}
+    jobs: dict[str, object] = {}
+
+    def _record_failure(table_name: str, snap_err: Exception) -> None:
+        logger.error(
+            "snapshot作成失敗 %s（他テーブルは継続）: %s",
+            table_name, snap_err, exc_info=True,
+        )
+        results[table_name] = -1
 
     for table_name in config.BQ_SNAPSHOT_TABLES:
         source_id = f"{project}.{config.BQ_DATASET}.{table_name}"
@@ -115,17 +630,19 @@ def create_snapshots(snapshot_date: str) -> dict[str, int]:
             f"TIMESTAMP_ADD(CURRENT_TIMESTAMP(), INTERVAL {expiration_days} DAY))"
         )
         try:
-            client.query(query).result()  # 完了まで待機
-            logger.info("snapshot作成: %s", snapshot_id)
+            jobs[table_name] = client.query(query)  # 投入のみ（完了待ちは後段）
+        except Exception as snap_err:
+            _record_failure(table_name, snap_err)
+
+    for table_name, job in jobs.items():
+        try:
+            job.result()  # 完了まで待機
+            logger.info("snapshot作成: %s_%s", table_name, snapshot_date)
             results[table_name] = 1
         except Exception as snap_err:
-            logger.error(
-                "snapshot作成失敗 %s（他テーブルは継続）: %s",
-                table_name, snap_err, exc_info=True,
-            )
-            results[table_name] = -1
+            _record_failure(table_name, snap_err)
 
-    return results
+    return {t: results[t] for t in config.BQ_SNAPSHOT_TABLES}
 
 
 def read_members_from_bq() -> list[list]:
@@ -141,6 +658,37 @@ def read_members_from_bq() -> list[list]:
     return df.where(df.notna(), None).values.tolist()
 
 
+def read_sheet_manifest() -> dict[str, dict]:
+    """報告シート差分収集マニフェストを読み取る
+
+    fail-soft: テーブル不在（初回）・BQ 障害時は空 dict を返す。
+    マニフェストが無いと全シートを再取得するだけで、データ欠損にはならないため。
+
+    Returns:
+        {source_url: {"modified_time": str, "data": {bq_table: [[b, c, ...], ...]}}}
+    """
+    client = _build_bq_client()
+    table_id = f"{config.GCP_PROJECT_ID}.{config.BQ_DATASET}.{config.BQ_TABLE_SHEET_MANIFEST}"
+    query = f"SELECT source_url, modified_time, rows_json FROM `{table_id}`"
+    try:
+        rows = client.query(query).result()
+    except Exception as exc:
+        logger.warning("マニフェスト読み取り失敗（全シート再取得）: %s", exc)
+        return {}
+
+    manifest: dict[str, dict] = {}
+    for row in rows:
+        try:
+            data = json.loads(row["rows_json"] or "{}")
+        except ValueError:
+            continue
+        manifest[row["source_url"]] = {
+            "modified_time": row["modified_time"],
+            "data": data,
+        }
+    return manifest
+
+
 def read_group_based_users() -> dict[str, list[dict]]:
     """dashboard_usersからグループ由来ユーザーを取得
 
@@ -205,33 +753,74 @@ def read_all_sync_groups() -> set[str]:
     return set(df["group_email"].tolist())
 
 
-def _update_last_synced_at(group_email: str) -> None:
+def _update_last_synced_at(*group_emails: str) -> None:
     """同期処理が走った enabled グループの last_synced_at を現在時刻で更新
 
+    複数グループを渡した場合も UPDATE 1本で更新する。
     last_synced_at は UI 表示用の補助情報であり、書込失敗で sync 全体を止める
     必要はない。warning ログのみ出して続行する（read 部の fail-fast とは意図的に非対称）。
     """
+    if not group_emails:
+        return
     client = _build_bq_client()
     table_id = f"{config.GCP_PROJECT_ID}.{config.BQ_DATASET}.{config.BQ_TABLE_SYNC_GROUPS}"
     query = f"""
     UPDATE `{table_id}`
     SET last_synced_at = CURRENT_TIMESTAMP()
-    WHERE group_email = @group_email
+    WHERE group_email IN UNNEST(@group_emails)
     """
     job_config = bigquery.QueryJobConfig(
         query_parameters=[
-            bigquery.ScalarQueryParameter("group_email", "STRING", group_email)
+            bigquery.ArrayQueryParameter("group_emails", "STRING", list(group_emails))
         ]
     )
     try:
         client.query(query, job_config=job_config).result()
     except Exception as exc:
         logger.warning(
-            "last_synced_at 更新失敗 (group=%s, 同期処理は継続): %s",
-            group_email, exc, exc_info=True,
+            "last_synced_at 更新失敗 (groups=%s, 同期処理は継続): %s",
+            ", ".join(group_emails), exc, exc_info=True,
         )
 
 
+# 空配列（全員脱退）でも型を確定させるため要素型を明示する
+_GROUP_MEMBER_TYPE = bigquery.StructQueryParameterType(
+    bigquery.ScalarQueryParameterType("STRING", name="email"),
+    bigquery.ScalarQueryParameterType("STRING", name="source_group"),
+    bigquery.ScalarQueryParameterType("STRING", name="role"),
+)
+
+
+def _build_group_sync_merge_sql(table_id: str) -> str:
+    """グループ同期の追加・手動登録スキップ・削除を1本で行う MERGE 文
+
+    @members: 同期対象グループの最新メンバー ARRAY<STRUCT<email, source_group, role>>
+    @groups:  同期対象（enabled）グループ。削除はこのグループのレコードに限定する
+    - 追加: 最新メンバーにいて未登録、かつ手動登録（source_group IS NULL）が無いユーザー
+    - 削除: 同期対象グループに登録済みだが最新メンバーにいないユーザー
+    """
+    return f"""
+    MERGE `{table_id}` T
+    USING (
+      SELECT
+        m.email,
+        m.source_group,
+        m.role,
+        EXISTS (
+          SELECT 1 FROM `{table_id}` u
+          WHERE u.email = m.email AND u.source_group IS NULL
+        ) AS is_manual
+      FROM UNNEST(@members) AS m
+    ) S
+    ON T.email = S.email AND T.source_group = S.source_group
+    WHEN NOT MATCHED BY TARGET AND NOT S.is_manual THEN
+      INSERT (email, role, display_name, added_by, source_group, created_at, updated_at)
+      VALUES (S.email, S.role, NULL, 'system-sync', S.source_group, CURRENT_TIMESTAMP(), CURRENT_TIMESTAMP())
+    WHEN NOT MATCHED BY SOURCE AND T.source_group IN UNNEST(@groups) THEN
+      DELETE
+    """
+
+
 def sync_dashboard_users_from_groups(
     group_members_map: dict[str, list[str]],
 ) -> dict[str, int]:
@@ -239,6 +828,8 @@ def sync_dashboard_users_from_groups(
 
     enabled=TRUE のグループのみ処理対象。enabled=FALSE/未登録のグループは
     既存 dashboard_users レコードを残したまま add/remove を一切行わない（凍結）。
+    対象グループの最新メンバー全体を配列パラメータで渡し、追加・手動登録スキップ・削除を
+    MERGE 1本で反映する（ユーザー単位の DML を発行しない）。差分が無ければ DML は発行しない。
 
     Args:
         group_members_map: {group_email: [member_email, ...]} Admin Directory APIから取得した最新データ
@@ -248,14 +839,13 @@ def sync_dashboard_users_from_groups(
         - skipped_disabled: dashboard_sync_groups に enabled=FALSE で登録されているグループ数
         - skipped_unregistered: dashboard_sync_groups に未登録のグループ数（新規グループ等）
     """
-    client = _build_bq_client()
     table_id = f"{config.GCP_PROJECT_ID}.{config.BQ_DATASET}.dashboard_users"
 
     enabled_groups = read_enabled_sync_groups()
     registered_groups = read_all_sync_groups()  # enabled の TRUE/FALSE 問わず登録済みグループ
     current = read_group_based_users()
     candidate_groups = set(current.keys()) | set(group_members_map.keys())
-    all_groups = candidate_groups & enabled_groups
+    all_groups = sorted(candidate_groups & enabled_groups)
     skipped_disabled = len(candidate_groups & registered_groups - enabled_groups)
     skipped_unregistered = len(candidate_groups - registered_groups)
     if skipped_disabled or skipped_unregistered:
@@ -264,70 +854,44 @@ def sync_dashboard_users_from_groups(
             skipped_disabled, skipped_unregistered,
         )
 
-    total_added = 0
-    total_removed = 0
-
+    members_param = []
+    has_diff = False
     for group_email in all_groups:
         current_users = {u["email"] for u in current.get(group_email, [])}
         latest_members = set(group_members_map.get(group_email, []))
+        if latest_members != current_users:
+            has_diff = True
 
         # このグループの既存ロールを取得（新規追加時に使用）
         existing_roles = current.get(group_email, [])
         default_role = existing_roles[0]["role"] if existing_roles else "viewer"
 
-        # 追加: 最新メンバーにいるが現在登録されていないユーザー
-        to_add = latest_members - current_users
-        for member_email in to_add:
-            # 手動登録済みユーザーはスキップ（source_group IS NULL のレコードが存在する場合）
-            check_query = f"""
-            SELECT COUNT(*) AS cnt FROM `{table_id}`
-            WHERE email = @email AND source_group IS NULL
-            """
-            job_config = bigquery.QueryJobConfig(
-                query_parameters=[
-                    bigquery.ScalarQueryParameter("email", "STRING", member_email)
-                ]
-            )
-            rows = list(client.query(check_query, job_config=job_config).result())
-            if rows[0].cnt > 0:
-                continue
-
-            insert_query = f"""
-            MERGE `{table_id}` T
-            USING (SELECT @email AS email, @source_group AS source_group) S
-            ON T.email = S.email AND T.source_group = S.source_group
-            WHEN NOT MATCHED THEN
-              INSERT (email, role, display_name, added_by, source_group, created_at, updated_at)
-              VALUES (@email, @role, NULL, 'system-sync', @source_group, CURRENT_TIMESTAMP(), CURRENT_TIMESTAMP())
-            """
-            job_config = bigquery.QueryJobConfig(
-                query_parameters=[
-                    bigquery.ScalarQueryParameter("email", "STRING", member_email),
-                    bigquery.ScalarQueryParameter("role", "STRING", default_role),
-                    bigquery.ScalarQueryParameter("source_group", "STRING", group_email),
-                ]
-            )
-            result = client.query(insert_query, job_config=job_config).result()
-            if result.num_dml_affected_rows > 0:
-                total_added += 1
-
-        # 削除: 現在登録されているがグループから抜けたユーザー
-        to_remove = current_users - latest_members
-        for member_email in to_remove:
-            delete_query = f"""
-            DELETE FROM `{table_id}`
-            WHERE email = @email AND source_group = @source_group
-            """
-            job_config = bigquery.QueryJobConfig(
-                query_parameters=[
-                    bigquery.ScalarQueryParameter("email", "STRING", member_email),
-                    bigquery.ScalarQueryParameter("source_group", "STRING", group_email),
-                ]
-            )
-            client.query(delete_query, job_config=job_config).result()
-            total_removed += 1
+        for member_email in sorted(latest_members):
+            members_param.append(bigquery.StructQueryParameter(
+                None,
+                bigquery.ScalarQueryParameter("email", "STRING", member_email),
+                bigquery.ScalarQueryParameter("source_group", "STRING", group_email),
+                bigquery.ScalarQueryParameter("role", "STRING", default_role),
+            ))
+
+    total_added = 0
+    total_removed = 0
+
+    if has_diff:
+        client = _build_bq_client()
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ArrayQueryParameter("members", _GROUP_MEMBER_TYPE, members_param),
+                bigquery.ArrayQueryParameter("groups", "STRING", all_groups),
+            ]
+        )
+        job = client.query(_build_group_sync_merge_sql(table_id), job_config=job_config)
+        job.result()
+        stats = job.dml_stats
+        total_added = stats.inserted_row_count if stats else 0
+        total_removed = stats.deleted_row_count if stats else 0
 
-        _update_last_synced_at(group_email)
+    _update_last_synced_at(*all_groups)
 
     return {
         "added": total_added,
@@ -471,6 +1035,98 @@ def _dedup_after_claim(client, *, year: int, month: int, team: str, job_id: str)
     return deleted
 
 
+def claim_team_eval_rows(
+    client,
+    *,
+    year: int,
+    month: int,
+    teams: Iterable[str],
+    job_id: str,
+    actor: str,
+    lock_duration_min: Optional[int] = None,
+) -> set[str]:
+    """(year, month) の複数隊の claim を 1 ジョブでまとめて取得する（月次一括 lease）。
+
+    claim_team_eval_row と同じ取得条件（未 claim か期限切れなら取得）の MERGE 1 本で
+    全隊を lease し、_dedup_after_claim と同じ保護条件の DELETE 1 本で重複行を絞り、
+    最後に自分の job_id を持つ隊を SELECT して返す（マルチステートメント 1 ジョブ）。
+    release は隊ごとに release_team_eval_claim / upsert_team_monthly_eval で行う。
+
+    Returns:
+        claim を取得できた隊の集合（他者 claim 中の隊は含まれない）。
+    """
+    teams = sorted(set(teams))
+    if not teams:
+        return set()
+    lock_min = lock_duration_min or config.EVAL_BULK_LOCK_DURATION_MIN
+    table_id = f"{config.GCP_PROJECT_ID}.{config.BQ_DATASET}.{config.BQ_TABLE_TEAM_MONTHLY_EVAL}"
+    sql = f"""
+    MERGE `{table_id}` t
+    USING (
+      SELECT @year AS year, @month AS month, team,
+             @job_id AS lock_token, @actor AS lock_actor,
+             TIMESTAMP_ADD(CURRENT_TIMESTAMP(), INTERVAL {lock_min} MINUTE) AS lock_until
+      FROM UNNEST(@teams) AS team
+    ) s
+    ON t.year = s.year AND t.month = s.month AND t.team = s.team
+    WHEN MATCHED AND (t.lock_token IS NULL OR t.lock_until < CURRENT_TIMESTAMP()) THEN
+      UPDATE SET lock_token = s.lock_token,
+                 lock_until = s.lock_until,
+                 lock_actor = s.lock_actor
+    WHEN NOT MATCHED THEN
+      INSERT (year, month, team, lock_token, lock_until, lock_actor)
+      VALUES (s.year, s.month, s.team, s.lock_token, s.lock_until, s.lock_actor);
+
+    -- 取得できた隊ごとに「自分の token + 最新 lock_until」の 1 行だけ残し、
+    -- 自分の重複行と期限切れ orphan を削除する。他者のアクティブな claim は保護する。
+    DELETE FROM `{table_id}` AS t
+    WHERE year = @year AND month = @month
+      AND team IN (
+        SELECT team FROM `{table_id}`
+        WHERE year = @year AND month = @month AND lock_token = @job_id
+      )
+      AND TO_HEX(SHA256(TO_JSON_STRING(t))) NOT IN (
+        SELECT row_hash FROM (
+          SELECT
+            TO_HEX(SHA256(TO_JSON_STRING(k))) AS row_hash,
+            ROW_NUMBER() OVER (
+              PARTITION BY k.team
+              ORDER BY k.lock_until DESC, TO_HEX(SHA256(TO_JSON_STRING(k)))
+            ) AS rn
+          FROM `{table_id}` AS k
+          WHERE k.year = @year AND k.month = @month AND k.lock_token = @job_id
+        )
+        WHERE rn = 1
+      )
+      AND (
+        t.lock_token = @job_id
+        OR t.lock_token IS NULL
+        OR t.lock_until IS NULL
+        OR t.lock_until <= CURRENT_TIMESTAMP()
+      );
+
+    SELECT DISTINCT team
+    FROM `{table_id}`
+    WHERE year = @year AND month = @month AND lock_token = @job_id;
+    """
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ScalarQueryParameter("year", "INT64", year),
+            bigquery.ScalarQueryParameter("month", "INT64", month),
+            bigquery.ArrayQueryParameter("teams", "STRING", teams),
+            bigquery.ScalarQueryParameter("job_id", "STRING", job_id),
+            bigquery.ScalarQueryParameter("actor", "STRING", actor),
+        ]
+    )
+    won = {row["team"] for row in client.query(sql, job_config=job_config).result()}
+    if len(won) < len(teams):
+        logger.info(
+            "一括 claim: year=%s month=%s 取得 %d / %d 隊（残りは他者 claim 中）",
+            year, month, len(won), len(teams),
+        )
+    return won
+
+
 def load_existing_eval(client, *, year: int, month: int, team: str) -> Optional[dict]:
     """既存の team_monthly_eval レコードを 1 件取得する（差分検知 hash 比較用）。
 
@@ -615,18 +1271,51 @@ def release_team_eval_claim(
     return (job.num_dml_affected_rows or 0) > 0
 
 
+def _load_one(table_name: str, rows: list[list]) -> int:
+    """load_all の1テーブル分。失敗時は -1 を返す（他テーブルは継続）"""
+    try:
+        if table_name == config.BQ_TABLE_SHEET_CHECKPOINT:
+            return replace_sheet_checkpoint(rows)
+        if config.BQ_DELTA_LOAD and table_name in config.BQ_DELTA_LOAD_TABLES:
+            return load_delta_to_bigquery(table_name, rows)
+        return load_to_bigquery(table_name, rows)
+    except Exception as e:
+        logger.error("テーブル %s への書き込みエラー: %s", table_name, e)
+        return -1
+
+
 def load_all(all_data: dict[str, list[list]]) -> dict[str, int]:
     """全テーブルにデータをロード
 
+    config.BQ_DELTA_LOAD_TABLES（報告・立替金テーブル）は load_delta_to_bigquery で
+    source_url 単位の差分反映、それ以外は WRITE_TRUNCATE で全件置換。
+    テーブル同士は独立なので、全テーブルのロードを同時に投入してまとめて完了待ちする
+    （ロードジョブはサーバー側で並行実行される）。
+    config.BQ_LOAD_AFTER のテーブルだけは、同じ all_data 内の前提テーブルが全て
+    書けた後にロードする（前提が失敗したら書かずに 0）。
+
     Returns:
         {"gyomu_reports": 行数, "hojo_reports": 行数, "members": 行数}
+        失敗したテーブルは -1。キー順は all_data と同じ。
     """
-    results = {}
-    for table_name, rows in all_data.items():
-        try:
-            count = load_to_bigquery(table_name, rows)
-            results[table_name] = count
-        except Exception as e:
-            logger.error("テーブル %s への書き込みエラー: %s", table_name, e)
-            results[table_name] = -1
-    return results
+    deferred = {t: rows for t, rows in all_data.items() if t in config.BQ_LOAD_AFTER}
+    first = {t: rows for t, rows in all_data.items() if t not in deferred}
+
+    if len(first) <= 1:
+        results = {t: _load_one(t, rows) for t, rows in first.items()}
+    else:
+        with ThreadPoolExecutor(max_workers=len(first)) as executor:
+            futures = {
+                table_name: executor.submit(_load_one, table_name, rows)
+                for table_name, rows in first.items()
+            }
+            results = {table_name: future.result() for table_name, future in futures.items()}
+
+    for table_name, rows in deferred.items():
+        failed = [t for t in config.BQ_LOAD_AFTER[table_name] if results.get(t, 0) < 0]
+        if failed:
+            logger.warning("テーブル %s: 前提テーブル %s の書き込み失敗のため未更新", table_name, failed)
+            results[table_name] = 0
+        else:
+            results[table_name] = _load_one(table_name, rows)
+    return {table_name: results[table_name] for table_name in all_data}
@@ -0,0 +1,161 @@
+"""Google API クライアント・認証情報のプロセス内レジストリ
+
+各ステップ・エンドポイントが呼ぶたびに DWD 認証情報の発行・discovery クライアントの
+構築・bigquery.Client の生成をしていたのを、プロセス内で初回に遅延構築して使い回す。
+
+- 認証情報（DWD / Cloud Run の ADC）: スコープごとにプロセスで1つ。アクセストークンは
+  期限が切れると AuthorizedHttp / BQ クライアントのリクエスト前に自動で再取得される。
+- bigquery.Client / Gemini クライアント: スレッドセーフなのでプロセスで1つ。
+- Sheets / Drive / Admin の discovery クライアント: httplib2 がスレッドセーフでないため
+  スレッドごとに1つ（gunicorn のリクエストスレッド・_run_pool のワーカースレッド単位）。
+
+コンテナ起動時に warm_up をバックグラウンドで走らせ、最初のリクエストでの
+認証情報発行・トークン取得の待ちを起動直後に済ませておく（config.CLIENT_WARMUP）。
+"""
+
+import logging
+import threading
+from typing import Optional
+
+import httplib2
+import google_auth_httplib2
+from google.oauth2 import service_account
+from googleapiclient.discovery import build
+
+import config
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_local = threading.local()
+_credentials: dict[tuple[str, ...], object] = {}
+_base_credentials = None
+_bq_client = None
+_genai_client = None
+
+
+def _get_base_credentials():
+    """Cloud Run の ADC（iam.Signer 用）。プロセスで1つ（呼び出し側で _lock 取得済み）"""
+    global _base_credentials
+    if _base_credentials is None:
+        import google.auth
+
+        _base_credentials, _ = google.auth.default()
+    return _base_credentials
+
+
+def _mint_dwd_credentials(scopes: tuple[str, ...]):
+    """DWD認証情報を発行
+
+    ローカル: SA_KEY_PATHからキーファイル読み込み
+    Cloud Run: IAM signBlob API経由でキーレスDWD（Workload Identity）
+    """
+    if config.SA_KEY_PATH:
+        return service_account.Credentials.from_service_account_file(
+            config.SA_KEY_PATH, scopes=list(scopes), subject=config.DELEGATE_USER_EMAIL
+        )
+
+    from google.auth import iam
+    from google.auth.transport import requests as google_requests
+
+    # signBlob 呼び出し前に iam.Signer が base 認証情報のトークンを必要に応じて更新する
+    signer = iam.Signer(
+        request=google_requests.Request(),
+        credentials=_get_base_credentials(),
+        service_account_email=config.SA_EMAIL,
+    )
+    return service_account.Credentials(
+        signer=signer,
+        service_account_email=config.SA_EMAIL,
+        token_uri="https://oauth2.googleapis.com/token",
+        scopes=list(scopes),
+        subject=config.DELEGATE_USER_EMAIL,
+    )
+
+
+def dwd_credentials(scopes: list[str]):
+    """scopes の DWD 認証情報（プロセス内で共有）
+
+    複数スレッドから同時に期限切れを検知すると更新が重複しうるが、
+    どちらのトークンも有効なので害はない（ロックでリクエストを直列化しない）。
+    """
+    key = tuple(sorted(scopes))
+    with _lock:
+        creds = _credentials.get(key)
+        if creds is None:
+            creds = _credentials[key] = _mint_dwd_credentials(key)
+    return creds
+
+
+def google_service(api: str, version: str, scopes: list[str], timeout: int = 60):
+    """DWD認証の discovery クライアント（呼び出しスレッド専用にキャッシュ）"""
+    cache = getattr(_local, "services", None)
+    if cache is None:
+        cache = _local.services = {}
+    key = (api, version, tuple(sorted(scopes)), timeout)
+    service = cache.get(key)
+    if service is None:
+        http = httplib2.Http(timeout=timeout)
+        authorized_http = google_auth_httplib2.AuthorizedHttp(dwd_credentials(scopes), http=http)
+        service = cache[key] = build(api, version, http=authorized_http, cache_discovery=False)
+    return service
+
+
+def bq_client():
+    """プロセス共有の bigquery.Client"""
+    global _bq_client
+    with _lock:
+        if _bq_client is None:
+            from google.cloud import bigquery
+
+            _bq_client = bigquery.Client(project=config.GCP_PROJECT_ID)
+    return _bq_client
+
+
+def genai_client():
+    """プロセス共有の Gemini クライアント（vertex_evaluator.build_genai_client）"""
+    global _genai_client
+    with _lock:
+        if _genai_client is None:
+            import vertex_evaluator
+
+            _genai_client = vertex_evaluator.build_genai_client()
+    return _genai_client
+
+
+def warm_up(dwd_scopes: list[list[str]]) -> None:
+    """BQ クライアントと各スコープの DWD 認証情報を構築し、トークンを先に取得しておく
+
+    失敗してもログのみ（最初の利用時に改めて構築・取得される）。
+    """
+    from google.auth.transport import requests as google_requests
+
+    try:
+        bq_client()
+        for scopes in dwd_scopes:
+            dwd_credentials(scopes).refresh(google_requests.Request())
+        logger.info("API クライアント warm-up 完了 (DWD スコープ %d 種)", len(dwd_scopes))
+    except Exception as exc:  # noqa: BLE001 - warm-up は最適化のみ
+        logger.warning("API クライアント warm-up 失敗（初回利用時に構築）: %s", exc)
+
+
+def start_warm_up(dwd_scopes: list[list[str]]) -> Optional[threading.Thread]:
+    """config.CLIENT_WARMUP が有効なら warm_up をデーモンスレッドで開始する"""
+    if not config.CLIENT_WARMUP:
+        return None
+    thread = threading.Thread(
+        target=warm_up, args=(dwd_scopes,), name="client-warm-up", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def reset() -> None:
+    """キャッシュを破棄する（テスト用。呼び出しスレッドの discovery クライアントのみ破棄）"""
+    global _base_credentials, _bq_client, _genai_client
+    with _lock:
+        _credentials.clear()
+        _base_credentials = None
+        _bq_client = None
+        _genai_client = None
+    _local.__dict__.clear()
@@ -15,6 +15,14 @@ BQ_TABLE_SYNC_GROUPS = "dashboard_sync_groups"
 BQ_TABLE_REIMBURSEMENT = "reimbursement_items"
 BQ_TABLE_WAM_PROJECTS = "wam_target_projects"
 BQ_TABLE_MEMBER_MASTER = "member_master"
+# 差分収集用マニフェスト（報告シートごとの Drive modifiedTime と前回取得行）
+BQ_TABLE_SHEET_MANIFEST = "report_sheet_manifest"
+# 収集途中のチェックポイント（取得済みシートを逐次追記。中断後の再開と失敗シートの再取得用）
+BQ_TABLE_SHEET_CHECKPOINT = "report_sheet_checkpoint"
+# 立替金シートの差分収集用マニフェスト（Drive modifiedTime・入力シートタブ名・前回取得行）
+BQ_TABLE_REIMBURSEMENT_MANIFEST = "reimbursement_sheet_manifest"
+# 立替金フォルダの Drive changes フィードの続きから読むための pageToken（1行）
+BQ_TABLE_REIMBURSEMENT_CHANGES_TOKEN = "reimbursement_changes_token"
 # BQが唯一のソースであるテーブル（毎朝バッチで再生成されない）
 BQ_TABLE_DASHBOARD_USERS = "dashboard_users"
 BQ_TABLE_CHECK_LOGS = "check_logs"
@@ -22,7 +30,18 @@ BQ_TABLE_WITHHOLDING = "withholding_targets"
 # 予実管理機能 (PR-A で BQ 作成済み)
 BQ_TABLE_TEAM_BUDGETS = "team_budgets"
 BQ_TABLE_TEAM_MONTHLY_EVAL = "team_monthly_eval"
-BQ_VIEW_TEAM_BUDGET_ACTUALS = "v_team_budget_actuals"
+# v_team_budget_actuals の実体化テーブル（読み出し用。更新は bq_loader.refresh_team_budget_actuals）
+BQ_TABLE_TEAM_BUDGET_ACTUALS = "team_budget_actuals"
+BQ_PROC_REFRESH_TEAM_BUDGET_ACTUALS = "refresh_team_budget_actuals"
+# 隊 × 年月の gyomu_reports 内容 hash（評価の差分検知用。更新は bq_loader.refresh_team_month_hashes）
+BQ_TABLE_TEAM_MONTH_HASHES = "team_month_hashes"
+BQ_PROC_REFRESH_TEAM_MONTH_HASHES = "refresh_team_month_hashes"
+# 締め済み月の v_monthly_compensation 凍結スナップショット（作成は bq_loader.freeze_closed_compensation）
+BQ_TABLE_MONTHLY_COMPENSATION_CLOSED = "monthly_compensation_closed"
+BQ_PROC_FREEZE_MONTHLY_COMPENSATION = "freeze_monthly_compensation"
+# 未締めとして VIEW がその場計算する直近の月数（当月を含む）。これより前の月は締め済み。
+# infra/bigquery/views.sql の v_monthly_compensation の境界（当月の 2 か月前）と一致させること。
+COMPENSATION_OPEN_MONTHS = 3
 # 予実管理機能 PR-E (四半期×統括隊×カテゴリ)
 BQ_TABLE_EXPENSE_CATEGORIES = "expense_categories"
 BQ_TABLE_TEAM_HIERARCHY = "team_hierarchy"
@@ -30,6 +49,41 @@ BQ_TABLE_TEAM_BUDGETS_QUARTERLY = "team_budgets_quarterly"
 BQ_VIEW_TEAM_BUDGET_ACTUALS_QUARTERLY = "v_team_budget_actuals_quarterly"
 BQ_VIEW_TEAM_HIERARCHY_COVERAGE = "v_team_hierarchy_coverage"
 
+# 報告テーブルの差分ロード（source_url 単位で内容が変わった分だけ置換）
+# False なら従来どおり WRITE_TRUNCATE で全件置換する。
+BQ_DELTA_LOAD = os.environ.get("BQ_DELTA_LOAD", "true").lower() == "true"
+BQ_DELTA_LOAD_TABLES = [BQ_TABLE_GYOMU, BQ_TABLE_HOJO, BQ_TABLE_REIMBURSEMENT]
+# load_all で前提テーブルのロード成功後にだけ書き込むテーブル {table: [前提テーブル, ...]}
+# changes フィードの pageToken は立替金データとマニフェストが書けた後でないと進めない
+# （先に進めると、書き込みに失敗した変更が次回のフィードに現れず取りこぼす）。
+BQ_LOAD_AFTER = {
+    BQ_TABLE_REIMBURSEMENT_CHANGES_TOKEN: [BQ_TABLE_REIMBURSEMENT, BQ_TABLE_REIMBURSEMENT_MANIFEST],
+}
+BQ_STAGING_SUFFIX = "_staging"
+# gyomu_reports のロード時に team_budget_actuals を再計算する（差分ロードは変化した年月のみ、
+# 同じトランザクション内）。テーブル・プロシージャ作成前に Cloud Run を出す場合だけ false にする。
+TEAM_BUDGET_ACTUALS_REFRESH = (
+    os.environ.get("TEAM_BUDGET_ACTUALS_REFRESH", "true").lower() == "true"
+)
+# 同じく gyomu_reports のロード時に team_month_hashes を再計算する（テーブル作成前だけ false）。
+TEAM_MONTH_HASHES_REFRESH = (
+    os.environ.get("TEAM_MONTH_HASHES_REFRESH", "true").lower() == "true"
+)
+# 本テーブルの物理レイアウト {table: {"partition": 整数範囲パーティション列, "cluster": [列, ...]}}
+# 定義は infra/bigquery/migrations/2026-10-17_report_partitioning.sql と一致させること。
+# 全件置換（WRITE_TRUNCATE）のロードジョブにも同じ指定を渡し、レイアウトを保つ。
+# year_month は YYYYMM の整数（typed_columns.year_month）。範囲外・NULL の行は
+# __UNPARTITIONED__ / __NULL__ パーティションに入るだけで欠落はしない。
+# 区画数は (end - start) / interval = (203501 - 201501) / 1 = 2,000（YYYYMM は 1 年で 100 進むため
+# 未使用の 00・13-99 月分を含めて 20 年 × 100）。BigQuery の上限 10,000 区画を超えないこと。
+BQ_YEAR_MONTH_RANGE = (201501, 203501)  # [start, end)、interval 1
+TABLE_LAYOUTS = {
+    BQ_TABLE_GYOMU: {"partition": "year_month", "cluster": ["activity_category", "source_url"]},
+    BQ_TABLE_HOJO: {"partition": "year_month", "cluster": ["source_url"]},
+}
+# ロード時の NDJSON 書き出し単位（行）。メモリ上に同時に持つ正規化済み行数の上限。
+BQ_LOAD_BATCH_ROWS = int(os.environ.get("BQ_LOAD_BATCH_ROWS", "5000"))
+
 # BQバックアップ（誤操作・誤DELETE/MERGEからの復旧用 snapshot）
 # 対象は「Sheets/Admin Directoryから再生成できない=BQが唯一のソース」のテーブルのみ。
 # 毎朝バッチ末尾(Step8)で別データセットへ snapshot を取得し、expiration で自動失効させる。
@@ -118,10 +172,30 @@ REIMBURSEMENT_FOLDER_ID = "1jXs3cbO6gBvgDbotK0ODa9mL4x-iDooI"
 REIMBURSEMENT_TAB_SUFFIX = "入力シート"
 REIMBURSEMENT_DATA_START_ROW = 4
 REIMBURSEMENT_NICKNAME_REGEX = r"【(.+?)】"
+# Drive changes フィードで前回以降に追加・更新・削除されたファイルだけを対象にする。
+# pageToken 未保存（初回）・期限切れ・FULL_REFRESH 時はフォルダ一覧取得にフォールバック。
+REIMBURSEMENT_CHANGES_FEED = os.environ.get("REIMBURSEMENT_CHANGES_FEED", "true").lower() == "true"
 
 # Sheets API レート制限対策
 SHEETS_API_NUM_RETRIES = 5
 SHEETS_API_SLEEP_BETWEEN_REQUESTS = 0.5
+# 並列収集（ワーカープール + 共有トークンバケット）
+# 1 以下なら従来の逐次収集（固定 sleep）にフォールバックする。
+SHEETS_COLLECT_WORKERS = int(os.environ.get("SHEETS_COLLECT_WORKERS", "4"))
+# Sheets API のユーザー単位 read quota（DWD で単一ユーザーに集約されるため 60/min）
+SHEETS_API_READS_PER_MIN = int(os.environ.get("SHEETS_API_READS_PER_MIN", "60"))
+SHEETS_API_BURST = int(os.environ.get("SHEETS_API_BURST", "10"))
+# 収集チェックポイント: 取得済みシートを何件ごとに report_sheet_checkpoint へ追記するか
+REPORT_CHECKPOINT_FLUSH_EVERY = int(os.environ.get("REPORT_CHECKPOINT_FLUSH_EVERY", "20"))
+# 中断した収集の再開に使うチェックポイントの有効期間（これより古い行は再利用しない）
+REPORT_CHECKPOINT_MAX_AGE_HOURS = int(os.environ.get("REPORT_CHECKPOINT_MAX_AGE_HOURS", "6"))
+# Admin Directory API（Sheets とは別 quota）
+ADMIN_API_READS_PER_MIN = int(os.environ.get("ADMIN_API_READS_PER_MIN", "600"))
+ADMIN_API_BURST = int(os.environ.get("ADMIN_API_BURST", "20"))
+# Admin Directory API の並列取得ワーカー数（グループメンバー / メンバー所属グループ）
+ADMIN_API_WORKERS = int(os.environ.get("ADMIN_API_WORKERS", "8"))
+# 毎朝バッチ (POST /) で互いに依存しないステップを並列実行するワーカー数（1 で逐次）
+BATCH_STEP_WORKERS = int(os.environ.get("BATCH_STEP_WORKERS", "4"))
 
 # Vertex AI Gemini (予実管理機能)
 # spec: docs/specs/2026-06-10-team-budget-eval-design.md §3.2, §5, §7
@@ -135,6 +209,15 @@ PROMPT_VERSION = os.environ.get("PROMPT_VERSION", "v1")
 SAMPLE_QUERY_VERSION = "v1"  # サンプリング SQL のバージョン
 MAX_REGEN_ATTEMPTS = 2  # 生成失敗時のリトライ最大回数
 EVAL_LOCK_DURATION_MIN = 5  # claim row pattern の lock 期限
+# 月次一括 claim（claim_team_eval_rows）の lease 期限。全隊を先に lease するため
+# バッチ全体の上限（dashboard 側 TEAM_EVAL_BULK_TIMEOUT=1800s）に合わせる
+EVAL_BULK_LOCK_DURATION_MIN = int(os.environ.get("EVAL_BULK_LOCK_DURATION_MIN", "30"))
+# 隊単位評価の並列度（1 で従来の逐次処理）。BQ / Gemini の同時実行数は別枠で制限する
+TEAM_EVAL_WORKERS = int(os.environ.get("TEAM_EVAL_WORKERS", "6"))
+TEAM_EVAL_BQ_CONCURRENCY = int(os.environ.get("TEAM_EVAL_BQ_CONCURRENCY", "4"))
+TEAM_EVAL_GEMINI_CONCURRENCY = int(os.environ.get("TEAM_EVAL_GEMINI_CONCURRENCY", "3"))
+# async モード (POST /eval/team-monthly {"async": true}) の完了ジョブをメモリに保持する時間
+TEAM_EVAL_JOB_RETENTION_MIN = int(os.environ.get("TEAM_EVAL_JOB_RETENTION_MIN", "60"))
 
 # サービスアカウント
 SA_EMAIL = os.environ.get("SA_EMAIL", "pay-collector@monthly-pay-tax.iam.gserviceaccount.com")
@@ -143,6 +226,12 @@ SA_KEY_PATH = os.environ.get("SA_KEY_PATH", "")  # ローカル開発用のみ
 # Domain-Wide Delegation 対象ユーザー
 DELEGATE_USER_EMAIL = os.environ.get("DELEGATE_USER_EMAIL", "yasushi-honda@tadakayo.jp")
 
+# コンテナ起動時に API クライアント・認証情報を先に構築する（clients.start_warm_up）。
+# 既定は Cloud Run 上（K_SERVICE あり）のみ有効。ローカル・テストでは認証を走らせない。
+CLIENT_WARMUP = os.environ.get(
+    "CLIENT_WARMUP", "true" if os.environ.get("K_SERVICE") else "false"
+).lower() == "true"
+
 # シート設定（GASのsheetConfigsに対応）
 SHEET_CONFIGS = [
     {
@@ -162,6 +251,23 @@ SHEET_CONFIGS = [
 ]
 
 # テーブル別カラム名定義
+# ロード時に計算して一緒に保存する型付き派生列 {table: [(列名, BQ 型), ...]}
+# 値の計算は typed_columns.derive。VIEW・hash/サンプル SQL は STRING 列を都度パースせずこちらを読む。
+TABLE_TYPED_COLUMNS = {
+    BQ_TABLE_GYOMU: [
+        ("year_int", "INT64"),         # SAFE_CAST(year AS INT64)
+        ("month_int", "INT64"),        # extract_month(date)
+        ("report_date", "DATE"),       # parse_gyomu_date(year, date)
+        ("amount_numeric", "NUMERIC"), # SAFE_CAST(REGEXP_REPLACE(amount, r'[^0-9.-]', '') AS NUMERIC)
+        ("year_month", "INT64"),       # year_int * 100 + month_int（パーティション列）
+    ],
+    BQ_TABLE_HOJO: [
+        ("year_int", "INT64"),         # 数値年 / "YYYY/M/D" / 日付シリアル値を正規化
+        ("month_int", "INT64"),        # 同上（月）
+        ("year_month", "INT64"),       # year_int * 100 + month_int（パーティション列）
+    ],
+}
+
 TABLE_COLUMNS = {
     BQ_TABLE_GYOMU: [
         "source_url",
@@ -197,6 +303,25 @@ TABLE_COLUMNS = {
     BQ_TABLE_WAM_PROJECTS: [
         "target_project", "wam_flag", "note",
     ],
+    BQ_TABLE_SHEET_MANIFEST: [
+        "source_url", "spreadsheet_id", "modified_time",
+        "rows_json",  # {bq_table: [[b, c, ...], ...]}（URL付加前）の JSON
+    ],
+    BQ_TABLE_REIMBURSEMENT_MANIFEST: [
+        "spreadsheet_id",
+        "name",       # ファイル名（changes フィード時は一覧を取らないためニックネームの元として保持）
+        "modified_time",
+        "tab_name",   # 入力シートタブ名（次回はタブ一覧取得を省略）。読めなかったシートは空
+        "rows_json",  # [[A, B, ..., L], ...]（source_url / nickname 付加前）の JSON
+    ],
+    BQ_TABLE_REIMBURSEMENT_CHANGES_TOKEN: [
+        "page_token",
+    ],
+    BQ_TABLE_SHEET_CHECKPOINT: [
+        "source_url", "spreadsheet_id", "modified_time",
+        "rows_json",  # report_sheet_manifest と同形式
+        "status",     # "done"（完全取得）/ "failed"（batchGet 失敗でタブ単位取得に落ちた）
+    ],
     BQ_TABLE_MEMBER_MASTER: [
         "member_id", "last_name", "first_name",
         "last_name_kana", "first_name_kana", "nickname",
@@ -13,7 +13,9 @@ from flask import Flask, jsonify, request
 import sheets_collector
 import bq_loader
 import chat_notifier
+import clients
 import config
+import step_graph
 import team_eval_service
 
 app = Flask(__name__)
@@ -24,156 +26,227 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# コンテナ起動時に BQ クライアント・DWD 認証情報を先に構築（最初のリクエストの待ちを削減）
+clients.start_warm_up([
+    sheets_collector.SCOPES, sheets_collector.DRIVE_SCOPES, sheets_collector.ADMIN_SCOPES,
+])
+
+
+def _full_refresh_requested() -> bool:
+    """差分収集を無効化して全報告シートを再取得するか（?full=1 または body {"full": true}）"""
+    if request.args.get("full", "").lower() in ("1", "true", "yes"):
+        return True
+    payload = request.get_json(silent=True) or {}
+    return bool(payload.get("full", False))
+
 
 @app.route("/", methods=["POST"])
 def run_consolidation():
-    """データ集約のメインエンドポイント（Cloud Schedulerから呼び出し）"""
+    """データ集約のメインエンドポイント（Cloud Schedulerから呼び出し）
+
+    Step 0-7 を依存グラフとして step_graph.run_steps で実行する。依存関係:
+        snapshot (Step0) ─────────────→ dashboard_users (Step5)
+        collect (Step1-3) → groups (Step4) → compensation (Step8)
+        reimbursement (Step6) / member_master (Step7) は独立
+    Step5 は Step0 の dashboard_users snapshot を前提とする fail-safe のため
+    Step0 の後に走る。Step0 の対象は BQ 唯一ソースのテーブルのみで、Step5 以外の
+    ステップは書き込まないため、他ステップと並列でも「更新前バックアップ」が保たれる。
+    """
     start = time.time()
     logger.info("--- 処理開始: 全スプレッドシートのデータ集約 ---")
+    full = _full_refresh_requested()  # request context はメインスレッドでのみ参照
 
     try:
-        failures: list[tuple[str, str]] = []  # 部分失敗を集約し末尾で Chat 通知
-        # Step 0: BQ唯一ソーステーブルの snapshot バックアップ（本処理の前に取得）
-        # バッチ実行前=直近の正常状態を保全することで、後続 Step5 の dashboard_users
-        # MERGE/DELETE 等の誤動作や、前日までのUI誤操作からの復旧手段を残す。
-        # 対象は Sheets/Admin Directory から再生成できないテーブルのみ（bq_loader.create_snapshots 参照）。
-        # 失敗しても本体処理は継続する（付随処理）。
-        try:
-            logger.info("--- snapshotバックアップ開始 ---")
-            jst = timezone(timedelta(hours=9))
-            snapshot_date = datetime.now(jst).strftime("%Y%m%d")
-            snapshot_results = bq_loader.create_snapshots(snapshot_date)
-            logger.info("--- snapshotバックアップ完了: %s ---", snapshot_results)
-        except Exception as snap_err:
-            logger.warning(
-                "snapshotバックアップスキップ（本体処理は継続）: %s", snap_err, exc_info=True
+        # 部分失敗をステップ毎に集約し末尾で Chat 通知（並列でもステップ順に並べる）
+        step_failures: dict[str, list[tuple[str, str]]] = {
+            name: [] for name in (
+                "snapshot", "collect", "groups", "dashboard_users",
+                "reimbursement", "member_master", "compensation",
             )
-            snapshot_results = {"status": "failed", "error": str(snap_err)}
-            failures.append(
-                ("Step0 snapshot", f"{type(snap_err).__name__}: {snap_err}")
-            )
-
-        # Step 1-2: Sheets APIでデータ収集
-        all_data = sheets_collector.run_collection()
+        }
 
-        # Step 3: BigQueryに投入
-        results = bq_loader.load_all(all_data)
+        def step_snapshot(_deps: dict):
+            # Step 0: BQ唯一ソーステーブルの snapshot バックアップ（Step5 の前に取得）
+            # バッチ実行前=直近の正常状態を保全することで、後続 Step5 の dashboard_users
+            # MERGE/DELETE 等の誤動作や、前日までのUI誤操作からの復旧手段を残す。
+            # 対象は Sheets/Admin Directory から再生成できないテーブルのみ（bq_loader.create_snapshots 参照）。
+            # 失敗しても本体処理は継続する（付随処理）。
+            try:
+                logger.info("--- snapshotバックアップ開始 ---")
+                jst = timezone(timedelta(hours=9))
+                snapshot_date = datetime.now(jst).strftime("%Y%m%d")
+                snapshot_results = bq_loader.create_snapshots(snapshot_date)
+                logger.info("--- snapshotバックアップ完了: %s ---", snapshot_results)
+            except Exception as snap_err:
+                logger.warning(
+                    "snapshotバックアップスキップ（本体処理は継続）: %s", snap_err, exc_info=True
+                )
+                snapshot_results = {"status": "failed", "error": str(snap_err)}
+                step_failures["snapshot"].append(
+                    ("Step0 snapshot", f"{type(snap_err).__name__}: {snap_err}")
+                )
+            return snapshot_results
 
-        # Step 4: グループ情報更新（Admin SDK、失敗しても本体は成功扱い）
-        try:
-            logger.info("--- グループ情報更新開始 ---")
-            updated_members, groups_master = sheets_collector.update_member_groups_from_bq()
-            results[bq_loader.config.BQ_TABLE_MEMBERS] = bq_loader.load_to_bigquery(
-                bq_loader.config.BQ_TABLE_MEMBERS, updated_members
-            )
-            results[bq_loader.config.BQ_TABLE_GROUPS_MASTER] = bq_loader.load_to_bigquery(
-                bq_loader.config.BQ_TABLE_GROUPS_MASTER, groups_master
-            )
-            logger.info(
-                "--- グループ情報更新完了 (members: %d, groups: %d) ---",
-                results[bq_loader.config.BQ_TABLE_MEMBERS],
-                results[bq_loader.config.BQ_TABLE_GROUPS_MASTER],
-            )
-        except Exception as grp_err:
-            logger.warning("グループ情報更新スキップ（本体処理は完了）: %s", grp_err, exc_info=True)
-            failures.append(
-                ("Step4 グループ情報", f"{type(grp_err).__name__}: {grp_err}")
-            )
+        def step_collect(_deps: dict):
+            # Step 1-2: Sheets APIでデータ収集（既定は Drive modifiedTime による差分収集）
+            all_data = sheets_collector.run_collection(full=full)
+            # Step 3: BigQueryに投入（ここまでの失敗は致命的エラー）
+            return bq_loader.load_all(all_data)
 
-        # Step 5: dashboard_usersグループベース自動同期
-        # fail-safe: dashboard_users は Step5 で MERGE/DELETE により破壊的に変更される。
-        # 復旧用 snapshot(Step0)が取れた日のみ実行し、snapshot が無い日はスキップする
-        # （バックアップ無しで唯一ソースを破壊的変更しない＝復旧不可リスクの回避）。
-        # スキップ/失敗時は results["dashboard_users_sync"]["status"] を残し Step 6/7 は継続。
-        # (bq_loader 側 read 関数は意図的に fail-fast 設計のため、ここで握り潰さない)
-        dashboard_users_backed_up = (
-            isinstance(snapshot_results, dict)
-            and snapshot_results.get(config.BQ_TABLE_DASHBOARD_USERS) == 1
-        )
-        if not dashboard_users_backed_up:
-            logger.warning(
-                "dashboard_users の snapshot が無いため Step5 同期をスキップ（fail-safe）"
-            )
-            results["dashboard_users_sync"] = {"status": "skipped_no_backup"}
-            failures.append(
-                ("Step5 dashboard_users同期", "snapshot 未取得のためスキップ（fail-safe）")
+        def step_groups(_deps: dict):
+            # Step 4: グループ情報更新（Admin SDK、失敗しても本体は成功扱い）
+            results = {}
+            try:
+                logger.info("--- グループ情報更新開始 ---")
+                updated_members, groups_master = sheets_collector.update_member_groups_from_bq()
+                results[bq_loader.config.BQ_TABLE_MEMBERS] = bq_loader.load_to_bigquery(
+                    bq_loader.config.BQ_TABLE_MEMBERS, updated_members
+                )
+                results[bq_loader.config.BQ_TABLE_GROUPS_MASTER] = bq_loader.load_to_bigquery(
+                    bq_loader.config.BQ_TABLE_GROUPS_MASTER, groups_master
+                )
+                logger.info(
+                    "--- グループ情報更新完了 (members: %d, groups: %d) ---",
+                    results[bq_loader.config.BQ_TABLE_MEMBERS],
+                    results[bq_loader.config.BQ_TABLE_GROUPS_MASTER],
+                )
+            except Exception as grp_err:
+                logger.warning("グループ情報更新スキップ（本体処理は完了）: %s", grp_err, exc_info=True)
+                step_failures["groups"].append(
+                    ("Step4 グループ情報", f"{type(grp_err).__name__}: {grp_err}")
+                )
+            return results
+
+        def step_dashboard_users(deps: dict):
+            # Step 5: dashboard_usersグループベース自動同期
+            # fail-safe: dashboard_users は Step5 で MERGE/DELETE により破壊的に変更される。
+            # 復旧用 snapshot(Step0)が取れた日のみ実行し、snapshot が無い日はスキップする
+            # （バックアップ無しで唯一ソースを破壊的変更しない＝復旧不可リスクの回避）。
+            # スキップ/失敗時は results["dashboard_users_sync"]["status"] を残し他ステップは継続。
+            # (bq_loader 側 read 関数は意図的に fail-fast 設計のため、ここで握り潰さない)
+            snapshot_results = deps["snapshot"]
+            dashboard_users_backed_up = (
+                isinstance(snapshot_results, dict)
+                and snapshot_results.get(config.BQ_TABLE_DASHBOARD_USERS) == 1
             )
-        else:
+            if not dashboard_users_backed_up:
+                logger.warning(
+                    "dashboard_users の snapshot が無いため Step5 同期をスキップ（fail-safe）"
+                )
+                step_failures["dashboard_users"].append(
+                    ("Step5 dashboard_users同期", "snapshot 未取得のためスキップ（fail-safe）")
+                )
+                return {"dashboard_users_sync": {"status": "skipped_no_backup"}}
             try:
                 logger.info("--- dashboard_usersグループ同期開始 ---")
                 group_users = bq_loader.read_group_based_users()
-                if group_users:
-                    admin_service = sheets_collector._build_admin_service()
-                    group_members_map = {}
-                    for group_email in group_users:
-                        members_list = sheets_collector.list_group_members(admin_service, group_email)
-                        group_members_map[group_email] = members_list
-                    sync_result = bq_loader.sync_dashboard_users_from_groups(group_members_map)
-                    results["dashboard_users_sync"] = sync_result
-                    logger.info(
-                        "--- dashboard_usersグループ同期完了 (追加: %d, 削除: %d, 凍結: %d, 未登録: %d) ---",
-                        sync_result["added"],
-                        sync_result["removed"],
-                        sync_result.get("skipped_disabled", 0),
-                        sync_result.get("skipped_unregistered", 0),
-                    )
-                else:
+                if not group_users:
                     logger.info("--- dashboard_usersグループ同期: 対象グループなし ---")
+                    return {}
+                group_members_map = sheets_collector.fetch_group_members_map(group_users)
+                sync_result = bq_loader.sync_dashboard_users_from_groups(group_members_map)
+                logger.info(
+                    "--- dashboard_usersグループ同期完了 (追加: %d, 削除: %d, 凍結: %d, 未登録: %d) ---",
+                    sync_result["added"],
+                    sync_result["removed"],
+                    sync_result.get("skipped_disabled", 0),
+                    sync_result.get("skipped_unregistered", 0),
+                )
+                return {"dashboard_users_sync": sync_result}
             except Exception as sync_err:
                 logger.error(
-                    "dashboard_usersグループ同期失敗 (Step 6/7 は継続): %s",
+                    "dashboard_usersグループ同期失敗 (他ステップは継続): %s",
                     sync_err, exc_info=True,
                 )
-                results["dashboard_users_sync"] = {
+                step_failures["dashboard_users"].append(
+                    ("Step5 dashboard_users同期", f"{type(sync_err).__name__}: {sync_err}")
+                )
+                return {"dashboard_users_sync": {
                     "status": "failed",
                     "error_type": type(sync_err).__name__,
                     "error": str(sync_err),
-                }
-                failures.append(
-                    ("Step5 dashboard_users同期", f"{type(sync_err).__name__}: {sync_err}")
+                }}
+
+        def step_reimbursement(_deps: dict):
+            # Step 6: 立替金シート収集（失敗しても本体は成功扱い）
+            try:
+                logger.info("--- 立替金シート収集開始 ---")
+                reimbursement_data = sheets_collector.run_reimbursement_collection(full=full)
+                reimbursement_results = bq_loader.load_all(reimbursement_data)
+                logger.info(
+                    "--- 立替金シート収集完了 (reimbursement_items: %d) ---",
+                    reimbursement_results.get(bq_loader.config.BQ_TABLE_REIMBURSEMENT, 0),
+                )
+                return reimbursement_results
+            except Exception as reimb_err:
+                logger.warning(
+                    "立替金シート収集スキップ（本体処理は完了）: %s", reimb_err, exc_info=True
                 )
+                step_failures["reimbursement"].append(
+                    ("Step6 立替金", f"{type(reimb_err).__name__}: {reimb_err}")
+                )
+                return {}
 
-        # Step 6: 立替金シート収集（失敗しても本体は成功扱い）
-        try:
-            logger.info("--- 立替金シート収集開始 ---")
-            reimbursement_data = sheets_collector.run_reimbursement_collection()
-            reimbursement_results = bq_loader.load_all(reimbursement_data)
-            results.update(reimbursement_results)
-            logger.info(
-                "--- 立替金シート収集完了 (reimbursement_items: %d) ---",
-                reimbursement_results.get(bq_loader.config.BQ_TABLE_REIMBURSEMENT, 0),
-            )
-        except Exception as reimb_err:
-            logger.warning(
-                "立替金シート収集スキップ（本体処理は完了）: %s", reimb_err, exc_info=True
-            )
-            failures.append(
-                ("Step6 立替金", f"{type(reimb_err).__name__}: {reimb_err}")
-            )
+        def step_member_master(_deps: dict):
+            # Step 7: タダメンMマスタ全量取得（失敗しても本体は成功扱い）
+            try:
+                logger.info("--- タダメンMマスタ収集開始 ---")
+                service = sheets_collector._build_sheets_service()
+                member_master_data = sheets_collector.collect_member_master(service)
+                member_master_count = bq_loader.load_to_bigquery(
+                    bq_loader.config.BQ_TABLE_MEMBER_MASTER, member_master_data
+                )
+                logger.info(
+                    "--- タダメンMマスタ収集完了 (member_master: %d) ---",
+                    member_master_count,
+                )
+                return {bq_loader.config.BQ_TABLE_MEMBER_MASTER: member_master_count}
+            except Exception as mm_err:
+                logger.warning(
+                    "タダメンMマスタ収集スキップ（本体処理は完了）: %s", mm_err, exc_info=True
+                )
+                step_failures["member_master"].append(
+                    ("Step7 タダメンM", f"{type(mm_err).__name__}: {mm_err}")
+                )
+                return {}
 
-        # Step 7: タダメンMマスタ全量取得（失敗しても本体は成功扱い）
-        try:
-            logger.info("--- タダメンMマスタ収集開始 ---")
-            service = sheets_collector._build_sheets_service()
-            member_master_data = sheets_collector.collect_member_master(service)
-            member_master_count = bq_loader.load_to_bigquery(
-                bq_loader.config.BQ_TABLE_MEMBER_MASTER, member_master_data
-            )
-            results[bq_loader.config.BQ_TABLE_MEMBER_MASTER] = member_master_count
-            logger.info(
-                "--- タダメンMマスタ収集完了 (member_master: %d) ---",
-                member_master_count,
-            )
-        except Exception as mm_err:
-            logger.warning(
-                "タダメンMマスタ収集スキップ（本体処理は完了）: %s", mm_err, exc_info=True
-            )
-            failures.append(
-                ("Step7 タダメンM", f"{type(mm_err).__name__}: {mm_err}")
-            )
+        def step_compensation(_deps: dict):
+            # Step 8: 締め済み月の報酬スナップショット（失敗しても本体は成功扱い）
+            # gyomu / hojo / members のロード後に、締め済みで未凍結の月を凍結する。
+            try:
+                jst = timezone(timedelta(hours=9))
+                frozen = bq_loader.freeze_closed_compensation(datetime.now(jst).date())
+                return {config.BQ_TABLE_MONTHLY_COMPENSATION_CLOSED: frozen}
+            except Exception as comp_err:
+                logger.warning(
+                    "報酬スナップショット凍結スキップ（本体処理は完了）: %s", comp_err, exc_info=True
+                )
+                step_failures["compensation"].append(
+                    ("Step8 報酬スナップショット", f"{type(comp_err).__name__}: {comp_err}")
+                )
+                return {}
+
+        outputs, report = step_graph.run_steps([
+            step_graph.Step("snapshot", step_snapshot),
+            step_graph.Step("collect", step_collect),
+            step_graph.Step("groups", step_groups, after=("collect",)),
+            step_graph.Step("dashboard_users", step_dashboard_users, after=("snapshot",)),
+            step_graph.Step("reimbursement", step_reimbursement),
+            step_graph.Step("member_master", step_member_master),
+            step_graph.Step("compensation", step_compensation, after=("groups",)),
+        ], max_workers=config.BATCH_STEP_WORKERS)
+
+        results = {}
+        for name in (
+            "collect", "groups", "dashboard_users", "reimbursement", "member_master",
+            "compensation",
+        ):
+            results.update(outputs[name])
+        failures = [f for step_list in step_failures.values() for f in step_list]
 
         elapsed = round(time.time() - start, 1)
         # Step 0 で取得した snapshot 結果をサマリーに含める
+        snapshot_results = outputs["snapshot"]
         results["snapshots"] = snapshot_results
         # Step0 の個別テーブル snapshot 失敗（-1）も部分失敗として集約に含める
         if isinstance(snapshot_results, dict):
@@ -185,9 +258,15 @@ def run_consolidation():
         summary = {
             "status": "success",
             "elapsed_seconds": elapsed,
+            "critical_path": report["critical_path"],
+            "critical_path_seconds": report["critical_path_sec"],
+            "steps": report["steps"],
             "tables": results,
         }
-        logger.info("--- 処理完了 (%s秒) --- 結果: %s", elapsed, results)
+        logger.info(
+            "--- 処理完了 (%s秒, クリティカルパス %s: %s秒) --- 結果: %s",
+            elapsed, " → ".join(report["critical_path"]), report["critical_path_sec"], results,
+        )
         return jsonify(summary), 200
 
     except Exception as e:
@@ -221,11 +300,7 @@ def update_groups():
         try:
             group_users = bq_loader.read_group_based_users()
             if group_users:
-                admin_service = sheets_collector._build_admin_service()
-                group_members_map = {}
-                for group_email in group_users:
-                    members_list = sheets_collector.list_group_members(admin_service, group_email)
-                    group_members_map[group_email] = members_list
+                group_members_map = sheets_collector.fetch_group_members_map(group_users)
                 sync_result = bq_loader.sync_dashboard_users_from_groups(group_members_map)
                 logger.info(
                     "dashboard_usersグループ同期完了 (追加: %d, 削除: %d, 凍結: %d, 未登録: %d)",
@@ -272,13 +347,16 @@ def sync_main_reports():
     Step 1-3 (run_collection) は members.groups を空文字で埋めるため、
     続けて Step 4 (update_member_groups_from_bq) で復元しないと
     dashboard のグループ別表示が壊れる。
-    約 330 秒 (217 秒 + 120 秒)。WRITE_TRUNCATE で全件置換。
+    約 330 秒 (217 秒 + 120 秒)。業務報告 / 補助報告は source_url 単位の差分反映
+    （bq_loader.load_delta_to_bigquery）、members は WRITE_TRUNCATE で全件置換。
+    シート取得は差分収集（未変更シートは前回データを再利用）。
+    ?full=1 または body {"full": true} で全シートを再取得する。
     """
     start = time.time()
     logger.info("--- 手動同期: メイン報告 開始 ---")
     try:
         # Step 1-3: 業務報告 / 補助報告 / メンバー (groups 空) を BQ へ
-        all_data = sheets_collector.run_collection()
+        all_data = sheets_collector.run_collection(full=_full_refresh_requested())
         results = bq_loader.load_all(all_data)
 
         # Step 4: members.groups を Admin SDK で復元 + groups_master 更新
@@ -314,11 +392,18 @@ def sync_main_reports():
 
 @app.route("/sync/reimbursement", methods=["POST"])
 def sync_reimbursement():
-    """Step 6 の手動同期: 立替金シート"""
+    """Step 6 の手動同期: 立替金シート
+
+    シート取得は差分収集（Drive changes フィードで前回以降に変更のあったシートだけを読み、
+    reimbursement_items もそのシートの行だけ置換する）。
+    ?full=1 または body {"full": true} でフォルダ一覧から全シートを読み直す。
+    """
     start = time.time()
     logger.info("--- 手動同期: 立替金 開始 ---")
     try:
-        reimbursement_data = sheets_collector.run_reimbursement_collection()
+        reimbursement_data = sheets_collector.run_reimbursement_collection(
+            full=_full_refresh_requested()
+        )
         results = bq_loader.load_all(reimbursement_data)
         elapsed = round(time.time() - start, 1)
         summary = {
@@ -341,6 +426,41 @@ def sync_reimbursement():
         }), 500
 
 
+@app.route("/sync/retry-failed", methods=["POST"])
+def sync_retry_failed():
+    """前回収集で失敗した報告シートだけを再取得して報告テーブルを再ロードする
+
+    失敗シート = batchGet が失敗しタブ単位取得に落ちたシート（report_sheet_checkpoint
+    の status=failed）。他シートは manifest の行を再利用するため API 呼び出しは
+    失敗シート分のみ。失敗シートが無ければ何もしない。
+    """
+    start = time.time()
+    logger.info("--- 手動同期: 失敗シート再取得 開始 ---")
+    try:
+        all_data = sheets_collector.run_failed_sheet_retry()
+        results = bq_loader.load_all(all_data) if all_data is not None else {}
+        elapsed = round(time.time() - start, 1)
+        summary = {
+            "status": "success",
+            "endpoint": "/sync/retry-failed",
+            "elapsed_seconds": elapsed,
+            "retried": all_data is not None,
+            "tables": results,
+        }
+        logger.info("--- 手動同期: 失敗シート再取得 完了 (%s秒) ---", elapsed)
+        return jsonify(summary), 200
+    except Exception as e:
+        elapsed = round(time.time() - start, 1)
+        logger.error("手動同期: 失敗シート再取得 エラー (%s秒): %s", elapsed, e, exc_info=True)
+        chat_notifier.notify_fatal("POST /sync/retry-failed", e)
+        return jsonify({
+            "status": "error",
+            "endpoint": "/sync/retry-failed",
+            "elapsed_seconds": elapsed,
+            "message": str(e),
+        }), 500
+
+
 @app.route("/sync/member-master", methods=["POST"])
 def sync_member_master():
     """Step 7 の手動同期: タダメンMマスタ"""
@@ -373,20 +493,73 @@ def sync_member_master():
         }), 500
 
 
+@app.route("/compensation/freeze", methods=["POST"])
+def freeze_compensation():
+    """締め済み月の報酬スナップショット（monthly_compensation_closed）の手動作成
+
+    body {"months": [YYYYMM, ...]} なら指定月を作り直す（締め後の訂正の反映）。
+    省略時は毎朝バッチ Step8 と同じく未凍結の締め済み月だけを凍結する。
+    """
+    start = time.time()
+    payload = request.get_json(silent=True) or {}
+    months = payload.get("months")
+    if months is not None and not (
+        isinstance(months, list)
+        and all(isinstance(m, int) and not isinstance(m, bool) for m in months)
+    ):
+        return jsonify({
+            "status": "error",
+            "endpoint": "/compensation/freeze",
+            "message": "'months' must be null or a list of YYYYMM integers",
+        }), 400
+
+    logger.info("--- 報酬スナップショット凍結 開始 (months=%s) ---", months)
+    jst = timezone(timedelta(hours=9))
+    try:
+        frozen = bq_loader.freeze_closed_compensation(datetime.now(jst).date(), months)
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "endpoint": "/compensation/freeze",
+            "message": str(e),
+        }), 400
+    except Exception as e:
+        elapsed = round(time.time() - start, 1)
+        logger.error("報酬スナップショット凍結 エラー (%s秒): %s", elapsed, e, exc_info=True)
+        chat_notifier.notify_fatal("POST /compensation/freeze", e)
+        return jsonify({
+            "status": "error",
+            "endpoint": "/compensation/freeze",
+            "elapsed_seconds": elapsed,
+            "message": str(e),
+        }), 500
+
+    elapsed = round(time.time() - start, 1)
+    logger.info("--- 報酬スナップショット凍結 完了 (%s秒) ---", elapsed)
+    return jsonify({
+        "status": "success",
+        "endpoint": "/compensation/freeze",
+        "elapsed_seconds": elapsed,
+        "frozen_months": frozen,
+    }), 200
+
+
 @app.route("/eval/team-monthly", methods=["POST"])
 def eval_team_monthly():
     """隊×月 予実評価エンドポイント（spec §5.1）。
 
     Request body:
         year (int|null), month (int|null), teams (list[str]|null),
-        force (bool, default false)
+        force (bool, default false), async (bool, default false)
 
     - year/month が null なら JST 前月を解決
     - teams が null なら対象月に出現する全 active 隊を処理
-    - 常に同期処理 (sync 200)。Cloud Scheduler 経由の月次バッチは
+    - 既定は同期処理 (sync 200)。Cloud Scheduler 経由の月次バッチは
       attempt-deadline=1800s を設定して呼ぶ前提（spec §5.3）。
-      旧 async モードは Cloud Run scale-down で daemon thread が silent kill
-      されるリスクを避けるため PR-C で撤廃。
+    - async=true なら job_id を即返し (202)、インスタンス内のワーカーで処理する。
+      進捗は GET /eval/jobs/<job_id> で取得する。旧 async モード (PR-C で撤廃) の
+      daemon thread と違い --no-cpu-throttling 前提の非 daemon ワーカーで動き、
+      状態が失われても評価結果は team_monthly_eval から読める（dashboard 用）。
     """
     start = time.time()
     payload = request.get_json(silent=True) or {}
@@ -394,6 +567,7 @@ def eval_team_monthly():
     month_in = payload.get("month")
     teams = payload.get("teams")
     force = bool(payload.get("force", False))
+    async_mode = bool(payload.get("async", False))
 
     # 入力 type 検証: teams は null または str リスト限定。文字列 "A" を渡されると
     # iterate されて "A" が 1 文字ずつ別 team として扱われる（バグソース）。
@@ -411,10 +585,21 @@ def eval_team_monthly():
         actor = team_eval_service.extract_actor(request)
         job_id = team_eval_service.generate_job_id()
         logger.info(
-            "eval/team-monthly request: year=%s month=%s teams=%s force=%s actor=%s",
-            year, month, teams, force, actor,
+            "eval/team-monthly request: year=%s month=%s teams=%s force=%s async=%s actor=%s",
+            year, month, teams, force, async_mode, actor,
         )
 
+        if async_mode:
+            job = team_eval_service.start_job(
+                year=year, month=month, teams=teams,
+                force=force, actor=actor, job_id=job_id,
+                on_error=lambda exc: chat_notifier.notify_fatal(
+                    "POST /eval/team-monthly (async)", exc,
+                ),
+            )
+            job["status_url"] = f"/eval/jobs/{job_id}"
+            return jsonify(job), 202
+
         result = team_eval_service.process_teams(
             year=year, month=month, teams=teams,
             force=force, actor=actor, job_id=job_id,
@@ -434,6 +619,22 @@ def eval_team_monthly():
         }), 500
 
 
+@app.route("/eval/jobs/<job_id>", methods=["GET"])
+def eval_job_status(job_id):
+    """async 評価ジョブの進捗・結果を返す（POST /eval/team-monthly async=true の job_id）。
+
+    このインスタンスが知らない job_id (再起動 / 別インスタンス / 保持期限切れ) は 404。
+    """
+    job = team_eval_service.get_job(job_id)
+    if job is None:
+        return jsonify({
+            "status": "error",
+            "endpoint": "/eval/jobs",
+            "message": f"job not found: {job_id}",
+        }), 404
+    return jsonify(job), 200
+
+
 @app.route("/health", methods=["GET"])
 def health():
     """ヘルスチェック"""
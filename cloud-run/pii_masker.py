@@ -19,8 +19,9 @@ test で担保。assert_no_raw_pii は「mask 漏れ検出」ではなく「prom
 import hashlib
 import logging
 import re
+import threading
 from dataclasses import dataclass, field
-from typing import Iterable
+from typing import Iterable, Union
 
 logger = logging.getLogger(__name__)
 
@@ -106,7 +107,151 @@ class MaskResult:
     detected_phone: tuple[str, ...] = field(default_factory=tuple)
 
 
-def mask_pii(text: str, member_names: Iterable[str]) -> MaskResult:
+_MEMBER_PLACEHOLDER = "<MEMBER>"
+
+
+class NameMatcher:
+    """member_names から構築する複数パターン照合器 (Aho–Corasick)。
+
+    テキストを 1 回走査するだけで全名前の出現位置 (重複・包含含む) を列挙する。
+    mask は「長い順 (同長は文字列順) に 1 名ずつ str.replace する」逐次置換と同一の
+    結果を返す: 先に置換された範囲と重なる出現は捨て、同名の出現は左から非重複に採る。
+
+    逐次置換では置換後の "<MEMBER>" を跨いだ / 内部の部分一致が後続の短い名前に
+    拾われうる。'<' / '>' を含む名前、または "<MEMBER>" の部分文字列である名前が
+    ある場合だけはこの等価性が崩れるため、逐次置換にフォールバックする。
+    """
+
+    def __init__(self, member_names: Iterable[str], *, min_len: int = _MIN_NAME_LEN):
+        self.names: tuple[str, ...] = tuple(sorted(
+            {n for n in member_names if n and len(n) >= min_len},
+            key=lambda n: (-len(n), n),
+        ))
+        self._sequential = any(
+            "<" in n or ">" in n or n in _MEMBER_PLACEHOLDER for n in self.names
+        )
+        # trie: 遷移 dict / failure link / 出力 (names の index) を状態ごとに保持
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+        for idx, name in enumerate(self.names):
+            state = 0
+            for ch in name:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(idx)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def __bool__(self) -> bool:
+        return bool(self.names)
+
+    def find_all(self, text: str) -> list[tuple[int, int]]:
+        """text 中の全出現を (start, names の index) で返す (重複・包含含む)。"""
+        found: list[tuple[int, int]] = []
+        goto, fail, out, names = self._goto, self._fail, self._out, self.names
+        state = 0
+        for pos, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for idx in out[state]:
+                found.append((pos - len(names[idx]) + 1, idx))
+        return found
+
+    def present(self, text: str) -> set[str]:
+        """text に出現する名前の集合。"""
+        return {self.names[idx] for _, idx in self.find_all(text)}
+
+    def mask(self, text: str) -> tuple[str, list[str]]:
+        """名前を <MEMBER> に置換し (masked_text, 置換した名前の一覧) を返す。"""
+        if not self.names or not text:
+            return text, []
+        if self._sequential:
+            return self._mask_sequential(text)
+
+        by_name: dict[int, list[int]] = {}
+        for start, idx in sorted(self.find_all(text)):
+            by_name.setdefault(idx, []).append(start)
+
+        covered = bytearray(len(text))
+        spans: list[tuple[int, int]] = []
+        detected: list[str] = []
+        for idx in sorted(by_name):  # names は長い順 → 逐次置換と同じ優先順位
+            length = len(self.names[idx])
+            last_end = -1
+            hit = False
+            for start in by_name[idx]:
+                end = start + length
+                if start < last_end or any(covered[start:end]):
+                    continue
+                covered[start:end] = b"\x01" * length
+                spans.append((start, end))
+                last_end = end
+                hit = True
+            if hit:
+                detected.append(self.names[idx])
+
+        if not spans:
+            return text, []
+        parts: list[str] = []
+        prev = 0
+        for start, end in sorted(spans):
+            parts.append(text[prev:start])
+            parts.append(_MEMBER_PLACEHOLDER)
+            prev = end
+        parts.append(text[prev:])
+        return "".join(parts), detected
+
+    def _mask_sequential(self, text: str) -> tuple[str, list[str]]:
+        detected: list[str] = []
+        working = text
+        for name in self.names:
+            if name in working:
+                detected.append(name)
+                working = working.replace(name, _MEMBER_PLACEHOLDER)
+        return working, detected
+
+
+class MemberNames(frozenset):
+    """load_member_names の戻り値。初回利用時に構築した NameMatcher を保持する
+    (不変集合なので 1 度構築すれば使い回せる)。"""
+
+    @property
+    def matcher(self) -> NameMatcher:
+        matcher = self.__dict__.get("_matcher")
+        if matcher is None:
+            matcher = self.__dict__["_matcher"] = NameMatcher(self)
+        return matcher
+
+
+def get_name_matcher(
+    member_names: Union[NameMatcher, MemberNames, Iterable[str]],
+) -> NameMatcher:
+    """member_names から NameMatcher を得る (MemberNames なら構築済みを再利用)。"""
+    if isinstance(member_names, NameMatcher):
+        return member_names
+    if isinstance(member_names, MemberNames):
+        return member_names.matcher
+    return NameMatcher(member_names)
+
+
+def mask_pii(
+    text: str, member_names: Union[NameMatcher, MemberNames, Iterable[str]]
+) -> MaskResult:
     """description から PII を <MEMBER> / <EMAIL> / <PHONE> に置換し MaskResult を返す。
 
     新仕様 (R5): 戻り値は str ではなく MaskResult。call site は `result.masked_text` で
@@ -115,24 +260,15 @@ def mask_pii(text: str, member_names: Iterable[str]) -> MaskResult:
 
     名前置換は長い順に行う ("山田太郎" を先に置換しないと "山田" だけマスクされて
     "太郎" が残る部分マッチを防ぐ)。空文字や 1 文字の名前はスキップ。
+    member_names には NameMatcher / MemberNames も渡せる (照合器の再構築を省く)。
     """
     if not text:
         return MaskResult(masked_text=text or "")
 
-    detected_names: list[str] = []
     detected_email: list[str] = []
     detected_phone: list[str] = []
 
-    unique_names = sorted(
-        {n for n in member_names if n and len(n) >= _MIN_NAME_LEN},
-        key=len,
-        reverse=True,
-    )
-    working = text
-    for name in unique_names:
-        if name in working:
-            detected_names.append(name)
-            working = working.replace(name, "<MEMBER>")
+    working, detected_names = get_name_matcher(member_names).mask(text)
 
     for m in EMAIL_RE.finditer(working):
         detected_email.append(m.group())
@@ -158,7 +294,7 @@ def _split_full_name(value: str) -> list[str]:
     return [p for p in parts if p]
 
 
-def load_member_names(bq_client) -> set[str]:
+def load_member_names(bq_client) -> MemberNames:
     """member_master からマスキング対象の名前一覧を取得する (mask_pii の入力用)。
 
     取得対象:
@@ -169,6 +305,7 @@ def load_member_names(bq_client) -> set[str]:
     - nickname
 
     1 文字の名前は誤検知が大きいため mask_pii 側で除外。
+    戻り値は MemberNames (frozenset)。mask_pii 用の NameMatcher を 1 度だけ構築して保持する。
     BQ エラー時は空 set を返す (transient 失敗で 1 隊単位ではなくバッチ全体が
     落ちるのを避けるため)。マスキングなしで Gemini に送るのは PII リスクが
     あるため、呼び出し側は空 set 時に処理スキップを判断する。
@@ -186,7 +323,7 @@ def load_member_names(bq_client) -> set[str]:
         rows = bq_client.query(query).result()
     except Exception as exc:  # noqa: BLE001 - transient 失敗は空 set で吸収
         logger.error("load_member_names failed (空 set で継続): %s", type(exc).__name__)
-        return names
+        return MemberNames()
 
     for row in rows:
         last = (row["last_name"] or "").strip() if hasattr(row, "__getitem__") else ""
@@ -206,7 +343,44 @@ def load_member_names(bq_client) -> set[str]:
         if nick:
             names.add(nick)
 
-    return {n for n in names if n and len(n) >= _MIN_NAME_LEN}
+    return MemberNames(n for n in names if n and len(n) >= _MIN_NAME_LEN)
+
+
+# プロセス内キャッシュ: member_master の最終更新時刻 (テーブルメタデータ) → MemberNames。
+# 毎朝バッチで member_master が再ロードされるまで同じ名前辞書と照合器を使い回す。
+_member_names_cache: dict = {"modified": None, "names": None}
+_member_names_lock = threading.Lock()
+
+
+def load_member_names_cached(bq_client) -> MemberNames:
+    """load_member_names のプロセス内キャッシュ版 (/eval/team-monthly の入口で使う)。
+
+    member_master の last-modified (get_table().modified) が前回と同じならキャッシュを
+    返し、変わっていれば load_member_names で取り直す。
+    fail-closed を保つため空 set はキャッシュしない (次回呼び出しで再取得)。
+    メタデータ取得に失敗した場合はキャッシュを使わず毎回 load_member_names を呼ぶ。
+    """
+    import config
+
+    table_id = f"{config.GCP_PROJECT_ID}.{config.BQ_DATASET}.{config.BQ_TABLE_MEMBER_MASTER}"
+    try:
+        modified = bq_client.get_table(table_id).modified
+    except Exception as exc:  # noqa: BLE001 - メタデータ取得失敗はキャッシュ無しで継続
+        logger.warning("member_master メタデータ取得失敗 (キャッシュ不使用): %s", type(exc).__name__)
+        return load_member_names(bq_client)
+
+    with _member_names_lock:
+        cached = _member_names_cache["names"]
+        if cached and modified is not None and _member_names_cache["modified"] == modified:
+            return cached
+        names = load_member_names(bq_client)
+        if not isinstance(names, MemberNames):
+            names = MemberNames(names)
+        if names and modified is not None:
+            _member_names_cache["modified"] = modified
+            _member_names_cache["names"] = names
+            names.matcher  # noqa: B018 - 照合器もここで構築してキャッシュに載せる
+        return names
 
 
 def _hash_prefix(value: str) -> str:
@@ -241,9 +415,14 @@ def assert_no_raw_pii(masked_output: str, mask_results: Iterable[MaskResult]) ->
     (e.g., samples_text 組み立て過程で raw description を誤って混入させた、複数
     description にまたがる name の取り扱い漏れ等) を検知する fail-safe。
     """
+    mask_results = list(mask_results)
+    # 検出済み名前の残存は Aho–Corasick で masked_output を 1 回だけ走査して判定する
+    leaked_names = NameMatcher(
+        (n for mr in mask_results for n in mr.detected_names), min_len=1,
+    ).present(masked_output)
     for mr in mask_results:
         for name in mr.detected_names:
-            if name in masked_output:
+            if name in leaked_names:
                 raise RuntimeError(
                     f"raw PII leaked into masked output: kind=name len={len(name)} "
                     f"hash={_hash_prefix(name)}"
@@ -5,16 +5,21 @@ Domain-Wide Delegation認証でSheets API v4を使用。
 """
 from __future__ import annotations
 
+import errno
+import json
 import logging
 import re
+import socket
+import ssl
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
 
 import httplib2
-import google_auth_httplib2
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+import clients
 import config
 
 logger = logging.getLogger(__name__)
@@ -24,48 +29,13 @@ ADMIN_SCOPES = ["https://www.googleapis.com/auth/admin.directory.group.readonly"
 
 
 def _get_dwd_credentials(scopes=None):
-    """DWD認証情報を取得
-
-    ローカル: SA_KEY_PATHからキーファイル読み込み
-    Cloud Run: IAM signBlob API経由でキーレスDWD（Workload Identity）
-    """
-    if scopes is None:
-        scopes = SCOPES
-    sa_email = config.SA_EMAIL
-
-    if config.SA_KEY_PATH:
-        return service_account.Credentials.from_service_account_file(
-            config.SA_KEY_PATH, scopes=scopes, subject=config.DELEGATE_USER_EMAIL
-        )
-
-    # Cloud Run: IAM signBlob APIでキーレスDWD
-    import google.auth
-    from google.auth import iam
-    from google.auth.transport import requests as google_requests
-
-    base_credentials, _ = google.auth.default()
-    base_credentials.refresh(google_requests.Request())
-
-    signer = iam.Signer(
-        request=google_requests.Request(),
-        credentials=base_credentials,
-        service_account_email=sa_email,
-    )
-    return service_account.Credentials(
-        signer=signer,
-        service_account_email=sa_email,
-        token_uri="https://oauth2.googleapis.com/token",
-        scopes=scopes,
-        subject=config.DELEGATE_USER_EMAIL,
-    )
+    """DWD認証情報を取得（clients のプロセス内キャッシュ。発行方法は clients 参照）"""
+    return clients.dwd_credentials(scopes or SCOPES)
 
 
 def _build_sheets_service(timeout=60):
-    """DWD認証でSheets APIサービスを構築"""
-    credentials = _get_dwd_credentials()
-    http = httplib2.Http(timeout=timeout)
-    authorized_http = google_auth_httplib2.AuthorizedHttp(credentials, http=http)
-    return build("sheets", "v4", http=authorized_http, cache_discovery=False)
+    """DWD認証のSheets APIサービス（clients でスレッドごとに1つ構築して使い回す）"""
+    return clients.google_service("sheets", "v4", SCOPES, timeout=timeout)
 
 
 def _get_admin_credentials():
@@ -74,49 +44,22 @@ def _get_admin_credentials():
     DWD スコープに admin.directory.group.readonly が必要。
     Google管理コンソール → セキュリティ → APIコントロール → ドメイン全体の委任で設定。
     """
-    sa_email = config.SA_EMAIL
-
-    if config.SA_KEY_PATH:
-        return service_account.Credentials.from_service_account_file(
-            config.SA_KEY_PATH, scopes=ADMIN_SCOPES, subject=config.DELEGATE_USER_EMAIL
-        )
-
-    import google.auth
-    from google.auth import iam
-    from google.auth.transport import requests as google_requests
-
-    base_credentials, _ = google.auth.default()
-    base_credentials.refresh(google_requests.Request())
-
-    signer = iam.Signer(
-        request=google_requests.Request(),
-        credentials=base_credentials,
-        service_account_email=sa_email,
-    )
-    return service_account.Credentials(
-        signer=signer,
-        service_account_email=sa_email,
-        token_uri="https://oauth2.googleapis.com/token",
-        scopes=ADMIN_SCOPES,
-        subject=config.DELEGATE_USER_EMAIL,
-    )
+    return clients.dwd_credentials(ADMIN_SCOPES)
 
 
 def _build_admin_service(timeout=60):
-    """DWD認証でAdmin Directory APIサービスを構築"""
-    credentials = _get_admin_credentials()
-    http = httplib2.Http(timeout=timeout)
-    authorized_http = google_auth_httplib2.AuthorizedHttp(credentials, http=http)
-    return build("admin", "directory_v1", http=authorized_http, cache_discovery=False)
+    """DWD認証のAdmin Directory APIサービス（clients でスレッドごとに1つ）"""
+    return clients.google_service("admin", "directory_v1", ADMIN_SCOPES, timeout=timeout)
 
 
 def collect_member_groups(
-    admin_service, gws_account: str
+    admin_service, gws_account: str, limiter: Optional[TokenBucket] = None
 ) -> tuple[str, list[tuple[str, str]]]:
     """Directory APIでメンバーのグループ一覧を取得
 
     ページネーションを考慮して全グループを取得する。
     エラー時は空文字列/空リストを返してバッチ全体を止めない。
+    limiter を渡すとページごとに共有トークンバケット経由で実行する（並列取得用）。
 
     Returns:
         (カンマ区切りemailリスト, [(email, name), ...])
@@ -127,17 +70,22 @@ def collect_member_groups(
         group_pairs: list[tuple[str, str]] = []
         page_token = None
         while True:
-            result = (
-                admin_service.groups()
-                .list(userKey=gws_account, pageToken=page_token, maxResults=200)
-                .execute()
+            request = admin_service.groups().list(
+                userKey=gws_account, pageToken=page_token, maxResults=200
             )
+            if limiter is None:
+                result = request.execute()
+            else:
+                result = _execute_with_throttle(
+                    request, context=f"collect_member_groups({gws_account})", limiter=limiter
+                )
             for g in result.get("groups", []):
                 group_pairs.append((g["email"], g.get("name", g["email"])))
             page_token = result.get("nextPageToken")
             if not page_token:
                 break
-        time.sleep(config.SHEETS_API_SLEEP_BETWEEN_REQUESTS)
+        if limiter is None:
+            time.sleep(config.SHEETS_API_SLEEP_BETWEEN_REQUESTS)
         emails_csv = ",".join(email for email, _ in group_pairs)
         return emails_csv, group_pairs
     except HttpError as e:
@@ -148,9 +96,13 @@ def collect_member_groups(
         return "", []
 
 
-def list_group_members(admin_service, group_email: str) -> list[str]:
+def list_group_members(
+    admin_service, group_email: str, limiter: Optional[TokenBucket] = None
+) -> list[str]:
     """Directory APIで指定グループのメンバーメールアドレス一覧を取得
 
+    limiter を渡すとページごとに共有トークンバケット経由で実行する（並列取得用）。
+
     Returns:
         メンバーのメールアドレスリスト
     """
@@ -160,18 +112,23 @@ def list_group_members(admin_service, group_email: str) -> list[str]:
         members: list[str] = []
         page_token = None
         while True:
-            result = (
-                admin_service.members()
-                .list(groupKey=group_email, pageToken=page_token, maxResults=200)
-                .execute()
+            request = admin_service.members().list(
+                groupKey=group_email, pageToken=page_token, maxResults=200
             )
+            if limiter is None:
+                result = request.execute()
+            else:
+                result = _execute_with_throttle(
+                    request, context=f"list_group_members({group_email})", limiter=limiter
+                )
             for m in result.get("members", []):
                 if m.get("type") == "USER" and m.get("email"):
                     members.append(m["email"].lower())
             page_token = result.get("nextPageToken")
             if not page_token:
                 break
-        time.sleep(config.SHEETS_API_SLEEP_BETWEEN_REQUESTS)
+        if limiter is None:
+            time.sleep(config.SHEETS_API_SLEEP_BETWEEN_REQUESTS)
         return members
     except HttpError as e:
         logger.warning("グループメンバー取得エラー (%s): %s", group_email, e)
@@ -181,6 +138,163 @@ def list_group_members(admin_service, group_email: str) -> list[str]:
         return []
 
 
+def list_members_of_groups(
+    admin_service,
+    group_emails: list[str],
+    *,
+    workers: Optional[int] = None,
+    service_factory: Optional[Callable] = None,
+) -> dict[str, list[str]]:
+    """複数グループのメンバーを並列取得して {group_email: [member_email, ...]} を返す
+
+    ワーカーは ADMIN_RATE_LIMITER を共有する。service_factory 未指定または
+    workers <= 1 なら list_group_members を逐次呼ぶ従来動作。
+    dict の挿入順は group_emails の順。
+    """
+    workers = _resolve_workers(workers, service_factory, default=config.ADMIN_API_WORKERS)
+    limiter = ADMIN_RATE_LIMITER if workers > 1 else None
+    group_emails = list(group_emails)
+    results = _run_pool(
+        lambda svc, email: list_group_members(svc, email, limiter=limiter),
+        group_emails,
+        service=admin_service,
+        service_factory=service_factory,
+        workers=workers,
+    )
+    return dict(zip(group_emails, results))
+
+
+def fetch_group_members_map(group_emails) -> dict[str, list[str]]:
+    """dashboard_users 同期用に、グループ群の最新メンバーを並列取得する
+
+    毎朝バッチ Step5 と /update-groups の共通入口。ワーカーごとに Admin service を構築し、
+    ADMIN_RATE_LIMITER を共有して取得する。
+
+    Returns:
+        {group_email: [member_email, ...]}（sync_dashboard_users_from_groups の入力形式）
+    """
+    return list_members_of_groups(
+        _build_admin_service(),
+        list(group_emails),
+        service_factory=_build_admin_service,
+    )
+
+
+class TokenBucket:
+    """ワーカー間で共有するトークンバケット型レートリミッタ（スレッドセーフ）
+
+    rate_per_min で補充、burst まで貯められる。429 を受けたら penalize() で
+    補充レートを半減させ（下限 min_rate_per_min）、成功のたびに reward() で
+    元のレートへ少しずつ戻す（AIMD）。プール全体で1インスタンスを共有するため、
+    1ワーカーの 429 が全ワーカーの送出ペースを落とす。
+    """
+
+    def __init__(
+        self,
+        rate_per_min: float,
+        burst: int,
+        *,
+        min_rate_per_min: Optional[float] = None,
+    ):
+        self.base_rate = rate_per_min / 60.0
+        self.rate = self.base_rate
+        self.min_rate = (min_rate_per_min or rate_per_min / 8) / 60.0
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """トークンを1つ取得する。足りなければ補充されるまで待機"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def penalize(self) -> None:
+        """429 受信時: 補充レートを半減し、貯まっているトークンを捨てる"""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0.0
+            self._updated = time.monotonic()
+        logger.warning("レート制限検知: 送出レートを %.1f reads/min に縮小", self.rate * 60)
+
+    def reward(self) -> None:
+        """成功時: 補充レートを base の 1/20 ずつ回復
+
+        penalize() と同じロック内で読み書きする（ロック外で読むと、並行する
+        penalize() の半減を古い値からの回復で上書きしうる）。
+        """
+        with self._lock:
+            if self.rate < self.base_rate:
+                self.rate = min(self.base_rate, self.rate + self.base_rate / 20)
+
+
+# プロセス内で共有するリミッタ（quota はプロジェクト×ユーザー単位のため全リクエスト共通）
+SHEETS_RATE_LIMITER = TokenBucket(
+    config.SHEETS_API_READS_PER_MIN, config.SHEETS_API_BURST
+)
+ADMIN_RATE_LIMITER = TokenBucket(
+    config.ADMIN_API_READS_PER_MIN, config.ADMIN_API_BURST
+)
+
+
+def _resolve_workers(
+    workers: Optional[int],
+    service_factory: Optional[Callable],
+    default: Optional[int] = None,
+) -> int:
+    """実効ワーカー数。service_factory が無ければスレッド用 service を作れないため逐次(1)
+
+    default 未指定時の既定は config.SHEETS_COLLECT_WORKERS。
+    """
+    if service_factory is None:
+        return 1
+    if workers is not None:
+        return workers
+    return config.SHEETS_COLLECT_WORKERS if default is None else default
+
+
+def _run_pool(
+    func: Callable,
+    items: list,
+    *,
+    service,
+    service_factory: Optional[Callable],
+    workers: int,
+) -> list:
+    """func(service, item) を items に対して実行し、入力順の結果リストを返す
+
+    workers <= 1 なら渡された service で逐次実行（従来動作）。
+    workers > 1 なら ThreadPoolExecutor で並列実行する。googleapiclient の
+    service（httplib2）はスレッドセーフでないため、ワーカースレッドごとに
+    service_factory で専用 service を1つ構築して使い回す。
+    結果は executor.map により入力順で返るため、逐次実行と同じ順序になる。
+    """
+    if workers <= 1 or len(items) <= 1 or service_factory is None:
+        return [func(service, item) for item in items]
+
+    local = threading.local()
+
+    def _task(item):
+        svc = getattr(local, "service", None)
+        if svc is None:
+            svc = local.service = service_factory()
+        return func(svc, item)
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as executor:
+        return list(executor.map(_task, items))
+
+
 def _extract_spreadsheet_id(url: str) -> str:
     """スプレッドシートURLからIDを抽出"""
     match = re.search(r"/spreadsheets/d/([a-zA-Z0-9_-]+)", url)
@@ -190,23 +304,80 @@ def _extract_spreadsheet_id(url: str) -> str:
 
 
 
-def _execute_with_throttle(request, context: str = ""):
+_TRANSIENT_STATUSES = (429, 500, 503)
+
+# googleapiclient の execute(num_retries=...)（逐次経路）がリトライする通信エラーの errno
+_RETRYABLE_SOCKET_ERRNOS = {
+    "WSAETIMEDOUT", "ETIMEDOUT", "EPIPE", "ECONNABORTED", "ECONNREFUSED", "ECONNRESET",
+}
+
+
+def _is_transient_status(status_code: Optional[int]) -> bool:
+    """逐次経路と同じく 429 と 5xx をリトライ対象とする"""
+    return status_code is not None and (
+        status_code in _TRANSIENT_STATUSES or status_code >= 500
+    )
+
+
+def _is_retryable_transport_error(e: BaseException) -> bool:
+    """逐次経路（googleapiclient の _retry_request）がリトライする通信エラーか"""
+    if isinstance(e, (ssl.SSLError, socket.timeout, ConnectionError,
+                      httplib2.ServerNotFoundError)):
+        return True
+    return isinstance(e, OSError) and (
+        errno.errorcode.get(e.errno) in _RETRYABLE_SOCKET_ERRNOS
+    )
+
+
+def _log_http_error(e: HttpError, context: str) -> None:
+    status_code = e.resp.status if e.resp else None
+    if _is_transient_status(status_code):
+        logger.error("[transient %s] %s (HTTP %s)", context, e, status_code)
+    else:
+        logger.warning("[permanent %s] %s (HTTP %s)", context, e, status_code)
+
+
+def _execute_with_throttle(request, context: str = "", limiter: Optional[TokenBucket] = None):
     """Sheets APIリクエストをスロットリング+リトライ付きで実行
 
+    limiter=None（逐次収集）:
     - time.sleep でリクエスト間隔を空け、レート制限(60 reads/min)内に収める
     - num_retries で429/5xx/ネットワークエラーをexponential backoffで自動リトライ
-    - HttpError はログ出力後に再raise（呼び出し元の既存except処理に委ねる）
+
+    limiter 指定（並列収集）:
+    - 送出前に共有トークンバケットからトークンを取得
+    - 429/5xx/ネットワークエラー（逐次経路と同じ範囲: socket.timeout・SSL・接続エラー・
+      httplib2.ServerNotFoundError 等）は自前で exponential backoff リトライし、
+      429 のたびに limiter.penalize() でプール全体の送出レートを縮小する
+
+    HttpError はログ出力後に再raise（呼び出し元の既存except処理に委ねる）
     """
-    time.sleep(config.SHEETS_API_SLEEP_BETWEEN_REQUESTS)
-    try:
-        return request.execute(num_retries=config.SHEETS_API_NUM_RETRIES)
-    except HttpError as e:
-        status_code = e.resp.status if e.resp else None
-        if status_code in (429, 500, 503):
-            logger.error("[transient %s] %s (HTTP %s)", context, e, status_code)
+    if limiter is None:
+        time.sleep(config.SHEETS_API_SLEEP_BETWEEN_REQUESTS)
+        try:
+            return request.execute(num_retries=config.SHEETS_API_NUM_RETRIES)
+        except HttpError as e:
+            _log_http_error(e, context)
+            raise
+
+    for attempt in range(config.SHEETS_API_NUM_RETRIES + 1):
+        limiter.acquire()
+        try:
+            result = request.execute()
+        except HttpError as e:
+            status_code = e.resp.status if e.resp else None
+            if not _is_transient_status(status_code) or attempt == config.SHEETS_API_NUM_RETRIES:
+                _log_http_error(e, context)
+                raise
+            if status_code == 429:
+                limiter.penalize()
+        except (OSError, httplib2.HttpLib2Error) as e:
+            if not _is_retryable_transport_error(e) or attempt == config.SHEETS_API_NUM_RETRIES:
+                raise
         else:
-            logger.warning("[permanent %s] %s (HTTP %s)", context, e, status_code)
-        raise
+            limiter.reward()
+            return result
+        time.sleep(min(2 ** attempt, 32))
 
 
 def get_url_list(service) -> list[str]:
@@ -236,83 +407,415 @@ def get_url_list(service) -> list[str]:
 
 
 def get_sheet_data(
-    service, spreadsheet_id: str, sheet_name: str, start_row: int, end_column: str
+    service,
+    spreadsheet_id: str,
+    sheet_name: str,
+    start_row: int,
+    end_column: str,
+    limiter: Optional[TokenBucket] = None,
 ) -> list[list]:
     """シートからデータを取得（GAS getSheetData_に対応）
 
     B列~end_column列のstart_row行以降を取得し、B列が空でない行をフィルタリング。
+    エラー時は空リストを返す（タブ欠落と API エラーを区別しない）。
     """
-    range_notation = f"'{sheet_name}'!B{start_row}:{end_column}"
-
     try:
-        request = service.spreadsheets().values().get(
-            spreadsheetId=spreadsheet_id,
-            range=range_notation,
+        return _get_sheet_values(
+            service, spreadsheet_id, sheet_name, start_row, end_column, limiter=limiter
         )
-        result = _execute_with_throttle(request, context=f"get_sheet_data({sheet_name})")
     except Exception:
         logger.warning("シート '%s' が見つからないか読み取れません", sheet_name)
         return []
 
-    values = result.get("values", [])
 
-    # B列（index 0）が空でない行のみ（GASのフィルタリングに対応）
-    filtered = [row for row in values if row and row[0]]
+def _get_sheet_values(
+    service,
+    spreadsheet_id: str,
+    sheet_name: str,
+    start_row: int,
+    end_column: str,
+    limiter: Optional[TokenBucket] = None,
+) -> list[list]:
+    """get_sheet_data のエラーを握り潰さない版（呼び出し元で欠落タブとエラーを区別する）"""
+    range_notation = f"'{sheet_name}'!B{start_row}:{end_column}"
+    request = service.spreadsheets().values().get(
+        spreadsheetId=spreadsheet_id,
+        range=range_notation,
+    )
+    result = _execute_with_throttle(
+        request, context=f"get_sheet_data({sheet_name})", limiter=limiter
+    )
+    return _filter_report_rows(result.get("values", []))
+
 
-    return filtered
+def _is_missing_tab_error(e: Exception) -> bool:
+    """values().get の 400 (Unable to parse range) = タブが存在しない"""
+    return isinstance(e, HttpError) and e.resp is not None and e.resp.status == 400
 
 
-def collect_all_data(service) -> dict[str, list[list]]:
-    """全スプレッドシートからデータを収集（GAS Step 2に対応）
+def _filter_report_rows(values: list[list]) -> list[list]:
+    """B列（index 0）が空でない行のみ残す（GASのフィルタリングに対応）"""
+    return [row for row in values if row and row[0]]
+
+
+def get_report_sheets_batch(
+    service, spreadsheet_id: str, limiter: Optional[TokenBucket] = None
+) -> dict[str, list[list]]:
+    """1スプレッドシートの全報告タブ（SHEET_CONFIGS）を values().batchGet 1回で取得
+
+    get_sheet_data をタブ数分呼ぶのと同じ結果を返すが、API呼び出し（=スロットリング
+    sleep）は1回で済む。batchGet は1レンジでも解決できないと全体が 400 になるため、
+    失敗時はタブ単位の get_sheet_data にフォールバックして既存の部分取得動作を維持する。
 
     Returns:
-        {"gyomu_reports": [[url, b, c, ...], ...], "hojo_reports": [...]}
+        {bq_table: [[b, c, ...], ...]}（URL付加前、フィルタ済み）
     """
-    urls = get_url_list(service)
+    data, _ = _get_report_sheets(service, spreadsheet_id, batch=True, limiter=limiter)
+    return data
 
-    all_data: dict[str, list[list]] = {}
-    for cfg in config.SHEET_CONFIGS:
-        all_data[cfg["bq_table"]] = []
 
-    for i, url in enumerate(urls):
-        progress = f"({i + 1}/{len(urls)})"
-        logger.info("[処理中 %s] %s", progress, url)
+def _get_report_sheets(
+    service, spreadsheet_id: str, *, batch: bool, limiter: Optional[TokenBucket]
+) -> tuple[dict[str, list[list]], bool]:
+    """報告タブを取得し (データ, 完全取得できたか) を返す
+
+    完全取得 = batchGet が成功した、またはタブ単位取得（フォールバック含む）の各タブが
+    成功したかタブ欠落 (HTTP 400) だった場合に True。タブが 1 つ無いだけのシートは
+    batchGet が毎回 400 になるため、欠落を完全取得扱いにしないと差分収集マニフェストに
+    載らず毎回再取得される。それ以外の HTTP エラー・通信エラーが 1 タブでもあれば False
+    （マニフェストには完全取得できたシートだけを記録する）。
+    """
+    if batch:
+        ranges = [
+            f"'{cfg['report_sheet_name']}'!B{cfg['data_start_row']}:{cfg['data_end_column']}"
+            for cfg in config.SHEET_CONFIGS
+        ]
+        try:
+            request = service.spreadsheets().values().batchGet(
+                spreadsheetId=spreadsheet_id,
+                ranges=ranges,
+            )
+            result = _execute_with_throttle(
+                request, context="get_report_sheets_batch", limiter=limiter
+            )
+        except Exception:
+            logger.info("  batchGet 失敗のためタブ単位で再取得: '%s'", spreadsheet_id)
+        else:
+            value_ranges = result.get("valueRanges", [])
+            data: dict[str, list[list]] = {}
+            for i, cfg in enumerate(config.SHEET_CONFIGS):
+                values = value_ranges[i].get("values", []) if i < len(value_ranges) else []
+                data[cfg["bq_table"]] = _filter_report_rows(values)
+            return data, True
+
+    data = {}
+    complete = True
+    for cfg in config.SHEET_CONFIGS:
+        try:
+            data[cfg["bq_table"]] = _get_sheet_values(
+                service,
+                spreadsheet_id,
+                cfg["report_sheet_name"],
+                cfg["data_start_row"],
+                cfg["data_end_column"],
+                limiter=limiter,
+            )
+        except Exception as e:
+            if _is_missing_tab_error(e):
+                logger.info("  [タブなし] '%s'", cfg["report_sheet_name"])
+            else:
+                logger.warning("  [シートエラー] '%s': %s", cfg["report_sheet_name"], e)
+                complete = False
+            data[cfg["bq_table"]] = []
+    return data, complete
+
+
+def _fetch_report_sheets(
+    service,
+    urls: list[str],
+    *,
+    batch: bool,
+    workers: Optional[int],
+    service_factory: Optional[Callable],
+    on_fetched: Optional[Callable[[str, tuple[dict[str, list[list]], bool]], None]] = None,
+) -> list[Optional[tuple[dict[str, list[list]], bool]]]:
+    """urls の各スプレッドシートから報告タブを取得（URL順、URL解析エラーは None）
+
+    on_fetched(url, (data, complete)) は各シートの取得直後にワーカースレッドから呼ばれる。
+    """
+    workers = _resolve_workers(workers, service_factory)
+    limiter = SHEETS_RATE_LIMITER if workers > 1 else None
+    total = len(urls)
 
+    def _fetch(svc, indexed_url):
+        i, url = indexed_url
+        logger.info("[処理中 (%d/%d)] %s", i + 1, total, url)
         try:
             spreadsheet_id = _extract_spreadsheet_id(url)
         except ValueError as e:
-            logger.warning("[スキップ %s] URL解析エラー: %s", progress, e)
-            continue
+            logger.warning("[スキップ (%d/%d)] URL解析エラー: %s", i + 1, total, e)
+            return None
+        result = _get_report_sheets(svc, spreadsheet_id, batch=batch, limiter=limiter)
+        if on_fetched is not None:
+            on_fetched(url, result)
+        return result
+
+    return _run_pool(
+        _fetch,
+        list(enumerate(urls)),
+        service=service,
+        service_factory=service_factory,
+        workers=workers,
+    )
+
+
+def _merge_report_data(
+    urls: list[str], per_url: list[Optional[dict[str, list[list]]]]
+) -> dict[str, list[list]]:
+    """URL順にシートごとのデータへURLを付加して bq_table 別に連結"""
+    all_data: dict[str, list[list]] = {}
+    for cfg in config.SHEET_CONFIGS:
+        all_data[cfg["bq_table"]] = []
 
+    for url, sheet_data in zip(urls, per_url):
+        if sheet_data is None:
+            continue
         for cfg in config.SHEET_CONFIGS:
-            try:
-                data = get_sheet_data(
-                    service,
-                    spreadsheet_id,
+            data = sheet_data.get(cfg["bq_table"], [])
+            if data:
+                # 各行の先頭にURLを付加（GASと同じ）
+                data_with_url = [[url] + row for row in data]
+                all_data[cfg["bq_table"]].extend(data_with_url)
+                logger.info(
+                    "  '%s': %d行取得 (合計: %d行)",
                     cfg["report_sheet_name"],
-                    cfg["data_start_row"],
-                    cfg["data_end_column"],
+                    len(data),
+                    len(all_data[cfg["bq_table"]]),
                 )
-                if data:
-                    # 各行の先頭にURLを付加（GASと同じ）
-                    data_with_url = [[url] + row for row in data]
-                    all_data[cfg["bq_table"]].extend(data_with_url)
-                    logger.info(
-                        "  '%s': %d行取得 (合計: %d行)",
-                        cfg["report_sheet_name"],
-                        len(data),
-                        len(all_data[cfg["bq_table"]]),
-                    )
-                else:
-                    logger.info("  '%s': 0行", cfg["report_sheet_name"])
-            except Exception as e:
-                logger.warning(
-                    "  [シートエラー] '%s': %s", cfg["report_sheet_name"], e
-                )
-
+            else:
+                logger.info("  '%s': 0行", cfg["report_sheet_name"])
     return all_data
 
 
+def collect_all_data(
+    service,
+    *,
+    batch: bool = True,
+    workers: Optional[int] = None,
+    service_factory: Optional[Callable] = None,
+) -> dict[str, list[list]]:
+    """全スプレッドシートからデータを収集（GAS Step 2に対応）
+
+    Args:
+        batch: True なら1スプレッドシートあたり batchGet 1回で全報告タブを取得
+            （get_report_sheets_batch）。False ならタブごとに get_sheet_data を呼ぶ旧経路。
+        workers: 並列ワーカー数（None なら config.SHEETS_COLLECT_WORKERS）。
+            1 以下なら従来の逐次収集。2 以上なら SHEETS_RATE_LIMITER を共有して並列取得する。
+        service_factory: ワーカースレッド用 service の構築関数（例 _build_sheets_service）。
+            未指定なら workers に関わらず逐次収集。
+
+    Returns:
+        {"gyomu_reports": [[url, b, c, ...], ...], "hojo_reports": [...]}
+        行の順序は workers に関わらず管理表の URL 順（逐次収集と同一）。
+    """
+    urls = get_url_list(service)
+    fetched = _fetch_report_sheets(
+        service, urls, batch=batch, workers=workers, service_factory=service_factory
+    )
+    return _merge_report_data(urls, [f[0] if f else None for f in fetched])
+
+
+def get_modified_times(drive_service, file_ids: list[str]) -> dict[str, str]:
+    """Drive API の batch リクエスト（100件/回）で各ファイルの modifiedTime を取得
+
+    取得できなかったファイル（権限不足・削除済み等）は結果に含めない
+    （呼び出し側で「変更あり」として扱う）。
+
+    Returns:
+        {file_id: modifiedTime (RFC3339)}
+    """
+    modified: dict[str, str] = {}
+
+    def _callback(request_id, response, exception):
+        if exception is not None:
+            logger.warning("modifiedTime 取得エラー (%s): %s", request_id, exception)
+            return
+        if response and response.get("modifiedTime"):
+            modified[request_id] = response["modifiedTime"]
+
+    unique_ids = list(dict.fromkeys(file_ids))
+    for start in range(0, len(unique_ids), 100):
+        batch = drive_service.new_batch_http_request(callback=_callback)
+        for file_id in unique_ids[start:start + 100]:
+            batch.add(
+                drive_service.files().get(
+                    fileId=file_id,
+                    fields="id, modifiedTime",
+                    supportsAllDrives=True,
+                ),
+                request_id=file_id,
+            )
+        try:
+            time.sleep(config.SHEETS_API_SLEEP_BETWEEN_REQUESTS)
+            batch.execute()
+        except Exception as e:
+            logger.warning("modifiedTime 一括取得エラー（該当分は再取得扱い）: %s", e)
+    return modified
+
+
+class ReportCheckpoint:
+    """報告シート収集のチェックポイント（report_sheet_checkpoint への逐次追記）
+
+    取得したシートを flush_every 件ごとに BQ へ追記しておき、インスタンスの停止や
+    タイムアウトで収集が中断しても、次回は取得済みシートを再取得せずに再開できる。
+    追記失敗は警告のみ（チェックポイントが欠けても再取得が増えるだけ）。
+    """
+
+    def __init__(self, flush_every: Optional[int] = None):
+        self.flush_every = flush_every or config.REPORT_CHECKPOINT_FLUSH_EVERY
+        self._pending: list[list] = []
+        self._failed: list[list] = []
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        url: str,
+        spreadsheet_id: str,
+        modified_time: Optional[str],
+        data: dict[str, list[list]],
+        complete: bool,
+    ) -> None:
+        """1 シート分の取得結果を記録（complete=False は失敗シートとして残す）"""
+        row = [
+            url, spreadsheet_id, modified_time or "",
+            json.dumps(data, ensure_ascii=False), "done" if complete else "failed",
+        ]
+        with self._lock:
+            self._pending.append(row)
+            if not complete:
+                self._failed.append(row)
+            should_flush = len(self._pending) >= self.flush_every
+        if should_flush:
+            self.flush()
+
+    def flush(self) -> None:
+        """未追記分を report_sheet_checkpoint へ追記する"""
+        import bq_loader
+
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return
+        try:
+            bq_loader.append_sheet_checkpoint(rows)
+        except Exception as e:
+            logger.warning("チェックポイント追記失敗（%d件、再開時は再取得）: %s", len(rows), e)
+
+    @property
+    def failed_rows(self) -> list[list]:
+        """今回の失敗シート行（収集完了時にチェックポイントをこれだけに置き換える）"""
+        with self._lock:
+            return list(self._failed)
+
+
+def collect_all_data_incremental(
+    service,
+    drive_service,
+    *,
+    full: bool = False,
+    batch: bool = True,
+    workers: Optional[int] = None,
+    service_factory: Optional[Callable] = None,
+    checkpoint: Optional[ReportCheckpoint] = None,
+    retry_urls: Optional[set[str]] = None,
+) -> tuple[dict[str, list[list]], list[list]]:
+    """Drive modifiedTime をキーに、前回から変更のあった報告シートだけを再取得する
+
+    report_sheet_manifest に前回の modifiedTime と取得行が記録されており、
+    modifiedTime が一致するシートは API を呼ばずに前回の行を再利用する。
+    full=True なら manifest を無視して全シート取得（manifest は作り直す）。
+
+    checkpoint を渡すと、中断した前回収集のチェックポイント（有効期間内・完全取得・
+    modifiedTime 一致）も再利用し（full=True でも）、今回取得したシートを逐次追記する。
+    retry_urls を渡すと再取得モード: retry_urls と manifest に無いシートだけを取得し、
+    それ以外は modifiedTime を見ずに manifest の行を再利用する（/sync/retry-failed）。
+
+    Note: IMPORTRANGE 等の外部参照で値だけ変わるケースは modifiedTime が
+    更新されないため、定期的に full=True で全件取得すること。
+
+    Returns:
+        (all_data, manifest_rows)
+        all_data は collect_all_data と同形式・同順序。
+        manifest_rows は TABLE_COLUMNS[BQ_TABLE_SHEET_MANIFEST] 順の行リスト。
+    """
+    urls = get_url_list(service)
+    ids: dict[str, str] = {}
+    for url in urls:
+        try:
+            ids[url] = _extract_spreadsheet_id(url)
+        except ValueError:
+            pass  # _fetch_report_sheets 側で警告してスキップされる
+
+    import bq_loader
+
+    modified = get_modified_times(drive_service, list(ids.values()))
+    manifest = {} if full else bq_loader.read_sheet_manifest()
+
+    reuse: dict[str, dict] = {}
+    if retry_urls is not None:
+        for url in ids:
+            if url not in retry_urls and url in manifest:
+                reuse[url] = manifest[url]
+    else:
+        resumed = (
+            bq_loader.read_sheet_checkpoint(config.REPORT_CHECKPOINT_MAX_AGE_HOURS)
+            if checkpoint is not None else {}
+        )
+        for url, sid in ids.items():
+            for prev in (resumed.get(url), manifest.get(url)):
+                if (
+                    prev and prev.get("status", "done") == "done"
+                    and modified.get(sid) and prev["modified_time"] == modified[sid]
+                ):
+                    reuse[url] = prev
+                    break
+
+    def _on_fetched(url: str, result: tuple[dict[str, list[list]], bool]) -> None:
+        data, complete = result
+        checkpoint.record(url, ids[url], modified.get(ids[url]), data, complete)
+
+    fetch_urls = [url for url in urls if url not in reuse]
+    logger.info(
+        "差分収集: 全%d件中 %d件を再取得、%d件は前回データを再利用 (full=%s, retry=%s)",
+        len(urls), len(fetch_urls), len(reuse), full, retry_urls is not None,
+    )
+    fetched = dict(zip(fetch_urls, _fetch_report_sheets(
+        service, fetch_urls, batch=batch, workers=workers, service_factory=service_factory,
+        on_fetched=_on_fetched if checkpoint is not None else None,
+    )))
+    if checkpoint is not None:
+        checkpoint.flush()
+
+    per_url: list[Optional[dict[str, list[list]]]] = []
+    manifest_rows: list[list] = []
+    for url in urls:
+        if url in reuse:
+            # 再利用分は記録済みの modifiedTime を引き継ぐ（retry で未確認の変更を取りこぼさない）
+            data, complete, modified_time = reuse[url]["data"], True, reuse[url]["modified_time"]
+        elif fetched.get(url) is not None:
+            (data, complete), modified_time = fetched[url], modified.get(ids[url])
+        else:
+            per_url.append(None)
+            continue
+        per_url.append(data)
+        if complete and modified_time:
+            manifest_rows.append(
+                [url, ids[url], modified_time, json.dumps(data, ensure_ascii=False)]
+            )
+
+    return _merge_report_data(urls, per_url), manifest_rows
+
+
 def collect_members(service) -> list[list]:
     """タダメンMマスタを取得
 
@@ -387,23 +890,72 @@ def collect_member_master(service) -> list[list]:
     return filtered
 
 
-def run_collection() -> dict[str, list[list]]:
-    """データ収集のエントリポイント（シート収集のみ、グループ更新は /update-groups で実行）"""
+def run_collection(full: bool = False) -> dict[str, list[list]]:
+    """データ収集のエントリポイント（シート収集のみ、グループ更新は /update-groups で実行）
+
+    既定は Drive modifiedTime による差分収集（collect_all_data_incremental）。
+    full=True で全報告シートを再取得する。更新後のマニフェストも戻り値に含め、
+    load_all で報告テーブルと一緒に書き込む。
+    取得済みシートは ReportCheckpoint で逐次 BQ に追記し、中断された前回収集が
+    あれば取得済みシートから再開する。
+    """
     service = _build_sheets_service()
+    drive_service = _build_drive_service()
     # membersを先に読む（1 APIコールのみ、レート制限回避）
     members = collect_members(service)
     # groups列を空文字で埋めてカラム数を合わせる
     members_padded = [row + [""] for row in members]
-    all_data = collect_all_data(service)
+    checkpoint = ReportCheckpoint()
+    all_data, manifest_rows = collect_all_data_incremental(
+        service, drive_service, full=full, service_factory=_build_sheets_service,
+        checkpoint=checkpoint,
+    )
     all_data[config.BQ_TABLE_MEMBERS] = members_padded
+    all_data[config.BQ_TABLE_SHEET_MANIFEST] = manifest_rows
+    # load_all でチェックポイントを今回の失敗シートだけに置き換える（/sync/retry-failed 用）
+    all_data[config.BQ_TABLE_SHEET_CHECKPOINT] = checkpoint.failed_rows
     return all_data
 
 
-def update_member_groups_from_bq() -> tuple[list[list], list[list]]:
+def run_failed_sheet_retry() -> Optional[dict[str, list[list]]]:
+    """前回収集で失敗したシート（チェックポイントの status=failed）だけを再取得する
+
+    他のシートは manifest の行を再利用して報告テーブル全体を組み直す（差分ロードは
+    source_url 単位の全置換のため、全シート分のデータが必要）。members は触らない。
+
+    Returns:
+        load_all に渡す all_data。失敗シートが無ければ None。
+    """
+    import bq_loader
+
+    failed = {
+        url for url, row in bq_loader.read_sheet_checkpoint().items()
+        if row["status"] == "failed"
+    }
+    if not failed:
+        logger.info("再取得対象の失敗シートなし")
+        return None
+
+    logger.info("失敗シート %d件を再取得", len(failed))
+    checkpoint = ReportCheckpoint()
+    all_data, manifest_rows = collect_all_data_incremental(
+        _build_sheets_service(), _build_drive_service(),
+        service_factory=_build_sheets_service,
+        checkpoint=checkpoint, retry_urls=failed,
+    )
+    all_data[config.BQ_TABLE_SHEET_MANIFEST] = manifest_rows
+    all_data[config.BQ_TABLE_SHEET_CHECKPOINT] = checkpoint.failed_rows
+    return all_data
+
+
+def update_member_groups_from_bq(
+    *, workers: Optional[int] = None
+) -> tuple[list[list], list[list]]:
     """BQのmembersテーブルを読み込み、Admin SDKでグループ情報を付加して返す
 
     /update-groups エンドポイントから呼び出す。
-    シート再収集なしで ~2分で完了する。
+    シート再収集なし。メンバーごとの所属グループ取得は ADMIN_RATE_LIMITER を共有する
+    ワーカープールで並列実行する（workers <= 1 で従来の逐次取得）。
 
     Returns:
         (updated_members, groups_master_rows)
@@ -418,13 +970,23 @@ def update_member_groups_from_bq() -> tuple[list[list], list[list]]:
     gws_idx = columns.index("gws_account")
     groups_idx = columns.index("groups")
 
+    workers = _resolve_workers(
+        workers, _build_admin_service, default=config.ADMIN_API_WORKERS
+    )
+    limiter = ADMIN_RATE_LIMITER if workers > 1 else None
+    fetched = _run_pool(
+        lambda svc, row: collect_member_groups(svc, row[gws_idx] or "", limiter=limiter),
+        rows,
+        service=admin_service,
+        service_factory=_build_admin_service,
+        workers=workers,
+    )
+
     updated = []
-    groups_dict: dict[str, str] = {}  # email → name（重複排除）
+    groups_dict: dict[str, str] = {}  # email → name（重複排除、入力順を維持）
 
-    for row in rows:
+    for row, (emails_csv, group_pairs) in zip(rows, fetched):
         row = list(row)
-        gws_account = row[gws_idx] or ""
-        emails_csv, group_pairs = collect_member_groups(admin_service, gws_account)
         row[groups_idx] = emails_csv
         updated.append(row)
         for email, name in group_pairs:
@@ -448,11 +1010,8 @@ DRIVE_SCOPES = [
 
 
 def _build_drive_service(timeout=60):
-    """DWD認証でDrive APIサービスを構築"""
-    credentials = _get_dwd_credentials(scopes=DRIVE_SCOPES)
-    http = httplib2.Http(timeout=timeout)
-    authorized_http = google_auth_httplib2.AuthorizedHttp(credentials, http=http)
-    return build("drive", "v3", http=authorized_http, cache_discovery=False)
+    """DWD認証のDrive APIサービス（clients でスレッドごとに1つ）"""
+    return clients.google_service("drive", "v3", DRIVE_SCOPES, timeout=timeout)
 
 
 def extract_nickname(filename: str):
@@ -461,17 +1020,21 @@ def extract_nickname(filename: str):
     return match.group(1) if match else None
 
 
+_SPREADSHEET_MIME_TYPE = "application/vnd.google-apps.spreadsheet"
+
+
 def list_reimbursement_sheets(drive_service) -> list[dict]:
     """Drive APIでフォルダ内の立替金シート一覧を取得
 
     Returns:
-        [{"id": spreadsheet_id, "name": filename, "nickname": extracted}, ...]
+        [{"id": spreadsheet_id, "name": filename, "nickname": extracted,
+          "modified_time": Drive modifiedTime (RFC3339) または None}, ...]
     """
     sheets = []
     page_token = None
     query = (
         f"'{config.REIMBURSEMENT_FOLDER_ID}' in parents"
-        " and mimeType='application/vnd.google-apps.spreadsheet'"
+        f" and mimeType='{_SPREADSHEET_MIME_TYPE}'"
         " and trashed=false"
     )
 
@@ -479,7 +1042,7 @@ def list_reimbursement_sheets(drive_service) -> list[dict]:
         try:
             request = drive_service.files().list(
                 q=query,
-                fields="nextPageToken, files(id, name)",
+                fields="nextPageToken, files(id, name, modifiedTime)",
                 pageSize=100,
                 pageToken=page_token,
                 supportsAllDrives=True,
@@ -497,6 +1060,7 @@ def list_reimbursement_sheets(drive_service) -> list[dict]:
                     "id": f["id"],
                     "name": f["name"],
                     "nickname": nickname,
+                    "modified_time": f.get("modifiedTime"),
                 })
             else:
                 logger.warning("ニックネーム抽出不可: %s", f["name"])
@@ -509,7 +1073,86 @@ def list_reimbursement_sheets(drive_service) -> list[dict]:
     return sheets
 
 
-def _find_input_tab_name(service, spreadsheet_id: str) -> str | None:
+def get_changes_start_page_token(drive_service) -> Optional[str]:
+    """Drive changes フィードの現在位置（以降の変更を取得するための pageToken）を取得
+
+    フォルダ一覧を取る「前」に取得しておくことで、一覧取得中の変更も次回のフィードで拾える。
+    取得失敗時は None（次回もフォルダ一覧から収集するだけ）。
+    """
+    try:
+        request = drive_service.changes().getStartPageToken(supportsAllDrives=True)
+        result = _execute_with_throttle(request, context="changes_start_token")
+    except Exception as e:
+        logger.warning("changes startPageToken 取得エラー: %s", e)
+        return None
+    return result.get("startPageToken")
+
+
+def list_reimbursement_changes(
+    drive_service, page_token: str
+) -> Optional[tuple[dict[str, Optional[dict]], str]]:
+    """page_token 以降の Drive 変更のうち、立替金フォルダに関係するものを返す
+
+    changes フィードはフォルダで絞り込めないため parents で判定する。
+    立替金シートとして有効なファイル（フォルダ内・スプレッドシート・未削除・ニックネーム抽出可）は
+    list_reimbursement_sheets と同形式の dict、それ以外（削除・ゴミ箱・フォルダ外への移動等）は
+    None を値とする。同じファイルの変更が複数あれば最後のものが残る。
+    呼び出し側は値が None の ID を「前回まであれば除外」として扱う。
+
+    Returns:
+        ({file_id: sheet_info or None}, 次回用の newStartPageToken)。
+        フィード取得に失敗（pageToken 期限切れ等）したら None（フォルダ一覧にフォールバック）。
+    """
+    changes: dict[str, Optional[dict]] = {}
+    token = page_token
+    while True:
+        try:
+            request = drive_service.changes().list(
+                pageToken=token,
+                fields=(
+                    "nextPageToken, newStartPageToken, changes(fileId, removed,"
+                    " file(id, name, mimeType, modifiedTime, trashed, parents))"
+                ),
+                pageSize=1000,
+                spaces="drive",
+                includeRemoved=True,
+                supportsAllDrives=True,
+                includeItemsFromAllDrives=True,
+            )
+            result = _execute_with_throttle(request, context="list_reimbursement_changes")
+        except Exception as e:
+            logger.warning("Drive changes 取得エラー（フォルダ一覧から収集）: %s", e)
+            return None
+
+        for change in result.get("changes", []):
+            file_id = change.get("fileId")
+            f = change.get("file") or {}
+            in_folder = config.REIMBURSEMENT_FOLDER_ID in (f.get("parents") or [])
+            nickname = extract_nickname(f.get("name", "")) if in_folder else None
+            if (
+                not change.get("removed") and in_folder and nickname
+                and f.get("mimeType") == _SPREADSHEET_MIME_TYPE and not f.get("trashed")
+            ):
+                changes[file_id] = {
+                    "id": file_id,
+                    "name": f["name"],
+                    "nickname": nickname,
+                    "modified_time": f.get("modifiedTime"),
+                }
+            else:
+                changes[file_id] = None
+
+        if result.get("newStartPageToken"):
+            return changes, result["newStartPageToken"]
+        token = result.get("nextPageToken")
+        if not token:
+            # 通常は最終ページで newStartPageToken が返る。無ければ位置を進めない
+            return changes, page_token
+
+
+def _find_input_tab_name(
+    service, spreadsheet_id: str, limiter: Optional[TokenBucket] = None
+) -> str | None:
     """スプレッドシートのタブ一覧から '入力シート' を含むタブ名を検索
 
     タブ名にはシートごとに異なる数字プレフィックス（0/1/2等）が付くため、
@@ -521,7 +1164,7 @@ def _find_input_tab_name(service, spreadsheet_id: str) -> str | None:
             fields="sheets.properties.title",
         )
         result = _execute_with_throttle(
-            request, context=f"tab_lookup({spreadsheet_id[:8]})"
+            request, context=f"tab_lookup({spreadsheet_id[:8]})", limiter=limiter
         )
     except Exception:
         logger.warning("タブ一覧取得エラー: '%s'", spreadsheet_id)
@@ -537,19 +1180,15 @@ def _find_input_tab_name(service, spreadsheet_id: str) -> str | None:
 _RECEIPT_COLUMN_INDEX = 11  # L列 (A=0, ..., L=11)
 
 
-def get_reimbursement_sheet_data(service, spreadsheet_id: str) -> list[list]:
-    """立替金シートの入力シートタブからデータを取得
+def _get_reimbursement_grid(
+    service, spreadsheet_id: str, tab_name: str, limiter: Optional[TokenBucket]
+) -> Optional[list[list]]:
+    """入力シートタブ tab_name の A列~L列を 1 リクエストで取得・フィルタする（読めなければ None）
 
-    A列~L列のSTART_ROW行以降を取得。
     マーカー列が "例" の行、全空行をフィルタリング。
     L列の receipt_url は cellData.hyperlink を優先取得し、
     `=HYPERLINK(url, text)` の URL 部分を BQ に保存する (#106)。
     """
-    tab_name = _find_input_tab_name(service, spreadsheet_id)
-    if not tab_name:
-        logger.warning("入力シートタブが見つかりません: '%s'", spreadsheet_id)
-        return []
-
     range_notation = (
         f"'{tab_name}'"
         f"!A{config.REIMBURSEMENT_DATA_START_ROW}:L"
@@ -562,11 +1201,11 @@ def get_reimbursement_sheet_data(service, spreadsheet_id: str) -> list[list]:
             fields="sheets.data.rowData.values(formattedValue,hyperlink)",
         )
         result = _execute_with_throttle(
-            request, context=f"reimbursement({spreadsheet_id[:8]})"
+            request, context=f"reimbursement({spreadsheet_id[:8]})", limiter=limiter
         )
     except Exception:
         logger.warning("立替金シート '%s' が読み取れません", spreadsheet_id)
-        return []
+        return None
 
     sheets = result.get("sheets", [])
     if not sheets:
@@ -599,20 +1238,58 @@ def get_reimbursement_sheet_data(service, spreadsheet_id: str) -> list[list]:
     return filtered
 
 
-def collect_reimbursement_data(sheets_service, drive_service) -> list[list]:
-    """全立替金シートからデータを収集
+def read_reimbursement_sheet(
+    service,
+    spreadsheet_id: str,
+    *,
+    tab_name: Optional[str] = None,
+    limiter: Optional[TokenBucket] = None,
+) -> tuple[list[list], Optional[str]]:
+    """立替金シートを読み、(行, 実際に読めたタブ名) を返す。読めなければ ([], None)。
 
-    各行に [source_url, nickname] をプリペンドして返す。
+    tab_name（前回読めたタブ名）を渡すとタブ一覧取得を省略し、グリッド取得 1 回で済ませる。
+    そのタブ名で読めない（タブ名変更・削除で 400）ときだけタブ一覧から探し直す。
     """
-    sheet_list = list_reimbursement_sheets(drive_service)
-    all_rows: list[list] = []
+    if tab_name:
+        rows = _get_reimbursement_grid(service, spreadsheet_id, tab_name, limiter)
+        if rows is not None:
+            return rows, tab_name
+        logger.info("前回のタブ名 '%s' で読めないため再検索: '%s'", tab_name, spreadsheet_id)
+
+    tab_name = _find_input_tab_name(service, spreadsheet_id, limiter=limiter)
+    if not tab_name:
+        logger.warning("入力シートタブが見つかりません: '%s'", spreadsheet_id)
+        return [], None
+    rows = _get_reimbursement_grid(service, spreadsheet_id, tab_name, limiter)
+    if rows is None:
+        return [], None
+    return rows, tab_name
+
+
+def get_reimbursement_sheet_data(
+    service, spreadsheet_id: str, limiter: Optional[TokenBucket] = None
+) -> list[list]:
+    """立替金シートの入力シートタブからデータを取得
+
+    A列~L列のSTART_ROW行以降を取得（タブ名検索 + グリッド取得、read_reimbursement_sheet 参照）。
+    """
+    return read_reimbursement_sheet(service, spreadsheet_id, limiter=limiter)[0]
+
 
-    for i, sheet_info in enumerate(sheet_list):
+def _reimbursement_source_url(spreadsheet_id: str) -> str:
+    return f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}/edit"
+
+
+def _prepend_reimbursement_meta(
+    sheet_list: list[dict], per_sheet: list[list[list]]
+) -> list[list]:
+    """一覧順に各行へ [source_url, nickname] をプリペンドして連結"""
+    all_rows: list[list] = []
+    for i, (sheet_info, data) in enumerate(zip(sheet_list, per_sheet)):
         progress = f"({i + 1}/{len(sheet_list)})"
-        source_url = f"https://docs.google.com/spreadsheets/d/{sheet_info['id']}/edit"
+        source_url = _reimbursement_source_url(sheet_info["id"])
         nickname = sheet_info["nickname"]
 
-        data = get_reimbursement_sheet_data(sheets_service, sheet_info["id"])
         if data:
             rows_with_meta = [[source_url, nickname] + row for row in data]
             all_rows.extend(rows_with_meta)
@@ -622,14 +1299,171 @@ def collect_reimbursement_data(sheets_service, drive_service) -> list[list]:
             )
         else:
             logger.info("  [立替金 %s] %s: 0行", progress, nickname)
-
     return all_rows
 
 
-def run_reimbursement_collection() -> dict[str, list[list]]:
-    """立替金シート収集のエントリポイント"""
+def collect_reimbursement_data(
+    sheets_service,
+    drive_service,
+    *,
+    workers: Optional[int] = None,
+    service_factory: Optional[Callable] = None,
+) -> list[list]:
+    """全立替金シートからデータを収集
+
+    各行に [source_url, nickname] をプリペンドして返す。
+    workers / service_factory は collect_all_data と同じ（行順は一覧順で不変）。
+    """
+    sheet_list = list_reimbursement_sheets(drive_service)
+    workers = _resolve_workers(workers, service_factory)
+    limiter = SHEETS_RATE_LIMITER if workers > 1 else None
+
+    fetched = _run_pool(
+        lambda svc, info: get_reimbursement_sheet_data(svc, info["id"], limiter=limiter),
+        sheet_list,
+        service=sheets_service,
+        service_factory=service_factory,
+        workers=workers,
+    )
+    return _prepend_reimbursement_meta(sheet_list, fetched)
+
+
+def _resolve_reimbursement_sheets(
+    drive_service, manifest: dict[str, dict], *, full: bool
+) -> tuple[list[dict], Optional[str]]:
+    """今回の立替金シート一覧と、次回用の changes pageToken を決める
+
+    保存済み pageToken とマニフェストがあれば changes フィードで前回以降の変更だけを取り、
+    マニフェストの一覧に反映する（フォルダ全体の files.list を省略）。
+    それ以外（初回・pageToken 期限切れ・full・フィード無効）はフォルダ一覧を取得する。
+    """
+    import bq_loader
+
+    if not config.REIMBURSEMENT_CHANGES_FEED:
+        return list_reimbursement_sheets(drive_service), None
+
+    saved_token = None if full or not manifest else bq_loader.read_reimbursement_changes_token()
+    feed = list_reimbursement_changes(drive_service, saved_token) if saved_token else None
+    if feed is None:
+        new_token = get_changes_start_page_token(drive_service)
+        return list_reimbursement_sheets(drive_service), new_token
+
+    changes, new_token = feed
+    sheet_list = []
+    for sid, prev in manifest.items():
+        if sid in changes:
+            continue
+        nickname = extract_nickname(prev.get("name") or "")
+        if nickname:
+            sheet_list.append({
+                "id": sid, "name": prev["name"], "nickname": nickname,
+                "modified_time": prev["modified_time"],
+            })
+    sheet_list.extend(info for info in changes.values() if info)
+    sheet_list.sort(key=lambda info: info["name"])
+    logger.info(
+        "立替金 changes フィード: 変更%d件（うち除外%d件）、対象シート%d件",
+        len(changes), sum(1 for info in changes.values() if info is None), len(sheet_list),
+    )
+    return sheet_list, new_token
+
+
+def collect_reimbursement_data_incremental(
+    sheets_service,
+    drive_service,
+    *,
+    full: bool = False,
+    workers: Optional[int] = None,
+    service_factory: Optional[Callable] = None,
+) -> tuple[list[list], list[list], Optional[str]]:
+    """変更のあった立替金シートだけを読み直す
+
+    シート一覧は Drive changes フィード（前回以降に追加・更新・削除されたファイルのみ）を
+    マニフェストに反映して作る（_resolve_reimbursement_sheets）。
+    reimbursement_sheet_manifest に前回の modifiedTime・タブ名・取得行が記録されており、
+    modifiedTime が一致するシートは Sheets API を呼ばずに前回の行を再利用する。
+    変更のあったシートも前回のタブ名でグリッド取得 1 回だけ行う（read_reimbursement_sheet）。
+    full=True なら行は再利用せず全シート読み直す（タブ名のヒントは使う）。
+
+    読めなかったシートもタブ名を空にしてマニフェストに残す（changes フィードでは
+    一覧を取り直さないため、記録しないと次回以降の再取得対象から漏れる）。
+
+    Returns:
+        (all_rows, manifest_rows, page_token)
+        all_rows は collect_reimbursement_data と同形式（全シート分。変更のないシートの行は
+        load_all の source_url 単位差分ロードで書き換えられない）。
+        manifest_rows は TABLE_COLUMNS[BQ_TABLE_REIMBURSEMENT_MANIFEST] 順の行リスト。
+        page_token は次回用の changes pageToken（フィード無効・取得失敗時は None）。
+    """
+    import bq_loader
+
+    manifest = bq_loader.read_reimbursement_manifest()
+    sheet_list, page_token = _resolve_reimbursement_sheets(drive_service, manifest, full=full)
+
+    per_sheet: dict[str, tuple[list[list], Optional[str]]] = {}
+    to_fetch: list[dict] = []
+    for info in sheet_list:
+        prev = manifest.get(info["id"])
+        if (
+            not full and prev and prev["tab_name"] and info.get("modified_time")
+            and prev["modified_time"] == info["modified_time"]
+        ):
+            per_sheet[info["id"]] = (prev["data"], prev["tab_name"])
+        else:
+            to_fetch.append(info)
+    logger.info(
+        "立替金差分収集: 全%d件中 %d件を読み直し、%d件は前回データを再利用 (full=%s)",
+        len(sheet_list), len(to_fetch), len(sheet_list) - len(to_fetch), full,
+    )
+
+    workers = _resolve_workers(workers, service_factory)
+    limiter = SHEETS_RATE_LIMITER if workers > 1 else None
+    fetched = _run_pool(
+        lambda svc, info: read_reimbursement_sheet(
+            svc, info["id"],
+            tab_name=(manifest.get(info["id"]) or {}).get("tab_name"),
+            limiter=limiter,
+        ),
+        to_fetch,
+        service=sheets_service,
+        service_factory=service_factory,
+        workers=workers,
+    )
+    per_sheet.update(zip([info["id"] for info in to_fetch], fetched))
+
+    manifest_rows: list[list] = []
+    for info in sheet_list:
+        data, tab_name = per_sheet[info["id"]]
+        # 読めなかったシートは tab_name 空 → 次回も読み直させる
+        manifest_rows.append([
+            info["id"], info["name"], info.get("modified_time") or "", tab_name or "",
+            json.dumps(data, ensure_ascii=False),
+        ])
+
+    all_rows = _prepend_reimbursement_meta(
+        sheet_list, [per_sheet[info["id"]][0] for info in sheet_list]
+    )
+    return all_rows, manifest_rows, page_token
+
+
+def run_reimbursement_collection(full: bool = False) -> dict[str, list[list]]:
+    """立替金シート収集のエントリポイント
+
+    既定は Drive changes フィード + modifiedTime による差分収集
+    （collect_reimbursement_data_incremental）。更新後のマニフェストと changes pageToken も
+    戻り値に含め、load_all で立替金テーブルと一緒に書き込む（pageToken は
+    config.BQ_LOAD_AFTER により立替金テーブル・マニフェストが書けた後にだけ進む）。
+    """
     sheets_service = _build_sheets_service()
     drive_service = _build_drive_service()
-    data = collect_reimbursement_data(sheets_service, drive_service)
+    data, manifest_rows, page_token = collect_reimbursement_data_incremental(
+        sheets_service, drive_service, full=full, service_factory=_build_sheets_service
+    )
     logger.info("立替金シート収集完了: %d行", len(data))
-    return {config.BQ_TABLE_REIMBURSEMENT: data}
+    all_data = {
+        config.BQ_TABLE_REIMBURSEMENT: data,
+        config.BQ_TABLE_REIMBURSEMENT_MANIFEST: manifest_rows,
+    }
+    if page_token:
+        all_data[config.BQ_TABLE_REIMBURSEMENT_CHANGES_TOKEN] = [[page_token]]
+    return all_data
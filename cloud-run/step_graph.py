@@ -0,0 +1,99 @@
+"""毎朝バッチ (POST /) のステップ依存グラフ実行
+
+各ステップは依存先 (after) が全て完了した時点でスレッドプールに投入されるため、
+互いに依存しないステップは並列に走る。ステップ内の部分失敗の扱い（握り潰して
+failures に積む / 例外で致命扱い）は各ステップ関数に任せる。
+
+ステップ関数が例外を投げた場合、そのステップに依存するステップは実行せず、
+実行中・実行可能な他ステップの完了を待ってから最初の例外（ステップ定義順）を
+再送出する（呼び出し元 = main の致命的エラー処理）。
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+
+class Step(NamedTuple):
+    """name: ステップ名 / func: 依存先の戻り値 {name: value} を受け取る関数 / after: 依存先"""
+
+    name: str
+    func: Callable[[dict], object]
+    after: tuple[str, ...] = ()
+
+
+def _timed(step: Step, deps: dict, origin: float):
+    started = time.monotonic()
+    try:
+        value, error = step.func(deps), None
+    except Exception as exc:  # noqa: BLE001 - run_steps で定義順に再送出する
+        value, error = None, exc
+    return value, error, started - origin, time.monotonic() - started
+
+
+def run_steps(steps: list[Step], *, max_workers: int) -> tuple[dict, dict]:
+    """steps を依存関係に従って並列実行し、(戻り値 {name: value}, 実行レポート) を返す。
+
+    steps は依存先が先に来る順（トポロジカル順）で渡すこと。
+    実行レポート: {"steps": {name: {"started_sec", "elapsed_sec"}},
+                   "critical_path": [name, ...], "critical_path_sec": float}
+    critical_path は依存チェーン上で所要時間の合計が最大の経路
+    （= 並列度が十分ならバッチ全体の所要時間の下限）。
+    """
+    seen: set[str] = set()
+    for step in steps:
+        unknown = [d for d in step.after if d not in seen]
+        if unknown:
+            raise ValueError(f"step {step.name} の依存先 {unknown} が先に定義されていない")
+        seen.add(step.name)
+
+    origin = time.monotonic()
+    outputs: dict[str, object] = {}
+    errors: dict[str, Exception] = {}
+    skipped: set[str] = set()
+    timings: dict[str, dict] = {}
+    waiting = list(steps)
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch-step") as executor:
+        while waiting or running:
+            for step in list(waiting):
+                if any(d in errors or d in skipped for d in step.after):
+                    # 依存先が失敗 / 未実行 → このステップも実行しない
+                    waiting.remove(step)
+                    skipped.add(step.name)
+                    logger.warning("step %s は依存先の失敗により未実行", step.name)
+                elif all(d in outputs for d in step.after):
+                    waiting.remove(step)
+                    deps = {d: outputs[d] for d in step.after}
+                    running[executor.submit(_timed, step, deps, origin)] = step.name
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                value, error, started, elapsed = future.result()
+                timings[name] = {"started_sec": round(started, 1), "elapsed_sec": round(elapsed, 1)}
+                if error is None:
+                    outputs[name] = value
+                else:
+                    errors[name] = error
+
+    for step in steps:
+        if step.name in errors:
+            raise errors[step.name]
+
+    # critical path: 各ステップまでの最長依存チェーン (所要時間の合計)
+    longest: dict[str, tuple[float, list[str]]] = {}
+    for step in steps:
+        prev = max((longest[d] for d in step.after), default=(0.0, []), key=lambda x: x[0])
+        longest[step.name] = (prev[0] + timings[step.name]["elapsed_sec"], prev[1] + [step.name])
+    path_sec, path = max(longest.values(), default=(0.0, []), key=lambda x: x[0])
+    return outputs, {
+        "steps": timings,
+        "critical_path": path,
+        "critical_path_sec": round(path_sec, 1),
+    }
@@ -10,17 +10,22 @@ BQ / Gemini クライアントは外部から差し替え可能。
 import json
 import logging
 import os
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Callable, Optional
 
 from google.auth.transport import requests as google_requests
 from google.oauth2 import id_token
 
 import bq_loader
+import clients
 import config
 import pii_masker
 import vertex_evaluator
+from team_budget_hash import compose_actual_data_hash
 
 logger = logging.getLogger(__name__)
 
@@ -91,12 +96,13 @@ def generate_job_id() -> str:
 def list_active_teams(bq_client, year: int, month: int) -> list[str]:
     """対象月に実額がある（または予算がある）隊一覧を取得する。
 
-    v_team_budget_actuals VIEW を使うと予算 only / 実額 only も含まれる。
-    spec §3.1 「2026/05 以降」フィルタは VIEW 内で適用済み。
+    team_budget_actuals（v_team_budget_actuals の実体化テーブル）を使うと
+    予算 only / 実額 only も含まれる。
+    spec §3.1 「2026/05 以降」フィルタは VIEW（= テーブルの集計元）内で適用済み。
     """
     table_id = (
         f"{config.GCP_PROJECT_ID}.{config.BQ_DATASET}."
-        f"{config.BQ_VIEW_TEAM_BUDGET_ACTUALS}"
+        f"{config.BQ_TABLE_TEAM_BUDGET_ACTUALS}"
     )
     sql = f"""
     SELECT DISTINCT team
@@ -118,10 +124,10 @@ def list_active_teams(bq_client, year: int, month: int) -> list[str]:
 
 
 def load_team_aggregate(bq_client, year: int, month: int, team: str) -> dict:
-    """1 隊の集計値（budget / actual / rate / diff）を VIEW から取得する。"""
+    """1 隊の集計値（budget / actual / rate / diff）を team_budget_actuals から取得する。"""
     table_id = (
         f"{config.GCP_PROJECT_ID}.{config.BQ_DATASET}."
-        f"{config.BQ_VIEW_TEAM_BUDGET_ACTUALS}"
+        f"{config.BQ_TABLE_TEAM_BUDGET_ACTUALS}"
     )
     sql = f"""
     SELECT budget_amount, actual_amount, achievement_rate, diff_amount,
@@ -141,13 +147,21 @@ def load_team_aggregate(bq_client, year: int, month: int, team: str) -> dict:
     )
     rows = list(bq_client.query(sql, job_config=job_config).result())
     if not rows:
-        return {
-            "budget_amount": None, "actual_amount": None,
-            "achievement_rate": None, "diff_amount": None,
-            "has_budget": False, "has_actual": False,
-        }
-    row = rows[0]
-    # NUMERIC → float 化（json 化を考慮）
+        return _empty_aggregate()
+    return _aggregate_from_row(rows[0])
+
+
+def _empty_aggregate() -> dict:
+    """team_budget_actuals に行が無い隊の集計値"""
+    return {
+        "budget_amount": None, "actual_amount": None,
+        "achievement_rate": None, "diff_amount": None,
+        "has_budget": False, "has_actual": False,
+    }
+
+
+def _aggregate_from_row(row) -> dict:
+    """team_budget_actuals 行 → 集計値 dict。NUMERIC → float 化（json 化を考慮）"""
     def _num(v):
         return float(v) if v is not None else None
 
@@ -161,9 +175,149 @@ def load_team_aggregate(bq_client, year: int, month: int, team: str) -> dict:
     }
 
 
+# -------- 月次一括プリフェッチ --------
+
+
+# 隊ごとの単独クエリ（load_team_aggregate / vertex_evaluator.compute_actual_data_hash /
+# load_existing_eval）と同じく、重複行がある場合は任意の 1 行を採る。
+# gyomu_reports の hash はロード時計算済みの team_month_hashes を引く（行なし = ""）。
+_MONTH_INPUTS_SQL = """
+WITH targets AS (
+  SELECT team FROM UNNEST(@teams) AS team
+),
+agg AS (
+  SELECT team, budget_amount, actual_amount, achievement_rate, diff_amount,
+         has_budget, has_actual
+  FROM `{project}.{dataset}.{actuals}`
+  WHERE year = @year AND month = @month AND team IN UNNEST(@teams)
+  QUALIFY ROW_NUMBER() OVER (PARTITION BY team) = 1
+),
+budgets AS (
+  SELECT team, budget_amount
+  FROM `{project}.{dataset}.{budgets}`
+  WHERE year = @year AND month = @month AND team IN UNNEST(@teams)
+  QUALIFY ROW_NUMBER() OVER (PARTITION BY team) = 1
+),
+evals AS (
+  SELECT team, actual_data_hash
+  FROM `{project}.{dataset}.{evals}`
+  WHERE year = @year AND month = @month AND team IN UNNEST(@teams)
+  QUALIFY ROW_NUMBER() OVER (PARTITION BY team) = 1
+),
+hashes AS (
+  SELECT team, data_hash
+  FROM `{project}.{dataset}.{hashes}`
+  WHERE year_month = @year * 100 + @month AND team IN UNNEST(@teams)
+)
+SELECT
+  t.team,
+  a.team IS NOT NULL AS has_aggregate,
+  a.budget_amount, a.actual_amount, a.achievement_rate, a.diff_amount,
+  a.has_budget, a.has_actual,
+  b.budget_amount AS hash_budget_amount,
+  IFNULL(h.data_hash, '') AS bq_hash,
+  e.team IS NOT NULL AS has_existing,
+  e.actual_data_hash AS existing_hash
+FROM targets t
+LEFT JOIN agg a USING (team)
+LEFT JOIN budgets b USING (team)
+LEFT JOIN evals e USING (team)
+LEFT JOIN hashes h USING (team)
+"""
+
+
+def prefetch_month_inputs(bq_client, year: int, month: int, teams: list[str]) -> dict:
+    """対象月の全隊分の評価入力を 1 query で一括取得する。
+
+    集計値（team_budget_actuals）・hash 用 budget（team_budgets）・既存評価 hash
+    （team_monthly_eval）・gyomu_reports の隊別 hash（team_month_hashes）を隊で結合し、
+    差分検知 hash は compose_actual_data_hash で PROMPT_VERSION と合成する
+    （vertex_evaluator.compute_actual_data_hash と同じ値）。
+
+    Returns:
+        {team: {"data_hash": str, "aggregate": dict, "existing_hash": Optional[str],
+                "has_existing": bool}}
+    """
+    if not teams:
+        return {}
+    from google.cloud import bigquery
+
+    sql = _MONTH_INPUTS_SQL.format(
+        project=config.GCP_PROJECT_ID, dataset=config.BQ_DATASET,
+        actuals=config.BQ_TABLE_TEAM_BUDGET_ACTUALS,
+        budgets=config.BQ_TABLE_TEAM_BUDGETS,
+        evals=config.BQ_TABLE_TEAM_MONTHLY_EVAL,
+        hashes=config.BQ_TABLE_TEAM_MONTH_HASHES,
+    )
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ScalarQueryParameter("year", "INT64", year),
+            bigquery.ScalarQueryParameter("month", "INT64", month),
+            bigquery.ArrayQueryParameter("teams", "STRING", list(teams)),
+        ]
+    )
+    rows = {row["team"]: row for row in bq_client.query(sql, job_config=job_config).result()}
+
+    inputs: dict = {}
+    for team in teams:
+        row = rows.get(team)
+        has_aggregate = row is not None and row["has_aggregate"]
+        inputs[team] = {
+            "data_hash": compose_actual_data_hash(
+                row["bq_hash"] if row else "",
+                row["hash_budget_amount"] if row else None,
+                config.PROMPT_VERSION,
+            ),
+            "aggregate": _aggregate_from_row(row) if has_aggregate else _empty_aggregate(),
+            "has_existing": bool(row and row["has_existing"]),
+            "existing_hash": row["existing_hash"] if row else None,
+        }
+    return inputs
+
+
+def _resolve_without_claim(team: str, inputs: dict, force: bool) -> Optional[dict]:
+    """プリフェッチ結果だけで結論が出る隊の result を返す（claim も追加 query もしない）。
+
+    - 実額なし → no_actual
+    - 既存評価の hash と一致（force でない）→ skipped_hash_match
+    それ以外は None（claim して process_one_team で処理する）。
+    """
+    agg = inputs["aggregate"]
+    if not agg["has_actual"]:
+        return {"team": team, "status": "no_actual", "actual_amount": None,
+                "budget_amount": agg["budget_amount"]}
+    if not force and inputs["has_existing"] and inputs["existing_hash"] == inputs["data_hash"]:
+        return {
+            "team": team,
+            "status": "skipped_hash_match",
+            "actual_amount": agg["actual_amount"],
+            "budget_amount": agg["budget_amount"],
+            "achievement_rate": agg["achievement_rate"],
+        }
+    return None
+
+
 # -------- 1 隊の処理 --------
 
 
+class EvalLimits:
+    """並列評価時の外部呼び出し同時実行数の上限（BQ と Gemini で別枠）
+
+    ワーカー数とは独立に絞るため、Gemini 待ちのワーカーが BQ 枠を占有しない。
+    """
+
+    def __init__(self, bq: int, gemini: int):
+        self.bq = threading.BoundedSemaphore(max(1, bq))
+        self.gemini = threading.BoundedSemaphore(max(1, gemini))
+
+
+def _slots(limits: Optional[EvalLimits]):
+    """(BQ 枠, Gemini 枠) のコンテキストマネージャ。limits 無しなら無制限"""
+    if limits is None:
+        return nullcontext(), nullcontext()
+    return limits.bq, limits.gemini
+
+
 def process_one_team(
     *,
     bq_client,
@@ -175,48 +329,73 @@ def process_one_team(
     job_id: str,
     actor: str,
     member_names: set,
+    limits: Optional[EvalLimits] = None,
+    prefetched: Optional[dict] = None,
+    claimed: bool = False,
 ) -> dict:
     """1 隊の評価を処理する。
 
+    limits を渡すと BQ 呼び出しと Gemini 呼び出しをそれぞれの枠内で実行する（並列実行用）。
+    prefetched（prefetch_month_inputs の 1 隊分）を渡すと hash / 集計値 / 既存 hash の
+    隊単位 query を省略してその値を使う。"samples" キーがあればサンプル取得も省略する。
+    claimed=True は呼び出し側が claim_team_eval_rows で lease 済みであることを示し、
+    隊単位の claim を省略する（release / upsert の lock_token 照合は同じ）。
+
     Returns:
         {"team": team, "status": "generated|skipped_claim|skipped_hash_match|no_actual|failed", ...}
     """
     result: dict = {"team": team}
+    bq_slot, gemini_slot = _slots(limits)
+
+    def _release() -> None:
+        with bq_slot:
+            bq_loader.release_team_eval_claim(
+                bq_client, year=year, month=month, team=team,
+                expected_lock_token=job_id,
+            )
 
     # 1. claim
-    claimed = bq_loader.claim_team_eval_row(
-        bq_client, year=year, month=month, team=team, job_id=job_id, actor=actor,
-    )
+    if not claimed:
+        with bq_slot:
+            claimed = bq_loader.claim_team_eval_row(
+                bq_client, year=year, month=month, team=team, job_id=job_id, actor=actor,
+            )
     if not claimed:
         result["status"] = "skipped_claim"
         return result
 
     try:
-        # 2. hash 計算
-        data_hash = vertex_evaluator.compute_actual_data_hash(
-            bq_client, year, month, team,
-        )
-        # 3. 集計値取得
-        agg = load_team_aggregate(bq_client, year, month, team)
+        if prefetched is not None:
+            data_hash = prefetched["data_hash"]
+            agg = prefetched["aggregate"]
+        else:
+            with bq_slot:
+                # 2. hash 計算
+                data_hash = vertex_evaluator.compute_actual_data_hash(
+                    bq_client, year, month, team,
+                )
+                # 3. 集計値取得
+                agg = load_team_aggregate(bq_client, year, month, team)
 
         if not agg["has_actual"]:
-            bq_loader.release_team_eval_claim(
-                bq_client, year=year, month=month, team=team,
-                expected_lock_token=job_id,
-            )
+            _release()
             result.update({"status": "no_actual", "actual_amount": None,
                           "budget_amount": agg["budget_amount"]})
             return result
 
         # 4. 既存比較
-        existing = bq_loader.load_existing_eval(
-            bq_client, year=year, month=month, team=team,
-        )
-        if not force and existing and existing.get("actual_data_hash") == data_hash:
-            bq_loader.release_team_eval_claim(
-                bq_client, year=year, month=month, team=team,
-                expected_lock_token=job_id,
+        if prefetched is not None:
+            existing = (
+                {"actual_data_hash": prefetched["existing_hash"]}
+                if prefetched["has_existing"] else None
             )
+        else:
+            with bq_slot:
+                existing = bq_loader.load_existing_eval(
+                    bq_client, year=year, month=month, team=team,
+                )
+        if not force and existing and existing.get("actual_data_hash") == data_hash:
+            _release()
             result.update({
                 "status": "skipped_hash_match",
                 "actual_amount": agg["actual_amount"],
@@ -226,9 +405,13 @@ def process_one_team(
             return result
 
         # 5. Gemini 呼び出し (R5 設計: PII 対策は入口 mask_pii に一本化)
-        top_categories, samples_raw = vertex_evaluator.load_team_samples(
-            bq_client, year, month, team,
-        )
+        if prefetched is not None and "samples" in prefetched:
+            top_categories, samples_raw = prefetched["samples"]
+        else:
+            with bq_slot:
+                top_categories, samples_raw = vertex_evaluator.load_team_samples(
+                    bq_client, year, month, team,
+                )
         samples_text, mask_results = vertex_evaluator.build_samples_text(
             samples_raw, member_names,
         )
@@ -242,7 +425,8 @@ def process_one_team(
             achievement_rate=agg["achievement_rate"], diff=agg["diff_amount"],
             top_categories=top_categories, samples_text=samples_text,
         )
-        comment, usage = vertex_evaluator.generate_comment(genai_client, user_prompt)
+        with gemini_slot:
+            comment, usage = vertex_evaluator.generate_comment(genai_client, user_prompt)
 
         # 6. upsert + claim release
         gen_cfg_json = json.dumps({
@@ -267,9 +451,10 @@ def process_one_team(
             "generation_config_json": gen_cfg_json,
             "generated_by": actor,
         }
-        upserted = bq_loader.upsert_team_monthly_eval(
-            bq_client, record=record, expected_lock_token=job_id,
-        )
+        with bq_slot:
+            upserted = bq_loader.upsert_team_monthly_eval(
+                bq_client, record=record, expected_lock_token=job_id,
+            )
         if not upserted:
             # claim を他者に奪われた稀ケース
             result.update({"status": "failed", "error": "claim_lost_during_processing"})
@@ -289,10 +474,7 @@ def process_one_team(
         logger.error("team eval failed: %s (%s)", team, type(exc).__name__, exc_info=True)
         # claim を release（後続呼び出しが進めるように）
         try:
-            bq_loader.release_team_eval_claim(
-                bq_client, year=year, month=month, team=team,
-                expected_lock_token=job_id,
-            )
+            _release()
         except Exception:  # noqa: BLE001
             pass
         result.update({"status": "failed", "error": type(exc).__name__})
@@ -302,6 +484,19 @@ def process_one_team(
 # -------- まとめて処理 --------
 
 
+def _release_unstarted(bq_client, year: int, month: int, job_id: str, teams: list[str]) -> None:
+    """lease 済みで処理に入らなかった隊の claim を release する（失敗はログのみ）"""
+    for team in teams:
+        try:
+            bq_loader.release_team_eval_claim(
+                bq_client, year=year, month=month, team=team, expected_lock_token=job_id,
+            )
+        except Exception:  # noqa: BLE001 - 元の例外を優先。lease は期限で失効する
+            logger.exception("release_team_eval_claim failed (team=%s)", team)
+    if teams:
+        logger.warning("team eval: released %d unstarted claims: %s", len(teams), teams)
+
+
 def process_teams(
     *,
     year: int,
@@ -312,17 +507,27 @@ def process_teams(
     job_id: str,
     bq_client=None,
     genai_client=None,
+    workers: Optional[int] = None,
+    on_teams: Optional[Callable[[list[str]], None]] = None,
+    on_result: Optional[Callable[[dict], None]] = None,
 ) -> dict:
-    """teams のリストを順に処理して summary を返す。
-
-    teams=None なら active な隊一覧を VIEW から取得する。
-    bq_client / genai_client が None なら本物を構築する（テスト時は注入）。
+    """teams のリストを処理して summary を返す。
+
+    teams=None なら active な隊一覧を team_budget_actuals から取得する。
+    bq_client / genai_client が None なら clients のプロセス共有クライアントを使う（テスト時は注入）。
+    最初に prefetch_month_inputs で全隊分の hash・集計値・既存 hash を一括取得し、
+    実額なし / hash 一致の隊は claim も隊単位 query もせずに結論を出す。
+    残りの隊は claim_team_eval_rows で 1 ジョブでまとめて lease し（取れなかった隊は
+    skipped_claim）、サンプルを load_month_samples で 1 query で取得したうえで、workers（既定 config.TEAM_EVAL_WORKERS）本のスレッドで並列実行し、
+    BQ / Gemini の同時呼び出し数は EvalLimits で別枠に制限する。workers <= 1 で逐次。
+    results は並列時も teams の順で返す。例外で中断した場合も、lease したまま
+    process_one_team に入らなかった隊の claim は release してから例外を上げる。
+    on_teams は対象隊の確定時に 1 回、on_result は各隊の結果確定ごとに（並列時は
+    ワーカースレッドから）呼ばれる。async ジョブの進捗記録用。
     """
-    from google.cloud import bigquery as _bq  # 関数内 import で循環回避
-
-    bq_client = bq_client or _bq.Client(project=config.GCP_PROJECT_ID)
-    genai_client = genai_client or vertex_evaluator.build_genai_client()
-    member_names = pii_masker.load_member_names(bq_client)
+    bq_client = bq_client or clients.bq_client()
+    genai_client = genai_client or clients.genai_client()
+    member_names = pii_masker.load_member_names_cached(bq_client)
     # silent PII bypass 防止: load_member_names が空 set を返すと mask_pii が no-op に
     # なり raw 名前を含む description が Gemini に送られる。空のときは abort し、Cloud
     # Run は HTTP 500 を返す。main.py の既存 chat_notifier がエンドポイント例外を catch
@@ -337,16 +542,76 @@ def process_teams(
 
     if teams is None:
         teams = list_active_teams(bq_client, year, month)
+    if on_teams is not None:
+        on_teams(list(teams))
 
-    results: list[dict] = []
-    for team in teams:
-        r = process_one_team(
-            bq_client=bq_client, genai_client=genai_client,
-            year=year, month=month, team=team,
-            force=force, job_id=job_id, actor=actor,
-            member_names=member_names,
+    workers = config.TEAM_EVAL_WORKERS if workers is None else workers
+    limits = (
+        EvalLimits(config.TEAM_EVAL_BQ_CONCURRENCY, config.TEAM_EVAL_GEMINI_CONCURRENCY)
+        if workers > 1 else None
+    )
+
+    inputs = prefetch_month_inputs(bq_client, year, month, teams)
+    resolved = {team: _resolve_without_claim(team, inputs[team], force) for team in teams}
+    pending = [team for team in teams if resolved[team] is None]
+    won = bq_loader.claim_team_eval_rows(
+        bq_client, year=year, month=month, teams=pending, job_id=job_id, actor=actor,
+    ) if pending else set()
+    for team in pending:
+        if team not in won:
+            resolved[team] = {"team": team, "status": "skipped_claim"}
+    pending = [team for team in pending if team in won]
+    # claim 以降で例外が出ても、lease したまま process_one_team に入らなかった隊は
+    # finally で release する（process_one_team に入った隊は自身で確定 / release する）。
+    # release しないと EVAL_BULK_LOCK_DURATION_MIN の間、再実行がすべて skipped_claim になる。
+    started: set[str] = set()
+    try:
+        if on_result is not None:
+            for team in teams:
+                if resolved[team] is not None:
+                    on_result(resolved[team])
+        logger.info(
+            "team eval prefetch: total=%d, resolved_without_claim=%d, claimed=%d",
+            len(teams), len(teams) - len(pending), len(pending),
         )
-        results.append(r)
+        # lease できた隊の (top_categories, samples) を 1 scan でまとめて取得。
+        # 失敗しても lease 済みの隊を取り残さないよう例外は上げず、prefetched に samples を
+        # 載せないまま process_one_team に渡す（隊ごとの load_team_samples に戻る。そこでの
+        # 失敗は process_one_team が failed にして claim を release する）。
+        if pending:
+            try:
+                month_samples = vertex_evaluator.load_month_samples(bq_client, year, month, pending)
+            except Exception:  # noqa: BLE001 - 隊単位のサンプル取得で継続
+                logger.exception(
+                    "load_month_samples failed (year=%s month=%s teams=%d), "
+                    "falling back to per-team sampling", year, month, len(pending),
+                )
+            else:
+                for team in pending:
+                    inputs[team] = dict(inputs[team], samples=month_samples[team])
+
+        def _process(team: str) -> dict:
+            started.add(team)
+            result = process_one_team(
+                bq_client=bq_client, genai_client=genai_client,
+                year=year, month=month, team=team,
+                force=force, job_id=job_id, actor=actor,
+                member_names=member_names, limits=limits,
+                prefetched=inputs[team], claimed=True,
+            )
+            if on_result is not None:
+                on_result(result)
+            return result
+
+        if workers <= 1 or len(pending) <= 1:
+            processed = [_process(team) for team in pending]
+        else:
+            with ThreadPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+                processed = list(executor.map(_process, pending))
+    finally:
+        _release_unstarted(bq_client, year, month, job_id, [t for t in pending if t not in started])
+    resolved.update(zip(pending, processed))
+    results: list[dict] = [resolved[team] for team in teams]
 
     counts = {"total": len(results), "generated": 0, "skipped_hash_match": 0,
               "skipped_claim": 0, "failed": 0, "no_actual": 0}
@@ -364,3 +629,118 @@ def process_teams(
         "year": year, "month": month, "job_id": job_id, "actor": actor,
         "summary": counts, "results": results,
     }
+
+
+# -------- async ジョブ --------
+#
+# POST /eval/team-monthly {"async": true} は job_id を即返し、process_teams を
+# インスタンス内のバックグラウンドスレッドで実行する。状態はメモリ上にのみ持つ
+# (Cloud Run は --no-cpu-throttling 前提 / ADR-0004)。評価結果そのものは従来どおり
+# team_monthly_eval に書かれるので、インスタンス再起動や別インスタンスへの
+# ポーリングで job が見つからなくても結果は BQ から読み直せる。dashboard
+# (_run_team_eval_job) は queued / 404 を失敗とみなさず期限までポーリングし、
+# 終わらなければ状態を案内して team_monthly_eval を読み直す。
+# 同一インスタンス内の async ジョブは 1 本ずつ順に実行する (claim の取り合い回避)。
+
+_jobs: dict[str, dict] = {}
+_jobs_lock = threading.Lock()
+_job_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="team-eval-job")
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _prune_jobs(now: datetime) -> None:
+    """保持期限 (config.TEAM_EVAL_JOB_RETENTION_MIN) を過ぎた完了ジョブを捨てる。_jobs_lock 内で呼ぶ。"""
+    cutoff = now - timedelta(minutes=config.TEAM_EVAL_JOB_RETENTION_MIN)
+    expired = [
+        job_id for job_id, job in _jobs.items()
+        if job["finished_at"] and datetime.fromisoformat(job["finished_at"]) < cutoff
+    ]
+    for job_id in expired:
+        del _jobs[job_id]
+
+
+def start_job(
+    *,
+    year: int,
+    month: int,
+    teams: Optional[list[str]],
+    force: bool,
+    actor: str,
+    job_id: str,
+    on_error: Optional[Callable[[Exception], None]] = None,
+) -> dict:
+    """process_teams をバックグラウンドで開始し、登録直後のジョブ状態を返す。
+
+    on_error はジョブが例外で終わったときにワーカースレッドから呼ばれる（Chat 通知用）。
+    """
+    job = {
+        "job_id": job_id, "status": "queued",
+        "year": year, "month": month, "force": force, "actor": actor,
+        "created_at": _utc_now_iso(), "started_at": None, "finished_at": None,
+        "teams": list(teams) if teams is not None else None,
+        "results": {}, "summary": None, "error": None,
+    }
+    with _jobs_lock:
+        _prune_jobs(datetime.now(timezone.utc))
+        _jobs[job_id] = job
+    _job_executor.submit(_run_job, job_id, teams, on_error)
+    return get_job(job_id)
+
+
+def _run_job(job_id: str, teams: Optional[list[str]], on_error) -> None:
+    with _jobs_lock:
+        job = _jobs[job_id]
+        job.update(status="running", started_at=_utc_now_iso())
+
+    def _on_teams(resolved_teams: list[str]) -> None:
+        with _jobs_lock:
+            job["teams"] = resolved_teams
+
+    def _on_result(result: dict) -> None:
+        with _jobs_lock:
+            job["results"][result["team"]] = result
+
+    try:
+        outcome = process_teams(
+            year=job["year"], month=job["month"], teams=teams,
+            force=job["force"], actor=job["actor"], job_id=job_id,
+            on_teams=_on_teams, on_result=_on_result,
+        )
+    except Exception as exc:  # noqa: BLE001 - ジョブ状態に残して呼び出し元へ返す
+        logger.error("team eval job %s 失敗: %s", job_id, exc, exc_info=True)
+        with _jobs_lock:
+            job.update(status="error", error=str(exc), finished_at=_utc_now_iso())
+        if on_error is not None:
+            on_error(exc)
+        return
+    with _jobs_lock:
+        job["results"] = {r["team"]: r for r in outcome["results"]}
+        job.update(status="done", summary=outcome["summary"], finished_at=_utc_now_iso())
+
+
+def get_job(job_id: str) -> Optional[dict]:
+    """ジョブ状態のスナップショットを返す。このインスタンスが知らない job_id なら None。
+
+    results は結果が確定した隊のみ（teams の順）。total は対象隊の確定前は None。
+    """
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return None
+        teams = job["teams"]
+        done = job["results"]
+        ordered = [done[t] for t in teams if t in done] if teams is not None else list(done.values())
+        return {
+            "job_id": job["job_id"], "status": job["status"],
+            "year": job["year"], "month": job["month"],
+            "force": job["force"], "actor": job["actor"],
+            "created_at": job["created_at"], "started_at": job["started_at"],
+            "finished_at": job["finished_at"],
+            "total": len(teams) if teams is not None else None,
+            "completed": len(ordered),
+            "results": ordered,
+            "summary": job["summary"], "error": job["error"],
+        }
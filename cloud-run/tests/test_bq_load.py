@@ -0,0 +1,444 @@
+"""報告テーブルの source_url 単位差分ロード・NDJSON ロード経路のユニットテスト
+
+bq_loader.load_delta_to_bigquery / load_all の振り分け、NDJSON 正規化を検証。
+BQ アクセスはモック。
+"""
+
+import threading
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import bq_loader
+import config
+
+
+class TestLoadDeltaToBigquery:
+    """load_delta_to_bigquery 単体"""
+
+    @patch("bq_loader._build_bq_client")
+    def test_stages_then_replaces_in_one_transaction(self, mock_build_client):
+        mock_client = MagicMock()
+        mock_build_client.return_value = mock_client
+        mock_client.query.return_value.result.return_value = [
+            {"changed_count": 3, "changed_months": [202605]}
+        ]
+        rows = [["https://example.com/a", "2026", "5/1"]]
+
+        count = bq_loader.load_delta_to_bigquery(config.BQ_TABLE_GYOMU, rows)
+
+        assert count == 1
+        # 1. staging へロード（本テーブルには直接ロードしない）
+        load_call = mock_client.load_table_from_file.call_args
+        assert load_call.args[1].endswith(
+            f".{config.BQ_TABLE_GYOMU}{config.BQ_STAGING_SUFFIX}"
+        )
+        assert (
+            load_call.kwargs["job_config"].write_disposition
+            == "WRITE_TRUNCATE"
+        )
+        # 2. 差分反映は 1 回の multi-statement トランザクション
+        assert mock_client.query.call_count == 1
+        sql = mock_client.query.call_args.args[0]
+        assert "BEGIN TRANSACTION" in sql and "COMMIT TRANSACTION" in sql
+        assert sql.index("DELETE FROM") < sql.index("INSERT INTO")
+        assert "source_url IN UNNEST(changed_urls)" in sql
+
+    def test_fingerprint_ignores_ingested_at(self):
+        """fingerprint は source_url 以外のデータ列のみ（ingested_at を含めない）"""
+        columns = config.TABLE_COLUMNS[config.BQ_TABLE_HOJO]
+        sql = bq_loader._build_delta_sql("p.d.t", "p.d.t_staging", columns)
+        struct_part = sql.split("STRUCT(")[1].split(")")[0]
+        assert "ingested_at" not in struct_part
+        assert "`source_url`" not in struct_part
+        assert "`month`" in struct_part
+
+    def test_gyomu_refreshes_changed_months_in_same_transaction(self):
+        """置換する source_url の新旧行の年月を集め、COMMIT 前にプロシージャを呼ぶ"""
+        columns = config.TABLE_COLUMNS[config.BQ_TABLE_GYOMU]
+        typed = [c for c, _ in config.TABLE_TYPED_COLUMNS[config.BQ_TABLE_GYOMU]]
+        sql = bq_loader._build_delta_sql(
+            "p.d.t", "p.d.t_staging", columns, typed, ["p.d.proc", "p.d.proc2"]
+        )
+
+        months_part = sql[sql.index("SET changed_months"):sql.index("DELETE FROM")]
+        assert "FROM `p.d.t` WHERE source_url IN UNNEST(changed_urls)" in months_part
+        assert "FROM `p.d.t_staging` WHERE source_url IN UNNEST(changed_urls)" in months_part
+        assert sql.index("INSERT INTO") < sql.index("CALL `p.d.proc`(changed_months)")
+        assert sql.index("CALL `p.d.proc`") < sql.index("CALL `p.d.proc2`(changed_months)")
+        assert sql.index("CALL `p.d.proc2`") < sql.index("COMMIT TRANSACTION")
+        assert "changed_count, changed_months" in sql
+
+    def test_table_without_year_month_does_not_track_months(self):
+        columns = config.TABLE_COLUMNS[config.BQ_TABLE_REIMBURSEMENT]
+        sql = bq_loader._build_delta_sql("p.d.t", "p.d.t_staging", columns, (), ["p.d.proc"])
+        assert "changed_months" not in sql and "CALL" not in sql
+
+    @patch("bq_loader._build_bq_client")
+    def test_refresh_only_for_gyomu(self, mock_build_client):
+        mock_client = MagicMock()
+        mock_client.query.return_value.result.return_value = [
+            {"changed_count": 1, "changed_months": [202605]}
+        ]
+        mock_build_client.return_value = mock_client
+
+        bq_loader.load_delta_to_bigquery(config.BQ_TABLE_HOJO, [["u", "2026", "5"]])
+        assert "CALL" not in mock_client.query.call_args.args[0]
+
+        with patch.object(config, "TEAM_BUDGET_ACTUALS_REFRESH", False), \
+                patch.object(config, "TEAM_MONTH_HASHES_REFRESH", False):
+            bq_loader.load_delta_to_bigquery(config.BQ_TABLE_GYOMU, [["u", "2026", "5/1"]])
+        assert "CALL" not in mock_client.query.call_args.args[0]
+
+        with patch.object(config, "TEAM_MONTH_HASHES_REFRESH", False):
+            bq_loader.load_delta_to_bigquery(config.BQ_TABLE_GYOMU, [["u", "2026", "5/1"]])
+        sql = mock_client.query.call_args.args[0]
+        assert f"{config.BQ_PROC_REFRESH_TEAM_BUDGET_ACTUALS}`(changed_months)" in sql
+        assert config.BQ_PROC_REFRESH_TEAM_MONTH_HASHES not in sql
+
+        bq_loader.load_delta_to_bigquery(config.BQ_TABLE_GYOMU, [["u", "2026", "5/1"]])
+        sql = mock_client.query.call_args.args[0]
+        assert f"{config.BQ_PROC_REFRESH_TEAM_BUDGET_ACTUALS}`(changed_months)" in sql
+        assert f"{config.BQ_PROC_REFRESH_TEAM_MONTH_HASHES}`(changed_months)" in sql
+
+    @patch("bq_loader._build_bq_client")
+    def test_empty_rows_does_not_touch_table(self, mock_build_client):
+        assert bq_loader.load_delta_to_bigquery(config.BQ_TABLE_GYOMU, []) == 0
+        mock_build_client.assert_not_called()
+
+    def test_rejects_table_without_source_url(self):
+        with pytest.raises(ValueError):
+            bq_loader.load_delta_to_bigquery(config.BQ_TABLE_MEMBERS, [["x"]])
+
+
+class TestLoadAllDispatch:
+    """load_all が報告・立替金テーブルだけ差分ロードに振り分けること"""
+
+    @patch("bq_loader.load_to_bigquery", return_value=5)
+    @patch("bq_loader.load_delta_to_bigquery", return_value=7)
+    def test_report_tables_use_delta(self, mock_delta, mock_truncate):
+        result = bq_loader.load_all({
+            config.BQ_TABLE_GYOMU: [["g"]],
+            config.BQ_TABLE_HOJO: [["h"]],
+            config.BQ_TABLE_MEMBERS: [["m"]],
+        })
+
+        assert result == {
+            config.BQ_TABLE_GYOMU: 7,
+            config.BQ_TABLE_HOJO: 7,
+            config.BQ_TABLE_MEMBERS: 5,
+        }
+        assert {c.args[0] for c in mock_delta.call_args_list} == {
+            config.BQ_TABLE_GYOMU, config.BQ_TABLE_HOJO,
+        }
+        mock_truncate.assert_called_once_with(config.BQ_TABLE_MEMBERS, [["m"]])
+
+    @patch("bq_loader.load_to_bigquery", return_value=5)
+    @patch("bq_loader.load_delta_to_bigquery")
+    def test_delta_disabled_falls_back_to_truncate(self, mock_delta, mock_truncate):
+        with patch.object(config, "BQ_DELTA_LOAD", False):
+            bq_loader.load_all({config.BQ_TABLE_GYOMU: [["g"]]})
+
+        mock_delta.assert_not_called()
+        mock_truncate.assert_called_once()
+
+    @patch("bq_loader.load_delta_to_bigquery", side_effect=RuntimeError("boom"))
+    def test_delta_error_keeps_minus_one_convention(self, _):
+        result = bq_loader.load_all({config.BQ_TABLE_GYOMU: [["g"]]})
+        assert result == {config.BQ_TABLE_GYOMU: -1}
+
+    def test_tables_load_concurrently(self):
+        """全テーブルのロードが同時に走る（直列なら Barrier が揃わずタイムアウト）"""
+        tables = [config.BQ_TABLE_GYOMU, config.BQ_TABLE_HOJO, config.BQ_TABLE_MEMBERS]
+        barrier = threading.Barrier(len(tables), timeout=5)
+
+        def _load(table_name, rows):
+            barrier.wait()
+            return len(rows)
+
+        with patch("bq_loader.load_delta_to_bigquery", side_effect=_load), \
+                patch("bq_loader.load_to_bigquery", side_effect=_load):
+            result = bq_loader.load_all({t: [["x"]] for t in tables})
+
+        assert list(result) == tables
+        assert result == {t: 1 for t in tables}
+
+    @patch("bq_loader.load_to_bigquery")
+    @patch("bq_loader.load_delta_to_bigquery", return_value=3)
+    def test_one_failure_does_not_stop_others(self, _, mock_truncate):
+        mock_truncate.side_effect = RuntimeError("boom")
+        result = bq_loader.load_all({
+            config.BQ_TABLE_GYOMU: [["g"]],
+            config.BQ_TABLE_MEMBERS: [["m"]],
+        })
+        assert result == {config.BQ_TABLE_GYOMU: 3, config.BQ_TABLE_MEMBERS: -1}
+
+    @patch("bq_loader.load_to_bigquery", return_value=1)
+    @patch("bq_loader.load_delta_to_bigquery", return_value=4)
+    def test_changes_token_loads_after_reimbursement(self, _, mock_truncate):
+        """立替金テーブル・マニフェストが書けたら pageToken を進める"""
+        result = bq_loader.load_all({
+            config.BQ_TABLE_REIMBURSEMENT_CHANGES_TOKEN: [["tok"]],
+            config.BQ_TABLE_REIMBURSEMENT: [["r"]],
+            config.BQ_TABLE_REIMBURSEMENT_MANIFEST: [["m"]],
+        })
+
+        assert list(result) == [
+            config.BQ_TABLE_REIMBURSEMENT_CHANGES_TOKEN,
+            config.BQ_TABLE_REIMBURSEMENT,
+            config.BQ_TABLE_REIMBURSEMENT_MANIFEST,
+        ]
+        assert result[config.BQ_TABLE_REIMBURSEMENT] == 4
+        assert mock_truncate.call_args_list[-1].args[0] == config.BQ_TABLE_REIMBURSEMENT_CHANGES_TOKEN
+
+    @patch("bq_loader.load_to_bigquery", return_value=1)
+    @patch("bq_loader.load_delta_to_bigquery", side_effect=RuntimeError("boom"))
+    def test_changes_token_kept_when_reimbursement_fails(self, _, mock_truncate):
+        """立替金テーブルが書けなければ pageToken は進めない（次回同じ変更を再取得）"""
+        result = bq_loader.load_all({
+            config.BQ_TABLE_REIMBURSEMENT: [["r"]],
+            config.BQ_TABLE_REIMBURSEMENT_MANIFEST: [["m"]],
+            config.BQ_TABLE_REIMBURSEMENT_CHANGES_TOKEN: [["tok"]],
+        })
+
+        assert result[config.BQ_TABLE_REIMBURSEMENT] == -1
+        assert result[config.BQ_TABLE_REIMBURSEMENT_CHANGES_TOKEN] == 0
+        assert [c.args[0] for c in mock_truncate.call_args_list] == [
+            config.BQ_TABLE_REIMBURSEMENT_MANIFEST,
+        ]
+
+
+class TestRefreshTeamBudgetActuals:
+    @patch("bq_loader._build_bq_client")
+    def test_months_are_bound_as_array(self, mock_build_client):
+        mock_client = MagicMock()
+        mock_build_client.return_value = mock_client
+
+        bq_loader.refresh_team_budget_actuals([202606, 202605, 202606])
+
+        sql = mock_client.query.call_args.args[0]
+        assert sql.index("BEGIN TRANSACTION") < sql.index("CALL") < sql.index("COMMIT")
+        assert "(@months)" in sql
+        param = mock_client.query.call_args.kwargs["job_config"].query_parameters[0]
+        assert (param.name, param.values) == ("months", [202605, 202606])
+
+    @patch("bq_loader._build_bq_client")
+    def test_none_rebuilds_all(self, mock_build_client):
+        mock_client = MagicMock()
+        mock_build_client.return_value = mock_client
+
+        bq_loader.refresh_team_budget_actuals()
+
+        assert "(NULL)" in mock_client.query.call_args.args[0]
+
+    @patch("bq_loader._build_bq_client")
+    def test_month_hashes_use_own_procedure(self, mock_build_client):
+        mock_client = MagicMock()
+        mock_build_client.return_value = mock_client
+
+        bq_loader.refresh_team_month_hashes([202605])
+
+        sql = mock_client.query.call_args.args[0]
+        assert f"{config.BQ_PROC_REFRESH_TEAM_MONTH_HASHES}`(@months)" in sql
+        assert sql.index("BEGIN TRANSACTION") < sql.index("CALL") < sql.index("COMMIT")
+
+    @patch("bq_loader._call_refresh")
+    @patch("bq_loader._build_bq_client")
+    def test_truncate_load_of_gyomu_rebuilds_all(self, mock_build_client, mock_refresh):
+        mock_build_client.return_value = MagicMock()
+
+        bq_loader.load_to_bigquery(config.BQ_TABLE_GYOMU, [["u", "2026", "5/1"]])
+        assert [c.args for c in mock_refresh.call_args_list] == [
+            (config.BQ_PROC_REFRESH_TEAM_BUDGET_ACTUALS, config.BQ_TABLE_TEAM_BUDGET_ACTUALS, None),
+            (config.BQ_PROC_REFRESH_TEAM_MONTH_HASHES, config.BQ_TABLE_TEAM_MONTH_HASHES, None),
+        ]
+
+        mock_refresh.reset_mock()
+        bq_loader.load_to_bigquery(config.BQ_TABLE_HOJO, [["u", "2026", "5"]])
+        mock_refresh.assert_not_called()
+
+
+class TestFreezeClosedCompensation:
+    """締め済み月の報酬スナップショット（monthly_compensation_closed）"""
+
+    @pytest.mark.parametrize("today, expected", [
+        (date(2026, 10, 17), 202608), (date(2026, 1, 1), 202511), (date(2026, 2, 28), 202512),
+    ])
+    def test_closed_before_keeps_current_and_two_previous_months_open(self, today, expected):
+        assert bq_loader.compensation_closed_before(today) == expected
+
+    @patch("bq_loader._build_bq_client")
+    def test_missing_months_use_today_boundary(self, mock_build_client):
+        """月末でも締め済みの月までしか凍結しない（10-31 に 2026-08 は凍結しない）"""
+        mock_client = mock_build_client.return_value
+        mock_client.query.return_value.result.return_value = [{"months": [202607]}]
+
+        frozen = bq_loader.freeze_closed_compensation(date(2026, 10, 31))
+
+        assert frozen == [202607]
+        sql = mock_client.query.call_args.args[0]
+        assert "NOT IN (SELECT DISTINCT year_month FROM" in sql
+        assert sql.index("BEGIN TRANSACTION") < sql.index("CALL") < sql.index("COMMIT")
+        assert "freeze_monthly_compensation`(months)" in sql
+        param = mock_client.query.call_args.kwargs["job_config"].query_parameters[0]
+        assert (param.name, param.value) == ("closed_before", 202608)
+
+    @patch("bq_loader._build_bq_client")
+    def test_explicit_months_are_refrozen(self, mock_build_client):
+        mock_client = mock_build_client.return_value
+
+        frozen = bq_loader.freeze_closed_compensation(date(2026, 10, 17), [202607, 202605, 202607])
+
+        assert frozen == [202605, 202607]
+        sql = mock_client.query.call_args.args[0]
+        assert "freeze_monthly_compensation`(@months)" in sql
+        param = mock_client.query.call_args.kwargs["job_config"].query_parameters[0]
+        assert (param.name, param.values) == ("months", [202605, 202607])
+
+    @patch("bq_loader._build_bq_client")
+    def test_open_month_is_rejected(self, mock_build_client):
+        with pytest.raises(ValueError, match="202608"):
+            bq_loader.freeze_closed_compensation(date(2026, 10, 17), [202607, 202608])
+        mock_build_client.return_value.query.assert_not_called()
+
+
+class TestSheetCheckpoint:
+    """report_sheet_checkpoint（収集チェックポイント）の書き込み"""
+
+    @patch("bq_loader._build_bq_client")
+    def test_append_uses_write_append(self, mock_build_client):
+        client = mock_build_client.return_value
+        count = bq_loader.append_sheet_checkpoint([["u", "s", "t", "{}", "done"]])
+        assert count == 1
+        job_config = client.load_table_from_file.call_args.kwargs["job_config"]
+        assert job_config.write_disposition == "WRITE_APPEND"
+
+    @patch("bq_loader._build_bq_client")
+    def test_replace_with_no_failures_truncates(self, mock_build_client):
+        """失敗シートが無い回は load_to_bigquery の no-op にならず TRUNCATE で空にする"""
+        result = bq_loader.load_all({config.BQ_TABLE_SHEET_CHECKPOINT: []})
+        assert result == {config.BQ_TABLE_SHEET_CHECKPOINT: 0}
+        sql = mock_build_client.return_value.query.call_args.args[0]
+        assert sql.startswith("TRUNCATE TABLE") and config.BQ_TABLE_SHEET_CHECKPOINT in sql
+
+    @patch("bq_loader.load_to_bigquery", return_value=1)
+    def test_replace_with_failures_truncate_loads(self, mock_truncate):
+        rows = [["u", "s", "t", "{}", "failed"]]
+        bq_loader.replace_sheet_checkpoint(rows)
+        mock_truncate.assert_called_once_with(config.BQ_TABLE_SHEET_CHECKPOINT, rows)
+
+
+class TestStreamingNormalization:
+    """NDJSON ストリーミング正規化（DataFrame を経由しないロード経路）"""
+
+    def test_pads_truncates_and_stringifies(self):
+        import io
+        import json
+
+        columns = ["source_url", "a", "b"]
+        buf = io.BytesIO()
+        count = bq_loader._write_ndjson(
+            [["u1", 1], ["u2", "x", None, "extra"]], columns, buf
+        )
+
+        assert count == 2
+        records = [json.loads(line) for line in buf.getvalue().decode().splitlines()]
+        assert records[0]["a"] == "1" and records[0]["b"] is None
+        assert (records[1]["source_url"], records[1]["a"], records[1]["b"]) == ("u2", "x", None)
+        assert "extra" not in buf.getvalue().decode()
+        assert records[0]["ingested_at"].endswith(" UTC")
+
+    def test_typed_columns_are_derived(self):
+        """gyomu_reports は型付き派生列を同じレコードに含め、スキーマにも型付きで載せる"""
+        import io
+        import json
+
+        columns = config.TABLE_COLUMNS[config.BQ_TABLE_GYOMU]
+        row = dict.fromkeys(columns, "")
+        row.update(source_url="u", year="2026", date="5/1", amount="1,200")
+        buf = io.BytesIO()
+        bq_loader._write_ndjson([list(row.values())], columns, buf, table_name=config.BQ_TABLE_GYOMU)
+
+        record = json.loads(buf.getvalue())
+        assert (record["year_int"], record["month_int"]) == (2026, 5)
+        assert (record["report_date"], record["amount_numeric"]) == ("2026-05-01", "1200")
+        assert record["year_month"] == 202605
+
+    @patch("bq_loader._build_bq_client")
+    def test_typed_schema_on_staging_load(self, mock_build_client):
+        mock_client = MagicMock()
+        mock_client.query.return_value.result.return_value = [
+            {"changed_count": 0, "changed_months": []}
+        ]
+        mock_build_client.return_value = mock_client
+
+        bq_loader.load_delta_to_bigquery(config.BQ_TABLE_GYOMU, [["u", "2026", "5/1"]])
+
+        job_config = mock_client.load_table_from_file.call_args.kwargs["job_config"]
+        types = {f.name: f.field_type for f in job_config.schema}
+        assert types["month_int"] == "INT64"
+        assert types["amount_numeric"] == "NUMERIC" and types["amount"] == "STRING"
+        sql = mock_client.query.call_args.args[0]
+        insert = sql[sql.index("INSERT INTO"):]
+        assert "`amount_numeric`" in insert and "`report_date`" in insert
+        # fingerprint（比較）には派生列を含めない
+        assert "amount_numeric" not in sql[:sql.index("INSERT INTO")]
+        assert "`year_month`" in insert
+        # staging は既存レイアウトのまま（パーティション指定を付けない）
+        assert job_config.range_partitioning is None
+
+    @patch("bq_loader._build_bq_client")
+    def test_full_load_keeps_partitioning_and_clustering(self, mock_build_client):
+        """WRITE_TRUNCATE でも本テーブルのパーティション・クラスタ指定を保つ"""
+        mock_client = MagicMock()
+        mock_build_client.return_value = mock_client
+
+        bq_loader.load_to_bigquery(config.BQ_TABLE_HOJO, [["u", "2026", "5"]])
+
+        job_config = mock_client.load_table_from_file.call_args.kwargs["job_config"]
+        assert job_config.range_partitioning.field == "year_month"
+        assert job_config.range_partitioning.range_.start == config.BQ_YEAR_MONTH_RANGE[0]
+        assert job_config.clustering_fields == ["source_url"]
+
+    def test_year_month_range_within_partition_limit(self):
+        """BigQuery の整数範囲パーティションは 1 テーブル 10,000 区画まで"""
+        start, end = config.BQ_YEAR_MONTH_RANGE
+        assert end - start == 2000
+        assert end - start <= 10000
+
+    @patch("bq_loader._build_bq_client")
+    def test_full_load_without_layout(self, mock_build_client):
+        mock_client = MagicMock()
+        mock_build_client.return_value = mock_client
+
+        bq_loader.load_to_bigquery(config.BQ_TABLE_MEMBERS, [["https://example.com/a"]])
+
+        job_config = mock_client.load_table_from_file.call_args.kwargs["job_config"]
+        assert job_config.range_partitioning is None
+        assert job_config.clustering_fields is None
+
+    def test_batches_are_bounded(self):
+        from datetime import datetime, timezone
+
+        rows = [["u", str(i)] for i in range(7)]
+        batches = list(bq_loader._iter_ndjson_batches(
+            rows, ["source_url", "a"], datetime.now(timezone.utc), batch_rows=3
+        ))
+
+        assert [b.count(b"\n") for b in batches] == [3, 3, 1]
+
+    @patch("bq_loader._build_bq_client")
+    def test_load_uses_ndjson_file(self, mock_build_client):
+        mock_client = MagicMock()
+        mock_build_client.return_value = mock_client
+
+        count = bq_loader.load_to_bigquery(
+            config.BQ_TABLE_MEMBERS, [["https://example.com/a", "TM001"]]
+        )
+
+        assert count == 1
+        mock_client.load_table_from_dataframe.assert_not_called()
+        job_config = mock_client.load_table_from_file.call_args.kwargs["job_config"]
+        assert job_config.source_format == "NEWLINE_DELIMITED_JSON"
+        assert job_config.write_disposition == "WRITE_TRUNCATE"
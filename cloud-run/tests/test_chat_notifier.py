@@ -161,6 +161,7 @@ class TestMainIntegration:
         mock_bq.config.BQ_TABLE_MEMBERS = "members"
         mock_bq.config.BQ_TABLE_GROUPS_MASTER = "groups_master"
         mock_bq.config.BQ_TABLE_MEMBER_MASTER = "member_master"
+        mock_bq.freeze_closed_compensation.return_value = []
         mock_bq.read_group_based_users.return_value = {}
         # Step6 で例外 → 部分失敗
         mock_sheets.run_reimbursement_collection.side_effect = RuntimeError("reimb boom")
@@ -194,6 +195,7 @@ class TestMainIntegration:
         mock_bq.config.BQ_TABLE_MEMBERS = "members"
         mock_bq.config.BQ_TABLE_GROUPS_MASTER = "groups_master"
         mock_bq.config.BQ_TABLE_MEMBER_MASTER = "member_master"
+        mock_bq.freeze_closed_compensation.return_value = []
         mock_bq.read_group_based_users.return_value = {}
         mock_sheets.run_reimbursement_collection.return_value = {
             "reimbursement_items": [["r"]]
@@ -274,7 +276,7 @@ class TestMainIntegration:
         mock_bq.config.BQ_TABLE_GROUPS_MASTER = "groups_master"
         mock_bq.read_group_based_users.return_value = {"g@x.com": []}  # truthy → 同期試行
         # 同期の内側で例外 → except sync_err で握り 200、ただし通知
-        mock_sheets._build_admin_service.side_effect = RuntimeError("sync boom")
+        mock_sheets.fetch_group_members_map.side_effect = RuntimeError("sync boom")
 
         response = client.post("/update-groups")
 
@@ -0,0 +1,106 @@
+"""clients（API クライアント・認証情報レジストリ）のユニットテスト
+
+認証情報の発行・discovery クライアント構築・bigquery.Client はモックし、
+プロセス共有 / スレッド単位のキャッシュと warm-up の振る舞いを検証。
+"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import clients
+import config
+
+
+@pytest.fixture(autouse=True)
+def _reset_registry():
+    clients.reset()
+    yield
+    clients.reset()
+
+
+class TestDwdCredentials:
+    @patch("clients._mint_dwd_credentials")
+    def test_cached_per_scope_set(self, mock_mint):
+        mock_mint.side_effect = lambda scopes: MagicMock(name=str(scopes))
+
+        a = clients.dwd_credentials(["s1", "s2"])
+        b = clients.dwd_credentials(["s2", "s1"])
+        c = clients.dwd_credentials(["s3"])
+
+        assert a is b
+        assert c is not a
+        assert mock_mint.call_count == 2
+
+
+class TestGoogleService:
+    @patch("clients.build")
+    @patch("clients._mint_dwd_credentials", return_value=MagicMock())
+    def test_reused_within_thread(self, mock_mint, mock_build):
+        mock_build.side_effect = lambda *a, **k: MagicMock()
+
+        first = clients.google_service("sheets", "v4", ["s"])
+        second = clients.google_service("sheets", "v4", ["s"])
+
+        assert first is second
+        mock_build.assert_called_once()
+
+    @patch("clients.build")
+    @patch("clients._mint_dwd_credentials", return_value=MagicMock())
+    def test_separate_per_thread_shared_credentials(self, mock_mint, mock_build):
+        """httplib2 はスレッドセーフでないため service はスレッドごと、認証情報は共有"""
+        mock_build.side_effect = lambda *a, **k: MagicMock()
+        services = []
+
+        def _worker():
+            services.append(clients.google_service("sheets", "v4", ["s"]))
+
+        threads = [threading.Thread(target=_worker) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert services[0] is not services[1]
+        mock_mint.assert_called_once()
+
+
+class TestSharedClients:
+    @patch("google.cloud.bigquery.Client")
+    def test_bq_client_is_process_singleton(self, mock_client):
+        assert clients.bq_client() is clients.bq_client()
+        mock_client.assert_called_once_with(project=config.GCP_PROJECT_ID)
+
+    @patch("vertex_evaluator.build_genai_client")
+    def test_genai_client_is_process_singleton(self, mock_build):
+        assert clients.genai_client() is clients.genai_client()
+        mock_build.assert_called_once()
+
+
+class TestWarmUp:
+    @patch("clients.bq_client")
+    @patch("clients._mint_dwd_credentials")
+    def test_warm_up_refreshes_each_scope(self, mock_mint, mock_bq):
+        creds = MagicMock()
+        mock_mint.return_value = creds
+
+        clients.warm_up([["a"], ["b"]])
+
+        mock_bq.assert_called_once()
+        assert creds.refresh.call_count == 2
+
+    @patch("clients.bq_client", side_effect=RuntimeError("no ADC"))
+    def test_warm_up_failure_is_swallowed(self, _):
+        clients.warm_up([["a"]])
+
+    def test_start_warm_up_disabled(self):
+        with patch.object(config, "CLIENT_WARMUP", False), patch("clients.warm_up") as mock_warm:
+            assert clients.start_warm_up([["a"]]) is None
+        mock_warm.assert_not_called()
+
+    def test_start_warm_up_runs_in_background(self):
+        with patch.object(config, "CLIENT_WARMUP", True), patch("clients.warm_up") as mock_warm:
+            thread = clients.start_warm_up([["a"]])
+            thread.join(timeout=5)
+        mock_warm.assert_called_once_with([["a"]])
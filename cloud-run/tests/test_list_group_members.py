@@ -1,4 +1,4 @@
-"""list_group_members のユニットテスト
+"""list_group_members / グループメンバー並列取得のユニットテスト
 
 Admin Directory API members().list() のページネーション・エラーハンドリングを検証。
 """
@@ -8,7 +8,12 @@ from unittest.mock import MagicMock, patch
 
 from googleapiclient.errors import HttpError
 
-from sheets_collector import list_group_members
+from sheets_collector import (
+    fetch_group_members_map,
+    list_group_members,
+    list_members_of_groups,
+    update_member_groups_from_bq,
+)
 
 
 class TestListGroupMembers:
@@ -112,3 +117,103 @@ class TestListGroupMembers:
         result = list_group_members(mock_service, "test-group@tadakayo.jp")
 
         assert result == ["alice@tadakayo.jp"]
+
+
+class TestListMembersOfGroups:
+    """list_members_of_groups（並列取得）のテスト"""
+
+    @patch("sheets_collector.time.sleep")
+    def test_parallel_result_matches_sequential(self, mock_sleep):
+        """並列取得でも {group: members} が逐次取得と同じ内容・順序になること"""
+        groups = [f"g{i}@tadakayo.jp" for i in range(6)]
+
+        def make_service():
+            svc = MagicMock()
+
+            def list_side_effect(groupKey, pageToken, maxResults):
+                req = MagicMock()
+                req.execute.return_value = {
+                    "members": [{"type": "USER", "email": f"U-{groupKey}"}]
+                }
+                return req
+
+            svc.members().list.side_effect = list_side_effect
+            return svc
+
+        sequential = list_members_of_groups(make_service(), groups, workers=1)
+        parallel = list_members_of_groups(
+            make_service(), groups, workers=3, service_factory=make_service
+        )
+
+        assert parallel == sequential
+        assert list(parallel) == groups
+        assert parallel["g0@tadakayo.jp"] == ["u-g0@tadakayo.jp"]
+
+    @patch("sheets_collector._build_admin_service")
+    def test_fetch_group_members_map_uses_worker_services(self, mock_build):
+        """fetch_group_members_map はワーカーごとに Admin service を構築して並列取得する"""
+        def make_service():
+            svc = MagicMock()
+            svc.members().list.side_effect = lambda groupKey, pageToken, maxResults: MagicMock(
+                execute=MagicMock(
+                    return_value={"members": [{"type": "USER", "email": f"u@{groupKey}"}]}
+                )
+            )
+            return svc
+
+        mock_build.side_effect = make_service
+        groups = {"a.example": [], "b.example": [], "c.example": []}
+
+        with patch("sheets_collector.ADMIN_RATE_LIMITER") as mock_limiter:
+            result = fetch_group_members_map(groups)
+
+        assert result == {g: [f"u@{g}"] for g in groups}
+        assert mock_build.call_count >= 2  # 呼出元用 + ワーカー用
+        assert mock_limiter.acquire.call_count == len(groups)
+
+
+class TestUpdateMemberGroupsFromBq:
+    """update_member_groups_from_bq（メンバー所属グループの並列取得）のテスト"""
+
+    @staticmethod
+    def _make_service():
+        svc = MagicMock()
+
+        def list_side_effect(userKey, pageToken, maxResults):
+            req = MagicMock()
+            req.execute.return_value = {
+                "groups": [{"email": f"grp-{userKey}", "name": f"G {userKey}"}]
+            }
+            return req
+
+        svc.groups().list.side_effect = list_side_effect
+        return svc
+
+    @patch("sheets_collector.time.sleep")
+    @patch("bq_loader.read_members_from_bq")
+    def test_parallel_result_matches_sequential(self, mock_read, mock_sleep):
+        """並列取得でも members 行・groups_master が逐次取得と同じ内容・順序になること"""
+        import config
+
+        columns = config.TABLE_COLUMNS[config.BQ_TABLE_MEMBERS]
+        gws_idx = columns.index("gws_account")
+        groups_idx = columns.index("groups")
+        rows = []
+        for i in range(5):
+            row = [None] * len(columns)
+            row[gws_idx] = f"user{i}@tadakayo.jp" if i != 2 else ""
+            rows.append(row)
+        mock_read.return_value = rows
+
+        with patch("sheets_collector._build_admin_service", side_effect=self._make_service):
+            sequential = update_member_groups_from_bq(workers=1)
+            with patch("sheets_collector.ADMIN_RATE_LIMITER"):
+                parallel = update_member_groups_from_bq(workers=3)
+
+        assert parallel == sequential
+        updated, groups_master = parallel
+        assert updated[0][groups_idx] == "grp-user0@tadakayo.jp"
+        assert updated[2][groups_idx] == ""  # gws_account 空は API を呼ばない
+        assert [g[0] for g in groups_master] == [
+            f"grp-user{i}@tadakayo.jp" for i in (0, 1, 3, 4)
+        ]
@@ -1,6 +1,7 @@
 """手動同期エンドポイントのユニットテスト
 
-POST /sync/main-reports, POST /sync/reimbursement, POST /sync/member-master の
+POST /sync/main-reports, POST /sync/reimbursement, POST /sync/member-master,
+POST /sync/retry-failed, POST /compensation/freeze の
 正常系・異常系を検証。実際の Sheets/BQ アクセスはモック。
 """
 
@@ -127,6 +128,93 @@ class TestSyncMemberMaster:
         assert "auth failed" in payload["message"]
 
 
+class TestSyncRetryFailed:
+    """POST /sync/retry-failed"""
+
+    @patch("main.bq_loader")
+    @patch("main.sheets_collector")
+    def test_reloads_after_retry(self, mock_sheets, mock_bq, client):
+        mock_sheets.run_failed_sheet_retry.return_value = {"gyomu_reports": [["r"]]}
+        mock_bq.load_all.return_value = {"gyomu_reports": 1}
+
+        response = client.post("/sync/retry-failed")
+
+        assert response.status_code == 200
+        payload = response.get_json()
+        assert payload["retried"] is True
+        assert payload["tables"] == {"gyomu_reports": 1}
+        mock_bq.load_all.assert_called_once_with({"gyomu_reports": [["r"]]})
+
+    @patch("main.bq_loader")
+    @patch("main.sheets_collector")
+    def test_noop_without_failed_sheets(self, mock_sheets, mock_bq, client):
+        mock_sheets.run_failed_sheet_retry.return_value = None
+
+        response = client.post("/sync/retry-failed")
+
+        assert response.status_code == 200
+        assert response.get_json()["retried"] is False
+        mock_bq.load_all.assert_not_called()
+
+    @patch("main.sheets_collector")
+    def test_error(self, mock_sheets, client):
+        mock_sheets.run_failed_sheet_retry.side_effect = RuntimeError("boom")
+
+        response = client.post("/sync/retry-failed")
+
+        assert response.status_code == 500
+        assert response.get_json()["endpoint"] == "/sync/retry-failed"
+
+
+class TestFreezeCompensation:
+    """POST /compensation/freeze"""
+
+    @patch("main.bq_loader")
+    def test_default_freezes_missing_months(self, mock_bq, client):
+        mock_bq.freeze_closed_compensation.return_value = [202607]
+
+        response = client.post("/compensation/freeze")
+
+        assert response.status_code == 200
+        assert response.get_json()["frozen_months"] == [202607]
+        assert mock_bq.freeze_closed_compensation.call_args.args[1] is None
+
+    @patch("main.bq_loader")
+    def test_explicit_months(self, mock_bq, client):
+        mock_bq.freeze_closed_compensation.return_value = [202605]
+
+        response = client.post("/compensation/freeze", json={"months": [202605]})
+
+        assert response.status_code == 200
+        assert mock_bq.freeze_closed_compensation.call_args.args[1] == [202605]
+
+    @pytest.mark.parametrize("months", ["202605", [202605, "202606"], [True]])
+    @patch("main.bq_loader")
+    def test_invalid_months_400(self, mock_bq, client, months):
+        response = client.post("/compensation/freeze", json={"months": months})
+
+        assert response.status_code == 400
+        mock_bq.freeze_closed_compensation.assert_not_called()
+
+    @patch("main.bq_loader")
+    def test_open_month_400(self, mock_bq, client):
+        mock_bq.freeze_closed_compensation.side_effect = ValueError("未締めの年月は凍結できません")
+
+        response = client.post("/compensation/freeze", json={"months": [209912]})
+
+        assert response.status_code == 400
+        assert "未締め" in response.get_json()["message"]
+
+    @patch("main.bq_loader")
+    def test_error(self, mock_bq, client):
+        mock_bq.freeze_closed_compensation.side_effect = RuntimeError("bq down")
+
+        response = client.post("/compensation/freeze")
+
+        assert response.status_code == 500
+        assert "bq down" in response.get_json()["message"]
+
+
 class TestHealth:
     """GET /health (既存エンドポイント、回帰確認)"""
 
@@ -3,7 +3,11 @@
 spec: docs/specs/2026-06-10-team-budget-eval-design.md §7.3 / §7.6
 """
 
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import pii_masker
 
 from pii_masker import (
     EMAIL_RE,
@@ -11,8 +15,11 @@ from pii_masker import (
     URL_RE,
     PLACEHOLDER_RE,
     MaskResult,
+    MemberNames,
+    NameMatcher,
     assert_no_raw_pii,
     load_member_names,
+    load_member_names_cached,
     mask_pii,
     validate_ai_comment,
 )
@@ -399,6 +406,56 @@ class TestMaskPiiCompleteness:
             assert p not in result.masked_text
 
 
+def _mask_names_sequential(text, names):
+    """旧実装の名前置換 (長い順 → 同長は文字列順に 1 名ずつ str.replace)。等価性検証の基準"""
+    ordered = sorted({n for n in names if n and len(n) >= 2}, key=lambda n: (-len(n), n))
+    detected = []
+    for name in ordered:
+        if name in text:
+            detected.append(name)
+            text = text.replace(name, "<MEMBER>")
+    return text, detected
+
+
+class TestNameMatcher:
+    """Aho–Corasick 照合器が逐次置換と同一の結果を返すこと"""
+
+    def test_matches_sequential_replace_on_random_inputs(self):
+        import random
+
+        rng = random.Random(20260613)
+        alphabet = "山田太郎花子あいうab"
+        for _ in range(2000):
+            names = {
+                "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+                for _ in range(rng.randint(0, 8))
+            }
+            text = "".join(rng.choice(alphabet + " さん") for _ in range(rng.randint(0, 30)))
+            expected_text, expected_names = _mask_names_sequential(text, names)
+
+            result = mask_pii(text, names)
+
+            assert result.masked_text == expected_text, (text, sorted(names))
+            assert list(result.detected_names) == expected_names
+
+    def test_overlapping_names_prefer_longer(self):
+        """長い名前が先に採られ、重なる短い名前の出現は捨てられる"""
+        matcher = NameMatcher({"田太郎", "山田", "太郎"})
+        assert matcher.mask("山田太郎と太郎") == ("山<MEMBER>と<MEMBER>", ["田太郎", "太郎"])
+
+    def test_falls_back_when_name_overlaps_placeholder(self):
+        """'<MEMBER>' の部分文字列となる名前は逐次置換と同じ結果 (フォールバック)"""
+        names = {"山田太郎", "ME", "R>"}
+        text = "山田太郎とMEとR>"
+        assert mask_pii(text, names).masked_text == _mask_names_sequential(text, names)[0]
+
+    def test_member_names_reuses_compiled_matcher(self):
+        names = MemberNames({"山田", "鈴木"})
+        assert names.matcher is names.matcher
+        assert names == {"山田", "鈴木"}
+        assert not MemberNames()
+
+
 # ==============================
 # assert_no_raw_pii (R5 新規)
 # ==============================
@@ -565,3 +622,45 @@ class TestLoadMemberNames:
         assert "山田 太郎" in names
         assert "山田" in names
         assert "太郎" in names
+
+
+class TestLoadMemberNamesCached:
+    """member_master の last-modified をキーにしたプロセス内キャッシュ"""
+
+    @pytest.fixture(autouse=True)
+    def _reset_cache(self):
+        pii_masker._member_names_cache.update(modified=None, names=None)
+        yield
+        pii_masker._member_names_cache.update(modified=None, names=None)
+
+    def _client(self, modified):
+        client = MagicMock()
+        client.get_table.return_value.modified = modified
+        return client
+
+    def test_reuses_names_until_member_master_reloaded(self):
+        with patch("pii_masker.load_member_names", return_value=MemberNames({"山田"})) as mock_load:
+            first = load_member_names_cached(self._client("2026-06-01T07:00"))
+            second = load_member_names_cached(self._client("2026-06-01T07:00"))
+            assert mock_load.call_count == 1
+            assert second is first
+            assert second.matcher is first.matcher  # 照合器も再利用
+
+            load_member_names_cached(self._client("2026-06-02T07:00"))
+            assert mock_load.call_count == 2
+
+    def test_empty_result_is_not_cached(self):
+        """空 set はキャッシュせず毎回取り直す (fail-closed は呼び出し側で abort)"""
+        client = self._client("2026-06-01T07:00")
+        with patch("pii_masker.load_member_names", return_value=MemberNames()) as mock_load:
+            assert not load_member_names_cached(client)
+            assert not load_member_names_cached(client)
+        assert mock_load.call_count == 2
+
+    def test_metadata_failure_falls_back_to_query(self):
+        client = MagicMock()
+        client.get_table.side_effect = RuntimeError("403")
+        with patch("pii_masker.load_member_names", return_value=MemberNames({"山田"})) as mock_load:
+            assert load_member_names_cached(client) == {"山田"}
+            load_member_names_cached(client)
+        assert mock_load.call_count == 2
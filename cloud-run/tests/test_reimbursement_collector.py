@@ -1,7 +1,8 @@
 """立替金シート収集のユニットテスト
 
 extract_nickname / list_reimbursement_sheets / get_reimbursement_sheet_data /
-collect_reimbursement_data の動作を検証。
+collect_reimbursement_data / 差分収集 (collect_reimbursement_data_incremental) /
+Drive changes フィード (list_reimbursement_changes) の動作を検証。
 """
 
 import httplib2
@@ -16,8 +17,12 @@ from sheets_collector import (
     list_reimbursement_sheets,
     get_reimbursement_sheet_data,
     collect_reimbursement_data,
+    collect_reimbursement_data_incremental,
+    list_reimbursement_changes,
+    read_reimbursement_sheet,
     run_reimbursement_collection,
     _find_input_tab_name,
+    _resolve_reimbursement_sheets,
 )
 
 
@@ -371,11 +376,11 @@ class TestRunReimbursementCollection:
 
     @patch("sheets_collector._build_drive_service")
     @patch("sheets_collector._build_sheets_service")
-    @patch("sheets_collector.collect_reimbursement_data")
+    @patch("sheets_collector.collect_reimbursement_data_incremental")
     def test_returns_correct_table_structure(self, mock_collect, mock_sheets, mock_drive):
         mock_sheets.return_value = MagicMock()
         mock_drive.return_value = MagicMock()
-        mock_collect.return_value = [
+        mock_collect.return_value = ([
             [
                 "https://docs.google.com/spreadsheets/d/test1/edit",
                 "KOU",
@@ -392,23 +397,232 @@ class TestRunReimbursementCollection:
                 "訪問",
                 "https://example.com/receipt.pdf",
             ]
-        ]
+        ], [["test1", "【KOU】", "2026-10-01T00:00:00.000Z", "0入力シート", "[]"]], "tok-2")
 
         result = run_reimbursement_collection()
 
         assert config.BQ_TABLE_REIMBURSEMENT in result
         assert len(result[config.BQ_TABLE_REIMBURSEMENT]) == 1
         assert result[config.BQ_TABLE_REIMBURSEMENT][0][1] == "KOU"
+        # 差分収集マニフェストと changes pageToken も一緒に書き込む
+        assert len(result[config.BQ_TABLE_REIMBURSEMENT_MANIFEST]) == 1
+        assert result[config.BQ_TABLE_REIMBURSEMENT_CHANGES_TOKEN] == [["tok-2"]]
+        assert mock_collect.call_args.kwargs["full"] is False
 
     @patch("sheets_collector._build_drive_service")
     @patch("sheets_collector._build_sheets_service")
-    @patch("sheets_collector.collect_reimbursement_data")
+    @patch("sheets_collector.collect_reimbursement_data_incremental")
     def test_handles_no_data_gracefully(self, mock_collect, mock_sheets, mock_drive):
         mock_sheets.return_value = MagicMock()
         mock_drive.return_value = MagicMock()
-        mock_collect.return_value = []
+        mock_collect.return_value = ([], [], None)
 
         result = run_reimbursement_collection()
 
         assert config.BQ_TABLE_REIMBURSEMENT in result
         assert len(result[config.BQ_TABLE_REIMBURSEMENT]) == 0
+        # pageToken が取れなかったときは保存済みの位置を上書きしない
+        assert config.BQ_TABLE_REIMBURSEMENT_CHANGES_TOKEN not in result
+
+
+def _grid(*rows) -> dict:
+    return {"sheets": [{"data": [{"rowData": list(rows)}]}]}
+
+
+class TestReadReimbursementSheet:
+    """タブ名ヒント付きの 1 リクエスト読み取り"""
+
+    @patch("sheets_collector.time.sleep")
+    def test_cached_tab_name_uses_single_request(self, mock_sleep):
+        mock_service = MagicMock()
+        mock_service.spreadsheets().get.reset_mock()
+        mock_service.spreadsheets().get().execute.return_value = _grid(
+            _row("", "2026年", "4月1日", "経産省PJ"),
+        )
+        mock_service.spreadsheets().get.reset_mock()
+
+        rows, tab_name = read_reimbursement_sheet(mock_service, "sid", tab_name="0入力シート")
+
+        assert len(rows) == 1
+        assert tab_name == "0入力シート"
+        assert mock_service.spreadsheets().get.call_count == 1
+        assert mock_service.spreadsheets().get.call_args.kwargs["includeGridData"] is True
+
+    @patch("sheets_collector.time.sleep")
+    def test_stale_tab_name_falls_back_to_lookup(self, mock_sleep):
+        """前回のタブ名で読めない（タブ名変更）→ タブ一覧から探し直して読む"""
+        stale = MagicMock()
+        stale.execute.side_effect = HttpError(httplib2.Response({"status": 400}), b"bad range")
+        lookup = MagicMock()
+        lookup.execute.return_value = {"sheets": [{"properties": {"title": "1入力シート"}}]}
+        grid = MagicMock()
+        grid.execute.return_value = _grid(_row("", "2026年", "4月1日"))
+        mock_service = MagicMock()
+        mock_service.spreadsheets.return_value.get.side_effect = [stale, lookup, grid]
+
+        rows, tab_name = read_reimbursement_sheet(mock_service, "sid", tab_name="0入力シート")
+
+        assert tab_name == "1入力シート"
+        assert len(rows) == 1
+
+
+class TestCollectReimbursementDataIncremental:
+    """Drive modifiedTime による立替金シートの差分収集"""
+
+    SHEETS = [
+        {"id": "same", "name": "【A】", "nickname": "A", "modified_time": "t1"},
+        {"id": "changed", "name": "【B】", "nickname": "B", "modified_time": "t2"},
+    ]
+
+    def _manifest(self):
+        return {
+            "same": {"modified_time": "t1", "tab_name": "0入力シート", "data": [["", "old-a"]]},
+            "changed": {"modified_time": "t0", "tab_name": "2入力シート", "data": [["", "old-b"]]},
+        }
+
+    @patch("sheets_collector.read_reimbursement_sheet")
+    @patch("bq_loader.read_reimbursement_manifest")
+    @patch("sheets_collector._resolve_reimbursement_sheets")
+    def test_reads_only_changed_sheets_with_cached_tab(self, mock_list, mock_manifest, mock_read):
+        mock_list.return_value = (self.SHEETS, "tok")
+        mock_manifest.return_value = self._manifest()
+        mock_read.return_value = ([["", "new-b"]], "2入力シート")
+
+        rows, manifest_rows, token = collect_reimbursement_data_incremental(
+            MagicMock(), MagicMock(),
+        )
+
+        assert token == "tok"
+        mock_read.assert_called_once()
+        assert mock_read.call_args.args[1] == "changed"
+        assert mock_read.call_args.kwargs["tab_name"] == "2入力シート"
+        assert [r[1:] for r in rows] == [["A", "", "old-a"], ["B", "", "new-b"]]
+        assert [r[:4] for r in manifest_rows] == [
+            ["same", "【A】", "t1", "0入力シート"], ["changed", "【B】", "t2", "2入力シート"],
+        ]
+
+    @patch("sheets_collector.read_reimbursement_sheet")
+    @patch("bq_loader.read_reimbursement_manifest")
+    @patch("sheets_collector._resolve_reimbursement_sheets")
+    def test_quiet_day_makes_no_sheets_calls(self, mock_list, mock_manifest, mock_read):
+        mock_list.return_value = (self.SHEETS[:1], "tok")
+        mock_manifest.return_value = self._manifest()
+
+        rows, _, _ = collect_reimbursement_data_incremental(MagicMock(), MagicMock())
+
+        mock_read.assert_not_called()
+        assert len(rows) == 1
+
+    @patch("sheets_collector.read_reimbursement_sheet")
+    @patch("bq_loader.read_reimbursement_manifest")
+    @patch("sheets_collector._resolve_reimbursement_sheets")
+    def test_unreadable_sheet_recorded_for_retry(self, mock_list, mock_manifest, mock_read):
+        """読めなかったシートはタブ名空で記録 → modifiedTime が同じでも次回読み直す"""
+        mock_list.return_value = (self.SHEETS[1:], "tok")
+        mock_manifest.return_value = {}
+        mock_read.return_value = ([], None)
+
+        rows, manifest_rows, _ = collect_reimbursement_data_incremental(
+            MagicMock(), MagicMock(), full=True,
+        )
+
+        assert rows == []
+        assert manifest_rows == [["changed", "【B】", "t2", "", "[]"]]
+
+        mock_manifest.return_value = {
+            "changed": {"name": "【B】", "modified_time": "t2", "tab_name": "", "data": []},
+        }
+        mock_read.reset_mock()
+        collect_reimbursement_data_incremental(MagicMock(), MagicMock())
+        mock_read.assert_called_once()
+
+
+def _change(file_id, name="【A】", *, parents=None, trashed=False, removed=False, mtime="t9"):
+    return {
+        "fileId": file_id,
+        "removed": removed,
+        "file": {
+            "id": file_id, "name": name, "modifiedTime": mtime, "trashed": trashed,
+            "mimeType": "application/vnd.google-apps.spreadsheet",
+            "parents": parents if parents is not None else [config.REIMBURSEMENT_FOLDER_ID],
+        },
+    }
+
+
+class TestListReimbursementChanges:
+    """Drive changes フィードから立替金フォルダ分だけを取り出す"""
+
+    def test_classifies_changes_and_returns_new_token(self):
+        drive = MagicMock()
+        drive.changes().list().execute.side_effect = [
+            {"changes": [_change("a"), _change("b", trashed=True)], "nextPageToken": "p2"},
+            {
+                "changes": [
+                    _change("c", parents=["other-folder"]),
+                    {"fileId": "d", "removed": True},
+                    _change("a", mtime="t10"),
+                ],
+                "newStartPageToken": "tok-2",
+            },
+        ]
+
+        changes, token = list_reimbursement_changes(drive, "tok-1")
+
+        assert token == "tok-2"
+        assert changes["a"] == {"id": "a", "name": "【A】", "nickname": "A", "modified_time": "t10"}
+        assert changes["b"] is None and changes["c"] is None and changes["d"] is None
+
+    @patch("sheets_collector.time.sleep")
+    def test_expired_token_returns_none(self, mock_sleep):
+        drive = MagicMock()
+        drive.changes().list().execute.side_effect = HttpError(
+            httplib2.Response({"status": 404}), b"invalid page token",
+        )
+
+        assert list_reimbursement_changes(drive, "old") is None
+
+
+class TestResolveReimbursementSheets:
+    """changes フィード / フォルダ一覧の切り替え"""
+
+    MANIFEST = {
+        "a": {"name": "【A】", "modified_time": "t1", "tab_name": "0入力シート", "data": []},
+        "b": {"name": "【B】", "modified_time": "t1", "tab_name": "0入力シート", "data": []},
+    }
+
+    @patch("sheets_collector.list_reimbursement_sheets")
+    @patch("sheets_collector.list_reimbursement_changes")
+    @patch("bq_loader.read_reimbursement_changes_token", return_value="tok-1")
+    def test_feed_applies_changes_to_manifest_list(self, _token, mock_changes, mock_list):
+        mock_changes.return_value = (
+            {"b": None, "n": {"id": "n", "name": "【N】", "nickname": "N", "modified_time": "t2"}},
+            "tok-2",
+        )
+
+        sheets, token = _resolve_reimbursement_sheets(MagicMock(), self.MANIFEST, full=False)
+
+        mock_list.assert_not_called()
+        assert token == "tok-2"
+        assert [(s["id"], s["nickname"], s["modified_time"]) for s in sheets] == [
+            ("a", "A", "t1"), ("n", "N", "t2"),
+        ]
+
+    @patch("sheets_collector.get_changes_start_page_token", return_value="tok-new")
+    @patch("sheets_collector.list_reimbursement_sheets", return_value=[])
+    @patch("sheets_collector.list_reimbursement_changes", return_value=None)
+    @patch("bq_loader.read_reimbursement_changes_token", return_value="expired")
+    def test_feed_failure_falls_back_to_listing(self, _token, _changes, mock_list, _start):
+        sheets, token = _resolve_reimbursement_sheets(MagicMock(), self.MANIFEST, full=False)
+
+        mock_list.assert_called_once()
+        assert token == "tok-new"
+
+    @patch("sheets_collector.get_changes_start_page_token", return_value="tok-new")
+    @patch("sheets_collector.list_reimbursement_sheets", return_value=[])
+    @patch("bq_loader.read_reimbursement_changes_token")
+    def test_full_or_empty_manifest_lists_folder(self, mock_token, mock_list, _start):
+        _resolve_reimbursement_sheets(MagicMock(), self.MANIFEST, full=True)
+        _resolve_reimbursement_sheets(MagicMock(), {}, full=False)
+
+        mock_token.assert_not_called()
+        assert mock_list.call_count == 2
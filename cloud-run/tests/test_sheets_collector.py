@@ -1,8 +1,13 @@
 """sheets_collector のユニットテスト
 
-_execute_with_throttle のスロットリング・リトライ・エラーハンドリングを検証。
+_execute_with_throttle のスロットリング・リトライ・エラーハンドリング、
+batchGet による報告タブ一括取得を検証。
 """
 
+import errno
+import socket
+import ssl
+
 import httplib2
 import pytest
 from unittest.mock import MagicMock, patch
@@ -11,7 +16,11 @@ from googleapiclient.errors import HttpError
 
 import config
 from sheets_collector import (
+    TokenBucket,
     _execute_with_throttle,
+    _get_report_sheets,
+    collect_all_data,
+    get_report_sheets_batch,
     get_sheet_data,
     get_url_list,
 )
@@ -104,3 +113,463 @@ class TestGetUrlList:
         result = get_url_list(mock_service)
 
         assert result == []
+
+
+URL = "https://docs.google.com/spreadsheets/d/abc123/edit"
+
+
+class TestGetReportSheetsBatch:
+    """get_report_sheets_batch のテスト"""
+
+    @patch("sheets_collector._execute_with_throttle")
+    def test_single_batch_get_for_all_tabs(self, mock_throttle):
+        """全報告タブを batchGet 1回で取得し、B列空行をフィルタすること"""
+        mock_throttle.return_value = {
+            "valueRanges": [
+                {"values": [["2026", "5/1"], [], ["", "x"], ["2026", "5/2"]]},
+                {"values": [["2026", "5"]]},
+            ]
+        }
+        mock_service = MagicMock()
+
+        result = get_report_sheets_batch(mock_service, "abc123")
+
+        assert mock_throttle.call_count == 1
+        _, kwargs = mock_service.spreadsheets().values().batchGet.call_args
+        assert kwargs["spreadsheetId"] == "abc123"
+        assert kwargs["ranges"] == [
+            f"'{cfg['report_sheet_name']}'!B{cfg['data_start_row']}:{cfg['data_end_column']}"
+            for cfg in config.SHEET_CONFIGS
+        ]
+        assert result == {
+            config.BQ_TABLE_GYOMU: [["2026", "5/1"], ["2026", "5/2"]],
+            config.BQ_TABLE_HOJO: [["2026", "5"]],
+        }
+
+    @patch("sheets_collector._get_sheet_values")
+    @patch("sheets_collector._execute_with_throttle")
+    def test_falls_back_to_per_tab_on_error(self, mock_throttle, mock_get):
+        """タブ欠落等で batchGet が失敗したらタブ単位取得にフォールバックすること"""
+        mock_throttle.side_effect = HttpError(
+            httplib2.Response({"status": 400}), b"Unable to parse range"
+        )
+        mock_get.side_effect = [[["g"]], []]
+
+        result = get_report_sheets_batch(MagicMock(), "abc123")
+
+        assert mock_get.call_count == len(config.SHEET_CONFIGS)
+        assert result == {config.BQ_TABLE_GYOMU: [["g"]], config.BQ_TABLE_HOJO: []}
+
+
+    @patch("sheets_collector._execute_with_throttle")
+    def test_missing_tab_in_fallback_is_complete(self, mock_throttle):
+        """タブが 1 つ無いだけのシートはフォールバック取得でも完全取得（manifest 対象）"""
+        missing = HttpError(httplib2.Response({"status": 400}), b"Unable to parse range")
+        mock_throttle.side_effect = [missing, {"values": [["g"]]}, missing]
+
+        data, complete = _get_report_sheets(MagicMock(), "abc123", batch=True, limiter=None)
+
+        assert complete is True
+        assert data == {config.BQ_TABLE_GYOMU: [["g"]], config.BQ_TABLE_HOJO: []}
+
+    @pytest.mark.parametrize("error", [
+        HttpError(httplib2.Response({"status": 403}), b"Forbidden"),
+        ConnectionError("reset"),
+    ])
+    @patch("sheets_collector._execute_with_throttle")
+    def test_fallback_error_is_incomplete(self, mock_throttle, error):
+        """欠落以外の HTTP エラー・通信エラーのあったシートは不完全（manifest 対象外）"""
+        missing = HttpError(httplib2.Response({"status": 400}), b"Unable to parse range")
+        mock_throttle.side_effect = [missing, {"values": [["g"]]}, error]
+
+        data, complete = _get_report_sheets(MagicMock(), "abc123", batch=True, limiter=None)
+
+        assert complete is False
+        assert data == {config.BQ_TABLE_GYOMU: [["g"]], config.BQ_TABLE_HOJO: []}
+
+
+class TestCollectAllData:
+    """collect_all_data の batch / 旧経路の同値性テスト"""
+
+    @patch("sheets_collector.get_url_list", return_value=[URL])
+    @patch("sheets_collector._get_sheet_values")
+    @patch("sheets_collector._execute_with_throttle")
+    def test_batch_and_sequential_produce_same_rows(
+        self, mock_throttle, mock_get, mock_urls
+    ):
+        gyomu = [["2026", "5/1", "月"]]
+        hojo = [["2026", "5", "10"]]
+        mock_throttle.return_value = {
+            "valueRanges": [{"values": gyomu}, {"values": hojo}]
+        }
+        mock_get.side_effect = [gyomu, hojo]
+
+        batched = collect_all_data(MagicMock(), batch=True, workers=1)
+        sequential = collect_all_data(MagicMock(), batch=False, workers=1)
+
+        assert batched == sequential
+        assert batched[config.BQ_TABLE_GYOMU] == [[URL, "2026", "5/1", "月"]]
+        assert batched[config.BQ_TABLE_HOJO] == [[URL, "2026", "5", "10"]]
+
+    @patch("sheets_collector.get_url_list")
+    @patch("sheets_collector._get_report_sheets")
+    def test_parallel_preserves_url_order(self, mock_get_sheets, mock_urls):
+        """ワーカープール経由でも行順が管理表の URL 順（逐次と同一）であること"""
+        urls = [f"https://docs.google.com/spreadsheets/d/id{i}/edit" for i in range(8)]
+        mock_urls.return_value = urls
+
+        def side_effect(service, spreadsheet_id, *, batch, limiter):
+            return {
+                config.BQ_TABLE_GYOMU: [[spreadsheet_id, "g"]],
+                config.BQ_TABLE_HOJO: [[spreadsheet_id, "h"]],
+            }, True
+
+        mock_get_sheets.side_effect = side_effect
+
+        sequential = collect_all_data(MagicMock(), workers=1)
+        parallel = collect_all_data(
+            MagicMock(), workers=4, service_factory=MagicMock
+        )
+
+        assert parallel == sequential
+        assert [r[1] for r in parallel[config.BQ_TABLE_GYOMU]] == [
+            f"id{i}" for i in range(8)
+        ]
+        # 並列時は共有リミッタが渡される
+        assert all(
+            c.kwargs["limiter"] is not None for c in mock_get_sheets.call_args_list[-8:]
+        )
+
+
+class TestCollectAllDataIncremental:
+    """Drive modifiedTime による差分収集のテスト"""
+
+    URLS = [
+        "https://docs.google.com/spreadsheets/d/same/edit",
+        "https://docs.google.com/spreadsheets/d/changed/edit",
+    ]
+
+    def _manifest(self):
+        return {
+            self.URLS[0]: {
+                "modified_time": "2026-10-01T00:00:00.000Z",
+                "data": {config.BQ_TABLE_GYOMU: [["old-same"]], config.BQ_TABLE_HOJO: []},
+            },
+            self.URLS[1]: {
+                "modified_time": "2026-10-01T00:00:00.000Z",
+                "data": {config.BQ_TABLE_GYOMU: [["old-changed"]], config.BQ_TABLE_HOJO: []},
+            },
+        }
+
+    def _fetch(self, service, spreadsheet_id, *, batch, limiter):
+        return {
+            config.BQ_TABLE_GYOMU: [[f"new-{spreadsheet_id}"]],
+            config.BQ_TABLE_HOJO: [],
+        }, True
+
+    @patch("bq_loader.read_sheet_manifest")
+    @patch("sheets_collector.get_modified_times")
+    @patch("sheets_collector._get_report_sheets")
+    @patch("sheets_collector.get_url_list")
+    def test_skips_unchanged_sheets(self, mock_urls, mock_get, mock_mtime, mock_manifest):
+        from sheets_collector import collect_all_data_incremental
+
+        mock_urls.return_value = self.URLS
+        mock_manifest.return_value = self._manifest()
+        mock_mtime.return_value = {
+            "same": "2026-10-01T00:00:00.000Z",
+            "changed": "2026-10-16T09:00:00.000Z",
+        }
+        mock_get.side_effect = self._fetch
+
+        all_data, manifest_rows = collect_all_data_incremental(MagicMock(), MagicMock())
+
+        # 変更のあったシートだけ取得
+        assert [c.args[1] for c in mock_get.call_args_list] == ["changed"]
+        # 未変更シートは前回行を再利用し、URL順は維持
+        assert all_data[config.BQ_TABLE_GYOMU] == [
+            [self.URLS[0], "old-same"],
+            [self.URLS[1], "new-changed"],
+        ]
+        assert [r[2] for r in manifest_rows] == [
+            "2026-10-01T00:00:00.000Z",
+            "2026-10-16T09:00:00.000Z",
+        ]
+
+    @patch("bq_loader.read_sheet_manifest")
+    @patch("sheets_collector.get_modified_times")
+    @patch("sheets_collector._get_report_sheets")
+    @patch("sheets_collector.get_url_list")
+    def test_full_refetches_everything(self, mock_urls, mock_get, mock_mtime, mock_manifest):
+        from sheets_collector import collect_all_data_incremental
+
+        mock_urls.return_value = self.URLS
+        mock_manifest.return_value = self._manifest()
+        mock_mtime.return_value = {
+            "same": "2026-10-01T00:00:00.000Z",
+            "changed": "2026-10-01T00:00:00.000Z",
+        }
+        mock_get.side_effect = self._fetch
+
+        all_data, _ = collect_all_data_incremental(MagicMock(), MagicMock(), full=True)
+
+        assert mock_get.call_count == 2
+        mock_manifest.assert_not_called()
+        assert all_data[config.BQ_TABLE_GYOMU][0] == [self.URLS[0], "new-same"]
+
+    @patch("bq_loader.read_sheet_manifest", return_value={})
+    @patch("sheets_collector.get_modified_times")
+    @patch("sheets_collector._get_report_sheets")
+    @patch("sheets_collector.get_url_list")
+    def test_incomplete_fetch_not_recorded(self, mock_urls, mock_get, mock_mtime, _):
+        """取得エラーのあったシートは manifest に記録しない（次回も再取得させる）"""
+        from sheets_collector import collect_all_data_incremental
+
+        mock_urls.return_value = self.URLS[:1]
+        mock_mtime.return_value = {"same": "2026-10-01T00:00:00.000Z"}
+        mock_get.return_value = ({config.BQ_TABLE_GYOMU: [], config.BQ_TABLE_HOJO: []}, False)
+
+        _, manifest_rows = collect_all_data_incremental(MagicMock(), MagicMock())
+
+        assert manifest_rows == []
+
+    @patch("bq_loader.read_sheet_checkpoint")
+    @patch("bq_loader.append_sheet_checkpoint")
+    @patch("bq_loader.read_sheet_manifest")
+    @patch("sheets_collector.get_modified_times")
+    @patch("sheets_collector._get_report_sheets")
+    @patch("sheets_collector.get_url_list")
+    def test_resumes_from_checkpoint_even_when_full(
+        self, mock_urls, mock_get, mock_mtime, mock_manifest, mock_append, mock_ckpt,
+    ):
+        """中断した前回収集のチェックポイント (done / modifiedTime 一致) は再取得しない"""
+        from sheets_collector import ReportCheckpoint, collect_all_data_incremental
+
+        mock_urls.return_value = self.URLS
+        mock_mtime.return_value = {
+            "same": "2026-10-16T09:00:00.000Z",
+            "changed": "2026-10-16T09:00:00.000Z",
+        }
+        mock_ckpt.return_value = {
+            self.URLS[0]: {
+                "modified_time": "2026-10-16T09:00:00.000Z", "status": "done",
+                "data": {config.BQ_TABLE_GYOMU: [["ckpt-same"]], config.BQ_TABLE_HOJO: []},
+            },
+            self.URLS[1]: {
+                "modified_time": "2026-10-16T09:00:00.000Z", "status": "failed",
+                "data": {config.BQ_TABLE_GYOMU: [], config.BQ_TABLE_HOJO: []},
+            },
+        }
+        mock_get.side_effect = self._fetch
+
+        all_data, manifest_rows = collect_all_data_incremental(
+            MagicMock(), MagicMock(), full=True, checkpoint=ReportCheckpoint(),
+        )
+
+        mock_ckpt.assert_called_once_with(config.REPORT_CHECKPOINT_MAX_AGE_HOURS)
+        # failed 行は再利用せず再取得、done 行は再利用
+        assert [c.args[1] for c in mock_get.call_args_list] == ["changed"]
+        assert all_data[config.BQ_TABLE_GYOMU] == [
+            [self.URLS[0], "ckpt-same"],
+            [self.URLS[1], "new-changed"],
+        ]
+        assert len(manifest_rows) == 2
+        # 今回取得したシートだけがチェックポイントに追記される
+        (appended,), _ = mock_append.call_args
+        assert [(r[0], r[4]) for r in appended] == [(self.URLS[1], "done")]
+
+    @patch("bq_loader.read_sheet_checkpoint")
+    @patch("bq_loader.read_sheet_manifest")
+    @patch("sheets_collector.get_modified_times")
+    @patch("sheets_collector._get_report_sheets")
+    @patch("sheets_collector.get_url_list")
+    def test_retry_refetches_only_failed_sheets(
+        self, mock_urls, mock_get, mock_mtime, mock_manifest, mock_ckpt,
+    ):
+        """retry_urls 指定時は失敗シートだけ取得し、他は modifiedTime を見ずに manifest 再利用"""
+        from sheets_collector import collect_all_data_incremental
+
+        mock_urls.return_value = self.URLS
+        mock_manifest.return_value = self._manifest()
+        mock_mtime.return_value = {
+            "same": "2026-10-16T09:00:00.000Z",  # 変更されていても retry では再取得しない
+            "changed": "2026-10-16T09:00:00.000Z",
+        }
+        mock_get.side_effect = self._fetch
+
+        all_data, manifest_rows = collect_all_data_incremental(
+            MagicMock(), MagicMock(), retry_urls={self.URLS[1]},
+        )
+
+        mock_ckpt.assert_not_called()
+        assert [c.args[1] for c in mock_get.call_args_list] == ["changed"]
+        assert all_data[config.BQ_TABLE_GYOMU] == [
+            [self.URLS[0], "old-same"],
+            [self.URLS[1], "new-changed"],
+        ]
+        # 再利用分は記録済みの modifiedTime を残す（次回の差分収集で変更を検出させる）
+        assert [r[2] for r in manifest_rows] == [
+            "2026-10-01T00:00:00.000Z",
+            "2026-10-16T09:00:00.000Z",
+        ]
+
+
+class TestReportCheckpoint:
+    @patch("bq_loader.append_sheet_checkpoint")
+    def test_flushes_every_n_sheets_and_keeps_failed(self, mock_append):
+        from sheets_collector import ReportCheckpoint
+
+        ckpt = ReportCheckpoint(flush_every=2)
+        ckpt.record("u1", "s1", "t1", {"gyomu_reports": [["a"]]}, True)
+        mock_append.assert_not_called()
+        ckpt.record("u2", "s2", None, {"gyomu_reports": []}, False)
+        assert mock_append.call_count == 1
+        (rows,), _ = mock_append.call_args
+        assert [r[0] for r in rows] == ["u1", "u2"]
+        assert rows[1][2:] == ["", '{"gyomu_reports": []}', "failed"]
+        assert [r[0] for r in ckpt.failed_rows] == ["u2"]
+
+        ckpt.flush()  # 未追記分なし
+        assert mock_append.call_count == 1
+
+    @patch("bq_loader.append_sheet_checkpoint", side_effect=RuntimeError("bq down"))
+    def test_append_failure_is_swallowed(self, _append):
+        from sheets_collector import ReportCheckpoint
+
+        ckpt = ReportCheckpoint(flush_every=1)
+        ckpt.record("u1", "s1", "t1", {}, True)  # 例外にならない
+
+
+class TestRunFailedSheetRetry:
+    @patch("sheets_collector._build_drive_service")
+    @patch("sheets_collector._build_sheets_service")
+    @patch("sheets_collector.collect_all_data_incremental")
+    @patch("bq_loader.read_sheet_checkpoint")
+    def test_retries_failed_urls_only(self, mock_ckpt, mock_collect, _sheets, _drive):
+        from sheets_collector import run_failed_sheet_retry
+
+        mock_ckpt.return_value = {
+            "u1": {"status": "done", "modified_time": "t", "data": {}},
+            "u2": {"status": "failed", "modified_time": "t", "data": {}},
+        }
+        mock_collect.return_value = ({config.BQ_TABLE_GYOMU: []}, [["u2"]])
+
+        all_data = run_failed_sheet_retry()
+
+        assert mock_collect.call_args.kwargs["retry_urls"] == {"u2"}
+        assert all_data[config.BQ_TABLE_SHEET_MANIFEST] == [["u2"]]
+        assert all_data[config.BQ_TABLE_SHEET_CHECKPOINT] == []
+        assert config.BQ_TABLE_MEMBERS not in all_data
+
+    @patch("sheets_collector.collect_all_data_incremental")
+    @patch("bq_loader.read_sheet_checkpoint", return_value={})
+    def test_noop_without_failed_sheets(self, _ckpt, mock_collect):
+        from sheets_collector import run_failed_sheet_retry
+
+        assert run_failed_sheet_retry() is None
+        mock_collect.assert_not_called()
+
+
+class TestTokenBucket:
+    """TokenBucket（共有レートリミッタ）のテスト"""
+
+    @patch("sheets_collector.time.sleep")
+    def test_burst_then_wait(self, mock_sleep):
+        """burst 分は待たずに取得でき、超過分は補充待ちの sleep が入ること"""
+        bucket = TokenBucket(60, 2)
+        bucket.acquire()
+        bucket.acquire()
+        mock_sleep.assert_not_called()
+
+        with patch("sheets_collector.time.monotonic") as mock_clock:
+            mock_clock.return_value = bucket._updated
+            mock_sleep.side_effect = lambda sec: setattr(
+                mock_clock, "return_value", mock_clock.return_value + sec
+            )
+            bucket.acquire()
+        assert mock_sleep.call_count == 1
+        assert mock_sleep.call_args[0][0] > 0
+
+    def test_penalize_shrinks_and_reward_recovers(self):
+        bucket = TokenBucket(60, 5, min_rate_per_min=10)
+        bucket.penalize()
+        assert bucket.rate == pytest.approx(0.5)
+        for _ in range(5):
+            bucket.penalize()
+        assert bucket.rate == pytest.approx(10 / 60)  # 下限で止まる
+        for _ in range(100):
+            bucket.reward()
+        assert bucket.rate == pytest.approx(1.0)  # base まで回復して頭打ち
+
+    def test_reward_reads_rate_under_lock(self):
+        """reward の rate 判定も penalize と同じロック内で行うこと"""
+        bucket = TokenBucket(60, 5)
+        bucket._lock = MagicMock()
+        # ロック待ちの間に別ワーカーが penalize した状態を再現
+        bucket._lock.__enter__.side_effect = lambda: setattr(bucket, "rate", 0.5)
+
+        bucket.reward()
+
+        bucket._lock.__enter__.assert_called_once()
+        assert bucket.rate == pytest.approx(0.5 + 1.0 / 20)
+
+
+class TestExecuteWithLimiter:
+    """_execute_with_throttle の limiter 経路"""
+
+    @patch("sheets_collector.time.sleep")
+    def test_429_penalizes_shared_bucket_and_retries(self, mock_sleep):
+        limiter = MagicMock()
+        mock_request = MagicMock()
+        mock_request.execute.side_effect = [
+            HttpError(httplib2.Response({"status": 429}), b"Rate Limit Exceeded"),
+            {"values": []},
+        ]
+
+        result = _execute_with_throttle(mock_request, context="t", limiter=limiter)
+
+        assert result == {"values": []}
+        assert limiter.acquire.call_count == 2
+        limiter.penalize.assert_called_once()
+        limiter.reward.assert_called_once()
+        # 固定 sleep は入らず、429 後の backoff (2**0 秒) のみ
+        mock_sleep.assert_called_once_with(1)
+
+    @patch("sheets_collector.time.sleep")
+    def test_permanent_error_not_retried(self, mock_sleep):
+        limiter = MagicMock()
+        mock_request = MagicMock()
+        mock_request.execute.side_effect = HttpError(
+            httplib2.Response({"status": 403}), b"Forbidden"
+        )
+
+        with pytest.raises(HttpError):
+            _execute_with_throttle(mock_request, limiter=limiter)
+
+        assert mock_request.execute.call_count == 1
+        limiter.penalize.assert_not_called()
+
+    @pytest.mark.parametrize("error", [
+        socket.timeout("timed out"),
+        ssl.SSLError("bad record mac"),
+        httplib2.ServerNotFoundError("dns"),
+        OSError(errno.ECONNRESET, "reset"),
+    ])
+    @patch("sheets_collector.time.sleep")
+    def test_transport_errors_retried_like_sequential_path(self, mock_sleep, error):
+        limiter = MagicMock()
+        mock_request = MagicMock()
+        mock_request.execute.side_effect = [error, {"values": []}]
+
+        assert _execute_with_throttle(mock_request, limiter=limiter) == {"values": []}
+        assert mock_request.execute.call_count == 2
+
+    @patch("sheets_collector.time.sleep")
+    def test_non_transient_os_error_not_retried(self, mock_sleep):
+        mock_request = MagicMock()
+        mock_request.execute.side_effect = OSError(errno.ENOENT, "no such file")
+
+        with pytest.raises(OSError):
+            _execute_with_throttle(mock_request, limiter=MagicMock())
+
+        assert mock_request.execute.call_count == 1
@@ -135,6 +135,21 @@ class TestCreateSnapshots:
 
         assert result == {t: -1 for t in config.BQ_SNAPSHOT_TABLES}
 
+    @patch("bq_loader._build_bq_client")
+    def test_all_clones_submitted_before_waiting(self, mock_build_client):
+        """全テーブルの CLONE を投入してから完了待ちする（1本ずつ直列に待たない）"""
+        mock_client = MagicMock()
+        mock_build_client.return_value = mock_client
+        events = []
+        mock_client.query.side_effect = lambda q: events.append("submit") or MagicMock(
+            result=lambda: events.append("wait")
+        )
+
+        bq_loader.create_snapshots("20260529")
+
+        n = len(config.BQ_SNAPSHOT_TABLES)
+        assert events == ["submit"] * n + ["wait"] * n
+
 
 class TestStep8Integration:
     """main の Step8 統合（バッチ POST /）"""
@@ -156,6 +171,7 @@ class TestStep8Integration:
         mock_bq.config.BQ_TABLE_MEMBERS = "members"
         mock_bq.config.BQ_TABLE_GROUPS_MASTER = "groups_master"
         mock_bq.config.BQ_TABLE_MEMBER_MASTER = "member_master"
+        mock_bq.freeze_closed_compensation.return_value = []
         # Step 5: 対象グループなしで簡潔に通す
         mock_bq.read_group_based_users.return_value = {}
         # Step 6
@@ -188,6 +204,7 @@ class TestStep8Integration:
         mock_bq.config.BQ_TABLE_MEMBERS = "members"
         mock_bq.config.BQ_TABLE_GROUPS_MASTER = "groups_master"
         mock_bq.config.BQ_TABLE_MEMBER_MASTER = "member_master"
+        mock_bq.freeze_closed_compensation.return_value = []
         mock_bq.read_group_based_users.return_value = {}
         mock_sheets.run_reimbursement_collection.return_value = {
             "reimbursement_items": [["r"]]
@@ -204,15 +221,19 @@ class TestStep8Integration:
 
     @patch("main.bq_loader")
     @patch("main.sheets_collector")
-    def test_snapshot_runs_before_collection(self, mock_sheets, mock_bq, client):
-        """snapshot(Step0)はデータ収集(Step1)より前に実行される=更新前バックアップ"""
+    def test_snapshot_runs_before_dashboard_users_sync(self, mock_sheets, mock_bq, client):
+        """snapshot(Step0)は dashboard_users 破壊的同期(Step5)より前に実行される=更新前バックアップ
+
+        収集系ステップ (Step1-4/6/7) は snapshot 対象テーブルに書かないため並列実行してよい。
+        """
         call_order = []
         mock_bq.create_snapshots.side_effect = (
             lambda d: call_order.append("snapshot") or {"dashboard_users": 1}
         )
-        mock_sheets.run_collection.side_effect = (
-            lambda: call_order.append("collection") or {"gyomu_reports": [["r"]]}
+        mock_bq.read_group_based_users.side_effect = (
+            lambda: call_order.append("dashboard_users_sync") or {}
         )
+        mock_sheets.run_collection.return_value = {"gyomu_reports": [["r"]]}
         mock_bq.load_all.return_value = {"gyomu_reports": 1}
         mock_sheets.update_member_groups_from_bq.return_value = (
             [["m1"]],
@@ -222,7 +243,7 @@ class TestStep8Integration:
         mock_bq.config.BQ_TABLE_MEMBERS = "members"
         mock_bq.config.BQ_TABLE_GROUPS_MASTER = "groups_master"
         mock_bq.config.BQ_TABLE_MEMBER_MASTER = "member_master"
-        mock_bq.read_group_based_users.return_value = {}
+        mock_bq.freeze_closed_compensation.return_value = []
         mock_sheets.run_reimbursement_collection.return_value = {
             "reimbursement_items": [["r"]]
         }
@@ -232,9 +253,43 @@ class TestStep8Integration:
         response = client.post("/")
 
         assert response.status_code == 200
-        # snapshot が最初に実行され、データ収集より前であること
-        assert call_order[0] == "snapshot"
-        assert call_order.index("snapshot") < call_order.index("collection")
+        assert call_order == ["snapshot", "dashboard_users_sync"]
+        payload = response.get_json()
+        assert payload["steps"].keys() == {
+            "snapshot", "collect", "groups", "dashboard_users",
+            "reimbursement", "member_master", "compensation",
+        }
+        assert payload["critical_path"][-1] in payload["steps"]
+        assert payload["critical_path_seconds"] <= payload["elapsed_seconds"] + 0.1
+
+
+class TestStep8CompensationIntegration:
+    """main の報酬スナップショット凍結ステップ（バッチ POST /）"""
+
+    @patch("main.bq_loader")
+    @patch("main.sheets_collector")
+    def test_freeze_failure_does_not_fail_batch(self, mock_sheets, mock_bq, client):
+        mock_sheets.run_collection.return_value = {"gyomu_reports": [["r1"]]}
+        mock_bq.load_all.return_value = {"gyomu_reports": 1}
+        mock_sheets.update_member_groups_from_bq.return_value = (
+            [["m1"]], [["g@x.com", "G"]],
+        )
+        mock_bq.load_to_bigquery.return_value = 1
+        mock_bq.config.BQ_TABLE_MEMBERS = "members"
+        mock_bq.config.BQ_TABLE_GROUPS_MASTER = "groups_master"
+        mock_bq.config.BQ_TABLE_MEMBER_MASTER = "member_master"
+        mock_bq.read_group_based_users.return_value = {}
+        mock_bq.create_snapshots.return_value = {"dashboard_users": 1}
+        mock_sheets._build_sheets_service.return_value = MagicMock()
+        mock_bq.freeze_closed_compensation.side_effect = RuntimeError("freeze down")
+
+        response = client.post("/")
+
+        assert response.status_code == 200
+        payload = response.get_json()
+        assert payload["status"] == "success"
+        assert config.BQ_TABLE_MONTHLY_COMPENSATION_CLOSED not in payload["tables"]
+        mock_bq.freeze_closed_compensation.assert_called_once()
 
 
 class TestStep5FailSafe:
@@ -252,6 +307,7 @@ class TestStep5FailSafe:
         mock_bq.config.BQ_TABLE_MEMBERS = "members"
         mock_bq.config.BQ_TABLE_GROUPS_MASTER = "groups_master"
         mock_bq.config.BQ_TABLE_MEMBER_MASTER = "member_master"
+        mock_bq.freeze_closed_compensation.return_value = []
         mock_sheets.run_reimbursement_collection.return_value = {
             "reimbursement_items": [["r"]]
         }
@@ -0,0 +1,87 @@
+"""step_graph (毎朝バッチのステップ依存グラフ実行) のユニットテスト"""
+
+import threading
+import time
+
+import pytest
+
+import step_graph
+from step_graph import Step
+
+
+class TestRunSteps:
+    def test_independent_steps_run_concurrently(self):
+        """依存の無いステップは同時に走る（Barrier が揃わなければ timeout で失敗）"""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def _wait(_deps):
+            barrier.wait()
+            return "ok"
+
+        outputs, _ = step_graph.run_steps(
+            [Step("a", _wait), Step("b", _wait), Step("c", _wait)], max_workers=3,
+        )
+        assert outputs == {"a": "ok", "b": "ok", "c": "ok"}
+
+    def test_dependent_step_receives_dependency_outputs(self):
+        order = []
+
+        def _first(_deps):
+            time.sleep(0.02)
+            order.append("first")
+            return 1
+
+        def _second(deps):
+            order.append("second")
+            return deps["first"] + 1
+
+        outputs, _ = step_graph.run_steps(
+            [Step("first", _first), Step("second", _second, after=("first",))],
+            max_workers=2,
+        )
+        assert order == ["first", "second"]
+        assert outputs["second"] == 2
+
+    def test_failure_skips_dependents_and_reraises_after_others(self):
+        """失敗ステップの依存先は実行せず、独立ステップは完走してから例外を再送出"""
+        ran = []
+
+        def _boom(_deps):
+            raise RuntimeError("collect boom")
+
+        def _record(name):
+            def _run(_deps):
+                time.sleep(0.02)
+                ran.append(name)
+            return _run
+
+        with pytest.raises(RuntimeError, match="collect boom"):
+            step_graph.run_steps([
+                Step("collect", _boom),
+                Step("groups", _record("groups"), after=("collect",)),
+                Step("after_groups", _record("after_groups"), after=("groups",)),
+                Step("reimbursement", _record("reimbursement")),
+            ], max_workers=2)
+        assert ran == ["reimbursement"]
+
+    def test_critical_path_is_longest_dependency_chain(self):
+        def _sleep(sec):
+            def _run(_deps):
+                time.sleep(sec)
+            return _run
+
+        _, report = step_graph.run_steps([
+            Step("short", _sleep(0.05)),
+            Step("long_a", _sleep(0.1)),
+            Step("long_b", _sleep(0.1), after=("long_a",)),
+        ], max_workers=3)
+        assert report["critical_path"] == ["long_a", "long_b"]
+        assert report["critical_path_sec"] == pytest.approx(0.2, abs=0.1)
+        assert report["steps"]["long_b"]["started_sec"] >= report["steps"]["long_a"]["elapsed_sec"]
+
+    def test_rejects_dependency_defined_later(self):
+        with pytest.raises(ValueError):
+            step_graph.run_steps(
+                [Step("b", lambda d: None, after=("a",)), Step("a", lambda d: None)],
+                max_workers=1,
+            )
@@ -1,8 +1,8 @@
 """sync_dashboard_users_from_groups のユニットテスト
 
 グループベースのdashboard_users同期ロジックを検証。
-- 追加: グループに新メンバー → INSERT
-- 削除: グループから脱退 → DELETE
+- 追加: グループに新メンバー → MERGE の INSERT 節
+- 削除: グループから脱退 → MERGE の DELETE 節
 - 手動登録ユーザーの不可侵
 - 既存ユーザーのスキップ
 """
@@ -29,6 +29,15 @@ class FakeQueryResult:
         return self
 
 
+class FakeDmlStats:
+    """QueryJob.dml_stats のモック"""
+
+    def __init__(self, inserted=0, deleted=0):
+        self.inserted_row_count = inserted
+        self.deleted_row_count = deleted
+        self.updated_row_count = 0
+
+
 class FakeRow:
     """BQ行のモック"""
 
@@ -97,6 +106,20 @@ class TestReadGroupBasedUsers:
         assert result == {}
 
 
+def _merge_calls(client):
+    """client.query に渡された MERGE クエリ呼出のみ抽出"""
+    return [c for c in client.query.call_args_list if c.args and "MERGE" in c.args[0]]
+
+
+def _members_param(merge_call):
+    """MERGE 呼出の @members パラメータを [(email, source_group, role), ...] で返す"""
+    params = {p.name: p for p in merge_call.kwargs["job_config"].query_parameters}
+    return [
+        tuple(v.struct_values[k] for k in ("email", "source_group", "role"))
+        for v in params["members"].values
+    ]
+
+
 class TestSyncDashboardUsersFromGroups:
     """sync_dashboard_users_from_groups のテスト"""
 
@@ -111,14 +134,8 @@ class TestSyncDashboardUsersFromGroups:
         mock_bq_client.query().to_dataframe.return_value = pd.DataFrame(
             columns=["email", "role", "source_group"]
         )
-
-        # 手動登録チェック: 該当なし、MERGE: 1行追加
-        query_results = [
-            FakeQueryResult(rows=[FakeRow(cnt=0)]),  # check: not manually registered
-            FakeQueryResult(num_dml_affected_rows=1),  # merge: inserted
-        ]
-        result_iter = iter(query_results)
-        mock_bq_client.query().result.side_effect = lambda: next(result_iter)
+        # MERGE: 1行追加
+        mock_bq_client.query().dml_stats = FakeDmlStats(inserted=1)
 
         result = sync_dashboard_users_from_groups({
             "group-a@tadakayo.jp": ["alice@tadakayo.jp"],
@@ -126,6 +143,11 @@ class TestSyncDashboardUsersFromGroups:
 
         assert result["added"] == 1
         assert result["removed"] == 0
+        merge_calls = _merge_calls(mock_bq_client)
+        assert len(merge_calls) == 1
+        assert _members_param(merge_calls[0]) == [
+            ("alice@tadakayo.jp", "group-a@tadakayo.jp", "viewer"),
+        ]
 
     def test_removes_departed_members(self, mock_bq_client, mock_sync_helpers):
         """グループから脱退したメンバーがDELETEされること"""
@@ -138,9 +160,7 @@ class TestSyncDashboardUsersFromGroups:
         mock_bq_client.query().to_dataframe.return_value = pd.DataFrame([
             {"email": "alice@tadakayo.jp", "role": "viewer", "source_group": "group-a@tadakayo.jp"},
         ])
-
-        # DELETE result
-        mock_bq_client.query().result.return_value = FakeQueryResult()
+        mock_bq_client.query().dml_stats = FakeDmlStats(deleted=1)
 
         # 最新グループメンバー: 空（aliceが脱退）
         result = sync_dashboard_users_from_groups({
@@ -149,6 +169,21 @@ class TestSyncDashboardUsersFromGroups:
 
         assert result["removed"] == 1
         assert result["added"] == 0
+        # 削除は同期対象グループに限定される
+        merge_call = _merge_calls(mock_bq_client)[0]
+        assert "WHEN NOT MATCHED BY SOURCE AND T.source_group IN UNNEST(@groups)" in (
+            merge_call.args[0]
+        )
+        # 全員脱退時も @members は型付きの空配列として渡る
+        params = {
+            p["name"]: p
+            for p in merge_call.kwargs["job_config"].to_api_repr()["query"]["queryParameters"]
+        }
+        assert params["members"]["parameterType"]["arrayType"]["type"] == "STRUCT"
+        assert params["members"]["parameterValue"]["arrayValues"] == []
+        assert params["groups"]["parameterValue"]["arrayValues"] == [
+            {"value": "group-a@tadakayo.jp"}
+        ]
 
     def test_skips_manually_registered_users(self, mock_bq_client, mock_sync_helpers):
         """手動登録ユーザーはグループ追加時にスキップされること"""
@@ -161,11 +196,8 @@ class TestSyncDashboardUsersFromGroups:
         mock_bq_client.query().to_dataframe.return_value = pd.DataFrame(
             columns=["email", "role", "source_group"]
         )
-
-        # 手動登録チェック: alice は手動登録済み (cnt=1)
-        mock_bq_client.query().result.side_effect = [
-            FakeQueryResult(rows=[FakeRow(cnt=1)]),  # manually registered → skip
-        ]
+        # alice は手動登録済み → MERGE の INSERT 条件で除外され 0 行
+        mock_bq_client.query().dml_stats = FakeDmlStats()
 
         result = sync_dashboard_users_from_groups({
             "group-a@tadakayo.jp": ["alice@tadakayo.jp"],
@@ -173,9 +205,12 @@ class TestSyncDashboardUsersFromGroups:
 
         assert result["added"] == 0
         assert result["removed"] == 0
+        sql = _merge_calls(mock_bq_client)[0].args[0]
+        assert "u.source_group IS NULL" in sql
+        assert "WHEN NOT MATCHED BY TARGET AND NOT S.is_manual THEN" in sql
 
     def test_no_changes_when_in_sync(self, mock_bq_client, mock_sync_helpers):
-        """既にメンバーが同期済みの場合変更なし"""
+        """既にメンバーが同期済みの場合変更なし（DML も発行しない）"""
         import pandas as pd
         from bq_loader import sync_dashboard_users_from_groups
 
@@ -193,6 +228,7 @@ class TestSyncDashboardUsersFromGroups:
 
         assert result["added"] == 0
         assert result["removed"] == 0
+        assert _merge_calls(mock_bq_client) == []
 
     def test_empty_group_members_map(self, mock_bq_client, mock_sync_helpers):
         """group_members_mapが空の場合、既存グループユーザーが全削除されること"""
@@ -205,8 +241,7 @@ class TestSyncDashboardUsersFromGroups:
         mock_bq_client.query().to_dataframe.return_value = pd.DataFrame([
             {"email": "alice@tadakayo.jp", "role": "viewer", "source_group": "group-a@tadakayo.jp"},
         ])
-
-        mock_bq_client.query().result.return_value = FakeQueryResult()
+        mock_bq_client.query().dml_stats = FakeDmlStats(deleted=1)
 
         # group_members_mapに該当グループがない → aliceは削除対象
         result = sync_dashboard_users_from_groups({})
@@ -224,26 +259,49 @@ class TestSyncDashboardUsersFromGroups:
         mock_bq_client.query().to_dataframe.return_value = pd.DataFrame([
             {"email": "alice@tadakayo.jp", "role": "checker", "source_group": "group-a@tadakayo.jp"},
         ])
-
-        # bobを追加: 手動登録なし → MERGE
-        query_results = [
-            FakeQueryResult(rows=[FakeRow(cnt=0)]),  # not manually registered
-            FakeQueryResult(num_dml_affected_rows=1),  # inserted
-        ]
-        result_iter = iter(query_results)
-        mock_bq_client.query().result.side_effect = lambda: next(result_iter)
+        mock_bq_client.query().dml_stats = FakeDmlStats(inserted=1)
 
         result = sync_dashboard_users_from_groups({
             "group-a@tadakayo.jp": ["alice@tadakayo.jp", "bob@tadakayo.jp"],
         })
 
         assert result["added"] == 1
+        # MERGE のメンバーパラメータにグループの既存ロール checker が渡されること
+        assert _members_param(_merge_calls(mock_bq_client)[0]) == [
+            ("alice@tadakayo.jp", "group-a@tadakayo.jp", "checker"),
+            ("bob@tadakayo.jp", "group-a@tadakayo.jp", "checker"),
+        ]
+
+    def test_all_groups_synced_in_single_merge(self, mock_bq_client, mock_sync_helpers):
+        """複数グループ・複数ユーザーの追加/削除も MERGE 1本で反映されること"""
+        import pandas as pd
+        from bq_loader import sync_dashboard_users_from_groups
 
-        # MERGEクエリに渡されたロールを検証
-        query_calls = mock_bq_client.query.call_args_list
-        # MERGEクエリのパラメータにcheckerが含まれていること
-        merge_calls = [c for c in query_calls if "MERGE" in str(c)]
-        assert len(merge_calls) > 0
+        mock_sync_helpers.return_value = {"group-a@tadakayo.jp", "group-b@tadakayo.jp"}
+        mock_bq_client.query().to_dataframe.return_value = pd.DataFrame([
+            {"email": "alice@tadakayo.jp", "role": "viewer", "source_group": "group-a@tadakayo.jp"},
+            {"email": "bob@tadakayo.jp", "role": "admin", "source_group": "group-b@tadakayo.jp"},
+        ])
+        mock_bq_client.query().dml_stats = FakeDmlStats(inserted=3, deleted=2)
+        mock_bq_client.query.reset_mock()
+
+        result = sync_dashboard_users_from_groups({
+            "group-a@tadakayo.jp": ["carol@tadakayo.jp", "dave@tadakayo.jp"],
+            "group-b@tadakayo.jp": ["erin@tadakayo.jp"],
+        })
+
+        assert result["added"] == 3
+        assert result["removed"] == 2
+        merge_calls = _merge_calls(mock_bq_client)
+        assert len(merge_calls) == 1
+        assert not any(
+            "DELETE FROM" in c.args[0] for c in mock_bq_client.query.call_args_list
+        )
+        assert _members_param(merge_calls[0]) == [
+            ("carol@tadakayo.jp", "group-a@tadakayo.jp", "viewer"),
+            ("dave@tadakayo.jp", "group-a@tadakayo.jp", "viewer"),
+            ("erin@tadakayo.jp", "group-b@tadakayo.jp", "admin"),
+        ]
 
 
 class TestSyncToggleSemantics:
@@ -319,7 +377,7 @@ class TestSyncToggleSemantics:
                 {"email": "bob@tadakayo.jp", "role": "viewer", "source_group": "group-b@tadakayo.jp"},
             ])
 
-            mock_bq_client.query().result.return_value = FakeQueryResult()
+            mock_bq_client.query().dml_stats = FakeDmlStats(deleted=1)
 
             # 最新メンバー: group-a 空（aliceは削除対象）、group-b 空（凍結）、group-c 新規（未登録 skip）
             result = sync_dashboard_users_from_groups({
@@ -113,6 +113,57 @@ class TestClaimTeamEvalRow:
         assert params["actor"] == "alice@example.com"
 
 
+class TestClaimTeamEvalRows:
+    """月次一括 claim（MERGE + dedup DELETE + 取得隊 SELECT を 1 ジョブで）"""
+
+    def _client(self, won_teams):
+        client = MagicMock()
+        client.query.return_value.result.return_value = [{"team": t} for t in won_teams]
+        return client
+
+    def test_returns_teams_actually_won(self):
+        client = self._client(["A", "C"])
+        won = bq_loader.claim_team_eval_rows(
+            client, year=2026, month=5, teams=["A", "B", "C"],
+            job_id="job-abc", actor="user@x",
+        )
+        assert won == {"A", "C"}
+        client.query.assert_called_once()  # 隊数によらず 1 ジョブ
+
+    def test_single_script_merges_dedups_and_selects(self):
+        client = self._client([])
+        bq_loader.claim_team_eval_rows(
+            client, year=2026, month=5, teams=["B", "A", "B"],
+            job_id="job-abc", actor="user@x",
+        )
+        sql = _sql_called(client)
+        assert "FROM UNNEST(@teams) AS team" in sql
+        assert "WHEN MATCHED AND (t.lock_token IS NULL OR t.lock_until < CURRENT_TIMESTAMP())" in sql
+        assert "DELETE FROM" in sql
+        assert "PARTITION BY k.team" in sql
+        # 他者のアクティブな claim は削除対象外（期限切れ / NULL / 自分の token のみ）
+        assert "t.lock_until <= CURRENT_TIMESTAMP()" in sql
+        assert sql.rstrip().endswith("lock_token = @job_id;")
+        job_config = client.query.call_args.kwargs["job_config"]
+        params = {p.name: p for p in job_config.query_parameters}
+        assert params["teams"].values == ["A", "B"]  # 重複排除（MERGE の source 一意性）
+        assert params["job_id"].value == "job-abc"
+
+    def test_uses_bulk_lock_duration(self):
+        client = self._client([])
+        bq_loader.claim_team_eval_rows(
+            client, year=2026, month=5, teams=["A"], job_id="j", actor="a",
+        )
+        assert f"INTERVAL {config.EVAL_BULK_LOCK_DURATION_MIN} MINUTE" in _sql_called(client)
+
+    def test_empty_teams_skips_query(self):
+        client = self._client([])
+        assert bq_loader.claim_team_eval_rows(
+            client, year=2026, month=5, teams=[], job_id="j", actor="a",
+        ) == set()
+        client.query.assert_not_called()
+
+
 class TestLoadExistingEval:
     def test_returns_none_when_no_rows(self):
         client = MagicMock()
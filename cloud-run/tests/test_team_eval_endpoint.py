@@ -289,10 +289,286 @@ class TestProcessOneTeam:
         assert "taro@example.com" in mask_results_arg[0].detected_email
 
 
+class TestProcessOneTeamPrefetched:
+    @patch("team_eval_service.bq_loader.upsert_team_monthly_eval", return_value=True)
+    @patch("team_eval_service.bq_loader.load_existing_eval")
+    @patch("team_eval_service.bq_loader.claim_team_eval_row")
+    @patch("team_eval_service.vertex_evaluator.generate_comment",
+           return_value=(VALID_COMMENT, {"attempts": 1}))
+    @patch("team_eval_service.vertex_evaluator.load_team_samples")
+    @patch("team_eval_service.vertex_evaluator.compute_actual_data_hash")
+    @patch("team_eval_service.load_team_aggregate")
+    def test_no_per_team_queries_when_prefetched(
+        self, mock_agg, mock_hash, mock_samples, mock_gen, mock_claim, mock_existing, mock_upsert,
+    ):
+        prefetched = _pending_inputs(None, 2026, 5, ["X"])["X"]
+        prefetched["samples"] = ([], ["サンプル"])
+
+        result = team_eval_service.process_one_team(
+            bq_client=_make_bq_client(), genai_client=MagicMock(),
+            year=2026, month=5, team="X", force=False,
+            job_id="job", actor="a", member_names={"山田"},
+            prefetched=prefetched, claimed=True,
+        )
+
+        assert result["status"] == "generated"
+        for m in (mock_agg, mock_hash, mock_samples, mock_claim, mock_existing):
+            m.assert_not_called()
+        assert mock_upsert.call_args.kwargs["record"]["actual_data_hash"] == "h-X"
+        assert "サンプル" in mock_gen.call_args.args[1]
+
+
+class TestEvalLimits:
+    @patch("team_eval_service.bq_loader.upsert_team_monthly_eval", return_value=True)
+    @patch("team_eval_service.bq_loader.load_existing_eval", return_value=None)
+    @patch("team_eval_service.bq_loader.claim_team_eval_row", return_value=True)
+    @patch("team_eval_service.vertex_evaluator.load_team_samples", return_value=([], []))
+    @patch("team_eval_service.vertex_evaluator.compute_actual_data_hash", return_value="h")
+    @patch("team_eval_service.load_team_aggregate")
+    def test_gemini_calls_capped_independently_of_workers(self, mock_agg, *_):
+        """Gemini 同時呼び出し数は TEAM_EVAL_GEMINI_CONCURRENCY を超えない"""
+        import threading
+        import time
+
+        mock_agg.return_value = {
+            "budget_amount": 1.0, "actual_amount": 1.0, "achievement_rate": 100.0,
+            "diff_amount": 0.0, "has_budget": True, "has_actual": True,
+        }
+        lock = threading.Lock()
+        state = {"now": 0, "peak": 0}
+
+        def _gen(*_a, **_kw):
+            with lock:
+                state["now"] += 1
+                state["peak"] = max(state["peak"], state["now"])
+            time.sleep(0.02)
+            with lock:
+                state["now"] -= 1
+            return VALID_COMMENT, {"attempts": 1}
+
+        limits = team_eval_service.EvalLimits(bq=4, gemini=2)
+        with patch("team_eval_service.vertex_evaluator.generate_comment", side_effect=_gen):
+            threads = [
+                threading.Thread(target=team_eval_service.process_one_team, kwargs=dict(
+                    bq_client=_make_bq_client(), genai_client=MagicMock(),
+                    year=2026, month=5, team=f"T{i}", force=False,
+                    job_id="job", actor="a", member_names=set(), limits=limits,
+                ))
+                for i in range(6)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        assert state["peak"] == 2
+
+
 # -------- process_teams (オーケストレーション) --------
 
 
+def _pending_inputs(_client, _year, _month, teams):
+    """prefetch_month_inputs の代替: 全隊が「実額あり・既存評価なし」（claim して処理する）"""
+    return {
+        t: {
+            "data_hash": f"h-{t}",
+            "aggregate": {
+                "budget_amount": 1.0, "actual_amount": 1.0, "achievement_rate": 100.0,
+                "diff_amount": 0.0, "has_budget": True, "has_actual": True,
+            },
+            "has_existing": False,
+            "existing_hash": None,
+        }
+        for t in teams
+    }
+
+
+def _win_all(_client, **kw):
+    """claim_team_eval_rows の代替: 全隊 lease 取得"""
+    return set(kw["teams"])
+
+
+class TestPrefetchMonthInputs:
+    def test_one_query_for_whole_month(self):
+        from team_budget_hash import compose_actual_data_hash as _compose
+
+        client = MagicMock()
+        client.query.return_value.result.return_value = [
+            {"team": "A", "has_aggregate": True, "budget_amount": 500, "actual_amount": 480,
+             "achievement_rate": 96, "diff_amount": -20, "has_budget": True,
+             "has_actual": True, "hash_budget_amount": 500, "bq_hash": "bq-a",
+             "has_existing": True, "existing_hash": "old"},
+            {"team": "B", "has_aggregate": False, "budget_amount": None,
+             "actual_amount": None, "achievement_rate": None, "diff_amount": None,
+             "has_budget": None, "has_actual": None, "hash_budget_amount": None,
+             "bq_hash": "", "has_existing": False, "existing_hash": None},
+        ]
+
+        inputs = team_eval_service.prefetch_month_inputs(client, 2026, 5, ["A", "B", "C"])
+
+        assert client.query.call_count == 1
+        sql = client.query.call_args.args[0]
+        assert f"{team_eval_service.config.BQ_TABLE_TEAM_MONTH_HASHES}`" in sql
+        assert "gyomu_reports" not in sql
+        pv = team_eval_service.config.PROMPT_VERSION
+        assert inputs["A"]["data_hash"] == _compose("bq-a", 500, pv)
+        assert inputs["A"]["aggregate"]["actual_amount"] == 480.0
+        assert inputs["A"]["existing_hash"] == "old"
+        assert inputs["B"]["data_hash"] == _compose("", None, pv)
+        assert inputs["B"]["aggregate"]["has_actual"] is False
+        assert inputs["C"]["data_hash"] == _compose("", None, pv)  # 結果行なし
+        assert inputs["B"]["has_existing"] is False
+
+    @patch("team_eval_service.pii_masker.load_member_names", return_value={"dummy"})
+    @patch("team_eval_service.bq_loader.claim_team_eval_rows", side_effect=_win_all)
+    @patch("team_eval_service.bq_loader.claim_team_eval_row")
+    @patch("team_eval_service.process_one_team")
+    @patch("team_eval_service.prefetch_month_inputs")
+    def test_hash_match_and_no_actual_skip_claim(
+        self, mock_prefetch, mock_proc, mock_claim, mock_bulk_claim, _names
+    ):
+        """hash 一致・実額なしの隊は claim も process_one_team も通らない"""
+        inputs = _pending_inputs(None, 2026, 5, ["A", "B", "C"])
+        inputs["A"].update(has_existing=True, existing_hash="h-A")  # hash 一致
+        inputs["B"]["aggregate"] = dict(inputs["B"]["aggregate"], has_actual=False)
+        mock_prefetch.return_value = inputs
+        mock_proc.side_effect = lambda **kw: {"team": kw["team"], "status": "generated"}
+
+        result = team_eval_service.process_teams(
+            year=2026, month=5, teams=["A", "B", "C"], force=False,
+            actor="a", job_id="job",
+            bq_client=MagicMock(), genai_client=MagicMock(), workers=1,
+        )
+
+        mock_claim.assert_not_called()
+        assert mock_bulk_claim.call_args.kwargs["teams"] == ["C"]
+        assert [c.kwargs["team"] for c in mock_proc.call_args_list] == ["C"]
+        assert mock_proc.call_args.kwargs["prefetched"] is inputs["C"]
+        assert mock_proc.call_args.kwargs["claimed"] is True
+        assert [r["status"] for r in result["results"]] == [
+            "skipped_hash_match", "no_actual", "generated",
+        ]
+
+    @patch("team_eval_service.pii_masker.load_member_names", return_value={"dummy"})
+    @patch("team_eval_service.bq_loader.claim_team_eval_rows", return_value={"A"})
+    @patch("team_eval_service.vertex_evaluator.load_month_samples")
+    @patch("team_eval_service.process_one_team")
+    @patch("team_eval_service.prefetch_month_inputs", side_effect=_pending_inputs)
+    def test_samples_loaded_once_for_claimed_teams(
+        self, _prefetch, mock_proc, mock_samples, _bulk, _names
+    ):
+        """サンプルは lease できた隊分だけ 1 query で取得し、prefetched で渡す"""
+        mock_samples.return_value = {"A": ([{"work_category": "訪問"}], ["s1"])}
+        mock_proc.side_effect = lambda **kw: {"team": kw["team"], "status": "generated"}
+
+        team_eval_service.process_teams(
+            year=2026, month=5, teams=["A", "B"], force=False,
+            actor="a", job_id="job",
+            bq_client=MagicMock(), genai_client=MagicMock(), workers=1,
+        )
+
+        mock_samples.assert_called_once()
+        assert mock_samples.call_args.args[1:] == (2026, 5, ["A"])
+        assert mock_proc.call_args.kwargs["prefetched"]["samples"] == (
+            [{"work_category": "訪問"}], ["s1"],
+        )
+
+    @patch("team_eval_service.pii_masker.load_member_names", return_value={"dummy"})
+    @patch("team_eval_service.bq_loader.claim_team_eval_rows", return_value={"A", "B"})
+    @patch("team_eval_service.vertex_evaluator.load_month_samples",
+           side_effect=RuntimeError("bq down"))
+    @patch("team_eval_service.process_one_team")
+    @patch("team_eval_service.prefetch_month_inputs", side_effect=_pending_inputs)
+    def test_samples_failure_falls_back_to_per_team_sampling(
+        self, _prefetch, mock_proc, _samples, _bulk, _names
+    ):
+        """一括サンプル取得が失敗しても lease 済みの隊は process_one_team に渡る
+        （samples なしの prefetched → 隊単位サンプリング。claim は各隊で release/確定）"""
+        mock_proc.side_effect = lambda **kw: {"team": kw["team"], "status": "generated"}
+
+        result = team_eval_service.process_teams(
+            year=2026, month=5, teams=["A", "B"], force=False,
+            actor="a", job_id="job",
+            bq_client=MagicMock(), genai_client=MagicMock(), workers=1,
+        )
+
+        assert [c.kwargs["team"] for c in mock_proc.call_args_list] == ["A", "B"]
+        assert all("samples" not in c.kwargs["prefetched"] for c in mock_proc.call_args_list)
+        assert result["summary"]["generated"] == 2
+
+    @patch("team_eval_service.pii_masker.load_member_names", return_value={"dummy"})
+    @patch("team_eval_service.bq_loader.release_team_eval_claim")
+    @patch("team_eval_service.bq_loader.claim_team_eval_rows", return_value={"A", "B", "C"})
+    @patch("team_eval_service.vertex_evaluator.load_month_samples",
+           side_effect=lambda _c, _y, _m, teams: {t: ([], []) for t in teams})
+    @patch("team_eval_service.process_one_team")
+    @patch("team_eval_service.prefetch_month_inputs", side_effect=_pending_inputs)
+    def test_crash_releases_claims_of_unstarted_teams(
+        self, _prefetch, mock_proc, _samples, _bulk, mock_release, _names
+    ):
+        """処理途中で例外が上がっても、process_one_team に入らなかった隊の lease は release"""
+        mock_proc.side_effect = RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            team_eval_service.process_teams(
+                year=2026, month=5, teams=["A", "B", "C"], force=False,
+                actor="a", job_id="job",
+                bq_client=MagicMock(), genai_client=MagicMock(), workers=1,
+            )
+
+        # A は process_one_team に入った（release は process_one_team の責務）
+        assert [c.kwargs["team"] for c in mock_release.call_args_list] == ["B", "C"]
+        assert all(c.kwargs["expected_lock_token"] == "job" for c in mock_release.call_args_list)
+
+    @patch("team_eval_service.pii_masker.load_member_names", return_value={"dummy"})
+    @patch("team_eval_service.bq_loader.release_team_eval_claim")
+    @patch("team_eval_service.bq_loader.claim_team_eval_rows", side_effect=_win_all)
+    @patch("team_eval_service.process_one_team")
+    @patch("team_eval_service.prefetch_month_inputs", side_effect=_pending_inputs)
+    def test_normal_run_releases_nothing_extra(
+        self, _prefetch, mock_proc, _bulk, mock_release, _names
+    ):
+        mock_proc.side_effect = lambda **kw: {"team": kw["team"], "status": "generated"}
+
+        with patch("team_eval_service.vertex_evaluator.load_month_samples",
+                   side_effect=lambda _c, _y, _m, teams: {t: ([], []) for t in teams}):
+            team_eval_service.process_teams(
+                year=2026, month=5, teams=["A", "B"], force=False,
+                actor="a", job_id="job",
+                bq_client=MagicMock(), genai_client=MagicMock(), workers=2,
+            )
+
+        mock_release.assert_not_called()
+
+    @patch("team_eval_service.pii_masker.load_member_names", return_value={"dummy"})
+    @patch("team_eval_service.bq_loader.claim_team_eval_rows", side_effect=_win_all)
+    @patch("team_eval_service.process_one_team")
+    @patch("team_eval_service.prefetch_month_inputs")
+    def test_force_processes_hash_match(self, mock_prefetch, mock_proc, _bulk, _names):
+        inputs = _pending_inputs(None, 2026, 5, ["A"])
+        inputs["A"].update(has_existing=True, existing_hash="h-A")
+        mock_prefetch.return_value = inputs
+        mock_proc.return_value = {"team": "A", "status": "generated"}
+
+        team_eval_service.process_teams(
+            year=2026, month=5, teams=["A"], force=True,
+            actor="a", job_id="job",
+            bq_client=MagicMock(), genai_client=MagicMock(),
+        )
+
+        mock_proc.assert_called_once()
+
+
 class TestProcessTeams:
+    @pytest.fixture(autouse=True)
+    def _prefetch(self):
+        with patch(
+            "team_eval_service.prefetch_month_inputs", side_effect=_pending_inputs
+        ) as mock_prefetch, patch(
+            "team_eval_service.bq_loader.claim_team_eval_rows", side_effect=_win_all,
+        ):
+            yield mock_prefetch
+
     @patch("team_eval_service.pii_masker.load_member_names", return_value={"dummy"})
     @patch("team_eval_service.process_one_team")
     @patch("team_eval_service.list_active_teams", return_value=["A", "B"])
@@ -327,6 +603,59 @@ class TestProcessTeams:
             "skipped_claim": 0, "failed": 1, "no_actual": 1,
         }
 
+    @patch("team_eval_service.pii_masker.load_member_names", return_value={"dummy"})
+    @patch("team_eval_service.process_one_team")
+    def test_parallel_keeps_team_order_and_shares_limits(self, mock_proc, _names):
+        """並列実行でも results は teams 順、全隊に同じ EvalLimits が渡る"""
+        import threading
+        import time
+
+        def _proc(**kw):
+            time.sleep(0.01 * (5 - ord(kw["team"]) + ord("A")))  # 後の隊ほど早く終わる
+            return {"team": kw["team"], "status": "generated", "tid": threading.get_ident()}
+
+        mock_proc.side_effect = _proc
+        teams = ["A", "B", "C", "D", "E"]
+        result = team_eval_service.process_teams(
+            year=2026, month=5, teams=teams, force=False,
+            actor="a", job_id="job",
+            bq_client=MagicMock(), genai_client=MagicMock(), workers=3,
+        )
+
+        assert [r["team"] for r in result["results"]] == teams
+        assert result["summary"]["generated"] == 5
+        limits = {id(c.kwargs["limits"]) for c in mock_proc.call_args_list}
+        assert len(limits) == 1
+        assert isinstance(mock_proc.call_args.kwargs["limits"], team_eval_service.EvalLimits)
+
+    @patch("team_eval_service.pii_masker.load_member_names", return_value={"dummy"})
+    @patch("team_eval_service.process_one_team")
+    def test_teams_lost_in_bulk_claim_are_skipped(self, mock_proc, _names):
+        """一括 lease で取れなかった隊は skipped_claim（process_one_team は呼ばない）"""
+        mock_proc.side_effect = lambda **kw: {"team": kw["team"], "status": "generated"}
+        with patch(
+            "team_eval_service.bq_loader.claim_team_eval_rows", return_value={"B"},
+        ):
+            result = team_eval_service.process_teams(
+                year=2026, month=5, teams=["A", "B"], force=False,
+                actor="a", job_id="job",
+                bq_client=MagicMock(), genai_client=MagicMock(), workers=1,
+            )
+        assert [r["status"] for r in result["results"]] == ["skipped_claim", "generated"]
+        assert result["summary"]["skipped_claim"] == 1
+        assert [c.kwargs["team"] for c in mock_proc.call_args_list] == ["B"]
+
+    @patch("team_eval_service.pii_masker.load_member_names", return_value={"dummy"})
+    @patch("team_eval_service.process_one_team")
+    def test_sequential_when_single_worker(self, mock_proc, _names):
+        mock_proc.side_effect = lambda **kw: {"team": kw["team"], "status": "generated"}
+        team_eval_service.process_teams(
+            year=2026, month=5, teams=["A", "B"], force=False,
+            actor="a", job_id="job",
+            bq_client=MagicMock(), genai_client=MagicMock(), workers=1,
+        )
+        assert all(c.kwargs["limits"] is None for c in mock_proc.call_args_list)
+
     @patch("team_eval_service.pii_masker.load_member_names", return_value=set())
     def test_raises_when_member_names_empty(self, _mock):
         """silent PII bypass 防止: load_member_names が空 set を返したら
@@ -340,6 +669,88 @@ class TestProcessTeams:
             )
 
 
+def _wait_job(job_id: str, timeout: float = 5.0) -> dict:
+    """async ジョブの完了 (done / error) を待ってスナップショットを返す"""
+    import time
+
+    deadline = time.monotonic() + timeout
+    while True:
+        job = team_eval_service.get_job(job_id)
+        if job["status"] in ("done", "error"):
+            return job
+        assert time.monotonic() < deadline, job
+        time.sleep(0.01)
+
+
+class TestAsyncJob:
+    @patch("team_eval_service.process_teams")
+    def test_progress_is_visible_while_running(self, mock_proc):
+        """on_teams / on_result で途中経過 (total / completed / results) が見える"""
+        import threading
+
+        release = threading.Event()
+        reported = threading.Event()
+
+        def _proc(**kw):
+            kw["on_teams"](["A", "B"])
+            kw["on_result"]({"team": "B", "status": "skipped_hash_match"})
+            reported.set()
+            release.wait(5)
+            kw["on_result"]({"team": "A", "status": "generated"})
+            return {"summary": {"total": 2}, "results": [
+                {"team": "A", "status": "generated"},
+                {"team": "B", "status": "skipped_hash_match"},
+            ]}
+
+        mock_proc.side_effect = _proc
+        team_eval_service.start_job(
+            year=2026, month=5, teams=None, force=False, actor="a", job_id="evj-progress",
+        )
+        assert reported.wait(5)
+        job = team_eval_service.get_job("evj-progress")
+        assert job["status"] == "running"
+        assert (job["total"], job["completed"]) == (2, 1)
+        assert job["summary"] is None
+
+        release.set()
+        job = _wait_job("evj-progress")
+        assert job["status"] == "done"
+        assert [r["team"] for r in job["results"]] == ["A", "B"]
+        assert job["summary"] == {"total": 2}
+
+    def test_finished_jobs_expire_after_retention(self):
+        old = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+        with team_eval_service._jobs_lock:
+            team_eval_service._jobs["evj-old"] = {"finished_at": old}
+        with patch("team_eval_service.process_teams", return_value={"summary": {}, "results": []}):
+            team_eval_service.start_job(
+                year=2026, month=5, teams=["A"], force=False, actor="a", job_id="evj-new",
+            )
+            _wait_job("evj-new")
+        assert team_eval_service.get_job("evj-old") is None
+
+    @patch("team_eval_service.pii_masker.load_member_names", return_value={"dummy"})
+    @patch("team_eval_service.process_one_team")
+    def test_process_teams_reports_every_team_once(self, mock_proc, _names):
+        """claim 前に確定した隊もワーカーで処理した隊も on_result に 1 回ずつ渡る"""
+        mock_proc.side_effect = lambda **kw: {"team": kw["team"], "status": "generated"}
+        reported = []
+        with patch(
+            "team_eval_service.prefetch_month_inputs", side_effect=_pending_inputs,
+        ), patch(
+            "team_eval_service.bq_loader.claim_team_eval_rows", return_value={"B", "C"},
+        ):
+            team_eval_service.process_teams(
+                year=2026, month=5, teams=["A", "B", "C"], force=False,
+                actor="a", job_id="job",
+                bq_client=MagicMock(), genai_client=MagicMock(), workers=2,
+                on_result=reported.append,
+            )
+        assert sorted((r["team"], r["status"]) for r in reported) == [
+            ("A", "skipped_claim"), ("B", "generated"), ("C", "generated"),
+        ]
+
+
 # -------- HTTP endpoint --------
 
 
@@ -361,22 +772,46 @@ class TestEvalTeamMonthlyEndpoint:
         assert "elapsed_sec" in body
 
     @patch("main.team_eval_service.process_teams")
-    def test_async_param_ignored_returns_200_sync(self, mock_proc, client):
-        """旧 async=true パラメータは廃止: 受け取っても無視して sync 実行 (200)"""
+    def test_async_returns_202_and_job_is_pollable(self, mock_proc, client):
+        """async=true: job_id を即返し (202)、GET /eval/jobs/<job_id> で結果を取れる"""
         mock_proc.return_value = {
             "year": 2026, "month": 5, "job_id": "j", "actor": "u",
             "summary": {"total": 1, "generated": 1, "skipped_hash_match": 0,
                        "skipped_claim": 0, "failed": 0, "no_actual": 0},
-            "results": [],
+            "results": [{"team": "X", "status": "generated"}],
         }
         resp = client.post("/eval/team-monthly", json={
-            "year": 2026, "month": 5, "async": True,
+            "year": 2026, "month": 5, "teams": ["X"], "async": True,
         })
-        # async は無視され同期実行 (200)。202 にはならない。
-        assert resp.status_code == 200
+        assert resp.status_code == 202
         body = resp.get_json()
-        assert "summary" in body
-        assert mock_proc.called
+        job_id = body["job_id"]
+        assert body["status_url"] == f"/eval/jobs/{job_id}"
+        assert body["status"] in ("queued", "running", "done")
+
+        job = _wait_job(job_id)
+        status = client.get(f"/eval/jobs/{job_id}")
+        assert status.status_code == 200
+        assert status.get_json()["summary"]["generated"] == 1
+        assert job["results"] == [{"team": "X", "status": "generated"}]
+        assert mock_proc.call_args.kwargs["job_id"] == job_id
+
+    @patch("main.chat_notifier.notify_fatal")
+    @patch("main.team_eval_service.process_teams", side_effect=RuntimeError("boom"))
+    def test_async_error_is_reported_on_job_and_notified(self, _proc, mock_fatal, client):
+        resp = client.post("/eval/team-monthly", json={
+            "year": 2026, "month": 5, "async": True,
+        })
+        assert resp.status_code == 202
+        job = _wait_job(resp.get_json()["job_id"])
+        assert job["status"] == "error"
+        assert "boom" in job["error"]
+        mock_fatal.assert_called_once()
+
+    def test_job_status_404_for_unknown_job(self, client):
+        resp = client.get("/eval/jobs/evj-unknown")
+        assert resp.status_code == 404
+        assert resp.get_json()["status"] == "error"
 
     @patch("main.chat_notifier.notify_fatal")
     @patch("main.team_eval_service.process_teams", side_effect=RuntimeError("boom"))
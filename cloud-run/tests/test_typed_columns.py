@@ -0,0 +1,113 @@
+"""typed_columns（ロード時の型付き派生列）のユニットテスト
+
+置き換え元の SQL 式（SAFE_CAST / extract_month UDF / REGEXP_REPLACE /
+旧 v_hojo_enriched の年月正規化）および dashboard の parse_gyomu_date と
+同じ結果になることを検証。
+"""
+
+from datetime import date
+
+import pytest
+
+import config
+import typed_columns
+
+
+class TestToInt64:
+    @pytest.mark.parametrize("value, expected", [
+        ("2026", 2026), (" 2026 ", 2026), ("-1", -1), ("+7", 7),
+        ("2026.0", None), ("二〇二六", None), ("２０２６", None), ("", None), (None, None),
+        ("9223372036854775808", None),
+    ])
+    def test_safe_cast_semantics(self, value, expected):
+        assert typed_columns.to_int64(value) == expected
+
+
+class TestParseAmount:
+    @pytest.mark.parametrize("value, expected", [
+        ("¥1,500", "1500"), ("-12.50円", "-12.5"), ("1.", "1"), (".5", "0.5"),
+        ("0", "0"), ("", None), ("-", None), ("1.2.3", None), ("1-2", None), (None, None),
+        ("0.0000000005", "0.000000001"),  # NUMERIC スケール 9 に四捨五入
+        ("1" + "0" * 28, "1" + "0" * 28), ("1" + "0" * 29, None),  # 整数部 29 桁まで
+    ])
+    def test_regexp_replace_numeric_semantics(self, value, expected):
+        assert typed_columns.parse_amount(value) == expected
+
+
+class TestExtractMonth:
+    @pytest.mark.parametrize("value, expected", [
+        ("4/29", 4), ("12/31", 12), ("4月29日", 4), ("2025/4/29", 4),
+        ("2025/4", None), ("123/4", None), (" 4/29", None), ("13/1", 13), (None, None),
+    ])
+    def test_udf_semantics(self, value, expected):
+        assert typed_columns.extract_month(value) == expected
+
+
+class TestParseGyomuDate:
+    def test_formats(self):
+        assert typed_columns.parse_gyomu_date(2025, "4/29") == date(2025, 4, 29)
+        assert typed_columns.parse_gyomu_date(2025, " 4月1日 ") == date(2025, 4, 1)
+        # YYYY/M/D は文字列内の年を優先
+        assert typed_columns.parse_gyomu_date(2099, "2024/4/29") == date(2024, 4, 29)
+        assert typed_columns.parse_gyomu_date(None, "2025/12/31") == date(2025, 12, 31)
+
+    def test_unparseable(self):
+        assert typed_columns.parse_gyomu_date(None, "4/29") is None
+        assert typed_columns.parse_gyomu_date(2026, "2/30") is None
+        assert typed_columns.parse_gyomu_date(2026, "") is None
+        assert typed_columns.parse_gyomu_date(2026, None) is None
+
+
+class TestDerive:
+    def test_gyomu_record(self):
+        record = dict.fromkeys(config.TABLE_COLUMNS[config.BQ_TABLE_GYOMU])
+        record.update(year="2026", date="5/31", amount="¥3,000")
+
+        derived = typed_columns.derive(config.BQ_TABLE_GYOMU, record)
+
+        assert derived == {
+            "year_int": 2026, "month_int": 5,
+            "report_date": "2026-05-31", "amount_numeric": "3000",
+            "year_month": 202605,
+        }
+        assert list(derived) == [c for c, _ in config.TABLE_TYPED_COLUMNS[config.BQ_TABLE_GYOMU]]
+
+    def test_hojo_record(self):
+        record = dict.fromkeys(config.TABLE_COLUMNS[config.BQ_TABLE_HOJO])
+        record.update(year="2026", month="46143")  # 2026/5/1 のシリアル値
+
+        derived = typed_columns.derive(config.BQ_TABLE_HOJO, record)
+
+        assert derived == {"year_int": 2026, "month_int": 5, "year_month": 202605}
+        assert list(derived) == [c for c, _ in config.TABLE_TYPED_COLUMNS[config.BQ_TABLE_HOJO]]
+
+    def test_table_without_typed_columns(self):
+        assert typed_columns.derive(config.BQ_TABLE_MEMBERS, {"report_url": "u"}) == {}
+
+
+class TestYearMonth:
+    @pytest.mark.parametrize("year, month, expected", [
+        (2026, 5, 202605), (2026, 12, 202612),
+        (2026, 13, None), (2026, 0, None), (None, 5, None), (2026, None, None),
+    ])
+    def test_only_valid_months(self, year, month, expected):
+        assert typed_columns.year_month(year, month) == expected
+
+
+class TestNormalizeHojo:
+    """旧 v_hojo_enriched の年月正規化 CASE 式と同じ判定順"""
+
+    @pytest.mark.parametrize("value, expected", [
+        ("2026", 2026), ("2031", None), ("2026/5/1", 2026), ("46143", 2026),
+        ("45000", 2023), ("40000", None), (" 2026/5/1", None), ("", None), (None, None),
+        ("99999999999", None),  # DATE の範囲外
+    ])
+    def test_year(self, value, expected):
+        assert typed_columns.normalize_hojo_year(value) == expected
+
+    @pytest.mark.parametrize("value, expected", [
+        ("5", 5), ("12", 12), ("13", None), ("2026/11/1", 11), ("46143", 5),
+        ("五月", None), (None, None),
+    ])
+    def test_month(self, value, expected):
+        assert typed_columns.normalize_hojo_month(value) == expected
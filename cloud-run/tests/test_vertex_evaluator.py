@@ -415,11 +415,71 @@ class TestLoadTeamSamples:
         assert top[0]["total_amount"] == 0
 
 
-class TestHashSqlOrderTieBreaker:
-    def test_sql_includes_row_json_tie_breaker(self):
-        """同一 row_hash 重複時の順序不定を防ぐため、ORDER BY に row_json を含む"""
+class TestLoadMonthSamples:
+    """月次一括版: 隊ごとの戻り値が load_team_samples と同じ形・同じ値になること"""
+
+    def test_per_team_result_matches_single_team_parse(self):
+        top = [{"work_category": "訪問", "cnt": 0, "total_amount": 0}]
+        client = MagicMock()
+        client.query.return_value.result.return_value = [
+            {"team": "A", "top_categories": top, "sample_descriptions": ["a1", "a2"]},
+            {"team": "B", "top_categories": None, "sample_descriptions": None},
+        ]
+        single = MagicMock()
+        single.query.return_value.result.return_value = [
+            {"top_categories": top, "sample_descriptions": ["a1", "a2"]}
+        ]
+
+        result = vertex_evaluator.load_month_samples(client, 2026, 5, ["A", "B", "C"])
+
+        assert result["A"] == load_team_samples(single, 2026, 5, "A")
+        assert result["B"] == ([], [])
+        assert result["C"] == ([], [])  # 行なしの隊
+        client.query.assert_called_once()
+
+    def test_sql_mirrors_single_team_sampling(self):
+        """抽出条件・金額パース・サンプル順序が _SAMPLE_SQL と同一"""
         import vertex_evaluator as ve
-        assert "ORDER BY row_hash, row_json" in ve._HASH_SQL
+
+        for fragment in (
+            "amount_numeric AS amount_num",
+            "WHERE year_month = @year * 100 + @month",
+            "AND description IS NOT NULL AND description != ''",
+            "ORDER BY total_amount DESC LIMIT 3",
+            "COUNT(*) AS cnt, SUM(amount_num) AS total_amount",
+        ):
+            assert fragment in ve._SAMPLE_SQL
+            assert fragment in ve._SAMPLE_BY_TEAM_SQL
+        assert "ORDER BY FARM_FINGERPRINT(description)" in ve._SAMPLE_BY_TEAM_SQL
+
+    def test_empty_teams_skips_query(self):
+        client = MagicMock()
+        assert vertex_evaluator.load_month_samples(client, 2026, 5, []) == {}
+        client.query.assert_not_called()
+
+
+class TestHashLookup:
+    def test_reads_precomputed_table_by_partition_key(self):
+        """hash は gyomu_reports を読まず、ロード時計算済みの team_month_hashes を引く"""
+        import vertex_evaluator as ve
+
+        sql = ve._HASH_SQL.format(project="p", dataset="d", hashes="team_month_hashes")
+        assert "`p.d.team_month_hashes`" in sql
+        assert "year_month = @year * 100 + @month" in sql
+        assert "gyomu_reports" not in sql
+
+
+class TestTypedColumnFilters:
+    def test_queries_read_typed_columns(self):
+        """年月・金額はロード時計算の型付き列を読み、STRING を都度パースしない。
+        年月はパーティション列 year_month で絞る（区画 prune のため）"""
+        import vertex_evaluator as ve
+
+        for sql in (ve._HASH_SQL, ve._SAMPLE_SQL, ve._SAMPLE_BY_TEAM_SQL):
+            assert "year_month = @year * 100 + @month" in sql
+            assert "month_int" not in sql
+            assert "extract_month" not in sql
+            assert "SAFE_CAST" not in sql
 
 
 class TestBuildGenaiClientTimeout:
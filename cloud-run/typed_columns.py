@@ -0,0 +1,192 @@
+"""ロード時に計算する型付き派生列（config.TABLE_TYPED_COLUMNS）
+
+gyomu_reports は Sheets の値をそのまま STRING で持つため、VIEW / hash・サンプル SQL /
+dashboard が毎回 REGEXP_REPLACE(amount) ・ extract_month(date) UDF ・ SAFE_CAST(year) で
+同じパースを繰り返していた。bq_loader がロード時に 1 回だけ計算して型付き列で保存する。
+hojo_reports の年月正規化（旧 v_hojo_enriched の CASE 式）と、両テーブルの
+パーティション列 year_month（config.TABLE_LAYOUTS）もここで計算する。
+
+各関数は置き換え元の SQL 式と同じ結果を返すこと（既存行は
+infra/bigquery/migrations/2026-10-17_gyomu_typed_columns.sql と
+2026-10-17_report_partitioning.sql が同じ規則の SQL でバックフィルする。差分ロードは内容の変わらない source_url を書き換えないため、
+Python と SQL の規則がずれると行ごとに値が食い違う）。
+数字の判定は BigQuery (RE2) の正規表現と同じく ASCII の 0-9 に限定する。
+"""
+
+import re
+from datetime import date, timedelta
+from decimal import ROUND_HALF_UP, Context, Decimal, InvalidOperation
+from typing import Optional
+
+import config
+
+_INT_RE = re.compile(r"[+-]?[0-9]+", re.ASCII)
+_AMOUNT_STRIP_RE = re.compile(r"[^0-9.\-]")
+_AMOUNT_RE = re.compile(r"-?([0-9]+\.?[0-9]*|\.[0-9]+)", re.ASCII)
+# NUMERIC: 精度 38・スケール 9（整数部 29 桁まで）
+_NUMERIC_SCALE = Decimal("1e-9")
+_NUMERIC_LIMIT = Decimal(10) ** 29
+_NUMERIC_CONTEXT = Context(prec=60)  # 既定 prec=28 だと 19 桁超の丸めが InvalidOperation になる
+
+# extract_month UDF と同じ判定順（YYYY/M/ を最優先、先頭 2 桁誤マッチを回避）
+_MONTH_FULL_RE = re.compile(r"^[0-9]{4}/([0-9]{1,2})/", re.ASCII)
+_MONTH_MD_RE = re.compile(r"^([0-9]{1,2})/", re.ASCII)
+_MONTH_JP_RE = re.compile(r"^([0-9]{1,2})月", re.ASCII)
+
+# hojo_reports の year / month に入る日付文字列（"YYYY/M/D"）
+_HOJO_DATE_RE = re.compile(r"^([0-9]{4})/([0-9]{1,2})/[0-9]{1,2}$", re.ASCII)
+# Sheets の日付シリアル値の起点（DATE '1899-12-30'）と、シリアル値とみなす下限
+_SERIAL_EPOCH = date(1899, 12, 30)
+_SERIAL_MIN = 40000
+
+# dashboard/lib/ui_helpers.parse_gyomu_date と同じ 3 形式
+_DATE_FULL_RE = re.compile(r"^\s*([0-9]{4})/([0-9]{1,2})/([0-9]{1,2})\s*$", re.ASCII)
+_DATE_JP_RE = re.compile(r"^\s*([0-9]{1,2})月([0-9]{1,2})日\s*$", re.ASCII)
+_DATE_MD_RE = re.compile(r"^\s*([0-9]{1,2})/([0-9]{1,2})\s*$", re.ASCII)
+
+
+def to_int64(value: Optional[str]) -> Optional[int]:
+    """SAFE_CAST(TRIM(value) AS INT64) 相当（10 進整数表記のみ）"""
+    if value is None:
+        return None
+    s = value.strip()
+    if not _INT_RE.fullmatch(s):
+        return None
+    n = int(s)
+    return n if -(2 ** 63) <= n < 2 ** 63 else None
+
+
+def parse_amount(value: Optional[str]) -> Optional[str]:
+    """SAFE_CAST(REGEXP_REPLACE(value, r'[^0-9.-]', '') AS NUMERIC) 相当
+
+    NDJSON にそのまま書けるよう、スケール 9 に丸めた 10 進文字列で返す。
+    """
+    if value is None:
+        return None
+    s = _AMOUNT_STRIP_RE.sub("", value)
+    if not _AMOUNT_RE.fullmatch(s):
+        return None
+    try:
+        amount = Decimal(s).quantize(
+            _NUMERIC_SCALE, rounding=ROUND_HALF_UP, context=_NUMERIC_CONTEXT
+        )
+    except InvalidOperation:
+        return None
+    if abs(amount) >= _NUMERIC_LIMIT:
+        return None
+    return format(amount.normalize(), "f") if amount else "0"
+
+
+def extract_month(date_str: Optional[str]) -> Optional[int]:
+    """extract_month UDF 相当（月の範囲チェックはしない）"""
+    if date_str is None:
+        return None
+    for pattern in (_MONTH_FULL_RE, _MONTH_MD_RE, _MONTH_JP_RE):
+        m = pattern.match(date_str)
+        if m:
+            return int(m.group(1))
+    return None
+
+
+def parse_gyomu_date(year_int: Optional[int], date_str: Optional[str]) -> Optional[date]:
+    """gyomu_reports.date を date に変換（dashboard の parse_gyomu_date と同じ規則）
+
+    "YYYY/M/D" は文字列内の年を優先、"M/D" ・ "M月D日" は year_int で補完する。
+    存在しない日付・補完する年が無い場合は None。
+    """
+    if date_str is None:
+        return None
+    m = _DATE_FULL_RE.match(date_str)
+    if m:
+        y, mo, d = int(m.group(1)), int(m.group(2)), int(m.group(3))
+    else:
+        m = _DATE_JP_RE.match(date_str) or _DATE_MD_RE.match(date_str)
+        if not m or year_int is None:
+            return None
+        y, mo, d = year_int, int(m.group(1)), int(m.group(2))
+    try:
+        return date(y, mo, d)
+    except ValueError:
+        return None
+
+
+def year_month(year_int: Optional[int], month_int: Optional[int]) -> Optional[int]:
+    """パーティション列 year_month（YYYYMM の整数）。月が 1-12 でなければ None
+
+    月を 1-12 に限るので year_month = @year * 100 + @month は
+    year_int = @year AND month_int = @month と同じ行を選ぶ。
+    """
+    if year_int is None or month_int is None or not 1 <= month_int <= 12:
+        return None
+    return year_int * 100 + month_int
+
+
+def _serial_date(serial: int) -> Optional[date]:
+    """Sheets の日付シリアル値を date に変換（範囲外は None）"""
+    try:
+        return _SERIAL_EPOCH + timedelta(days=serial)
+    except OverflowError:
+        return None
+
+
+def normalize_hojo_year(value: Optional[str]) -> Optional[int]:
+    """hojo_reports.year の正規化（数値年 / "YYYY/M/D" / 日付シリアル値）"""
+    n = to_int64(value)
+    if n is not None and 2020 <= n <= 2030:
+        return n
+    m = _HOJO_DATE_RE.match(value or "")
+    if m:
+        return int(m.group(1))
+    if n is not None and n > _SERIAL_MIN:
+        d = _serial_date(n)
+        return d.year if d else None
+    return None
+
+
+def normalize_hojo_month(value: Optional[str]) -> Optional[int]:
+    """hojo_reports.month の正規化（数値月 / "YYYY/M/D" / 日付シリアル値）"""
+    n = to_int64(value)
+    if n is not None and 1 <= n <= 12:
+        return n
+    m = _HOJO_DATE_RE.match(value or "")
+    if m:
+        return int(m.group(2))
+    if n is not None and n > _SERIAL_MIN:
+        d = _serial_date(n)
+        return d.month if d else None
+    return None
+
+
+def _derive_gyomu(record: dict) -> dict:
+    year_int = to_int64(record.get("year"))
+    month_int = extract_month(record.get("date"))
+    report_date = parse_gyomu_date(year_int, record.get("date"))
+    return {
+        "year_int": year_int,
+        "month_int": month_int,
+        "report_date": report_date.isoformat() if report_date else None,
+        "amount_numeric": parse_amount(record.get("amount")),
+        "year_month": year_month(year_int, month_int),
+    }
+
+
+def _derive_hojo(record: dict) -> dict:
+    year_int = normalize_hojo_year(record.get("year"))
+    month_int = normalize_hojo_month(record.get("month"))
+    return {
+        "year_int": year_int,
+        "month_int": month_int,
+        "year_month": year_month(year_int, month_int),
+    }
+
+
+_DERIVERS = {
+    config.BQ_TABLE_GYOMU: _derive_gyomu,
+    config.BQ_TABLE_HOJO: _derive_hojo,
+}
+
+
+def derive(table_name: str, record: dict) -> dict:
+    """record（TABLE_COLUMNS の列名 → 文字列）から table_name の派生列を計算する"""
+    deriver = _DERIVERS.get(table_name)
+    return deriver(record) if deriver else {}
@@ -20,7 +20,7 @@ from google import genai
 from google.genai import types
 
 import config
-from pii_masker import MaskResult, mask_pii, validate_ai_comment
+from pii_masker import MaskResult, get_name_matcher, mask_pii, validate_ai_comment
 
 logger = logging.getLogger(__name__)
 
@@ -300,31 +300,16 @@ def generate_comment(
 # -------- BQ クエリ（hash / サンプリング） --------
 
 
-# CTE 名に `rows` は使わない (BigQuery の予約語 ROWS と衝突して
-#  "Unexpected keyword ROWS" 構文エラーになる)。
+# gyomu_reports 部分の hash はロード時に bq_loader が team_month_hashes（隊 × 年月）へ
+# 計算済み。計算式（row_data の列・ORDER BY row_hash, row_json）は
+# infra/bigquery/views.sql の team_month_hashes_for に一本化している。
+# 行がない = その隊 × 年月の gyomu 行なし（従来の IFNULL(..., '') と同じく "" として合成）。
 _HASH_SQL = """
-WITH row_data AS (
-  SELECT
-    TO_JSON_STRING(STRUCT(
-      g.activity_category, g.date, g.source_url, g.work_category, g.sponsor,
-      g.description, g.unit_price, g.hours, g.amount
-    )) AS row_json,
-    TO_HEX(SHA256(TO_JSON_STRING(STRUCT(
-      g.activity_category, g.date, g.source_url, g.work_category, g.sponsor,
-      g.description, g.unit_price, g.hours, g.amount
-    )))) AS row_hash
-  FROM `{project}.{dataset}.gyomu_reports` g
-  WHERE SAFE_CAST(g.year AS INT64) = @year
-    AND `{project}.{dataset}`.extract_month(g.date) = @month
-    AND g.activity_category = @team
-)
--- ORDER BY に row_json を tie-breaker として加える: 9 列すべて同値の重複行が
--- ある場合 row_hash 単独では順序不定 → hash が呼び出しごとに揺れる。
-SELECT IFNULL(
-  TO_HEX(SHA256(STRING_AGG(row_hash, '' ORDER BY row_hash, row_json))),
-  ''
-) AS data_hash
-FROM row_data
+SELECT data_hash
+FROM `{project}.{dataset}.{hashes}`
+WHERE year_month = @year * 100 + @month
+  AND team = @team
+LIMIT 1
 """
 
 
@@ -363,8 +348,8 @@ def _fetch_team_budget_for_hash(bq_client, year: int, month: int, team: str):
 def compute_actual_data_hash(bq_client, year: int, month: int, team: str) -> str:
     """spec §4.5 + 2026-06-13 拡張。差分検知 hash を計算する。
 
-    既存 BQ SQL hash (gyomu_reports 集計) に加え、team_budgets の budget_amount と
-    config.PROMPT_VERSION を Python 側で合成して composite hash を返す。
+    ロード時計算済みの gyomu_reports hash (team_month_hashes) に加え、team_budgets の
+    budget_amount と config.PROMPT_VERSION を Python 側で合成して composite hash を返す。
 
     これにより予算編集 / プロンプト改訂時にも outdated 判定が発火する
     (docs/specs/2026-06-13-team-monthly-budget-input.md §4.2 / §5.3)。
@@ -375,7 +360,10 @@ def compute_actual_data_hash(bq_client, year: int, month: int, team: str) -> str
 
     from team_budget_hash import compose_actual_data_hash as _compose
 
-    query = _HASH_SQL.format(project=config.GCP_PROJECT_ID, dataset=config.BQ_DATASET)
+    query = _HASH_SQL.format(
+        project=config.GCP_PROJECT_ID, dataset=config.BQ_DATASET,
+        hashes=config.BQ_TABLE_TEAM_MONTH_HASHES,
+    )
     job_config = bigquery.QueryJobConfig(
         query_parameters=[
             bigquery.ScalarQueryParameter("year", "INT64", year),
@@ -389,13 +377,18 @@ def compute_actual_data_hash(bq_client, year: int, month: int, team: str) -> str
     return _compose(bq_hash, budget, config.PROMPT_VERSION)
 
 
+# CTE 名に `rows` は使わない (BigQuery の予約語 ROWS と衝突して
+#  "Unexpected keyword ROWS" 構文エラーになる)。
+# 年月・金額の絞り込み/集計はロード時に計算済みの型付き列 (year_month / amount_numeric、
+# config.TABLE_TYPED_COLUMNS) を読む。
+# 年月はパーティション列 year_month (YYYYMM) を定数式で絞り、対象月の区画だけを走査させる
+# (year_int = @year AND month_int = @month と同じ行を選ぶ)。
 _SAMPLE_SQL = """
 WITH actuals AS (
   SELECT work_category, description,
-         SAFE_CAST(REGEXP_REPLACE(amount, r'[^0-9.-]', '') AS NUMERIC) AS amount_num
+         amount_numeric AS amount_num
   FROM `{project}.{dataset}.gyomu_reports`
-  WHERE SAFE_CAST(year AS INT64) = @year
-    AND `{project}.{dataset}`.extract_month(date) = @month
+  WHERE year_month = @year * 100 + @month
     AND activity_category = @team
     AND description IS NOT NULL AND description != ''
 ),
@@ -441,8 +434,83 @@ def load_team_samples(
     rows = list(bq_client.query(query, job_config=job_config).result())
     if not rows:
         return [], []
+    return _samples_from_row(rows[0])
+
+
+# _SAMPLE_SQL の月次一括版。actuals の抽出条件・top_categories の集約・samples の
+# 並び順は _SAMPLE_SQL と同一に保つこと（隊ごとの結果が単独版と一致する前提のため
+# SAMPLE_QUERY_VERSION は据え置き）。隊は activity_category で GROUP BY する。
+_SAMPLE_BY_TEAM_SQL = """
+WITH actuals AS (
+  SELECT activity_category AS team, work_category, description,
+         amount_numeric AS amount_num
+  FROM `{project}.{dataset}.gyomu_reports`
+  WHERE year_month = @year * 100 + @month
+    AND activity_category IN UNNEST(@teams)
+    AND description IS NOT NULL AND description != ''
+),
+top_categories AS (
+  SELECT team,
+         ARRAY_AGG(STRUCT(work_category, cnt, total_amount)
+                   ORDER BY total_amount DESC LIMIT 3) AS top
+  FROM (
+    SELECT team, work_category, COUNT(*) AS cnt, SUM(amount_num) AS total_amount
+    FROM actuals GROUP BY team, work_category
+  )
+  GROUP BY team
+),
+samples AS (
+  SELECT team,
+         ARRAY_AGG(description ORDER BY FARM_FINGERPRINT(description)
+                   LIMIT @sample_size) AS descriptions
+  FROM (
+    SELECT DISTINCT team, description FROM actuals
+  )
+  GROUP BY team
+)
+SELECT
+  t.team,
+  tc.top AS top_categories,
+  s.descriptions AS sample_descriptions
+FROM UNNEST(@teams) AS t
+LEFT JOIN top_categories tc ON tc.team = t.team
+LEFT JOIN samples s ON s.team = t.team
+"""
+
+
+def load_month_samples(
+    bq_client, year: int, month: int, teams: list[str], sample_size: int = 10
+) -> dict[str, tuple[list[dict], list[str]]]:
+    """load_team_samples の月次一括版。gyomu_reports を 1 回だけ走査する。
+
+    Returns:
+        {team: (top_categories, descriptions)}。teams の全隊をキーに持つ
+        （対象行が無い隊は ([], [])）。
+    """
+    from google.cloud import bigquery
+
+    if not teams:
+        return {}
+    query = _SAMPLE_BY_TEAM_SQL.format(
+        project=config.GCP_PROJECT_ID, dataset=config.BQ_DATASET
+    )
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ScalarQueryParameter("year", "INT64", year),
+            bigquery.ScalarQueryParameter("month", "INT64", month),
+            bigquery.ArrayQueryParameter("teams", "STRING", list(teams)),
+            bigquery.ScalarQueryParameter("sample_size", "INT64", sample_size),
+        ]
+    )
+    by_team = {
+        row["team"]: _samples_from_row(row)
+        for row in bq_client.query(query, job_config=job_config).result()
+    }
+    return {team: by_team.get(team, ([], [])) for team in teams}
+
 
-    row = rows[0]
+def _samples_from_row(row) -> tuple[list[dict], list[str]]:
+    """サンプリング SQL の 1 行 → (top_categories, descriptions)"""
     top_raw = row["top_categories"] or []
     samples_raw = row["sample_descriptions"] or []
     # BQ STRUCT row → dict 化。
@@ -473,7 +541,8 @@ def build_samples_text(
     R5 新仕様: 戻り値が str → tuple[str, list[MaskResult]]。call site (team_eval_service)
     は MaskResult 一覧を assert_no_raw_pii に渡して prompt 構築過程の二重検証を行う。
     """
-    results: list[MaskResult] = [mask_pii(d, member_names) for d in descriptions if d]
+    matcher = get_name_matcher(member_names)  # 照合器は全 description で共有
+    results: list[MaskResult] = [mask_pii(d, matcher) for d in descriptions if d]
     if not results:
         return "", []
     samples_text = "\n".join(f"- {r.masked_text}" for r in results)
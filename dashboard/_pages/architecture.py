@@ -198,6 +198,11 @@ render_section_header("4. v_monthly_compensation 計算チェーン", icon="🧮
 st.markdown("""
 月別報酬は6つのCTE（共通テーブル式）を経て最終的な支払額を算出します。
 源泉徴収は `-FLOOR(対象額 * 0.1021)` で計算。法人・寄付シートは源泉免除、士業は全額対象。
+
+計算本体は table function `monthly_compensation_between` に持ち、VIEW は締め済みの月
+（当月の 2 か月前より前）を凍結スナップショット `monthly_compensation_closed` から読み、
+未締めの直近 3 か月だけをその場で計算して結合します。凍結は毎朝バッチが行います。
+直近に締まった 1 か月だけは、月替わりからバッチで凍結されるまでの間その場計算で補います。
 """)
 
 render_mermaid("""
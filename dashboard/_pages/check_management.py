@@ -94,9 +94,12 @@ def load_check_data(year: int, month: int):
         cl.action_log,
         cl.updated_at AS check_updated_at
     FROM `{PROJECT_ID}.{DATASET}.members` m
-    LEFT JOIN `{PROJECT_ID}.{DATASET}.v_hojo_enriched` h
+    LEFT JOIN (
+        -- パーティション列 year_month (YYYYMM) で対象月の区画だけを読む
+        SELECT * FROM `{PROJECT_ID}.{DATASET}.v_hojo_enriched`
+        WHERE year_month = @year * 100 + @month
+    ) h
         ON m.report_url = h.source_url
-        AND h.year = @year AND h.month = @month
     LEFT JOIN `{CHECK_LOGS_TABLE}` cl
         ON m.report_url = cl.source_url
         AND cl.year = @year AND cl.month = @month
@@ -11,6 +11,7 @@ VIEW 層で根本除外される。本ページは leader_team 列の存在を
 """
 
 import logging
+import time
 
 import altair as alt
 import pandas as pd
@@ -28,9 +29,10 @@ from lib.bq_client import (
     load_team_budget_actuals,
     load_team_monthly_eval,
 )
-from lib.cloud_run_client import invoke_team_eval
+from lib.cloud_run_client import get_team_eval_job, start_team_eval_job
 from lib.constants import DATASET, PROJECT_ID, PROMPT_VERSION
 from lib.fiscal_calendar import calendar_to_fiscal
+from lib.team_budget_actuals_repo import refresh_team_budget_actuals
 from lib.team_budget_cache import (
     invalidate_team_budget_caches,
     load_other_team_budgets_cached,
@@ -232,6 +234,75 @@ def _render_drilldown_summary(
         st.caption("💡 FY 初月のため前月比なし")
 
 
+def _refresh_actuals(year: int, month: int) -> None:
+    """予算 DML 後に該当年月の team_budget_actuals を再計算 (失敗時は警告のみ、DML は確定済み)"""
+    if not refresh_team_budget_actuals(get_bq_client(), [(year, month)]):
+        st.warning(
+            "予実集計の更新に失敗しました。予算は保存されていますが、"
+            "一覧への反映は次回の更新時になります。"
+        )
+
+
+# async 評価ジョブのポーリング間隔 / 打ち切り (collector 側 lease 30 分より十分短く)
+TEAM_EVAL_POLL_INTERVAL_SEC = 2
+TEAM_EVAL_POLL_TIMEOUT_SEC = 300
+
+
+def _run_team_eval_job(*, year: int, month: int, team: str, force: bool):
+    """collector に async 評価ジョブを投げ、GET /eval/jobs/<job_id> をポーリングして待つ。
+
+    HTTP 接続は開始・ポーリングごとに即閉じるため、評価中に collector の worker /
+    proxy timeout に縛られない。
+
+    collector はインスタンス内の async ジョブを 1 本ずつ順に実行するため、月全体の評価の
+    後ろでは queued のまま待つことがある。ジョブ状態はインスタンスのメモリ上にしかなく、
+    別インスタンス / 再起動後のポーリングは 404 (None) になる。どちらも失敗ではないので、
+    状態を表示しながら期限までポーリングし、期限が来たら最後の状態をそのまま返す。
+
+    Returns:
+        完了 (done / error) 時のジョブ dict。期限までに終わらなければ最後に取れた
+        queued / running のジョブ dict、状態が取れなかった場合は None
+        (いずれも結果は team_monthly_eval を読み直せば分かる)。
+    """
+    job = start_team_eval_job(year=year, month=month, teams=[team], force=force)
+    job_id = job["job_id"]
+    deadline = time.monotonic() + TEAM_EVAL_POLL_TIMEOUT_SEC
+    progress = st.progress(0.0, text="評価ジョブ待機中...")
+    fraction = 0.0
+    while job is None or job["status"] not in ("done", "error"):
+        if time.monotonic() > deadline:
+            logger.warning(
+                "評価ジョブ %s が %s 秒内に終わりません (最後の状態: %s)",
+                job_id, TEAM_EVAL_POLL_TIMEOUT_SEC, job["status"] if job else "不明",
+            )
+            break
+        time.sleep(TEAM_EVAL_POLL_INTERVAL_SEC)
+        job = get_team_eval_job(job_id)
+        if job is None:
+            progress.progress(fraction, text="ジョブ状態を取得できません (別インスタンス等)。待機を継続中...")
+        elif job["status"] == "queued":
+            progress.progress(fraction, text="評価ジョブ待機中 (実行中の他の評価ジョブの完了待ち)...")
+        elif job.get("total"):
+            fraction = job["completed"] / job["total"]
+            progress.progress(
+                fraction,
+                text=f"評価中 ({job['completed']}/{job['total']} 隊)",
+            )
+    progress.empty()
+    return job
+
+
+def _unfinished_job_message(job) -> str:
+    """期限内に done / error にならなかったジョブの案内 (失敗扱いにしない)"""
+    if job is None:
+        return "評価ジョブの状態を取得できませんでした。保存済みの評価結果を読み直します。"
+    state = "待機中" if job["status"] == "queued" else "実行中"
+    return (
+        f"評価ジョブ {job['job_id']} はまだ{state}です。"
+        "完了後にページを再表示すると結果が反映されます。"
+    )
+
+
 def _render_team_budget_editor(
     *,
     year: int,
@@ -361,6 +432,7 @@ def _render_team_budget_editor(
                 st.error(f"保存失敗: {exc}")
                 return
 
+            _refresh_actuals(year, month)
             invalidate_team_budget_caches()
             st.success("予算を保存しました")
             prev_amount = current_row.budget_amount if current_row else None
@@ -407,6 +479,7 @@ def _render_team_budget_editor(
                     f"⚠ 削除競合: {exc}。画面を更新してください。"
                 )
             else:
+                _refresh_actuals(year, month)
                 invalidate_team_budget_caches()
                 st.session_state.pop(delete_key, None)
                 st.success("予算を削除しました")
@@ -916,34 +989,46 @@ with tab_drilldown:
                 def _on_update():
                     with st.spinner("Vertex AI Gemini で評価生成中... (約 30 秒)"):
                         try:
-                            result = invoke_team_eval(
-                                year=year, month=month, teams=[team], force=False,
-                            )
-                            s = result.get("summary", {})
-                            st.success(
-                                f"評価生成完了 (generated={s.get('generated', 0)}"
-                                f" skipped_hash={s.get('skipped_hash_match', 0)}"
-                                f" failed={s.get('failed', 0)})"
+                            job = _run_team_eval_job(
+                                year=year, month=month, team=team, force=False,
                             )
                         except Exception as exc:  # noqa: BLE001
-                            logger.exception("invoke_team_eval failed")
+                            logger.exception("team eval job failed")
                             st.error(f"評価生成失敗: {exc}")
                             return
+                    if job is not None and job["status"] == "error":
+                        st.error(f"評価生成失敗: {job.get('error')}")
+                        return
+                    if job is None or job["status"] != "done":
+                        st.info(_unfinished_job_message(job))
+                    else:
+                        s = job.get("summary") or {}
+                        st.success(
+                            f"評価生成完了 (generated={s.get('generated', 0)}"
+                            f" skipped_hash={s.get('skipped_hash_match', 0)}"
+                            f" failed={s.get('failed', 0)})"
+                        )
                     _clear_team_eval_cache()
                     st.rerun()
 
                 def _on_force_update():
                     with st.spinner("Vertex AI Gemini で強制再生成中... (約 30 秒)"):
                         try:
-                            result = invoke_team_eval(
-                                year=year, month=month, teams=[team], force=True,
+                            job = _run_team_eval_job(
+                                year=year, month=month, team=team, force=True,
                             )
-                            s = result.get("summary", {})
-                            st.success(f"強制再生成完了 (generated={s.get('generated', 0)})")
                         except Exception as exc:  # noqa: BLE001
-                            logger.exception("invoke_team_eval force failed")
+                            logger.exception("team eval force job failed")
                             st.error(f"強制再生成失敗: {exc}")
                             return
+                    if job is not None and job["status"] == "error":
+                        st.error(f"強制再生成失敗: {job.get('error')}")
+                        return
+                    if job is None or job["status"] != "done":
+                        st.info(_unfinished_job_message(job))
+                    else:
+                        s = job.get("summary") or {}
+                        st.success(f"強制再生成完了 (generated={s.get('generated', 0)})")
                     _clear_team_eval_cache()
                     st.rerun()
 
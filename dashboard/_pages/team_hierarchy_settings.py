@@ -29,6 +29,8 @@ from lib.doc_styles import (
     render_hero,
     render_section_header,
 )
+from lib.bq_client import get_bq_client
+from lib.team_budget_actuals_repo import refresh_team_budget_actuals
 from lib.team_hierarchy_repo import (
     delete_hierarchy_row,
     fetch_hierarchy,
@@ -88,9 +90,14 @@ def _load_unmapped() -> pd.DataFrame:
 
 
 def _invalidate_caches() -> None:
-    """編集後に全 cache をクリア (個別 cache.clear で他ユーザーへの波及を最小化)。"""
+    """編集後に全 cache をクリア (個別 cache.clear で他ユーザーへの波及を最小化)。
+
+    隊の所属・operating 判定は全月の予実に効くため team_budget_actuals も全件再計算する。
+    """
     _load_hierarchy.clear()
     _load_unmapped.clear()
+    if not refresh_team_budget_actuals(get_bq_client()):
+        st.warning("予実集計の更新に失敗しました。階層の変更は保存されています。")
 
 
 # CR-H1 反映: dialog はモジュールトップで定義 (条件分岐内にあると df_hierarchy 空時に未定義)
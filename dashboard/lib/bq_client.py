@@ -10,8 +10,9 @@ from lib.constants import (
     DATASET,
     LEADER_TEAM_MONTHLY_BUDGETS_TABLE,
     PROJECT_ID,
-    TEAM_BUDGET_ACTUALS_VIEW,
+    TEAM_BUDGET_ACTUALS_TABLE,
     TEAM_BUDGETS_QUARTERLY_TABLE,
+    TEAM_MONTH_HASHES_TABLE,
     TEAM_MONTHLY_EVAL_TABLE,
 )
 from lib.fiscal_calendar import fiscal_year_month_range
@@ -40,7 +41,10 @@ def load_team_budget_actuals(
     *,
     fiscal_year: Optional[int] = None,
 ) -> pd.DataFrame:
-    """v_team_budget_actuals から期間内の予実データを取得 (spec §6.6, ttl=5 分)。
+    """team_budget_actuals から期間内の予実データを取得 (spec §6.6, ttl=5 分)。
+
+    2026-10-17: 読み出し先を v_team_budget_actuals の実体化テーブルに変更
+    (更新は lib/team_budget_actuals_repo / cloud-run bq_loader が年月単位で行う)。
 
     PR-A (2026-06-12) で leader_team 列を追加。team_hierarchy INNER JOIN により
     operating 統括隊配下の隊のみ取得 (非「隊」活動分類は VIEW 層で根本除外)。
@@ -68,7 +72,7 @@ def load_team_budget_actuals(
     SELECT year, month, team, leader_team, actual_amount, actual_count,
            reporter_count, budget_amount, achievement_rate, diff_amount,
            has_budget, has_actual
-    FROM `{TEAM_BUDGET_ACTUALS_VIEW}`
+    FROM `{TEAM_BUDGET_ACTUALS_TABLE}`
     WHERE (
       (@m_start <= @m_end AND year BETWEEN @y_start AND @y_end
                           AND month BETWEEN @m_start AND @m_end)
@@ -156,7 +160,7 @@ def load_active_teams(
         y_start, y_end, m_start, m_end = year_start, year_end, month_start, month_end
     sql = f"""
     SELECT DISTINCT team
-    FROM `{TEAM_BUDGET_ACTUALS_VIEW}`
+    FROM `{TEAM_BUDGET_ACTUALS_TABLE}`
     WHERE (
       (@m_start <= @m_end AND year BETWEEN @y_start AND @y_end
                           AND month BETWEEN @m_start AND @m_end)
@@ -319,7 +323,8 @@ def load_active_leader_teams(
 ) -> list[str]:
     """期間内に予算 or 実額が存在する全 active 統括隊の一覧 (PR-A、ttl=10 分)。
 
-    v_team_budget_actuals の INNER JOIN により operating の統括隊のみが返る。
+    team_budget_actuals (v_team_budget_actuals の実体化) は INNER JOIN 済みのため
+    operating の統括隊のみが返る。
     UI の統括隊フィルタ selectbox / 統括隊タブのランキング軸として使用。
 
     Issue #248 (2026-06-14): `fiscal_year` keyword arg 追加 (Codex H1、AC13)。
@@ -331,7 +336,7 @@ def load_active_leader_teams(
         y_start, y_end, m_start, m_end = year_start, year_end, month_start, month_end
     sql = f"""
     SELECT DISTINCT leader_team
-    FROM `{TEAM_BUDGET_ACTUALS_VIEW}`
+    FROM `{TEAM_BUDGET_ACTUALS_TABLE}`
     WHERE (
       (@m_start <= @m_end AND year BETWEEN @y_start AND @y_end
                           AND month BETWEEN @m_start AND @m_end)
@@ -366,7 +371,7 @@ def compute_current_hashes(
 ) -> dict[str, str]:
     """各隊の現在の actual_data_hash を計算 (spec §6.6 + 2026-06-13 拡張)。
 
-    2026-06-13 拡張: 既存 BQ SQL hash (gyomu_reports 集計) に加え、
+    2026-06-13 拡張: 既存 BQ hash (gyomu_reports 集計) に加え、
     team_budgets.budget_amount と prompt_version を Python 側で合成して
     composite hash を返す。これにより予算編集時にも outdated 判定が発火する
     (docs/specs/2026-06-13-team-monthly-budget-input.md §4.2 / §5.3)。
@@ -377,6 +382,8 @@ def compute_current_hashes(
 
     team_monthly_eval.actual_data_hash と突き合わせて outdated バッジ表示に使う。
     引数 teams は cache key 化のため tuple で受ける。
+    gyomu_reports 部分の hash は cloud-run のロード時に計算済みの team_month_hashes
+    (隊 × 年月、計算式は infra/bigquery/views.sql の team_month_hashes_for) を引く。
 
     Returns:
         {team: composite_hash}
@@ -385,32 +392,11 @@ def compute_current_hashes(
         return {}
     from lib.team_budget_hash import compose_actual_data_hash
     client = get_bq_client()
-    # CTE 名に `rows` は使わない (BigQuery の予約語 ROWS と衝突して
-    #  "Unexpected keyword ROWS" 構文エラーになる)。
     sql = f"""
-    WITH row_data AS (
-      SELECT
-        g.activity_category AS team,
-        TO_JSON_STRING(STRUCT(
-          g.activity_category, g.date, g.source_url, g.work_category, g.sponsor,
-          g.description, g.unit_price, g.hours, g.amount
-        )) AS row_json,
-        TO_HEX(SHA256(TO_JSON_STRING(STRUCT(
-          g.activity_category, g.date, g.source_url, g.work_category, g.sponsor,
-          g.description, g.unit_price, g.hours, g.amount
-        )))) AS row_hash
-      FROM `{PROJECT_ID}.{DATASET}.gyomu_reports` g
-      WHERE SAFE_CAST(g.year AS INT64) = @year
-        AND `{PROJECT_ID}.{DATASET}`.extract_month(g.date) = @month
-        AND g.activity_category IN UNNEST(@teams)
-    )
-    SELECT team,
-           IFNULL(
-             TO_HEX(SHA256(STRING_AGG(row_hash, '' ORDER BY row_hash, row_json))),
-             ''
-           ) AS data_hash
-    FROM row_data
-    GROUP BY team
+    SELECT team, data_hash
+    FROM `{TEAM_MONTH_HASHES_TABLE}`
+    WHERE year_month = @year * 100 + @month
+      AND team IN UNNEST(@teams)
     """
     job_config = bigquery.QueryJobConfig(
         query_parameters=[
@@ -423,9 +409,9 @@ def compute_current_hashes(
         row["team"]: row["data_hash"]
         for row in client.query(sql, job_config=job_config).result()
     }
-    # データなし隊は cloud-run 側の hash 計算と整合させるため "" を入れる
-    # (cloud-run/vertex_evaluator.compute_actual_data_hash も IFNULL(..., '') で
-    #  「データなし」を空文字として表現する。dashboard 側で None のままだと
+    # データなし隊 (team_month_hashes に行なし) は cloud-run 側と整合させるため "" を入れる
+    # (cloud-run/vertex_evaluator.compute_actual_data_hash も行なしを
+    #  「データなし」の空文字として扱う。dashboard 側で None のままだと
     #  is_outdated が「未判定」と扱い、データ削除を outdated と検知できない)
     bq_hashes = {team: bq_hashes.get(team, "") for team in teams}
 
@@ -117,3 +117,72 @@ def invoke_team_eval(
     )
     response.raise_for_status()
     return response.json()
+
+
+# async モード (POST /eval/team-monthly async=true → GET /eval/jobs/<job_id>)
+# 開始・ポーリングとも即応答なので短いタイムアウトで足りる
+TEAM_EVAL_JOB_REQUEST_TIMEOUT = 30
+
+
+def start_team_eval_job(
+    *,
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    teams: Optional[list[str]] = None,
+    force: bool = False,
+) -> dict:
+    """POST /eval/team-monthly を async=true で呼び、ジョブ状態 (job_id 等) を返す。
+
+    Returns:
+        202 レスポンス: {job_id, status, year, month, total, completed, status_url, ...}
+
+    Raises:
+        requests.HTTPError: 4xx/5xx
+        requests.Timeout
+    """
+    url = f"{_base_url()}/eval/team-monthly"
+
+    auth_req = google.auth.transport.requests.Request()
+    token = google.oauth2.id_token.fetch_id_token(auth_req, COLLECTOR_URL)
+
+    body = {"year": year, "month": month, "teams": teams, "force": force, "async": True}
+    logger.info(
+        "team-eval ジョブ開始: year=%s month=%s teams=%s force=%s",
+        year, month, teams, force,
+    )
+    response = requests.post(
+        url,
+        headers={"Authorization": f"Bearer {token}"},
+        json=body,
+        timeout=TEAM_EVAL_JOB_REQUEST_TIMEOUT,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def get_team_eval_job(job_id: str) -> Optional[dict]:
+    """GET /eval/jobs/<job_id> でジョブ状態を返す。
+
+    Returns:
+        {job_id, status (queued/running/done/error), total, completed, results,
+         summary, error, ...}。collector が job を知らない (再起動 / 別インスタンス /
+         保持期限切れ) 場合は None。評価結果自体は team_monthly_eval から読める。
+
+    Raises:
+        requests.HTTPError: 404 以外の 4xx/5xx
+        requests.Timeout
+    """
+    url = f"{_base_url()}/eval/jobs/{job_id}"
+
+    auth_req = google.auth.transport.requests.Request()
+    token = google.oauth2.id_token.fetch_id_token(auth_req, COLLECTOR_URL)
+
+    response = requests.get(
+        url,
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=TEAM_EVAL_JOB_REQUEST_TIMEOUT,
+    )
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return response.json()
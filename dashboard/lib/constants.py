@@ -20,7 +20,11 @@ GAS_BINDINGS_TABLE = f"{PROJECT_ID}.{DATASET}.gas_bindings"
 # 予実管理機能 (PR-A で BQ 構築済み、PR-D で UI 連携)
 TEAM_BUDGETS_TABLE = f"{PROJECT_ID}.{DATASET}.team_budgets"
 TEAM_MONTHLY_EVAL_TABLE = f"{PROJECT_ID}.{DATASET}.team_monthly_eval"
-TEAM_BUDGET_ACTUALS_VIEW = f"{PROJECT_ID}.{DATASET}.v_team_budget_actuals"
+# v_team_budget_actuals の実体化テーブル (読み出し用) と、その年月単位の再計算プロシージャ
+TEAM_BUDGET_ACTUALS_TABLE = f"{PROJECT_ID}.{DATASET}.team_budget_actuals"
+REFRESH_TEAM_BUDGET_ACTUALS_PROC = f"{PROJECT_ID}.{DATASET}.refresh_team_budget_actuals"
+# 隊 × 年月の gyomu_reports 内容 hash (cloud-run がロード時に更新。outdated 判定用)
+TEAM_MONTH_HASHES_TABLE = f"{PROJECT_ID}.{DATASET}.team_month_hashes"
 GYOMU_REPORTS_TABLE = f"{PROJECT_ID}.{DATASET}.gyomu_reports"
 # 予実管理機能 PR-E (四半期×統括隊×カテゴリ) + PR-F (階層設定 UI)
 TEAM_HIERARCHY_TABLE = f"{PROJECT_ID}.{DATASET}.team_hierarchy"
@@ -0,0 +1,62 @@
+"""予実集計テーブル (team_budget_actuals) の再計算。
+
+team_budget_actuals は v_team_budget_actuals の実体化テーブルで、dashboard の予実読み出し
+(lib/bq_client.load_team_budget_actuals 等) はこちらを読む。集計本体と DELETE + INSERT は
+BQ 側の refresh_team_budget_actuals プロシージャ (infra/bigquery/views.sql) に一本化し、
+本モジュールは対象年月を渡してトランザクション内で呼ぶだけ。
+
+呼び出し契機:
+    - team_budgets の DML (予算入力ページ): その (year, month) のみ
+    - team_hierarchy の DML (階層設定ページ): 隊の所属は全月に効くため全件
+
+DML 自体は成功しているため、再計算の失敗は例外にせず False を返す (UI は警告表示)。
+取り残された年月は同じ年月の次の更新か、
+infra/bigquery/migrations/2026-10-17_team_budget_actuals_table.sql の再実行 (全件) で直る。
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Iterable, Optional
+
+from google.cloud import bigquery
+
+from lib.constants import REFRESH_TEAM_BUDGET_ACTUALS_PROC
+
+logger = logging.getLogger(__name__)
+
+
+def build_refresh_sql(all_months: bool) -> str:
+    """プロシージャ呼び出しの multi-statement SQL。all_months なら全件 (NULL)"""
+    arg = "NULL" if all_months else "@months"
+    return f"""
+    BEGIN TRANSACTION;
+    CALL `{REFRESH_TEAM_BUDGET_ACTUALS_PROC}`({arg});
+    COMMIT TRANSACTION;
+    """
+
+
+def refresh_team_budget_actuals(
+    client, year_months: Optional[Iterable[tuple[int, int]]] = None
+) -> bool:
+    """year_months [(year, month), ...] の team_budget_actuals を再計算する。None なら全件
+
+    Returns:
+        成功なら True。失敗時はログに残して False。
+    """
+    if year_months is None:
+        sql, job_config = build_refresh_sql(all_months=True), None
+    else:
+        months = sorted({year * 100 + month for year, month in year_months})
+        if not months:
+            return True
+        sql = build_refresh_sql(all_months=False)
+        job_config = bigquery.QueryJobConfig(query_parameters=[
+            bigquery.ArrayQueryParameter("months", "INT64", months),
+        ])
+    try:
+        client.query(sql, job_config=job_config).result()
+    except Exception:  # noqa: BLE001 - DML は確定済み。再計算失敗は呼び出し側で警告のみ
+        logger.exception("team_budget_actuals refresh failed (year_months=%s)", year_months)
+        return False
+    return True
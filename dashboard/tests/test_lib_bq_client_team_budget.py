@@ -55,7 +55,8 @@ class TestLoadTeamBudgetActuals:
         _to_dataframe_mock(mock_client, pd.DataFrame())
         bq_client.load_team_budget_actuals(2026, 2026, 5, 5)
         sql = mock_client.query.call_args.args[0]
-        assert "v_team_budget_actuals" in sql
+        assert "team_budget_actuals`" in sql
+        assert "v_team_budget_actuals" not in sql
         assert "@y_start" in sql and "@m_end" in sql
 
     def test_sql_selects_leader_team_column(self, mock_client):
@@ -303,7 +304,8 @@ class TestLoadActiveLeaderTeams:
         sql = mock_client.query.call_args.args[0]
         assert "DISTINCT leader_team" in sql
         assert "leader_team IS NOT NULL" in sql
-        assert "v_team_budget_actuals" in sql
+        assert "team_budget_actuals`" in sql
+        assert "v_team_budget_actuals" not in sql
 
     def test_params_bound(self, mock_client):
         _result_mock(mock_client, [])
@@ -392,13 +394,15 @@ class TestComputeCurrentHashes:
         assert h1 != h2
 
     def test_hash_sql_uses_unnest(self, mock_client):
-        """1 回目 query (hash SQL) が UNNEST + ORDER BY tie-breaker を使う"""
+        """1 回目 query が UNNEST で team_month_hashes (ロード時計算済み) を引く"""
         bq_client.compute_current_hashes.clear()
         _hash_and_budget_mock(mock_client, [], [])
         bq_client.compute_current_hashes(2026, 5, ("A", "B"), "v1")
         sql = mock_client.query.call_args_list[0].args[0]
         assert "UNNEST(@teams)" in sql
-        assert "ORDER BY row_hash, row_json" in sql
+        assert "team_month_hashes`" in sql
+        assert "year_month = @year * 100 + @month" in sql
+        assert "gyomu_reports" not in sql
 
     def test_budget_sql_selects_team_budgets(self, mock_client):
         """2 回目 query (budget SELECT) が team_budgets を参照"""
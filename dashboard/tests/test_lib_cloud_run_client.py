@@ -1,7 +1,7 @@
 """dashboard/lib/cloud_run_client.py のユニットテスト
 
-invoke_collector (既存) + invoke_team_eval (PR-D) をカバー。
-OIDC token 取得 + requests.post をモック。
+invoke_collector (既存) + invoke_team_eval (PR-D) + async 評価ジョブ (start / get) をカバー。
+OIDC token 取得 + requests.post / get をモック。
 """
 
 from unittest.mock import MagicMock, patch
@@ -110,3 +110,31 @@ class TestInvokeTeamEval:
                 mock_post.return_value = resp
                 cloud_run_client.invoke_team_eval(year=2026, month=5, teams=["X"])
         assert captured["url"] == cloud_run_client.COLLECTOR_URL
+
+
+class TestTeamEvalJob:
+    def test_start_sends_async_flag(self, mock_token):
+        with patch("lib.cloud_run_client.requests.post") as mock_post:
+            resp = MagicMock()
+            resp.json.return_value = {"job_id": "evj-1", "status": "queued"}
+            mock_post.return_value = resp
+            job = cloud_run_client.start_team_eval_job(year=2026, month=5, teams=["X"])
+        assert job["job_id"] == "evj-1"
+        _, kwargs = mock_post.call_args
+        assert kwargs["json"]["async"] is True
+        assert kwargs["timeout"] == cloud_run_client.TEAM_EVAL_JOB_REQUEST_TIMEOUT
+
+    def test_get_job_returns_status(self, mock_token):
+        with patch("lib.cloud_run_client.requests.get") as mock_get:
+            resp = MagicMock(status_code=200)
+            resp.json.return_value = {"job_id": "evj-1", "status": "running"}
+            mock_get.return_value = resp
+            job = cloud_run_client.get_team_eval_job("evj-1")
+        assert job["status"] == "running"
+        assert mock_get.call_args.args[0].endswith("/eval/jobs/evj-1")
+
+    def test_get_job_unknown_returns_none(self, mock_token):
+        """collector が job を知らない (再起動 / 別インスタンス) → None"""
+        with patch("lib.cloud_run_client.requests.get") as mock_get:
+            mock_get.return_value = MagicMock(status_code=404)
+            assert cloud_run_client.get_team_eval_job("evj-1") is None
@@ -0,0 +1,50 @@
+"""dashboard/lib/team_budget_actuals_repo.py の単体テスト。
+
+BQ client は MagicMock で差し替え。プロシージャ呼び出し SQL とパラメータ、失敗時の戻り値を検証。
+"""
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from lib import team_budget_actuals_repo as repo
+
+
+def test_refresh_given_months_passes_sorted_unique_yyyymm():
+    client = MagicMock()
+
+    assert repo.refresh_team_budget_actuals(client, [(2026, 6), (2026, 5), (2026, 6)]) is True
+
+    sql = client.query.call_args[0][0]
+    assert "BEGIN TRANSACTION" in sql
+    assert "refresh_team_budget_actuals`(@months)" in sql
+    assert "COMMIT TRANSACTION" in sql
+    params = client.query.call_args[1]["job_config"].query_parameters
+    assert params[0].name == "months"
+    assert params[0].array_type == "INT64"
+    assert params[0].values == [202605, 202606]
+    client.query.return_value.result.assert_called_once()
+
+
+def test_refresh_all_months_passes_null():
+    client = MagicMock()
+
+    assert repo.refresh_team_budget_actuals(client) is True
+
+    sql = client.query.call_args[0][0]
+    assert "refresh_team_budget_actuals`(NULL)" in sql
+    assert client.query.call_args[1]["job_config"] is None
+
+
+def test_refresh_empty_months_skips_query():
+    client = MagicMock()
+
+    assert repo.refresh_team_budget_actuals(client, []) is True
+
+    client.query.assert_not_called()
+
+
+def test_refresh_failure_returns_false():
+    client = MagicMock()
+    client.query.return_value.result.side_effect = RuntimeError("boom")
+
+    assert repo.refresh_team_budget_actuals(client, [(2026, 5)]) is False
@@ -674,3 +674,89 @@ class TestRenderDrilldownSummary:
             deltas = [c.kwargs.get("delta") for c in metric_calls]
             non_none = [d for d in deltas if d is not None]
             assert non_none == [], f"前月データなしで delta が省略されていない: {non_none}"
+
+
+class TestRunTeamEvalJob:
+    """async 評価ジョブの開始 + ポーリング (_run_team_eval_job)"""
+
+    @pytest.fixture(autouse=True)
+    def _import_page(self):
+        sys.modules.pop("pages.team_budget", None)
+        with patch("lib.ui_helpers.render_sidebar_year_month", return_value=(2026, 5)), \
+             patch("lib.bq_client.load_team_budget_actuals", return_value=pd.DataFrame()), \
+             patch("lib.bq_client.load_team_monthly_eval", return_value=pd.DataFrame()), \
+             patch("lib.bq_client.load_active_teams", return_value=[]), \
+             patch("lib.bq_client.load_active_leader_teams", return_value=[]), \
+             patch("lib.bq_client.load_leader_team_monthly_budgets", return_value=pd.DataFrame()), \
+             patch("lib.bq_client.compute_current_hashes", return_value={}), \
+             patch("lib.bq_client.get_bq_client"), \
+             patch("lib.auth.require_user"):
+            self.mod = importlib.import_module("pages.team_budget")
+            yield
+        sys.modules.pop("pages.team_budget", None)
+
+    def test_polls_until_done(self):
+        polled = [
+            {"job_id": "evj-1", "status": "running", "total": 1, "completed": 0},
+            {"job_id": "evj-1", "status": "done", "total": 1, "completed": 1,
+             "summary": {"generated": 1}},
+        ]
+        with patch("pages.team_budget.start_team_eval_job",
+                   return_value={"job_id": "evj-1", "status": "queued"}) as start, \
+             patch("pages.team_budget.get_team_eval_job", side_effect=polled) as get, \
+             patch("pages.team_budget.time.sleep"), \
+             patch("pages.team_budget.st"):
+            job = self.mod._run_team_eval_job(year=2026, month=5, team="A 隊", force=True)
+        assert job["summary"] == {"generated": 1}
+        assert start.call_args.kwargs == {
+            "year": 2026, "month": 5, "teams": ["A 隊"], "force": True,
+        }
+        assert get.call_count == 2
+
+    def test_keeps_polling_through_unknown_job(self):
+        # 別インスタンスに振られた 404 (None) ではループを抜けず、状態が取れるまで待つ
+        polled = [
+            None,
+            None,
+            {"job_id": "evj-1", "status": "done", "total": 1, "completed": 1,
+             "summary": {"generated": 1}},
+        ]
+        with patch("pages.team_budget.start_team_eval_job",
+                   return_value={"job_id": "evj-1", "status": "queued"}), \
+             patch("pages.team_budget.get_team_eval_job", side_effect=polled) as get, \
+             patch("pages.team_budget.time.sleep"), \
+             patch("pages.team_budget.st"):
+            job = self.mod._run_team_eval_job(year=2026, month=5, team="A 隊", force=False)
+        assert job["status"] == "done"
+        assert get.call_count == 3
+
+    def test_unknown_job_until_deadline_returns_none(self):
+        with patch("pages.team_budget.start_team_eval_job",
+                   return_value={"job_id": "evj-1", "status": "queued"}), \
+             patch("pages.team_budget.get_team_eval_job", return_value=None) as get, \
+             patch("pages.team_budget.time.sleep"), \
+             patch("pages.team_budget.time.monotonic", side_effect=[0, 1, 2, 10_000]), \
+             patch("pages.team_budget.st"):
+            assert self.mod._run_team_eval_job(
+                year=2026, month=5, team="A 隊", force=False,
+            ) is None
+        assert get.call_count == 2
+
+    def test_deadline_returns_queued_job_without_raising(self):
+        # 月全体の評価の後ろで queued のまま期限が来ても失敗扱いにしない
+        queued = {"job_id": "evj-1", "status": "queued", "total": None}
+        with patch("pages.team_budget.start_team_eval_job",
+                   return_value={"job_id": "evj-1", "status": "queued"}), \
+             patch("pages.team_budget.get_team_eval_job", return_value=queued), \
+             patch("pages.team_budget.time.sleep"), \
+             patch("pages.team_budget.time.monotonic", side_effect=[0, 1, 10_000]), \
+             patch("pages.team_budget.st"):
+            job = self.mod._run_team_eval_job(year=2026, month=5, team="A 隊", force=False)
+        assert job == queued
+
+    def test_unfinished_job_message(self):
+        assert "待機中" in self.mod._unfinished_job_message(
+            {"job_id": "evj-1", "status": "queued"})
+        assert "実行中" in self.mod._unfinished_job_message(
+            {"job_id": "evj-1", "status": "running"})
+        assert "読み直します" in self.mod._unfinished_job_message(None)
@@ -0,0 +1,65 @@
+-- ============================================================
+-- gyomu_reports 型付き派生列の追加 + 既存行バックフィル
+-- ============================================================
+-- 目的:
+--   v_team_budget_actuals / v_team_budget_actuals_quarterly / v_monthly_compensation と
+--   Cloud Run・dashboard の hash / サンプル SQL が、毎回 STRING 列を
+--   REGEXP_REPLACE(amount) ・ extract_month(date) ・ SAFE_CAST(year) でパースしていたのを、
+--   ロード時に 1 回だけ計算した型付き列を読むように変更する。
+--
+-- 設計判断:
+--   - 値はロード時に Cloud Run (cloud-run/typed_columns.py) が計算して一緒に書き込む。
+--     差分ロード (bq_loader.load_delta_to_bigquery) は内容の変わらない source_url の行を
+--     書き換えないため、既存行はこの migration で同じ規則の SQL でバックフィルする。
+--     Python 側の規則を変える場合はこのバックフィル式も合わせて変更し再実行すること。
+--   - year_int   : TRIM 後に 10 進整数表記なら INT64
+--   - month_int  : extract_month UDF（YYYY/M/ → M/ → M月 の順）
+--   - report_date: dashboard の parse_gyomu_date と同じ 3 形式。存在しない日付は NULL
+--   - amount_numeric: 数字・小数点・符号以外を除き、数値表記なら NUMERIC
+--
+-- デプロイ順序:
+--   1. 本 migration（列追加 + バックフィル）
+--   2. Cloud Run デプロイ（列が無い状態で差分ロードすると INSERT が失敗するため後）
+--   3. views.sql 再適用 + dashboard デプロイ
+--
+-- 実行コマンド:
+--   bq query --use_legacy_sql=false --project_id=monthly-pay-tax \
+--     < infra/bigquery/migrations/2026-10-17_gyomu_typed_columns.sql
+--
+-- 事後検証（旧パースとの一致。0 行であること）:
+--   bq query --use_legacy_sql=false \
+--     "SELECT COUNT(*) FROM \`monthly-pay-tax.pay_reports.gyomu_reports\` \
+--      WHERE year_int IS DISTINCT FROM SAFE_CAST(TRIM(year) AS INT64) \
+--         OR month_int IS DISTINCT FROM \`monthly-pay-tax.pay_reports.extract_month\`(date) \
+--         OR amount_numeric IS DISTINCT FROM \
+--            SAFE_CAST(REGEXP_REPLACE(amount, r'[^0-9.-]', '') AS NUMERIC)"
+
+ALTER TABLE `monthly-pay-tax.pay_reports.gyomu_reports`
+  ADD COLUMN IF NOT EXISTS year_int INT64,
+  ADD COLUMN IF NOT EXISTS month_int INT64,
+  ADD COLUMN IF NOT EXISTS report_date DATE,
+  ADD COLUMN IF NOT EXISTS amount_numeric NUMERIC;
+
+UPDATE `monthly-pay-tax.pay_reports.gyomu_reports` g
+SET
+  year_int = IF(REGEXP_CONTAINS(TRIM(g.year), r'^[+-]?[0-9]+$'), SAFE_CAST(TRIM(g.year) AS INT64), NULL),
+  month_int = `monthly-pay-tax.pay_reports.extract_month`(g.date),
+  report_date = CASE
+    WHEN REGEXP_CONTAINS(g.date, r'^\s*[0-9]{4}/[0-9]{1,2}/[0-9]{1,2}\s*$') THEN SAFE.DATE(
+      CAST(REGEXP_EXTRACT(g.date, r'^\s*([0-9]{4})/') AS INT64),
+      CAST(REGEXP_EXTRACT(g.date, r'^\s*[0-9]{4}/([0-9]{1,2})/') AS INT64),
+      CAST(REGEXP_EXTRACT(g.date, r'/([0-9]{1,2})\s*$') AS INT64))
+    WHEN REGEXP_CONTAINS(g.date, r'^\s*[0-9]{1,2}月[0-9]{1,2}日\s*$') THEN SAFE.DATE(
+      IF(REGEXP_CONTAINS(TRIM(g.year), r'^[+-]?[0-9]+$'), SAFE_CAST(TRIM(g.year) AS INT64), NULL),
+      CAST(REGEXP_EXTRACT(g.date, r'^\s*([0-9]{1,2})月') AS INT64),
+      CAST(REGEXP_EXTRACT(g.date, r'月([0-9]{1,2})日') AS INT64))
+    WHEN REGEXP_CONTAINS(g.date, r'^\s*[0-9]{1,2}/[0-9]{1,2}\s*$') THEN SAFE.DATE(
+      IF(REGEXP_CONTAINS(TRIM(g.year), r'^[+-]?[0-9]+$'), SAFE_CAST(TRIM(g.year) AS INT64), NULL),
+      CAST(REGEXP_EXTRACT(g.date, r'^\s*([0-9]{1,2})/') AS INT64),
+      CAST(REGEXP_EXTRACT(g.date, r'/([0-9]{1,2})\s*$') AS INT64))
+  END,
+  amount_numeric = IF(
+    REGEXP_CONTAINS(REGEXP_REPLACE(g.amount, r'[^0-9.-]', ''), r'^-?([0-9]+\.?[0-9]*|\.[0-9]+)$'),
+    SAFE_CAST(REGEXP_REPLACE(g.amount, r'[^0-9.-]', '') AS NUMERIC),
+    NULL)
+WHERE TRUE;
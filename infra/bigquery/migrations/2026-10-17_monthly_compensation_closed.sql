@@ -0,0 +1,108 @@
+-- ============================================================
+-- 締め済み月の報酬スナップショット monthly_compensation_closed
+-- ============================================================
+-- 目的:
+--   v_monthly_compensation（多段 CTE の論理 VIEW）は dashboard の報酬表示・wam_monthly・
+--   支払明細 PDF から繰り返し読まれ、そのたびに源泉対象の sub-select や REGEXP による
+--   金額パースを全履歴の gyomu_reports / hojo_reports に対してやり直していた。
+--   締め済みの月は結果が変わらない前提のため凍結し、未締めの月だけをその場で計算する。
+--
+-- 設計判断:
+--   - 計算本体は views.sql の table function monthly_compensation_between(from, to)。
+--     VIEW は「スナップショットの締め済み月」UNION ALL「未締め月のその場計算」で、
+--     読み手は従来どおり v_monthly_compensation を読むだけ（列も変わらない）。
+--   - 未締め = 当月を含む直近 3 か月（補助＆立替報告は翌月入力のため 1 か月の余裕を持たせる）。
+--     境界は VIEW 内で CURRENT_DATE('Asia/Tokyo') から求めた定数なので、
+--     スナップショット・報告テーブルとも year_month パーティションで絞り込まれる。
+--     cloud-run/config.COMPENSATION_OPEN_MONTHS と一致させること。
+--   - 凍結: 毎朝バッチ（cloud-run bq_loader.freeze_closed_compensation）が締め済みで未凍結の月を
+--     freeze_monthly_compensation プロシージャで作る。締まる前の月は凍結しない（締め日当日の
+--     訂正を取りこぼさないため）。凍結ステップが失敗した月も次の毎朝バッチが凍結する。
+--   - 月替わりの 0 時から毎朝バッチまでの間は、直近に締まった 1 か月がまだ未凍結になる。
+--     VIEW はその 1 か月だけ、スナップショットに行が無ければその場計算で補う（範囲は定数で
+--     prune が効く）。それより前の未凍結月は VIEW では補わないため、凍結の失敗が続いた場合は
+--     POST /compensation/freeze で凍結する。
+--   - 凍結時点の members（役職手当率・資格手当・法人/寄付判定）と withholding_targets で
+--     計算した値を保持する。後から訂正する場合は POST /compensation/freeze
+--     {"months": [YYYYMM]} で再凍結する。
+--
+-- デプロイ順序:
+--   1. 本 migration（テーブル作成 + 締め済み月を現行 VIEW から投入。冪等）
+--      ※ views.sql より先に流す。現行 VIEW は全月をその場計算しているため、投入中も読み手に影響なし
+--   2. views.sql 再適用（monthly_compensation_between / freeze_monthly_compensation / VIEW 差し替え）
+--   3. Cloud Run デプロイ（毎朝バッチに凍結ステップ追加）
+--
+-- 実行コマンド:
+--   bq query --use_legacy_sql=false --project_id=monthly-pay-tax \
+--     < infra/bigquery/migrations/2026-10-17_monthly_compensation_closed.sql
+--
+-- 事後検証（views.sql 適用後。全月その場計算との差分が 0 行であること）:
+--   bq query --use_legacy_sql=false \
+--     "(SELECT * FROM \`monthly-pay-tax.pay_reports.v_monthly_compensation\`
+--       EXCEPT DISTINCT
+--       SELECT * EXCEPT (year_month)
+--       FROM \`monthly-pay-tax.pay_reports.monthly_compensation_between\`(NULL, NULL))
+--      UNION ALL
+--      (SELECT * EXCEPT (year_month)
+--       FROM \`monthly-pay-tax.pay_reports.monthly_compensation_between\`(NULL, NULL)
+--       EXCEPT DISTINCT
+--       SELECT * FROM \`monthly-pay-tax.pay_reports.v_monthly_compensation\`)"
+--   （members 等を凍結後に更新していると、締め済み月の差分として現れる。それは意図どおり）
+--
+-- ロールバック:
+--   views.sql を前の版に戻して再適用（VIEW が全月その場計算に戻る）。テーブルは残しても無害。
+
+-- 締め境界（未締めの最初の年月）。views.sql の v_monthly_compensation と同じ式
+DECLARE closed_before INT64 DEFAULT CAST(FORMAT_DATE(
+  '%Y%m', DATE_SUB(DATE_TRUNC(CURRENT_DATE('Asia/Tokyo'), MONTH), INTERVAL 2 MONTH)) AS INT64);
+
+CREATE TABLE IF NOT EXISTS `monthly-pay-tax.pay_reports.monthly_compensation_closed` (
+  year INT64,
+  month INT64,
+  member_id STRING,
+  nickname STRING,
+  full_name STRING,
+  is_corporate BOOL,
+  is_donation BOOL,
+  is_licensed BOOL,
+  report_url STRING,
+  work_hours FLOAT64,
+  hour_compensation FLOAT64,
+  travel_distance_km FLOAT64,
+  distance_compensation FLOAT64,
+  subtotal_compensation FLOAT64,
+  position_rate FLOAT64,
+  position_adjusted_compensation INT64,
+  qualification_allowance FLOAT64,
+  qualification_adjusted_compensation INT64,
+  withholding_target_amount FLOAT64,
+  withholding_tax INT64,
+  dx_subsidy FLOAT64,
+  reimbursement FLOAT64,
+  payment FLOAT64,
+  donation_payment INT64,
+  daily_wage_count INT64,
+  full_day_compensation FLOAT64,
+  total_work_hours FLOAT64,
+  year_month INT64 NOT NULL,
+  frozen_at TIMESTAMP NOT NULL
+)
+PARTITION BY RANGE_BUCKET(year_month, GENERATE_ARRAY(201501, 203501, 1))
+CLUSTER BY member_id;
+
+-- 締め済み月のうち未投入の月を現行 VIEW から投入。year_month は gyomu_reports / hojo_reports と
+-- 同じ規則（月が 1-12 の時だけ YYYYMM）。投入済みの月は触らないため、views.sql 適用後
+-- （VIEW がこのテーブルを読む状態）に再実行しても何も変わらない。
+INSERT INTO `monthly-pay-tax.pay_reports.monthly_compensation_closed`
+SELECT *
+FROM (
+  SELECT
+    c.*,
+    IF(c.month BETWEEN 1 AND 12, c.year * 100 + c.month, NULL) AS year_month,
+    CURRENT_TIMESTAMP() AS frozen_at
+  FROM `monthly-pay-tax.pay_reports.v_monthly_compensation` c
+)
+WHERE year_month < closed_before
+  AND year_month NOT IN (
+    SELECT DISTINCT year_month FROM `monthly-pay-tax.pay_reports.monthly_compensation_closed`
+  );
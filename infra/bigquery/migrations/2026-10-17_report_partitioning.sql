@@ -0,0 +1,168 @@
+-- ============================================================
+-- gyomu_reports / hojo_reports を年月パーティション + クラスタ構成に作り直す
+-- ============================================================
+-- 目的:
+--   両テーブルはパーティション・クラスタなしのため、月指定のクエリ
+--   （check_management.load_check_data、team eval の hash / サンプル SQL、
+--   v_team_budget_actuals 経由の load_team_budget_actuals）が毎回全履歴を走査し、
+--   課金バイト・レイテンシが月を追うごとに増えていた。
+--
+-- 設計判断:
+--   - パーティション列 year_month INT64 = year_int * 100 + month_int（YYYYMM）。
+--     月が 1-12 の行だけ非 NULL なので、year_month = @year * 100 + @month は
+--     year_int = @year AND month_int = @month と同じ行を選ぶ（hash の値は変わらない）。
+--   - RANGE_BUCKET(year_month, GENERATE_ARRAY(201501, 203501, 1))。区画数は
+--     (203501 - 201501) / 1 = 2,000（YYYYMM は 1 年で 100 進むため 20 年分 × 100。
+--     上限 10,000 区画）。13-99 月・00 月の区画は空のまま。範囲外は __UNPARTITIONED__、
+--     NULL は __NULL__ 区画に入るだけで行は欠落しない。範囲は cloud-run/config.BQ_YEAR_MONTH_RANGE
+--     と一致させる（scripts/tests/test_migration_report_partitioning.py で検証）。
+--   - CLUSTER BY: gyomu は activity_category, source_url（隊絞り込み + 差分ロードの
+--     source_url 単位 DELETE）、hojo は activity_category 列が無いため source_url のみ。
+--   - hojo_reports にも型付き派生列 year_int / month_int を追加し、v_hojo_enriched の
+--     年月正規化 CASE 式をロード時計算（cloud-run/typed_columns.py）に移す。
+--     下の一時関数は Python 側と同じ規則。変える場合は両方を合わせること。
+--   - 既存テーブルのパーティション指定は変更できないため、新構成の `<table>_new` を作って
+--     INSERT → バックアップへ COPY → 旧テーブル DROP → `_new` を RENAME の順で行う。
+--     作成・投入が失敗した時点でスクリプトは止まり、旧テーブルは無傷で残る
+--     （`_new` は CREATE OR REPLACE なので、そのまま再実行できる）。
+--     DDL はトランザクションに含められないので、収集（Cloud Scheduler の pay-collector
+--     ジョブ）を止めてから実行する。
+--
+-- デプロイ順序:
+--   1. Cloud Scheduler の収集ジョブを一時停止
+--   2. 本 migration
+--   3. Cloud Run デプロイ（year_month / hojo の型付き列を書き込む版）
+--   4. views.sql 再適用 + dashboard デプロイ
+--   5. 収集ジョブ再開。事後検証が通ったらバックアップテーブルを DROP
+--
+-- 実行コマンド:
+--   bq query --use_legacy_sql=false --project_id=monthly-pay-tax \
+--     < infra/bigquery/migrations/2026-10-17_report_partitioning.sql
+--
+-- 事後検証（件数が一致すること / 区画 prune の確認）:
+--   bq query --use_legacy_sql=false \
+--     "SELECT (SELECT COUNT(*) FROM \`monthly-pay-tax.pay_reports.gyomu_reports\`),
+--             (SELECT COUNT(*) FROM \`monthly-pay-tax.pay_reports.gyomu_reports_bak_20261017\`),
+--             (SELECT COUNT(*) FROM \`monthly-pay-tax.pay_reports.hojo_reports\`),
+--             (SELECT COUNT(*) FROM \`monthly-pay-tax.pay_reports.hojo_reports_bak_20261017\`)"
+--   bq query --use_legacy_sql=false --dry_run \
+--     "SELECT COUNT(*) FROM \`monthly-pay-tax.pay_reports.gyomu_reports\` WHERE year_month = 202605"
+--   （dry run の処理バイトが全件より小さくなること）
+--
+-- ロールバック:
+--   DROP TABLE `monthly-pay-tax.pay_reports.gyomu_reports`;
+--   CREATE TABLE `monthly-pay-tax.pay_reports.gyomu_reports`
+--     COPY `monthly-pay-tax.pay_reports.gyomu_reports_bak_20261017`;
+--   （hojo_reports も同様。Cloud Run・views.sql も前の版に戻す）
+
+-- 型付き列の規則（cloud-run/typed_columns.py と同一）
+CREATE TEMP FUNCTION to_int64(s STRING) AS (
+  IF(REGEXP_CONTAINS(TRIM(s), r'^[+-]?[0-9]+$'), SAFE_CAST(TRIM(s) AS INT64), NULL)
+);
+CREATE TEMP FUNCTION hojo_year(s STRING) AS (
+  CASE
+    WHEN to_int64(s) BETWEEN 2020 AND 2030 THEN to_int64(s)
+    WHEN REGEXP_CONTAINS(s, r'^[0-9]{4}/[0-9]{1,2}/[0-9]{1,2}$')
+      THEN CAST(REGEXP_EXTRACT(s, r'^([0-9]{4})/') AS INT64)
+    WHEN to_int64(s) > 40000
+      THEN EXTRACT(YEAR FROM SAFE.DATE_ADD(DATE '1899-12-30', INTERVAL to_int64(s) DAY))
+  END
+);
+CREATE TEMP FUNCTION hojo_month(s STRING) AS (
+  CASE
+    WHEN to_int64(s) BETWEEN 1 AND 12 THEN to_int64(s)
+    WHEN REGEXP_CONTAINS(s, r'^[0-9]{4}/[0-9]{1,2}/[0-9]{1,2}$')
+      THEN CAST(REGEXP_EXTRACT(s, r'^[0-9]{4}/([0-9]{1,2})/') AS INT64)
+    WHEN to_int64(s) > 40000
+      THEN EXTRACT(MONTH FROM SAFE.DATE_ADD(DATE '1899-12-30', INTERVAL to_int64(s) DAY))
+  END
+);
+CREATE TEMP FUNCTION year_month(y INT64, m INT64) AS (
+  IF(m BETWEEN 1 AND 12, y * 100 + m, NULL)
+);
+
+
+-- ============================================================
+-- 1. gyomu_reports
+-- ============================================================
+CREATE OR REPLACE TABLE `monthly-pay-tax.pay_reports.gyomu_reports_new` (
+  source_url STRING NOT NULL,
+  year STRING,
+  date STRING,
+  day_of_week STRING,
+  activity_category STRING,
+  work_category STRING,
+  sponsor STRING,
+  description STRING,
+  unit_price STRING,
+  hours STRING,
+  amount STRING,
+  year_int INT64,
+  month_int INT64,
+  report_date DATE,
+  amount_numeric NUMERIC,
+  year_month INT64,
+  ingested_at TIMESTAMP NOT NULL
+)
+PARTITION BY RANGE_BUCKET(year_month, GENERATE_ARRAY(201501, 203501, 1))
+CLUSTER BY activity_category, source_url;
+
+-- year_int / month_int / report_date / amount_numeric は
+-- 2026-10-17_gyomu_typed_columns.sql でバックフィル済みのものをそのまま写す
+INSERT INTO `monthly-pay-tax.pay_reports.gyomu_reports_new`
+SELECT
+  source_url, year, date, day_of_week, activity_category, work_category, sponsor,
+  description, unit_price, hours, amount,
+  year_int, month_int, report_date, amount_numeric,
+  year_month(year_int, month_int) AS year_month,
+  ingested_at
+FROM `monthly-pay-tax.pay_reports.gyomu_reports`;
+
+-- 新テーブルが揃ってから旧テーブルを退避して差し替える
+CREATE TABLE `monthly-pay-tax.pay_reports.gyomu_reports_bak_20261017`
+  COPY `monthly-pay-tax.pay_reports.gyomu_reports`;
+
+DROP TABLE `monthly-pay-tax.pay_reports.gyomu_reports`;
+
+ALTER TABLE `monthly-pay-tax.pay_reports.gyomu_reports_new` RENAME TO gyomu_reports;
+
+
+-- ============================================================
+-- 2. hojo_reports
+-- ============================================================
+CREATE OR REPLACE TABLE `monthly-pay-tax.pay_reports.hojo_reports_new` (
+  source_url STRING NOT NULL,
+  year STRING,
+  month STRING,
+  hours STRING,
+  compensation STRING,
+  dx_subsidy STRING,
+  reimbursement STRING,
+  total_amount STRING,
+  monthly_complete STRING,
+  dx_receipt STRING,
+  expense_receipt STRING,
+  year_int INT64,
+  month_int INT64,
+  year_month INT64,
+  ingested_at TIMESTAMP NOT NULL
+)
+PARTITION BY RANGE_BUCKET(year_month, GENERATE_ARRAY(201501, 203501, 1))
+CLUSTER BY source_url;
+
+INSERT INTO `monthly-pay-tax.pay_reports.hojo_reports_new`
+SELECT
+  source_url, year, month, hours, compensation, dx_subsidy, reimbursement,
+  total_amount, monthly_complete, dx_receipt, expense_receipt,
+  hojo_year(year) AS year_int,
+  hojo_month(month) AS month_int,
+  year_month(hojo_year(year), hojo_month(month)) AS year_month,
+  ingested_at
+FROM `monthly-pay-tax.pay_reports.hojo_reports`;
+
+CREATE TABLE `monthly-pay-tax.pay_reports.hojo_reports_bak_20261017`
+  COPY `monthly-pay-tax.pay_reports.hojo_reports`;
+
+DROP TABLE `monthly-pay-tax.pay_reports.hojo_reports`;
+
+ALTER TABLE `monthly-pay-tax.pay_reports.hojo_reports_new` RENAME TO hojo_reports;
@@ -0,0 +1,60 @@
+-- ============================================================
+-- v_team_budget_actuals の実体化テーブル team_budget_actuals
+-- ============================================================
+-- 目的:
+--   v_team_budget_actuals は論理 VIEW のため、dashboard の load_team_budget_actuals /
+--   load_active_teams / load_active_leader_teams と Cloud Run の list_active_teams が
+--   呼ばれるたびに、予算の ROW_NUMBER 重複排除・gyomu_reports の集計・FULL OUTER JOIN・
+--   team_hierarchy との JOIN を全月分やり直していた。結果を物理テーブルに持ち、
+--   変化のあった年月だけを再計算する。
+--
+-- 設計判断:
+--   - 集計本体は views.sql の table function team_budget_actuals_for(months) に一本化。
+--     VIEW は months = NULL（全月）、テーブルは refresh_team_budget_actuals(months) が
+--     対象年月 (YYYYMM) の行を DELETE してから同じ関数で INSERT する → VIEW と行単位で一致。
+--   - 更新契機:
+--       * gyomu_reports の差分ロード（cloud-run bq_loader）: 内容の変わった source_url の
+--         新旧行の年月だけを、差分反映と同じトランザクション内で再計算
+--       * gyomu_reports の全件置換（BQ_DELTA_LOAD=false）・毎朝バッチの ?full=1: 全件
+--       * team_budgets の DML（dashboard 予算入力・scripts/upload_budgets.py）: その年月
+--       * team_hierarchy の DML（dashboard 階層設定・scripts/upload_team_hierarchy.py）:
+--         隊の所属・operating 判定が全月に効くため全件
+--   - 年月 m の行は予算・実額とも年月 m の行だけから決まる（FULL OUTER JOIN のキーに
+--     year, month を含む）ため、months で先に絞っても全件計算と同じ行になる。
+--
+-- デプロイ順序:
+--   1. views.sql 再適用（team_budget_actuals_for / refresh_team_budget_actuals / VIEW）
+--   2. 本 migration（テーブル作成 + 全件投入）
+--   3. Cloud Run / dashboard デプロイ（読み出し先をテーブルへ切替・更新呼び出し追加）
+--
+-- 実行コマンド（冪等。全件の作り直しにも使える）:
+--   bq query --use_legacy_sql=false --project_id=monthly-pay-tax \
+--     < infra/bigquery/migrations/2026-10-17_team_budget_actuals_table.sql
+--
+-- 事後検証（VIEW との差分。0 行であること）:
+--   bq query --use_legacy_sql=false \
+--     "(SELECT * FROM \`monthly-pay-tax.pay_reports.v_team_budget_actuals\`
+--       EXCEPT DISTINCT SELECT * FROM \`monthly-pay-tax.pay_reports.team_budget_actuals\`)
+--      UNION ALL
+--      (SELECT * FROM \`monthly-pay-tax.pay_reports.team_budget_actuals\`
+--       EXCEPT DISTINCT SELECT * FROM \`monthly-pay-tax.pay_reports.v_team_budget_actuals\`)"
+
+CREATE TABLE IF NOT EXISTS `monthly-pay-tax.pay_reports.team_budget_actuals` (
+  year INT64,
+  month INT64,
+  team STRING,
+  leader_team STRING,
+  actual_amount NUMERIC,
+  actual_count INT64,
+  reporter_count INT64,
+  budget_amount NUMERIC,
+  achievement_rate FLOAT64,
+  diff_amount NUMERIC,
+  has_budget BOOL,
+  has_actual BOOL
+)
+CLUSTER BY year, month, team;
+
+BEGIN TRANSACTION;
+CALL `monthly-pay-tax.pay_reports.refresh_team_budget_actuals`(NULL);
+COMMIT TRANSACTION;
@@ -0,0 +1,58 @@
+-- ============================================================
+-- 隊 × 年月の gyomu_reports 内容 hash テーブル team_month_hashes
+-- ============================================================
+-- 目的:
+--   隊月次評価の差分検知 (actual_data_hash) のため、cloud-run vertex_evaluator の
+--   compute_actual_data_hash / 月次一括版と dashboard の compute_current_hashes が、
+--   呼ばれるたびに対象月の gyomu_reports 全行の TO_JSON_STRING → SHA256 → STRING_AGG を
+--   やり直していた（outdated バッジ表示・評価スキップ判定のたび）。
+--   gyomu_reports が変わるのはロード時だけなので、hash もロード時に 1 回だけ計算して持つ。
+--
+-- 設計判断:
+--   - 計算本体は views.sql の table function team_month_hashes_for(months)。row_data の列・
+--     ORDER BY は従来の vertex_evaluator._HASH_SQL と同一（既存評価の actual_data_hash と
+--     ビット一致し、移行で全隊が outdated にならない）。
+--   - 更新は refresh_team_month_hashes(months) が対象年月 (YYYYMM) の行を DELETE して
+--     同じ関数で INSERT する。cloud-run bq_loader が gyomu_reports の差分ロードと同じ
+--     トランザクション内で、内容の変わった source_url の新旧行の年月だけを再計算する
+--     （全件置換・?full=1 は全件）。config.TEAM_MONTH_HASHES_REFRESH。
+--   - 行のない隊 × 年月はテーブルにも行がない。読み手は従来の IFNULL(..., '') と同じく '' とみなす。
+--   - budget_amount と PROMPT_VERSION は従来どおり読み出し時に Python 側
+--     (team_budget_hash.compose_actual_data_hash) で合成する。予算編集・プロンプト改訂では
+--     本テーブルの再計算は不要。
+--
+-- デプロイ順序:
+--   1. views.sql 再適用（team_month_hashes_for / refresh_team_month_hashes）
+--   2. 本 migration（テーブル作成 + 全件投入）
+--   3. Cloud Run / dashboard デプロイ（hash の読み出し先をテーブルへ切替・ロード時の更新追加）
+--
+-- 実行コマンド（冪等。全件の作り直しにも使える）:
+--   bq query --use_legacy_sql=false --project_id=monthly-pay-tax \
+--     < infra/bigquery/migrations/2026-10-17_team_month_hashes_table.sql
+--
+-- 事後検証（関数の全件計算との差分。0 行であること）:
+--   bq query --use_legacy_sql=false \
+--     "(SELECT year_month, team, data_hash
+--       FROM \`monthly-pay-tax.pay_reports.team_month_hashes_for\`(CAST(NULL AS ARRAY<INT64>))
+--       EXCEPT DISTINCT
+--       SELECT year_month, team, data_hash FROM \`monthly-pay-tax.pay_reports.team_month_hashes\`)
+--      UNION ALL
+--      (SELECT year_month, team, data_hash FROM \`monthly-pay-tax.pay_reports.team_month_hashes\`
+--       EXCEPT DISTINCT
+--       SELECT year_month, team, data_hash
+--       FROM \`monthly-pay-tax.pay_reports.team_month_hashes_for\`(CAST(NULL AS ARRAY<INT64>)))"
+--
+-- ロールバック:
+--   Cloud Run / dashboard を前の版に戻す（hash をその場計算に戻る）。テーブルは残しても無害。
+
+CREATE TABLE IF NOT EXISTS `monthly-pay-tax.pay_reports.team_month_hashes` (
+  year_month INT64 NOT NULL,
+  team STRING NOT NULL,
+  data_hash STRING NOT NULL,
+  computed_at TIMESTAMP NOT NULL
+)
+CLUSTER BY year_month, team;
+
+BEGIN TRANSACTION;
+CALL `monthly-pay-tax.pay_reports.refresh_team_month_hashes`(NULL);
+COMMIT TRANSACTION;
@@ -5,6 +5,9 @@
 -- bq mk --dataset --location=asia-northeast1 monthly-pay-tax:pay_reports
 
 -- 【都度入力】業務報告
+-- Cloud Run は gyomu_reports_staging（同スキーマ、ロード時に自動作成）へ全行をロードし、
+-- source_url 単位で内容が変わった行だけを1トランザクションで置換する（bq_loader.load_delta_to_bigquery）。
+-- hojo_reports も同様に hojo_reports_staging を経由する。
 CREATE TABLE IF NOT EXISTS `monthly-pay-tax.pay_reports.gyomu_reports` (
   source_url STRING NOT NULL,            -- 元スプレッドシートURL
   year STRING,                           -- 年
@@ -17,8 +20,19 @@ CREATE TABLE IF NOT EXISTS `monthly-pay-tax.pay_reports.gyomu_reports` (
   unit_price STRING,                     -- 業務単価（円/h）
   hours STRING,                          -- 所要時間（H）
   amount STRING,                         -- 金額
+  -- 型付き派生列: Cloud Run がロード時に上の STRING 列から計算（cloud-run/typed_columns.py）
+  year_int INT64,                        -- SAFE_CAST(year AS INT64)
+  month_int INT64,                       -- extract_month(date)
+  report_date DATE,                      -- parse_gyomu_date(year, date)。不正な日付は NULL
+  amount_numeric NUMERIC,                -- 金額から数字・小数点・符号以外を除いて NUMERIC 化
+  year_month INT64,                      -- year_int * 100 + month_int（月 1-12 のみ。パーティション列）
   ingested_at TIMESTAMP NOT NULL         -- データ取得日時
-);
+)
+-- 月指定のクエリは year_month = @year * 100 + @month で絞ると対象月の区画だけを読む。
+-- 既存テーブルの作り直しは infra/bigquery/migrations/2026-10-17_report_partitioning.sql 参照。
+-- 区画数は (203501 - 201501) / 1 = 2,000（上限 10,000。cloud-run/config.BQ_YEAR_MONTH_RANGE と一致）。
+PARTITION BY RANGE_BUCKET(year_month, GENERATE_ARRAY(201501, 203501, 1))
+CLUSTER BY activity_category, source_url;
 
 -- 【月１入力】補助＆立替報告＋月締め
 CREATE TABLE IF NOT EXISTS `monthly-pay-tax.pay_reports.hojo_reports` (
@@ -33,8 +47,14 @@ CREATE TABLE IF NOT EXISTS `monthly-pay-tax.pay_reports.hojo_reports` (
   monthly_complete STRING,               -- 当月入力完了フラグ
   dx_receipt STRING,                     -- DX補助用 領収書添付欄
   expense_receipt STRING,                -- 個人立替用 領収書添付欄
+  -- 型付き派生列: Cloud Run がロード時に year / month から計算（cloud-run/typed_columns.py）
+  year_int INT64,                        -- 数値年 / "YYYY/M/D" / 日付シリアル値を正規化
+  month_int INT64,                       -- 同上（月）
+  year_month INT64,                      -- year_int * 100 + month_int（月 1-12 のみ。パーティション列）
   ingested_at TIMESTAMP NOT NULL         -- データ取得日時
-);
+)
+PARTITION BY RANGE_BUCKET(year_month, GENERATE_ARRAY(201501, 203501, 1))
+CLUSTER BY source_url;
 
 -- タダメンMマスタ（メンバー情報、管理表 A:K 列）
 CREATE TABLE IF NOT EXISTS `monthly-pay-tax.pay_reports.members` (
@@ -196,6 +216,49 @@ CREATE TABLE IF NOT EXISTS `monthly-pay-tax.pay_reports.member_master` (
   ingested_at TIMESTAMP NOT NULL
 );
 
+-- 報告シート差分収集マニフェスト（Cloud Run が毎朝 WRITE_TRUNCATE で再生成）
+-- modified_time が Drive の modifiedTime と一致するシートは再取得せず rows_json を再利用する。
+CREATE TABLE IF NOT EXISTS `monthly-pay-tax.pay_reports.report_sheet_manifest` (
+  source_url STRING NOT NULL,            -- 報告シートURL（gyomu/hojo の source_url と同一）
+  spreadsheet_id STRING,                 -- スプレッドシートID
+  modified_time STRING,                  -- 取得時点の Drive modifiedTime（RFC3339）
+  rows_json STRING,                      -- {bq_table: [[B, C, ...], ...]}（URL付加前の取得行）
+  ingested_at TIMESTAMP NOT NULL         -- データ取得日時
+);
+
+-- 報告シート収集のチェックポイント（Cloud Run が取得済みシートを逐次 WRITE_APPEND）
+-- 中断した収集の再開（REPORT_CHECKPOINT_MAX_AGE_HOURS 以内の行）と、
+-- POST /sync/retry-failed での失敗シート（status = 'failed'）の再取得に使う。
+-- 収集完了時に今回の失敗シートだけへ置き換える（失敗なしなら TRUNCATE）。
+-- 追記ロードは全列 NULLABLE のスキーマで行うため、NOT NULL は付けない（モード不一致で追記が失敗する）。
+CREATE TABLE IF NOT EXISTS `monthly-pay-tax.pay_reports.report_sheet_checkpoint` (
+  source_url STRING,                     -- 報告シートURL
+  spreadsheet_id STRING,                 -- スプレッドシートID
+  modified_time STRING,                  -- 取得時点の Drive modifiedTime（RFC3339）
+  rows_json STRING,                      -- report_sheet_manifest と同形式
+  status STRING,                         -- "done"（完全取得）/ "failed"（タブ単位取得に落ちた）
+  ingested_at TIMESTAMP                  -- 追記日時（source_url ごとに最新行が有効）
+);
+
+-- 立替金シート差分収集マニフェスト（Cloud Run が毎朝 WRITE_TRUNCATE で再生成）
+-- modified_time が Drive の modifiedTime と一致するシートは再取得せず rows_json を再利用する。
+CREATE TABLE IF NOT EXISTS `monthly-pay-tax.pay_reports.reimbursement_sheet_manifest` (
+  spreadsheet_id STRING,                 -- スプレッドシートID
+  name STRING,                           -- ファイル名（changes フィード時のニックネームの元）
+  modified_time STRING,                  -- 取得時点の Drive modifiedTime（RFC3339）
+  tab_name STRING,                       -- 入力シートタブ名。読めなかったシートは空文字
+  rows_json STRING,                      -- [[A, B, ..., L], ...]（source_url / nickname 付加前）
+  ingested_at TIMESTAMP                  -- データ取得日時
+);
+
+-- 立替金フォルダの Drive changes フィード pageToken（1 行。Cloud Run が WRITE_TRUNCATE で更新）
+-- 立替金データとマニフェストの書き込み成功後にだけ進める（config.BQ_LOAD_AFTER）。
+-- 行がなければ次回はフォルダ一覧から全シートを確認する。
+CREATE TABLE IF NOT EXISTS `monthly-pay-tax.pay_reports.reimbursement_changes_token` (
+  page_token STRING,                     -- 次回 changes.list の pageToken
+  ingested_at TIMESTAMP                  -- 保存日時（最新行を使う）
+);
+
 -- WAM対象PJマスタ（WAM判定ルール）
 CREATE TABLE IF NOT EXISTS `monthly-pay-tax.pay_reports.wam_target_projects` (
   target_project STRING NOT NULL,
@@ -273,6 +336,76 @@ CREATE TABLE IF NOT EXISTS `monthly-pay-tax.pay_reports.team_monthly_eval` (
 -- 小規模テーブル（年間 24 隊 × 12 月 ≒ 288 行）のため CLUSTER のみで partition なし。
 CLUSTER BY year, month, team;
 
+-- 予実管理機能: v_team_budget_actuals の実体化テーブル（VIEW と同じ列・同じ行）。
+-- dashboard / Cloud Run の予実読み出しはこのテーブルを読む。更新は
+-- refresh_team_budget_actuals プロシージャ（views.sql）で年月単位に DELETE + INSERT。
+-- 詳細: infra/bigquery/migrations/2026-10-17_team_budget_actuals_table.sql
+CREATE TABLE IF NOT EXISTS `monthly-pay-tax.pay_reports.team_budget_actuals` (
+  year INT64,
+  month INT64,
+  team STRING,
+  leader_team STRING,
+  actual_amount NUMERIC,
+  actual_count INT64,
+  reporter_count INT64,
+  budget_amount NUMERIC,
+  achievement_rate FLOAT64,
+  diff_amount NUMERIC,
+  has_budget BOOL,
+  has_actual BOOL
+)
+-- 小規模テーブル（隊 × 月）のため team_monthly_eval と同じく CLUSTER のみ。
+CLUSTER BY year, month, team;
+
+-- 締め済み月の v_monthly_compensation 凍結スナップショット（VIEW の列 + year_month + frozen_at）。
+-- v_monthly_compensation はこのテーブルの締め済み月と、未締め月のその場計算を UNION ALL する。
+-- 作成・再凍結は freeze_monthly_compensation プロシージャ（views.sql）で年月単位に DELETE + INSERT。
+-- 詳細: infra/bigquery/migrations/2026-10-17_monthly_compensation_closed.sql
+CREATE TABLE IF NOT EXISTS `monthly-pay-tax.pay_reports.monthly_compensation_closed` (
+  year INT64,
+  month INT64,
+  member_id STRING,
+  nickname STRING,
+  full_name STRING,
+  is_corporate BOOL,
+  is_donation BOOL,
+  is_licensed BOOL,
+  report_url STRING,
+  work_hours FLOAT64,
+  hour_compensation FLOAT64,
+  travel_distance_km FLOAT64,
+  distance_compensation FLOAT64,
+  subtotal_compensation FLOAT64,
+  position_rate FLOAT64,
+  position_adjusted_compensation INT64,
+  qualification_allowance FLOAT64,
+  qualification_adjusted_compensation INT64,
+  withholding_target_amount FLOAT64,
+  withholding_tax INT64,
+  dx_subsidy FLOAT64,
+  reimbursement FLOAT64,
+  payment FLOAT64,
+  donation_payment INT64,
+  daily_wage_count INT64,
+  full_day_compensation FLOAT64,
+  total_work_hours FLOAT64,
+  year_month INT64 NOT NULL,              -- 凍結した年月 (YYYYMM)
+  frozen_at TIMESTAMP NOT NULL            -- 凍結（再凍結）日時
+)
+PARTITION BY RANGE_BUCKET(year_month, GENERATE_ARRAY(201501, 203501, 1))
+CLUSTER BY member_id;
+
+-- 隊月次評価の差分検知用: 隊 × 年月の gyomu_reports 内容 hash（actual_data_hash の BQ 側成分）。
+-- 更新は refresh_team_month_hashes プロシージャ（views.sql）で gyomu_reports のロード時に年月単位。
+-- 詳細: infra/bigquery/migrations/2026-10-17_team_month_hashes_table.sql
+CREATE TABLE IF NOT EXISTS `monthly-pay-tax.pay_reports.team_month_hashes` (
+  year_month INT64 NOT NULL,              -- YYYYMM
+  team STRING NOT NULL,                   -- gyomu_reports.activity_category
+  data_hash STRING NOT NULL,              -- team_month_hashes_for の hex digest
+  computed_at TIMESTAMP NOT NULL
+)
+CLUSTER BY year_month, team;
+
 -- 予実管理機能 PR-E: 支出カテゴリマスタ (7 行 seed)。
 -- team_budgets_quarterly の expense_category typo 防止のため JOIN 検証必須。
 -- 詳細: infra/bigquery/migrations/2026-06-11_quarterly_budgets.sql
@@ -7,7 +7,7 @@
 --   - 距離分離（自家用車使用の場合 hours → travel_distance_km）
 --   - 1立てフラグ（日給制）
 --   - 総稼働時間（全日稼働 +6h / 半日稼働 +3h）
---   - hojo の年月正規化（Excel シリアル値・日付文字列対応）
+--   - hojo の年月正規化（Excel シリアル値・日付文字列対応。Cloud Run がロード時に計算）
 
 -- ============================================================
 -- v_gyomu_enriched: 業務報告 + メンバー情報 + 加工フィールド
@@ -24,19 +24,17 @@ SELECT
   g.description,
   g.unit_price,
   g.amount,
+  -- ロード時計算の型付き列（cloud-run/typed_columns.py）
+  g.year_int,
+  g.report_date,
+  g.amount_numeric,
+  g.year_month,                          -- パーティション列（YYYYMM）。月指定の絞り込みはこの列で
   -- メンバー情報
   m.member_id,
   m.nickname,
   m.full_name,
-  -- 月抽出: "M/D" or "M月D日" 形式から月を取得
-  SAFE_CAST(
-    CASE
-      WHEN REGEXP_CONTAINS(g.date, r'^\d{1,2}/') THEN REGEXP_EXTRACT(g.date, r'^(\d{1,2})/')
-      WHEN REGEXP_CONTAINS(g.date, r'^\d{1,2}月') THEN REGEXP_EXTRACT(g.date, r'^(\d{1,2})月')
-      WHEN REGEXP_CONTAINS(g.date, r'^\d{4}/(\d{1,2})/') THEN REGEXP_EXTRACT(g.date, r'^\d{4}/(\d{1,2})/')
-      ELSE NULL
-    END AS INT64
-  ) AS month,
+  -- 月: "M/D" / "M月D日" / "YYYY/M/D" 形式から抽出済み（extract_month UDF と同一規則）
+  g.month_int AS month,
   -- 距離分離: 自家用車使用なら hours は移動距離
   CASE
     WHEN g.work_category = '自家用車使用' THEN NULL
@@ -82,30 +80,10 @@ SELECT
   m.member_id,
   m.nickname,
   m.full_name,
-  -- 年の正規化: 数値年 / 日付文字列 / Excel シリアル値を統一
-  SAFE_CAST(
-    CASE
-      WHEN SAFE_CAST(h.year AS INT64) BETWEEN 2020 AND 2030
-        THEN h.year
-      WHEN REGEXP_CONTAINS(h.year, r'^\d{4}/\d{1,2}/\d{1,2}$')
-        THEN REGEXP_EXTRACT(h.year, r'^(\d{4})/')
-      WHEN SAFE_CAST(h.year AS INT64) > 40000
-        THEN CAST(EXTRACT(YEAR FROM DATE_ADD(DATE '1899-12-30', INTERVAL CAST(h.year AS INT64) DAY)) AS STRING)
-      ELSE NULL
-    END AS INT64
-  ) AS year,
-  -- 月の正規化
-  SAFE_CAST(
-    CASE
-      WHEN SAFE_CAST(h.month AS INT64) BETWEEN 1 AND 12
-        THEN h.month
-      WHEN REGEXP_CONTAINS(h.month, r'^\d{4}/\d{1,2}/\d{1,2}$')
-        THEN REGEXP_EXTRACT(h.month, r'^\d{4}/(\d{1,2})/')
-      WHEN SAFE_CAST(h.month AS INT64) > 40000
-        THEN CAST(EXTRACT(MONTH FROM DATE_ADD(DATE '1899-12-30', INTERVAL CAST(h.month AS INT64) DAY)) AS STRING)
-      ELSE NULL
-    END AS INT64
-  ) AS month,
+  -- 年月: 数値 / 日付文字列 / Excel シリアル値をロード時に正規化済み（cloud-run/typed_columns.py）
+  h.year_int AS year,
+  h.month_int AS month,
+  h.year_month,                          -- パーティション列（YYYYMM）。月指定の絞り込みはこの列で
   h.ingested_at
 FROM `monthly-pay-tax.pay_reports.hojo_reports` h
 LEFT JOIN `monthly-pay-tax.pay_reports.members` m
@@ -118,29 +96,45 @@ LEFT JOIN `monthly-pay-tax.pay_reports.members` m
 -- メンバー × 年 × 月 で gyomu + hojo を集計し、
 -- 報酬計算 → 役職手当 → 資格手当 → 源泉徴収 → 支払い を算出。
 -- 源泉対象リスト（withholding_targets テーブル）を参照。
-CREATE OR REPLACE VIEW `monthly-pay-tax.pay_reports.v_monthly_compensation` AS
+--
+-- 計算本体は table function monthly_compensation_between(from, to) に持ち、
+-- 年月 (YYYYMM) が [from_year_month, to_year_month] の行だけを計算する（NULL は片側無制限）。
+-- 月が 1-12 以外の行（year_month NULL）は締めの対象外のため、上限なしの時だけ含める。
+-- 年月 m の行は年月 m の gyomu / hojo と、その時点の members / withholding_targets だけから決まる。
+--
+-- VIEW は締め済みの月を monthly_compensation_closed（凍結スナップショット）から、
+-- 未締めの月だけをその場で計算して UNION ALL する（読み手は VIEW 名のまま）。
+--   - 未締め = 当月を含む直近 3 か月。cloud-run/config.COMPENSATION_OPEN_MONTHS と一致させる
+--   - 凍結は毎朝バッチ（cloud-run bq_loader.freeze_closed_compensation）が締め済みの未凍結月に行う
+--   - 凍結後の訂正は POST /compensation/freeze {"months": [YYYYMM]} で再凍結
+--   - 直近に締まった 1 か月だけは、凍結されるまで VIEW がその場計算で補う（月替わり〜バッチの間）
+-- 詳細: infra/bigquery/migrations/2026-10-17_monthly_compensation_closed.sql
+CREATE OR REPLACE TABLE FUNCTION `monthly-pay-tax.pay_reports.monthly_compensation_between`(
+  from_year_month INT64, to_year_month INT64
+) AS (
 WITH
 -- ─── CTE 1: 業務報告の月別集計 ───
 gyomu_agg AS (
   SELECT
     g.source_url,
-    SAFE_CAST(g.year AS INT64) AS year,
+    g.year_int AS year,
     g.month,
+    g.year_month,
     -- K: 時間（自家用車使用以外）
     SUM(SAFE_CAST(g.work_hours AS FLOAT64)) AS work_hours,
     -- L: (時間)報酬 = 所要時間ありの金額合計
     SUM(CASE WHEN g.work_hours IS NOT NULL AND g.work_hours != ''
-         THEN SAFE_CAST(REGEXP_REPLACE(g.amount, r'[^0-9.\-]', '') AS FLOAT64) END) AS hour_compensation,
+         THEN CAST(g.amount_numeric AS FLOAT64) END) AS hour_compensation,
     -- M: 距離
     SUM(SAFE_CAST(g.travel_distance_km AS FLOAT64)) AS travel_distance_km,
     -- N: (距離)報酬 = 移動距離ありの金額合計
     SUM(CASE WHEN g.travel_distance_km IS NOT NULL AND g.travel_distance_km != ''
-         THEN SAFE_CAST(REGEXP_REPLACE(g.amount, r'[^0-9.\-]', '') AS FLOAT64) END) AS distance_compensation,
+         THEN CAST(g.amount_numeric AS FLOAT64) END) AS distance_compensation,
     -- AB: 1立て件数
     SUM(g.daily_wage_flag) AS daily_wage_count,
     -- AC: 全日稼働の報酬（1立て報酬）
     SUM(CASE WHEN REGEXP_CONTAINS(g.work_category, r'全日稼働')
-         THEN SAFE_CAST(REGEXP_REPLACE(g.amount, r'[^0-9.\-]', '') AS FLOAT64) END) AS full_day_compensation,
+         THEN CAST(g.amount_numeric AS FLOAT64) END) AS full_day_compensation,
     -- AD: 総稼働時間（1立て込み）
     SUM(g.total_work_hours) AS total_work_hours,
     -- 源泉対象業務分類のみの金額合計（士業以外用）
@@ -148,10 +142,15 @@ gyomu_agg AS (
            SELECT DISTINCT work_category
            FROM `monthly-pay-tax.pay_reports.withholding_targets`
            WHERE licensed_member_id IS NULL
-         ) THEN SAFE_CAST(REGEXP_REPLACE(g.amount, r'[^0-9.\-]', '') AS FLOAT64) END) AS withholding_eligible_amount
+         ) THEN CAST(g.amount_numeric AS FLOAT64) END) AS withholding_eligible_amount
   FROM `monthly-pay-tax.pay_reports.v_gyomu_enriched` g
-  WHERE g.year IS NOT NULL AND g.month IS NOT NULL
-  GROUP BY g.source_url, SAFE_CAST(g.year AS INT64), g.month
+  WHERE g.year_int IS NOT NULL AND g.month IS NOT NULL
+    AND (
+      (from_year_month IS NULL OR g.year_month >= from_year_month)
+        AND (to_year_month IS NULL OR g.year_month <= to_year_month)
+      OR (g.year_month IS NULL AND to_year_month IS NULL)
+    )
+  GROUP BY g.source_url, g.year_int, g.month, g.year_month
 ),
 
 -- ─── CTE 2: 補助報告の月別集計 ───
@@ -160,13 +159,19 @@ hojo_agg AS (
     h.source_url,
     h.year,
     h.month,
+    h.year_month,
     -- V: DX補助
     SUM(SAFE_CAST(REGEXP_REPLACE(NULLIF(h.dx_subsidy, ''), r'[^0-9.\-]', '') AS FLOAT64)) AS dx_subsidy,
     -- W: 立替
     SUM(SAFE_CAST(REGEXP_REPLACE(NULLIF(h.reimbursement, ''), r'[^0-9.\-]', '') AS FLOAT64)) AS reimbursement
   FROM `monthly-pay-tax.pay_reports.v_hojo_enriched` h
   WHERE h.year IS NOT NULL AND h.month IS NOT NULL
-  GROUP BY h.source_url, h.year, h.month
+    AND (
+      (from_year_month IS NULL OR h.year_month >= from_year_month)
+        AND (to_year_month IS NULL OR h.year_month <= to_year_month)
+      OR (h.year_month IS NULL AND to_year_month IS NULL)
+    )
+  GROUP BY h.source_url, h.year, h.month, h.year_month
 ),
 
 -- ─── CTE 3: メンバー属性（法人/寄付/士業フラグ） ───
@@ -215,9 +220,9 @@ member_attrs AS (
 
 -- ─── CTE 4: gyomu と hojo のキー統合 ───
 all_keys AS (
-  SELECT source_url, year, month FROM gyomu_agg
+  SELECT source_url, year, month, year_month FROM gyomu_agg
   UNION DISTINCT
-  SELECT source_url, year, month FROM hojo_agg
+  SELECT source_url, year, month, year_month FROM hojo_agg
 ),
 
 -- ─── CTE 5: 基本計算（小計 → 役職手当 → 資格手当加算） ───
@@ -225,6 +230,7 @@ base_calc AS (
   SELECT
     k.year,
     k.month,
+    k.year_month,
     ma.member_id,
     ma.nickname,
     ma.full_name,
@@ -354,13 +360,94 @@ SELECT
   -- AC: 1立て報酬（全日稼働分）
   t.full_day_compensation,
   -- AD: 総稼働時間
-  t.total_work_hours
+  t.total_work_hours,
+
+  -- 年月 (YYYYMM)。月が 1-12 以外は NULL。VIEW では出力しない
+  t.year_month
 
 FROM with_tax t
 WHERE t.qualification_adjusted > 0
    OR t.dx_subsidy > 0
    OR t.reimbursement > 0
-   OR t.work_hours > 0;
+   OR t.work_hours > 0
+);
+
+
+-- 締め境界 (未締めの最初の年月 YYYYMM) = 当月の 2 か月前。両側で同じ式を定数として使い、
+-- スナップショット・gyomu_reports / hojo_reports とも年月パーティションで絞り込ませる。
+-- 3 本目は直近に締まった 1 か月（境界の前月）だけの安全網。月替わりの 0 時から毎朝バッチの
+-- 凍結までの間、その月がまだスナップショットに無ければその場計算で補う。範囲は定数なので
+-- 報告テーブル・スナップショットとも 1 区画しか読まない。それより前の未凍結月は VIEW では補わず、
+-- 毎朝バッチ Step8 / POST /compensation/freeze が未凍結の締め済み月として凍結する。
+CREATE OR REPLACE VIEW `monthly-pay-tax.pay_reports.v_monthly_compensation` AS
+WITH frozen AS (
+  SELECT *
+  FROM `monthly-pay-tax.pay_reports.monthly_compensation_closed`
+  WHERE year_month < CAST(FORMAT_DATE(
+    '%Y%m', DATE_SUB(DATE_TRUNC(CURRENT_DATE('Asia/Tokyo'), MONTH), INTERVAL 2 MONTH)) AS INT64)
+)
+SELECT * EXCEPT (year_month, frozen_at)
+FROM frozen
+UNION ALL
+SELECT * EXCEPT (year_month)
+FROM `monthly-pay-tax.pay_reports.monthly_compensation_between`(
+  CAST(FORMAT_DATE(
+    '%Y%m', DATE_SUB(DATE_TRUNC(CURRENT_DATE('Asia/Tokyo'), MONTH), INTERVAL 2 MONTH)) AS INT64),
+  NULL
+)
+UNION ALL
+SELECT * EXCEPT (year_month)
+FROM `monthly-pay-tax.pay_reports.monthly_compensation_between`(
+  CAST(FORMAT_DATE(
+    '%Y%m', DATE_SUB(DATE_TRUNC(CURRENT_DATE('Asia/Tokyo'), MONTH), INTERVAL 3 MONTH)) AS INT64),
+  CAST(FORMAT_DATE(
+    '%Y%m', DATE_SUB(DATE_TRUNC(CURRENT_DATE('Asia/Tokyo'), MONTH), INTERVAL 3 MONTH)) AS INT64)
+)
+WHERE NOT EXISTS (
+  SELECT 1
+  FROM frozen
+  WHERE year_month = CAST(FORMAT_DATE(
+    '%Y%m', DATE_SUB(DATE_TRUNC(CURRENT_DATE('Asia/Tokyo'), MONTH), INTERVAL 3 MONTH)) AS INT64)
+);
+
+
+-- ============================================================
+-- freeze_monthly_compensation: 締め済み月の報酬スナップショット作成
+-- ============================================================
+-- months (YYYYMM の配列) の行を monthly_compensation_closed から削除して、
+-- monthly_compensation_between で計算し直した結果を入れる（同じ月の再実行 = 再凍結）。
+-- NULL / 空配列は何もしない。トランザクションは呼び出し側で張る。
+-- 呼び出し元: cloud-run bq_loader.freeze_closed_compensation（毎朝バッチ / POST /compensation/freeze）
+CREATE OR REPLACE PROCEDURE `monthly-pay-tax.pay_reports.freeze_monthly_compensation`(
+  months ARRAY<INT64>
+)
+BEGIN
+  DECLARE from_ym INT64 DEFAULT (SELECT MIN(m) FROM UNNEST(months) AS m);
+  DECLARE to_ym INT64 DEFAULT (SELECT MAX(m) FROM UNNEST(months) AS m);
+  IF ARRAY_LENGTH(months) > 0 THEN
+    DELETE FROM `monthly-pay-tax.pay_reports.monthly_compensation_closed`
+    WHERE year_month IN UNNEST(months);
+    INSERT INTO `monthly-pay-tax.pay_reports.monthly_compensation_closed` (
+      year, month, member_id, nickname, full_name, is_corporate, is_donation, is_licensed,
+      report_url, work_hours, hour_compensation, travel_distance_km, distance_compensation,
+      subtotal_compensation, position_rate, position_adjusted_compensation,
+      qualification_allowance, qualification_adjusted_compensation,
+      withholding_target_amount, withholding_tax, dx_subsidy, reimbursement, payment,
+      donation_payment, daily_wage_count, full_day_compensation, total_work_hours,
+      year_month, frozen_at
+    )
+    SELECT
+      year, month, member_id, nickname, full_name, is_corporate, is_donation, is_licensed,
+      report_url, work_hours, hour_compensation, travel_distance_km, distance_compensation,
+      subtotal_compensation, position_rate, position_adjusted_compensation,
+      qualification_allowance, qualification_adjusted_compensation,
+      withholding_target_amount, withholding_tax, dx_subsidy, reimbursement, payment,
+      donation_payment, daily_wage_count, full_day_compensation, total_work_hours,
+      year_month, CURRENT_TIMESTAMP()
+    FROM `monthly-pay-tax.pay_reports.monthly_compensation_between`(from_ym, to_ym)
+    WHERE year_month IN UNNEST(months);
+  END IF;
+END;
 
 
 -- =============================================================================
@@ -419,9 +506,10 @@ WHERE member_seq = 1;
 -- ============================================================
 -- extract_month UDF: gyomu_reports.date の複数形式から月を INT64 抽出
 -- ============================================================
--- v_team_budget_actuals と Cloud Run の hash 計算 SQL で共通使用。
+-- gyomu_reports.month_int のバックフィル（migrations/2026-10-17_gyomu_typed_columns.sql）で使用。
+-- ロード時は cloud-run/typed_columns.extract_month が同じ規則で month_int を計算する。
 -- YYYY/M/D 形式を最優先で判定（先頭 2 桁誤マッチを回避）。
--- 既存 v_gyomu_enriched の月抽出ロジックは互換性のため触らない。
+-- v_gyomu_enriched の旧月抽出（判定順のみ異なり結果は同一）も month_int に統一済み。
 -- 詳細: docs/specs/2026-06-10-team-budget-eval-design.md §4.1
 CREATE OR REPLACE FUNCTION `monthly-pay-tax.pay_reports.extract_month`(date_str STRING)
 AS (
@@ -447,7 +535,14 @@ AS (
 --   - leader_team 列を出力 (UI で統括隊集計に使用、PR-A)
 -- 詳細: docs/specs/2026-06-10-team-budget-eval-design.md §4.4
 --       docs/specs/2026-06-12-team-budget-leader-team-restructure.md §3.1
-CREATE OR REPLACE VIEW `monthly-pay-tax.pay_reports.v_team_budget_actuals` AS
+--
+-- 集計本体は table function team_budget_actuals_for(months) に持ち、VIEW は全月分
+-- (months = NULL)。物理テーブル team_budget_actuals は refresh_team_budget_actuals
+-- プロシージャが同じ関数で対象年月 (YYYYMM) だけ再計算するため、VIEW と行単位で一致する。
+-- 年月 m の行は予算・実額とも年月 m の行だけから決まるので、months で先に絞っても同じ結果。
+CREATE OR REPLACE TABLE FUNCTION `monthly-pay-tax.pay_reports.team_budget_actuals_for`(
+  months ARRAY<INT64>
+) AS (
 WITH budgets_latest AS (
   SELECT * EXCEPT(rn)
   FROM (
@@ -455,28 +550,30 @@ WITH budgets_latest AS (
       PARTITION BY year, month, team ORDER BY updated_at DESC, version DESC
     ) AS rn
     FROM `monthly-pay-tax.pay_reports.team_budgets`
+    WHERE months IS NULL OR year * 100 + month IN UNNEST(months)
   )
   WHERE rn = 1
 ),
 actuals_agg AS (
-  -- subquery で year/month を pre-compute し WHERE で filter（GROUP BY 前に prune してコスト削減）
+  -- year/month/金額はロード時計算の型付き列を読む（GROUP BY 前に WHERE で prune）
+  -- 2026/05 以降の条件はパーティション列 year_month の定数比較で書き、それ以前の区画を読まない
+  -- （year_month は月 1-12 の行だけ非 NULL）
   SELECT year, month, team,
          SUM(amount_numeric) AS actual_amount,
          COUNT(*) AS actual_count,
          COUNT(DISTINCT source_url) AS reporter_count
   FROM (
     SELECT
-      SAFE_CAST(g.year AS INT64) AS year,
-      `monthly-pay-tax.pay_reports.extract_month`(g.date) AS month,
+      g.year_int AS year,
+      g.month_int AS month,
       g.activity_category AS team,
-      SAFE_CAST(REGEXP_REPLACE(g.amount, r'[^0-9.-]', '') AS NUMERIC) AS amount_numeric,
+      g.amount_numeric,
       g.source_url
     FROM `monthly-pay-tax.pay_reports.gyomu_reports` g
-    WHERE g.activity_category IS NOT NULL AND g.activity_category != ''
+    WHERE g.year_month >= 202605
+      AND (months IS NULL OR g.year_month IN UNNEST(months))
+      AND g.activity_category IS NOT NULL AND g.activity_category != ''
   )
-  WHERE year IS NOT NULL AND month IS NOT NULL
-    AND month BETWEEN 1 AND 12
-    AND (year > 2026 OR (year = 2026 AND month >= 5))
   GROUP BY year, month, team
 ),
 combined AS (
@@ -511,7 +608,102 @@ SELECT
 FROM combined c
 INNER JOIN `monthly-pay-tax.pay_reports.team_hierarchy` h
   ON c.team = h.activity_category
-WHERE h.leader_team_type = 'operating';
+WHERE h.leader_team_type = 'operating'
+);
+
+CREATE OR REPLACE VIEW `monthly-pay-tax.pay_reports.v_team_budget_actuals` AS
+SELECT * FROM `monthly-pay-tax.pay_reports.team_budget_actuals_for`(CAST(NULL AS ARRAY<INT64>));
+
+
+-- ============================================================
+-- refresh_team_budget_actuals: 物理テーブル team_budget_actuals の年月単位再計算
+-- ============================================================
+-- months (YYYYMM の配列) の行を削除して team_budget_actuals_for(months) で入れ直す。
+-- NULL なら全件を作り直す。トランザクションは呼び出し側で張る
+-- (gyomu_reports の差分ロードは同じトランザクション内で呼び、変わった年月だけを反映する)。
+-- 呼び出し元:
+--   - cloud-run bq_loader: gyomu_reports ロード後（差分ロードは変化した年月、全件置換は全件）
+--   - dashboard lib/team_budget_actuals_repo: 予算 (team_budgets) / 階層 (team_hierarchy) の DML 後
+--   - scripts/upload_budgets.py / upload_team_hierarchy.py: MERGE 後
+CREATE OR REPLACE PROCEDURE `monthly-pay-tax.pay_reports.refresh_team_budget_actuals`(
+  months ARRAY<INT64>
+)
+BEGIN
+  DELETE FROM `monthly-pay-tax.pay_reports.team_budget_actuals`
+  WHERE months IS NULL OR year * 100 + month IN UNNEST(months);
+  INSERT INTO `monthly-pay-tax.pay_reports.team_budget_actuals` (
+    year, month, team, leader_team, actual_amount, actual_count, reporter_count,
+    budget_amount, achievement_rate, diff_amount, has_budget, has_actual
+  )
+  SELECT
+    year, month, team, leader_team, actual_amount, actual_count, reporter_count,
+    budget_amount, achievement_rate, diff_amount, has_budget, has_actual
+  FROM `monthly-pay-tax.pay_reports.team_budget_actuals_for`(months);
+END;
+
+
+-- ============================================================
+-- team_month_hashes_for: 隊 × 年月の gyomu_reports 内容 hash
+-- ============================================================
+-- 隊月次評価の差分検知 (actual_data_hash) の BQ 側成分。cloud-run vertex_evaluator と
+-- dashboard compute_current_hashes はこの結果を実体化した team_month_hashes を引き、
+-- team_budgets.budget_amount と PROMPT_VERSION を Python 側 (compose_actual_data_hash) で合成する。
+-- row_data の列・ORDER BY (row_json の tie-breaker 含む) は評価済み行の actual_data_hash と
+-- ビット一致させるため変えないこと。行のない隊 × 年月はテーブルに行を持たず、読み手が '' とみなす。
+-- 詳細: infra/bigquery/migrations/2026-10-17_team_month_hashes_table.sql
+CREATE OR REPLACE TABLE FUNCTION `monthly-pay-tax.pay_reports.team_month_hashes_for`(
+  months ARRAY<INT64>
+) AS (
+WITH row_data AS (
+  SELECT
+    g.year_month,
+    g.activity_category AS team,
+    TO_JSON_STRING(STRUCT(
+      g.activity_category, g.date, g.source_url, g.work_category, g.sponsor,
+      g.description, g.unit_price, g.hours, g.amount
+    )) AS row_json,
+    TO_HEX(SHA256(TO_JSON_STRING(STRUCT(
+      g.activity_category, g.date, g.source_url, g.work_category, g.sponsor,
+      g.description, g.unit_price, g.hours, g.amount
+    )))) AS row_hash
+  FROM `monthly-pay-tax.pay_reports.gyomu_reports` g
+  WHERE g.year_month IS NOT NULL
+    AND g.activity_category IS NOT NULL
+    AND (months IS NULL OR g.year_month IN UNNEST(months))
+)
+-- ORDER BY に row_json を tie-breaker として加える: 9 列すべて同値の重複行が
+-- ある場合 row_hash 単独では順序不定 → hash が計算ごとに揺れる。
+SELECT
+  year_month,
+  team,
+  IFNULL(
+    TO_HEX(SHA256(STRING_AGG(row_hash, '' ORDER BY row_hash, row_json))),
+    ''
+  ) AS data_hash
+FROM row_data
+GROUP BY year_month, team
+);
+
+
+-- ============================================================
+-- refresh_team_month_hashes: 物理テーブル team_month_hashes の年月単位再計算
+-- ============================================================
+-- months (YYYYMM の配列) の行を削除して team_month_hashes_for(months) で入れ直す。
+-- NULL なら全件を作り直す。トランザクションは呼び出し側で張る。
+-- 呼び出し元: cloud-run bq_loader の gyomu_reports ロード（差分ロードは変化した年月を
+-- 差分反映と同じトランザクション内で、全件置換は全件）。
+CREATE OR REPLACE PROCEDURE `monthly-pay-tax.pay_reports.refresh_team_month_hashes`(
+  months ARRAY<INT64>
+)
+BEGIN
+  DELETE FROM `monthly-pay-tax.pay_reports.team_month_hashes`
+  WHERE months IS NULL OR year_month IN UNNEST(months);
+  INSERT INTO `monthly-pay-tax.pay_reports.team_month_hashes` (
+    year_month, team, data_hash, computed_at
+  )
+  SELECT year_month, team, data_hash, CURRENT_TIMESTAMP()
+  FROM `monthly-pay-tax.pay_reports.team_month_hashes_for`(months);
+END;
 
 
 -- ============================================================
@@ -549,18 +741,17 @@ gyomu_parsed AS (
     fq.fiscal_year,
     fq.fiscal_quarter,
     th.leader_team,
-    SAFE_CAST(REGEXP_REPLACE(g.amount, r'[^0-9.-]', '') AS NUMERIC) AS parsed_amount
+    g.amount_numeric AS parsed_amount
   FROM `monthly-pay-tax.pay_reports.gyomu_reports` g
   JOIN `monthly-pay-tax.pay_reports.team_hierarchy` th
     ON g.activity_category = th.activity_category
   CROSS JOIN UNNEST([`monthly-pay-tax.pay_reports.fiscal_quarter`(
-    SAFE_CAST(g.year AS INT64),
-    `monthly-pay-tax.pay_reports.extract_month`(g.date)
+    g.year_int, g.month_int
   )]) AS fq
   WHERE g.activity_category IS NOT NULL AND g.activity_category != ''
-    AND SAFE_CAST(g.year AS INT64) IS NOT NULL
-    AND `monthly-pay-tax.pay_reports.extract_month`(g.date) IS NOT NULL
-    AND `monthly-pay-tax.pay_reports.extract_month`(g.date) BETWEEN 1 AND 12
+    AND g.year_int IS NOT NULL
+    AND g.month_int IS NOT NULL
+    AND g.month_int BETWEEN 1 AND 12
     AND th.leader_team_type = 'operating'
 ),
 gyomu_actuals AS (
@@ -0,0 +1,56 @@
+"""年月パーティション (RANGE_BUCKET) を持つテーブル定義と report_partitioning migration の構造検証テスト。
+
+- 区画数 (end - start) / interval が BigQuery の上限 10,000 以内で、
+  cloud-run/config.BQ_YEAR_MONTH_RANGE (201501, 203501) と一致すること
+- migration は新テーブルの作成・投入が済むまで旧テーブルを DROP しないこと
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import pytest
+
+_BQ_DIR = Path(__file__).resolve().parents[2] / "infra" / "bigquery"
+_MIGRATION_PATH = _BQ_DIR / "migrations" / "2026-10-17_report_partitioning.sql"
+_RANGE_RE = re.compile(
+    r"RANGE_BUCKET\(\s*year_month\s*,\s*GENERATE_ARRAY\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\)\s*\)"
+)
+_MAX_PARTITIONS = 10000
+
+
+def _ranges(path: Path) -> list[tuple[int, int, int]]:
+    return [tuple(map(int, m)) for m in _RANGE_RE.findall(path.read_text(encoding="utf-8"))]
+
+
+@pytest.mark.parametrize("path", [
+    _BQ_DIR / "schema.sql",
+    _MIGRATION_PATH,
+    _BQ_DIR / "migrations" / "2026-10-17_monthly_compensation_closed.sql",
+], ids=lambda p: p.name)
+def test_partition_ranges_within_limit(path: Path):
+    ranges = _ranges(path)
+    assert ranges
+    for start, end, interval in ranges:
+        assert (start, end, interval) == (201501, 203501, 1)
+        assert (end - start) // interval <= _MAX_PARTITIONS
+
+
+@pytest.fixture(scope="module")
+def migration_text() -> str:
+    """コメント行（ヘッダのロールバック手順など）を除いた migration 本体。"""
+    lines = _MIGRATION_PATH.read_text(encoding="utf-8").splitlines()
+    return "\n".join(line for line in lines if not line.lstrip().startswith("--"))
+
+
+@pytest.mark.parametrize("table", ["gyomu_reports", "hojo_reports"])
+def test_old_table_dropped_only_after_new_table_is_filled(migration_text: str, table: str):
+    table_id = f"`monthly-pay-tax.pay_reports.{table}`"
+    new_id = f"`monthly-pay-tax.pay_reports.{table}_new`"
+    create_new = migration_text.index(f"CREATE OR REPLACE TABLE {new_id}")
+    insert_new = migration_text.index(f"INSERT INTO {new_id}")
+    backup = migration_text.index(f"COPY {table_id}")
+    drop = migration_text.index(f"DROP TABLE {table_id}")
+    rename = migration_text.index(f"ALTER TABLE {new_id} RENAME TO {table};")
+    assert create_new < insert_new < backup < drop < rename
@@ -0,0 +1,63 @@
+"""migration 2026-10-17_team_month_hashes_table.sql と views.sql の hash 計算の構造検証テスト。
+
+team_month_hashes の data_hash は既存評価 (team_monthly_eval.actual_data_hash) の BQ 側成分と
+ビット一致する必要がある。従来 cloud-run / dashboard がその場計算していた SQL と
+row_data の列・集約順序が変わっていないことを機械検証する。
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import pytest
+
+_BQ_DIR = Path(__file__).resolve().parents[2] / "infra" / "bigquery"
+_MIGRATION_PATH = _BQ_DIR / "migrations" / "2026-10-17_team_month_hashes_table.sql"
+
+# 従来の vertex_evaluator._HASH_SQL / dashboard compute_current_hashes の row_data 列
+_ROW_STRUCT = (
+    "g.activity_category, g.date, g.source_url, g.work_category, g.sponsor, "
+    "g.description, g.unit_price, g.hours, g.amount"
+)
+
+
+def _squash(text: str) -> str:
+    return re.sub(r"\s+", " ", text)
+
+
+@pytest.fixture(scope="module")
+def function_body() -> str:
+    """views.sql の team_month_hashes_for 定義部分。"""
+    sql = (_BQ_DIR / "views.sql").read_text(encoding="utf-8")
+    start = sql.index("TABLE FUNCTION `monthly-pay-tax.pay_reports.team_month_hashes_for`")
+    end = sql.index("PROCEDURE `monthly-pay-tax.pay_reports.refresh_team_month_hashes`")
+    return _squash(sql[start:end])
+
+
+class TestHashFunction:
+    def test_row_json_and_row_hash_use_same_columns(self, function_body: str):
+        assert f"TO_JSON_STRING(STRUCT( {_ROW_STRUCT} )) AS row_json" in function_body
+        assert (
+            f"TO_HEX(SHA256(TO_JSON_STRING(STRUCT( {_ROW_STRUCT} )))) AS row_hash"
+            in function_body
+        )
+
+    def test_aggregation_keeps_row_json_tie_breaker(self, function_body: str):
+        """同一 row_hash 重複時の順序不定を防ぐため、ORDER BY に row_json を含む"""
+        assert (
+            "IFNULL( TO_HEX(SHA256(STRING_AGG(row_hash, '' ORDER BY row_hash, row_json))), '' )"
+            in function_body
+        )
+        assert "GROUP BY year_month, team" in function_body
+
+    def test_filters_by_partition_column(self, function_body: str):
+        assert "months IS NULL OR g.year_month IN UNNEST(months)" in function_body
+
+
+class TestMigration:
+    def test_creates_table_and_rebuilds_all(self):
+        sql = _squash(_MIGRATION_PATH.read_text(encoding="utf-8"))
+        assert "CREATE TABLE IF NOT EXISTS `monthly-pay-tax.pay_reports.team_month_hashes`" in sql
+        assert "CLUSTER BY year_month, team" in sql
+        assert "CALL `monthly-pay-tax.pay_reports.refresh_team_month_hashes`(NULL)" in sql
@@ -6,6 +6,7 @@
 - preview_changes の新規/更新/変更なし判定
 - do_merge_single の MERGE SQL パラメータ構築 (optimistic / force)
 - merge_in_batches の skipped (lock 競合) / failed のカウント
+- team_budget_actuals 再計算の対象年月と失敗時の継続
 - resolve_actor の優先順位
 
 BQ client / API には接続せず、google.cloud.bigquery のクラスは MagicMock で差し替える。
@@ -279,6 +280,51 @@ def test_merge_in_batches_skips_unchanged_rows(monkeypatch):
     assert merge_calls == [(2026, 5, "B")]  # UNCHANGED の A は呼ばれない
 
 
+# --- team_budget_actuals 再計算 ---
+
+
+def test_changed_year_months_excludes_unchanged_rows():
+    rows = [
+        ub.BudgetRow(2026, 6, "A", 100, None),
+        ub.BudgetRow(2026, 5, "B", 200, None),
+        ub.BudgetRow(2026, 5, "C", 300, None),
+        ub.BudgetRow(2026, 7, "D", 400, None),
+    ]
+    preview = ub.PreviewResult(new_count=2, update_count=1, unchanged_count=1,
+                               details=[("new", rows[0], None),
+                                        ("update", rows[1], {"version": 1}),
+                                        ("new", rows[2], None),
+                                        ("unchanged", rows[3], {"version": 1})])
+
+    assert ub.changed_year_months(rows, preview) == [202605, 202606]
+
+
+def test_refresh_team_budget_actuals_calls_procedure_with_months():
+    client = MagicMock()
+
+    assert ub.refresh_team_budget_actuals(client, [202605, 202606]) is True
+
+    sql = client.query.call_args[0][0]
+    assert "BEGIN TRANSACTION" in sql
+    assert "refresh_team_budget_actuals`(@months)" in sql
+    param = client.query.call_args[1]["job_config"].query_parameters[0]
+    assert (param.name, param.values) == ("months", [202605, 202606])
+
+
+def test_refresh_team_budget_actuals_failure_only_warns(capsys):
+    client = MagicMock()
+    client.query.return_value.result.side_effect = RuntimeError("boom")
+
+    assert ub.refresh_team_budget_actuals(client, [202605]) is False
+    assert "WARN" in capsys.readouterr().err
+
+
+def test_refresh_team_budget_actuals_noop_without_months():
+    client = MagicMock()
+    assert ub.refresh_team_budget_actuals(client, []) is True
+    client.query.assert_not_called()
+
+
 # --- resolve_actor ---
 
 
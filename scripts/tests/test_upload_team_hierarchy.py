@@ -6,6 +6,7 @@
 - preview_changes: 新規/更新/変更なし判定 (leader_team / leader_team_type / note 変更)
 - do_merge_single: MERGE SQL パラメータ構築 (optimistic / force)
 - merge_in_batches: skipped (lock 競合) / failed のカウント、UNCHANGED 行スキップ
+- refresh_team_budget_actuals: 全件再計算の呼び出しと失敗時の継続
 - resolve_actor: 優先順位
 
 BQ client は MagicMock で差し替え。
@@ -288,6 +289,27 @@ def test_check_coverage_zero_when_clean():
     assert (unmapped, unused) == (0, 0)
 
 
+# --- team_budget_actuals 再計算 ---
+
+
+def test_refresh_team_budget_actuals_rebuilds_all_months():
+    client = MagicMock()
+
+    assert uth.refresh_team_budget_actuals(client) is True
+
+    sql = client.query.call_args[0][0]
+    assert "BEGIN TRANSACTION" in sql
+    assert "refresh_team_budget_actuals`(NULL)" in sql
+
+
+def test_refresh_team_budget_actuals_failure_only_warns(capsys):
+    client = MagicMock()
+    client.query.return_value.result.side_effect = RuntimeError("boom")
+
+    assert uth.refresh_team_budget_actuals(client) is False
+    assert "WARN" in capsys.readouterr().err
+
+
 # --- resolve_actor ---
 
 
@@ -0,0 +1,38 @@
+"""views.sql の v_monthly_compensation（締め済みスナップショット + 未締めその場計算）の構造検証テスト。"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import pytest
+
+_VIEWS_PATH = Path(__file__).resolve().parents[2] / "infra" / "bigquery" / "views.sql"
+
+
+@pytest.fixture(scope="module")
+def view_sql() -> str:
+    sql = _VIEWS_PATH.read_text(encoding="utf-8")
+    start = sql.index("CREATE OR REPLACE VIEW `monthly-pay-tax.pay_reports.v_monthly_compensation`")
+    end = sql.index(";", start)
+    return re.sub(r"\s+", " ", sql[start:end])
+
+
+_LAST_CLOSED = (
+    "CAST(FORMAT_DATE( '%Y%m', DATE_SUB(DATE_TRUNC(CURRENT_DATE('Asia/Tokyo'), MONTH),"
+    " INTERVAL 3 MONTH)) AS INT64)"
+)
+
+
+def test_only_last_closed_month_falls_back_to_live_calculation(view_sql: str):
+    """未凍結の締め済み月の補完は直近に締まった 1 か月だけ（定数範囲で prune が効く）"""
+    assert view_sql.count("UNION ALL") == 2
+    assert f"monthly_compensation_between`( {_LAST_CLOSED}, {_LAST_CLOSED} )" in view_sql
+    assert f"WHERE year_month = {_LAST_CLOSED}" in view_sql
+    # 締め済み全履歴をその場計算する anti-join は持たない
+    assert "between`( NULL," not in view_sql
+    assert "NOT IN" not in view_sql
+
+
+def test_open_months_start_at_boundary(view_sql: str):
+    assert view_sql.count("INTERVAL 2 MONTH") == 2  # frozen の上限と未締めの下限が同じ境界
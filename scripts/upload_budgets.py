@@ -30,6 +30,7 @@ PROJECT = "monthly-pay-tax"
 DATASET = "pay_reports"
 TABLE = "team_budgets"
 FULL_TABLE = f"`{PROJECT}.{DATASET}.{TABLE}`"
+REFRESH_ACTUALS_PROC = f"`{PROJECT}.{DATASET}.refresh_team_budget_actuals`"
 
 
 @dataclass
@@ -310,6 +311,35 @@ def merge_in_batches(client: bigquery.Client, rows: list[BudgetRow], actor: str,
     return success, skipped, unchanged, failed
 
 
+def changed_year_months(rows: list[BudgetRow], preview: PreviewResult) -> list[int]:
+    """MERGE 対象 (UNCHANGED 以外) の年月を YYYYMM の昇順で返す。"""
+    unchanged_keys = {r.key for kind, r, _ in preview.details if kind == "unchanged"}
+    return sorted({r.year * 100 + r.month for r in rows if r.key not in unchanged_keys})
+
+
+def refresh_team_budget_actuals(client: bigquery.Client, year_months: list[int]) -> bool:
+    """team_budget_actuals (予実の実体化テーブル) の year_months 分を再計算。
+
+    失敗時は warn のみ出して False を返す (MERGE は確定済み。同じ年月の次回更新か
+    infra/bigquery/migrations/2026-10-17_team_budget_actuals_table.sql の再実行で直る)。
+    """
+    if not year_months:
+        return True
+    sql = f"""
+    BEGIN TRANSACTION;
+    CALL {REFRESH_ACTUALS_PROC}(@months);
+    COMMIT TRANSACTION;
+    """
+    params = [bigquery.ArrayQueryParameter("months", "INT64", year_months)]
+    try:
+        client.query(sql, job_config=bigquery.QueryJobConfig(query_parameters=params)).result()
+    except Exception as e:
+        print(f"  WARN: team_budget_actuals の再計算失敗 (MERGE 結果には影響しません): {e}",
+              file=sys.stderr)
+        return False
+    return True
+
+
 def resolve_actor() -> str:
     """gcloud 認証ユーザーから actor 文字列を構築。"""
     user_email = (
@@ -382,6 +412,8 @@ def main(argv: list[str] | None = None) -> int:
     success, skipped, unchanged, failed = merge_in_batches(client, rows, actor, args.force, preview)
     print(f"\n=== 完了: 成功 {success} 件 / 変更なしスキップ {unchanged} 件 / "
           f"lock競合スキップ {skipped} 件 / 失敗 {failed} 件 ===")
+    if success > 0:
+        refresh_team_budget_actuals(client, changed_year_months(rows, preview))
     if failed > 0 or (skipped > 0 and not args.force):
         if skipped > 0:
             print("ヒント: --force で lock 競合を強制上書きできます", file=sys.stderr)
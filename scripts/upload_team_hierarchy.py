@@ -34,6 +34,7 @@ DATASET = "pay_reports"
 TABLE = "team_hierarchy"
 FULL_TABLE = f"`{PROJECT}.{DATASET}.{TABLE}`"
 COVERAGE_VIEW = f"`{PROJECT}.{DATASET}.v_team_hierarchy_coverage`"
+REFRESH_ACTUALS_PROC = f"`{PROJECT}.{DATASET}.refresh_team_budget_actuals`"
 
 VALID_LEADER_TEAM_TYPES = {"operating", "common"}
 
@@ -284,6 +285,27 @@ def check_coverage(client: bigquery.Client) -> tuple[int, int]:
     return unmapped, unused
 
 
+def refresh_team_budget_actuals(client: bigquery.Client) -> bool:
+    """team_budget_actuals (予実の実体化テーブル) を全件再計算。
+
+    隊の所属・operating 判定は全月の予実に効くため年月を絞らない。失敗時は warn のみ出して
+    False を返す (MERGE は確定済み。
+    infra/bigquery/migrations/2026-10-17_team_budget_actuals_table.sql の再実行で直る)。
+    """
+    sql = f"""
+    BEGIN TRANSACTION;
+    CALL {REFRESH_ACTUALS_PROC}(NULL);
+    COMMIT TRANSACTION;
+    """
+    try:
+        client.query(sql).result()
+    except Exception as e:
+        print(f"  WARN: team_budget_actuals の再計算失敗 (MERGE 結果には影響しません): {e}",
+              file=sys.stderr)
+        return False
+    return True
+
+
 def resolve_actor() -> str:
     """gcloud 認証ユーザーから actor 文字列を構築。"""
     user_email = (
@@ -348,6 +370,8 @@ def main(argv: list[str] | None = None) -> int:
     success, skipped, unchanged, failed = merge_in_batches(client, rows, actor, args.force, preview)
     print(f"\n=== 完了: 成功 {success} 件 / 変更なしスキップ {unchanged} 件 / "
           f"lock競合スキップ {skipped} 件 / 失敗 {failed} 件 ===")
+    if success > 0:
+        refresh_team_budget_actuals(client)
 
     if args.check_coverage:
         print("\n--- v_team_hierarchy_coverage ---")